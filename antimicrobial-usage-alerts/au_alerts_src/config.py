@@ -79,6 +79,8 @@ class Config:
         "INDICATION_DB_PATH",
         str(Path.home() / ".aegis" / "indications.db"),
     )
+    # Seconds usage reports (by antibiotic/location/service) are cached
+    INDICATION_REPORT_CACHE_SECONDS: float = float(os.getenv("INDICATION_REPORT_CACHE_SECONDS", "300"))
     CHUA_CSV_PATH: str = os.getenv(
         "CHUA_CSV_PATH",
         str(ASP_ALERTS_ROOT / "data" / "chuk046645.ww2.csv"),
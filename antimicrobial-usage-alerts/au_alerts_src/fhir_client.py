@@ -12,13 +12,15 @@ from typing import Any
 
 import requests
 
-from .config import config
+from .config import config  # This adds the project root to sys.path
 from .models import Patient, MedicationOrder
 
+from common.fhir import PagedSearchMixin
+
 logger = logging.getLogger(__name__)
 
 
-class FHIRClient(ABC):
+class FHIRClient(PagedSearchMixin, ABC):
     """Abstract FHIR client - implement for different backends."""
 
     @abstractmethod
@@ -26,17 +28,6 @@ class FHIRClient(ABC):
         """GET a FHIR resource or search."""
         pass
 
-    @staticmethod
-    def _extract_entries(bundle: dict) -> list[dict]:
-        """Extract resource entries from a FHIR Bundle."""
-        if bundle.get("resourceType") != "Bundle":
-            return []
-        return [
-            entry.get("resource", {})
-            for entry in bundle.get("entry", [])
-            if "resource" in entry
-        ]
-
     def get_patient(self, patient_id: str) -> Patient | None:
         """Get a patient by ID and convert to model."""
         try:
@@ -57,7 +48,7 @@ class FHIRClient(ABC):
             rxnorm_codes: Optional list of RxNorm codes to filter by.
                          If None, returns all active medication requests.
         """
-        params = {"status": "active", "_count": "500"}
+        params = {"status": "active"}
 
         if rxnorm_codes:
             # FHIR uses code system|code format
@@ -67,8 +58,7 @@ class FHIRClient(ABC):
             )
             params["code"] = code_param
 
-        response = self.get("MedicationRequest", params)
-        return self._extract_entries(response)
+        return list(self.search("MedicationRequest", params))
 
     def get_monitored_medications(self) -> list[MedicationOrder]:
         """Get active medication requests for monitored broad-spectrum antibiotics."""
@@ -99,8 +89,7 @@ class FHIRClient(ABC):
             )
             params["code"] = code_param
 
-        response = self.get("MedicationRequest", params)
-        resources = self._extract_entries(response)
+        resources = list(self.search("MedicationRequest", params))
 
         orders = []
         for resource in resources:
@@ -232,8 +221,7 @@ class FHIRClient(ABC):
         }
 
         try:
-            response = self.get("Encounter", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("Encounter", params, limit=1))
         except Exception as e:
             logger.warning(f"Failed to get encounter for patient {patient_id}: {e}")
             return {"location": None, "service": None}
@@ -291,8 +279,7 @@ class FHIRClient(ABC):
         }
 
         try:
-            response = self.get("Condition", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("Condition", params))
         except Exception as e:
             logger.warning(f"Failed to get conditions for patient {patient_id}: {e}")
             return []
@@ -339,8 +326,7 @@ class FHIRClient(ABC):
             params["type"] = ",".join(note_types)
 
         try:
-            response = self.get("DocumentReference", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("DocumentReference", params, limit=50))
         except Exception as e:
             logger.warning(f"Failed to get notes for patient {patient_id}: {e}")
             return []
@@ -428,7 +414,6 @@ class FHIRClient(ABC):
         params = {
             "status": "active",
             "authoredon": f"ge{since_date.strftime('%Y-%m-%dT%H:%M:%S')}",
-            "_count": "500",
         }
 
         if rxnorm_codes:
@@ -439,8 +424,7 @@ class FHIRClient(ABC):
             params["code"] = code_param
 
         try:
-            response = self.get("MedicationRequest", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("MedicationRequest", params))
         except Exception as e:
             logger.warning(f"Failed to get recent medication requests: {e}")
             return []
@@ -612,6 +596,10 @@ class EpicFHIRClient(FHIRClient):
 
         return self.access_token
 
+    def _auth_headers(self) -> dict:
+        """Bearer token header, refreshed when it expires."""
+        return {"Authorization": f"Bearer {self._get_access_token()}"}
+
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request with OAuth authentication."""
         token = self._get_access_token()
@@ -11,6 +11,7 @@ import uuid
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable
 
 from .models import (
     EvidenceSource,
@@ -19,10 +20,16 @@ from .models import (
     Patient,
     MedicationOrder,
 )
-from .config import config
+from .config import config  # This adds the project root to sys.path
+
+from common.db import VersionedCache
 
 logger = logging.getLogger(__name__)
 
+# Usage report results shared by all IndicationDatabase instances (they are
+# created per request), keyed by (db_path, report, days)
+_report_cache = VersionedCache("indication_changes")
+
 
 def _log_indication_activity(
     activity_type: str,
@@ -39,14 +46,14 @@ def _log_indication_activity(
 ) -> None:
     """Log activity to the unified metrics store.
 
-    This is a fire-and-forget operation - failures are logged but don't
-    interrupt the main operation.
+    This is a fire-and-forget operation - the row is queued and written in
+    the background (see common.metrics_store.sink), and failures are logged
+    but don't interrupt the main operation.
     """
     try:
-        from common.metrics_store import MetricsStore, ModuleSource
+        from common.metrics_store import ModuleSource, get_activity_sink
 
-        store = MetricsStore()
-        store.log_activity(
+        get_activity_sink().log_activity(
             activity_type=activity_type,
             module=ModuleSource.ABX_INDICATIONS,
             provider_id=provider_id,
@@ -174,6 +181,13 @@ class IndicationDatabase:
                 except Exception as e:
                     logger.debug(f"Migration skipped for {col_name}: {e}")
 
+        # Usage reports join reviews by candidate and count agent decisions;
+        # created here because agent_decision may have just been added
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reviews_candidate_decision "
+            "ON indication_reviews(candidate_id, agent_decision)"
+        )
+
         conn.commit()
 
     @contextmanager
@@ -696,76 +710,12 @@ class IndicationDatabase:
         Returns:
             List of dicts with medication stats including syndromes and appropriateness.
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Get basic counts per antibiotic
-            cursor.execute(
-                """
-                SELECT
-                    medication_name,
-                    rxnorm_code,
-                    COUNT(*) as total_orders
-                FROM indication_candidates
-                WHERE created_at >= datetime('now', ?)
-                GROUP BY medication_name, rxnorm_code
-                ORDER BY total_orders DESC
-                """,
-                (f"-{days} days",),
-            )
-            antibiotics = cursor.fetchall()
-
-            results = []
-            for abx in antibiotics:
-                med_name = abx["medication_name"]
-
-                # Get top 3 syndromes for this antibiotic
-                cursor.execute(
-                    """
-                    SELECT clinical_syndrome_display, COUNT(*) as cnt
-                    FROM indication_candidates
-                    WHERE medication_name = ?
-                    AND created_at >= datetime('now', ?)
-                    AND clinical_syndrome IS NOT NULL
-                    AND clinical_syndrome != ''
-                    GROUP BY clinical_syndrome
-                    ORDER BY cnt DESC
-                    LIMIT 3
-                    """,
-                    (med_name, f"-{days} days"),
-                )
-                top_syndromes = [row["clinical_syndrome_display"] for row in cursor.fetchall()]
-
-                # Get agent appropriateness for this antibiotic
-                cursor.execute(
-                    """
-                    SELECT
-                        SUM(CASE WHEN r.agent_decision = 'agent_appropriate' THEN 1 ELSE 0 END) as appropriate,
-                        SUM(CASE WHEN r.agent_decision = 'agent_acceptable' THEN 1 ELSE 0 END) as acceptable,
-                        SUM(CASE WHEN r.agent_decision = 'agent_inappropriate' THEN 1 ELSE 0 END) as inappropriate,
-                        COUNT(CASE WHEN r.agent_decision IN ('agent_appropriate', 'agent_acceptable', 'agent_inappropriate') THEN 1 END) as assessed
-                    FROM indication_candidates c
-                    JOIN indication_reviews r ON c.id = r.candidate_id
-                    WHERE c.medication_name = ?
-                    AND c.created_at >= datetime('now', ?)
-                    """,
-                    (med_name, f"-{days} days"),
-                )
-                agent_row = cursor.fetchone()
-                assessed = agent_row["assessed"] or 0
-                agent_appropriate = (agent_row["appropriate"] or 0) + (agent_row["acceptable"] or 0)
-
-                results.append({
-                    "medication_name": med_name,
-                    "rxnorm_code": abx["rxnorm_code"],
-                    "total_orders": abx["total_orders"],
-                    "top_syndromes": top_syndromes,
-                    "agent_assessed": assessed,
-                    "agent_appropriate": agent_appropriate,
-                    "agent_inappropriate": agent_row["inappropriate"] or 0,
-                    "agent_appropriate_rate": agent_appropriate / assessed if assessed > 0 else None,
-                })
-            return results
+        def compute():
+            return [
+                {"medication_name": row.pop("key"), **row}
+                for row in self._usage_breakdown("medication_name", days, extra_column="rxnorm_code")
+            ]
+        return self._cached_report("by_antibiotic", days, compute)
 
     def get_usage_by_location(self, days: int = 30) -> list[dict]:
         """Get antibiotic usage statistics grouped by location/unit.
@@ -778,74 +728,12 @@ class IndicationDatabase:
         Returns:
             List of dicts with location stats including syndromes and appropriateness.
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Get basic counts per location
-            cursor.execute(
-                """
-                SELECT
-                    COALESCE(location, 'Unknown') as location,
-                    COUNT(*) as total_orders
-                FROM indication_candidates
-                WHERE created_at >= datetime('now', ?)
-                GROUP BY location
-                ORDER BY total_orders DESC
-                """,
-                (f"-{days} days",),
-            )
-            locations = cursor.fetchall()
-
-            results = []
-            for loc in locations:
-                loc_name = loc["location"]
-
-                # Get top 3 syndromes for this location
-                cursor.execute(
-                    """
-                    SELECT clinical_syndrome_display, COUNT(*) as cnt
-                    FROM indication_candidates
-                    WHERE COALESCE(location, 'Unknown') = ?
-                    AND created_at >= datetime('now', ?)
-                    AND clinical_syndrome IS NOT NULL
-                    AND clinical_syndrome != ''
-                    GROUP BY clinical_syndrome
-                    ORDER BY cnt DESC
-                    LIMIT 3
-                    """,
-                    (loc_name, f"-{days} days"),
-                )
-                top_syndromes = [row["clinical_syndrome_display"] for row in cursor.fetchall()]
-
-                # Get agent appropriateness for this location
-                cursor.execute(
-                    """
-                    SELECT
-                        SUM(CASE WHEN r.agent_decision = 'agent_appropriate' THEN 1 ELSE 0 END) as appropriate,
-                        SUM(CASE WHEN r.agent_decision = 'agent_acceptable' THEN 1 ELSE 0 END) as acceptable,
-                        SUM(CASE WHEN r.agent_decision = 'agent_inappropriate' THEN 1 ELSE 0 END) as inappropriate,
-                        COUNT(CASE WHEN r.agent_decision IN ('agent_appropriate', 'agent_acceptable', 'agent_inappropriate') THEN 1 END) as assessed
-                    FROM indication_candidates c
-                    JOIN indication_reviews r ON c.id = r.candidate_id
-                    WHERE COALESCE(c.location, 'Unknown') = ?
-                    AND c.created_at >= datetime('now', ?)
-                    """,
-                    (loc_name, f"-{days} days"),
-                )
-                agent_row = cursor.fetchone()
-                assessed = agent_row["assessed"] or 0
-                agent_appropriate = (agent_row["appropriate"] or 0) + (agent_row["acceptable"] or 0)
-
-                results.append({
-                    "location": loc_name,
-                    "total_orders": loc["total_orders"],
-                    "top_syndromes": top_syndromes,
-                    "agent_assessed": assessed,
-                    "agent_appropriate": agent_appropriate,
-                    "agent_inappropriate": agent_row["inappropriate"] or 0,
-                    "agent_appropriate_rate": agent_appropriate / assessed if assessed > 0 else None,
-                })
-            return results
+        def compute():
+            return [
+                {"location": row.pop("key"), **row}
+                for row in self._usage_breakdown("COALESCE(location, 'Unknown')", days)
+            ]
+        return self._cached_report("by_location", days, compute)
 
     def get_usage_by_service(self, days: int = 30) -> list[dict]:
         """Get antibiotic usage statistics grouped by ordering service.
@@ -858,74 +746,126 @@ class IndicationDatabase:
         Returns:
             List of dicts with service stats including syndromes and appropriateness.
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+        def compute():
+            return [
+                {"service": row.pop("key"), **row}
+                for row in self._usage_breakdown("COALESCE(service, 'Unknown')", days)
+            ]
+        return self._cached_report("by_service", days, compute)
 
-            # Get basic counts per service
-            cursor.execute(
-                """
+    def _usage_breakdown(self, key: str, days: int, extra_column: str | None = None) -> list[dict]:
+        """Orders, top syndromes and agent appropriateness per group.
+
+        Runs three grouped queries however many groups there are: order
+        counts, the top 3 syndromes per group (ranked with ROW_NUMBER), and
+        review agent decisions per group.
+
+        Args:
+            key: Grouping expression over indication_candidates columns.
+            days: Number of days to include.
+            extra_column: Column to split order counts by as well (syndromes
+                and agent stats stay per key).
+
+        Returns:
+            List of dicts ordered by total_orders descending.
+        """
+        cutoff = (f"-{days} days",)
+        extra = f", {extra_column}" if extra_column else ""
+
+        with self._get_connection() as conn:
+            orders = conn.execute(
+                f"""
                 SELECT
-                    COALESCE(service, 'Unknown') as service,
-                    COUNT(*) as total_orders
+                    {key} as usage_key{extra},
+                    COUNT(*) as total_orders,
+                    SUM(CASE WHEN final_classification = 'N' THEN 1 ELSE 0 END) as inappropriate
                 FROM indication_candidates
                 WHERE created_at >= datetime('now', ?)
-                GROUP BY service
+                GROUP BY usage_key{extra}
                 ORDER BY total_orders DESC
                 """,
-                (f"-{days} days",),
-            )
-            services = cursor.fetchall()
-
-            results = []
-            for svc in services:
-                svc_name = svc["service"]
+                cutoff,
+            ).fetchall()
 
-                # Get top 3 syndromes for this service
-                cursor.execute(
-                    """
-                    SELECT clinical_syndrome_display, COUNT(*) as cnt
+            top_syndromes: dict[str, list[str]] = {}
+            for row in conn.execute(
+                f"""
+                SELECT usage_key, clinical_syndrome_display
+                FROM (
+                    SELECT
+                        {key} as usage_key,
+                        clinical_syndrome_display,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY {key} ORDER BY COUNT(*) DESC, clinical_syndrome
+                        ) as syndrome_rank
                     FROM indication_candidates
-                    WHERE COALESCE(service, 'Unknown') = ?
-                    AND created_at >= datetime('now', ?)
+                    WHERE created_at >= datetime('now', ?)
                     AND clinical_syndrome IS NOT NULL
                     AND clinical_syndrome != ''
-                    GROUP BY clinical_syndrome
-                    ORDER BY cnt DESC
-                    LIMIT 3
-                    """,
-                    (svc_name, f"-{days} days"),
+                    GROUP BY usage_key, clinical_syndrome
                 )
-                top_syndromes = [row["clinical_syndrome_display"] for row in cursor.fetchall()]
-
-                # Get agent appropriateness for this service
-                cursor.execute(
-                    """
+                WHERE syndrome_rank <= 3
+                ORDER BY usage_key, syndrome_rank
+                """,
+                cutoff,
+            ):
+                top_syndromes.setdefault(row["usage_key"], []).append(row["clinical_syndrome_display"])
+
+            agent_stats = {
+                row["usage_key"]: row
+                for row in conn.execute(
+                    f"""
                     SELECT
+                        {key} as usage_key,
                         SUM(CASE WHEN r.agent_decision = 'agent_appropriate' THEN 1 ELSE 0 END) as appropriate,
                         SUM(CASE WHEN r.agent_decision = 'agent_acceptable' THEN 1 ELSE 0 END) as acceptable,
                         SUM(CASE WHEN r.agent_decision = 'agent_inappropriate' THEN 1 ELSE 0 END) as inappropriate,
                         COUNT(CASE WHEN r.agent_decision IN ('agent_appropriate', 'agent_acceptable', 'agent_inappropriate') THEN 1 END) as assessed
                     FROM indication_candidates c
                     JOIN indication_reviews r ON c.id = r.candidate_id
-                    WHERE COALESCE(c.service, 'Unknown') = ?
-                    AND c.created_at >= datetime('now', ?)
+                    WHERE c.created_at >= datetime('now', ?)
+                    GROUP BY usage_key
                     """,
-                    (svc_name, f"-{days} days"),
+                    cutoff,
                 )
-                agent_row = cursor.fetchone()
-                assessed = agent_row["assessed"] or 0
-                agent_appropriate = (agent_row["appropriate"] or 0) + (agent_row["acceptable"] or 0)
+            }
 
-                results.append({
-                    "service": svc_name,
-                    "total_orders": svc["total_orders"],
-                    "top_syndromes": top_syndromes,
-                    "agent_assessed": assessed,
-                    "agent_appropriate": agent_appropriate,
-                    "agent_inappropriate": agent_row["inappropriate"] or 0,
-                    "agent_appropriate_rate": agent_appropriate / assessed if assessed > 0 else None,
-                })
-            return results
+        results = []
+        for row in orders:
+            usage_key = row["usage_key"]
+            agent_row = agent_stats.get(usage_key)
+            assessed = (agent_row["assessed"] or 0) if agent_row else 0
+            agent_appropriate = (
+                (agent_row["appropriate"] or 0) + (agent_row["acceptable"] or 0) if agent_row else 0
+            )
+
+            result = {"key": usage_key}
+            if extra_column:
+                result[extra_column] = row[extra_column]
+            result.update({
+                "total_orders": row["total_orders"],
+                "inappropriate": row["inappropriate"] or 0,
+                "top_syndromes": top_syndromes.get(usage_key, []),
+                "agent_assessed": assessed,
+                "agent_appropriate": agent_appropriate,
+                "agent_inappropriate": (agent_row["inappropriate"] or 0) if agent_row else 0,
+                "agent_appropriate_rate": agent_appropriate / assessed if assessed > 0 else None,
+            })
+            results.append(result)
+        return results
+
+    def _cached_report(self, report: str, days: int, compute: Callable[[], Any]) -> Any:
+        """Serve a usage report from the cache while no candidate or review has changed.
+
+        Entries are keyed on (database, report, days) and validated against
+        the trigger-maintained indication_changes version, so writes from
+        any process invalidate them; INDICATION_REPORT_CACHE_SECONDS bounds
+        how far the rolling "last N days" window can drift.
+        """
+        with self._get_connection() as conn:
+            version = _report_cache.read_version(conn)
+        key = (str(Path(self.db_path).expanduser()), report, days)
+        return _report_cache.get(key, version, compute, config.INDICATION_REPORT_CACHE_SECONDS)
 
     def get_usage_by_location_and_antibiotic(self, days: int = 30) -> list[dict]:
         """Get cross-tabulated usage by location AND antibiotic.
@@ -1012,6 +952,9 @@ class IndicationDatabase:
         Returns:
             Dict with summary statistics.
         """
+        return self._cached_report("summary", days, lambda: self._compute_usage_summary(days))
+
+    def _compute_usage_summary(self, days: int) -> dict:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
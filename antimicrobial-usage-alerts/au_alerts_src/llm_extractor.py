@@ -12,6 +12,8 @@ from typing import Any
 
 import requests
 
+from common.note_scanner import NoteScanner
+
 from .config import config
 from .models import IndicationExtraction, EvidenceSource
 
@@ -55,6 +57,16 @@ INFECTION_KEYWORDS = {
     "initiated",
 }
 
+_infection_scanner: NoteScanner | None = None
+
+
+def _get_infection_scanner() -> NoteScanner:
+    """Compiled scanner for INFECTION_KEYWORDS (built once per process)."""
+    global _infection_scanner
+    if _infection_scanner is None:
+        _infection_scanner = NoteScanner(keywords={"infection": INFECTION_KEYWORDS})
+    return _infection_scanner
+
 
 class NoteWithMetadata:
     """Clinical note with associated metadata."""
@@ -255,6 +267,10 @@ Respond with JSON containing:
         med_parts = med_lower.split()
         search_terms = {med_lower, med_parts[0]} if med_parts else {med_lower}
 
+        # One pass per note over medication terms and infection keywords
+        scanner = NoteScanner(keywords={"medication": search_terms}) if med_lower else None
+        infection_scanner = _get_infection_scanner()
+
         filtered = []
         for note in notes:
             # Always include high-priority note types
@@ -263,16 +279,12 @@ Respond with JSON containing:
                 filtered.append(note)
                 continue
 
-            # Check if note text contains relevant content
-            text_lower = note.text.lower()
-
-            # Check for medication name
-            if any(term in text_lower for term in search_terms):
+            # Check for medication name, then infection keywords
+            if scanner is not None and scanner.has_keyword(note.text):
                 filtered.append(note)
                 continue
 
-            # Check for infection keywords
-            if any(kw in text_lower for kw in INFECTION_KEYWORDS):
+            if infection_scanner.has_keyword(note.text):
                 filtered.append(note)
                 continue
 
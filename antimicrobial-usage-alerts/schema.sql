@@ -105,11 +105,48 @@ CREATE INDEX IF NOT EXISTS idx_candidates_service ON indication_candidates(servi
 CREATE INDEX IF NOT EXISTS idx_candidates_rxnorm ON indication_candidates(rxnorm_code);
 CREATE INDEX IF NOT EXISTS idx_candidates_medication ON indication_candidates(medication_name);
 
+-- Usage reports filter on created_at and group by location/service
+CREATE INDEX IF NOT EXISTS idx_candidates_created_location ON indication_candidates(created_at, location);
+CREATE INDEX IF NOT EXISTS idx_candidates_created_service ON indication_candidates(created_at, service);
+
 CREATE INDEX IF NOT EXISTS idx_reviews_candidate ON indication_reviews(candidate_id);
 CREATE INDEX IF NOT EXISTS idx_reviews_override ON indication_reviews(is_override);
 
 CREATE INDEX IF NOT EXISTS idx_extractions_candidate ON indication_extractions(candidate_id);
 
+-- Change counter for cached usage reports: bumped by any write to
+-- candidates or reviews, so a cached report is valid while it is unchanged
+CREATE TABLE IF NOT EXISTS indication_changes (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO indication_changes (id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_candidates_insert_version AFTER INSERT ON indication_candidates
+BEGIN
+    UPDATE indication_changes SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_candidates_update_version AFTER UPDATE ON indication_candidates
+BEGIN
+    UPDATE indication_changes SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_candidates_delete_version AFTER DELETE ON indication_candidates
+BEGIN
+    UPDATE indication_changes SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_reviews_insert_version AFTER INSERT ON indication_reviews
+BEGIN
+    UPDATE indication_changes SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_reviews_update_version AFTER UPDATE ON indication_reviews
+BEGIN
+    UPDATE indication_changes SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_reviews_delete_version AFTER DELETE ON indication_reviews
+BEGIN
+    UPDATE indication_changes SET version = version + 1 WHERE id = 1;
+END;
+
 -- Migration: Add new columns if they don't exist (for existing databases)
 -- SQLite doesn't support IF NOT EXISTS for ALTER TABLE, so we use a workaround
 -- These will fail silently if columns already exist (handled in Python)
@@ -229,3 +229,77 @@ class TestIndicationAssessment:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestUsageReports:
+    """Test the grouped usage reports."""
+
+    @pytest.fixture
+    def usage_db(self, tmp_path):
+        """A database with orders across two locations."""
+        db = IndicationDatabase(str(tmp_path / "usage.db"))
+        orders = [
+            # id, medication, location, classification, syndrome
+            ("c1", "Ceftriaxone", "PICU", "A", "pneumonia"),
+            ("c2", "Ceftriaxone", "PICU", "N", "pneumonia"),
+            ("c3", "Vancomycin", "PICU", "A", "sepsis"),
+            ("c4", "Vancomycin", "PICU", "A", "uti"),
+            ("c5", "Vancomycin", "PICU", "A", "cellulitis"),
+            ("c6", "Vancomycin", "PICU", "A", "sepsis"),
+            ("c7", "Meropenem", None, "N", None),
+        ]
+        with db._get_connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO indication_candidates (
+                    id, patient_id, patient_mrn, medication_request_id, medication_name,
+                    order_date, location, icd10_classification, final_classification,
+                    classification_source, clinical_syndrome, clinical_syndrome_display
+                ) VALUES (?, 'p', 'mrn', ?, ?, datetime('now'), ?, ?, ?, 'icd10', ?, ?)
+                """,
+                [
+                    (cid, f"med-{cid}", med, loc, cls, cls, syndrome, syndrome.title() if syndrome else None)
+                    for cid, med, loc, cls, syndrome in orders
+                ],
+            )
+            conn.commit()
+        db.save_review("c1", "rph", "confirmed", agent_decision="agent_appropriate")
+        db.save_review("c2", "rph", "confirmed_n", agent_decision="agent_inappropriate")
+        return db
+
+    def test_usage_by_location(self, usage_db):
+        """Test counts, top 3 syndromes and agent stats per location."""
+        picu, unknown = usage_db.get_usage_by_location(days=30)
+
+        assert picu["location"] == "PICU"
+        assert picu["total_orders"] == 6
+        assert picu["inappropriate"] == 1
+        assert picu["top_syndromes"][:2] == ["Pneumonia", "Sepsis"]
+        assert len(picu["top_syndromes"]) == 3
+        assert (picu["agent_assessed"], picu["agent_appropriate"], picu["agent_inappropriate"]) == (2, 1, 1)
+        assert picu["agent_appropriate_rate"] == 0.5
+
+        assert unknown["location"] == "Unknown"
+        assert unknown["top_syndromes"] == []
+        assert unknown["agent_appropriate_rate"] is None
+
+    def test_usage_by_antibiotic(self, usage_db):
+        """Test antibiotic rows keep the rxnorm_code column."""
+        by_name = {r["medication_name"]: r for r in usage_db.get_usage_by_antibiotic(days=30)}
+
+        assert by_name["Vancomycin"]["total_orders"] == 4
+        assert by_name["Vancomycin"]["top_syndromes"][0] == "Sepsis"
+        assert "rxnorm_code" in by_name["Vancomycin"]
+        assert by_name["Ceftriaxone"]["agent_assessed"] == 2
+
+    def test_reports_cached_until_data_changes(self, usage_db):
+        """Test a cached report is served until a review is written."""
+        first = usage_db.get_usage_by_service(days=30)
+        first[0]["total_orders"] = -1  # Callers get copies
+        assert usage_db.get_usage_by_service(days=30)[0]["total_orders"] == 7
+
+        with usage_db._get_connection() as conn:
+            conn.execute("DELETE FROM indication_candidates WHERE id = 'c7'")
+            conn.commit()
+
+        assert usage_db.get_usage_by_service(days=30)[0]["total_orders"] == 6
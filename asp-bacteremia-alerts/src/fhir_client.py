@@ -7,14 +7,15 @@ and Epic FHIR API. Switch between them via environment variables.
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 import requests
 
-from .config import config
+from .config import config  # This adds the project root to sys.path
+from common.fhir import PagedSearchMixin
 
 
-class FHIRClient(ABC):
+class FHIRClient(PagedSearchMixin, ABC):
     """Abstract FHIR client - implement for different backends."""
 
     @abstractmethod
@@ -29,8 +30,7 @@ class FHIRClient(ABC):
 
     def search_patients(self, **params) -> list[dict]:
         """Search for patients."""
-        response = self.get("Patient", params)
-        return self._extract_entries(response)
+        return list(self.search("Patient", params))
 
     def get_patient(self, patient_id: str) -> dict | None:
         """Get a single patient by ID."""
@@ -43,11 +43,10 @@ class FHIRClient(ABC):
 
     def get_active_medication_requests(self, patient_id: str) -> list[dict]:
         """Get active medication requests for a patient."""
-        response = self.get("MedicationRequest", {
+        return list(self.search("MedicationRequest", {
             "patient": patient_id,
             "status": "active",
-        })
-        return self._extract_entries(response)
+        }))
 
     def get_diagnostic_reports(
         self,
@@ -67,8 +66,7 @@ class FHIRClient(ABC):
         if date_from:
             params["date"] = f"ge{date_from.strftime('%Y-%m-%d')}"
 
-        response = self.get("DiagnosticReport", params)
-        return self._extract_entries(response)
+        return list(self.search("DiagnosticReport", params))
 
     def get_recent_blood_cultures(
         self,
@@ -76,28 +74,23 @@ class FHIRClient(ABC):
         status: str | None = None,
     ) -> list[dict]:
         """Get recent blood culture results (DiagnosticReport resources)."""
+        return list(self.iter_recent_blood_cultures(hours_back, status))
+
+    def iter_recent_blood_cultures(
+        self,
+        hours_back: int = 24,
+        status: str | None = None,
+    ) -> Iterator[dict]:
+        """Yield recent blood culture results page by page."""
         date_from = datetime.now() - timedelta(hours=hours_back)
         params = {
             "code": "http://loinc.org|600-7",  # LOINC for blood culture
             "date": f"ge{date_from.strftime('%Y-%m-%dT%H:%M:%S')}",
-            "_count": "500",
         }
         if status:
             params["status"] = status
 
-        response = self.get("DiagnosticReport", params)
-        return self._extract_entries(response)
-
-    @staticmethod
-    def _extract_entries(bundle: dict) -> list[dict]:
-        """Extract resource entries from a FHIR Bundle."""
-        if bundle.get("resourceType") != "Bundle":
-            return []
-        return [
-            entry.get("resource", {})
-            for entry in bundle.get("entry", [])
-            if "resource" in entry
-        ]
+        return self.search("DiagnosticReport", params)
 
 
 class HAPIFHIRClient(FHIRClient):
@@ -210,6 +203,10 @@ class EpicFHIRClient(FHIRClient):
 
         return self.access_token
 
+    def _auth_headers(self) -> dict:
+        """Bearer token header, refreshed when it expires."""
+        return {"Authorization": f"Bearer {self._get_access_token()}"}
+
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request with OAuth authentication."""
         token = self._get_access_token()
@@ -15,6 +15,7 @@ from .models import Antibiotic, CultureResult, Patient
 from .config import config
 
 from common.alert_store import AlertStore, AlertType, AlertStatus
+from common.fhir import PatientSnapshot
 
 
 class BacteremiaMonitor:
@@ -149,10 +150,19 @@ class BacteremiaMonitor:
             status=med_request.get("status", "active"),
         )
 
-    def check_culture(self, culture_report: dict) -> tuple[bool, str | None]:
+    def check_culture(
+        self,
+        culture_report: dict,
+        snapshot: PatientSnapshot | None = None,
+    ) -> tuple[bool, str | None]:
         """
         Check a single culture result for coverage issues.
 
+        Args:
+            culture_report: FHIR DiagnosticReport
+            snapshot: Patients/medications prefetched for this cycle. Patients
+                it doesn't cover are fetched individually.
+
         Returns:
             Tuple of (alert_generated, alert_id)
         """
@@ -178,7 +188,12 @@ class BacteremiaMonitor:
             print(f"  Warning: Culture {culture.fhir_id} has no patient reference")
             return False, None
 
-        patient_resource = self.fhir.get_patient(culture.patient_id)
+        if snapshot and snapshot.covers(culture.patient_id):
+            patient_resource = snapshot.patient(culture.patient_id)
+            med_requests = snapshot.medication_requests(culture.patient_id)
+        else:
+            patient_resource = self.fhir.get_patient(culture.patient_id)
+            med_requests = None
         if not patient_resource:
             print(f"  Warning: Patient {culture.patient_id} not found")
             return False, None
@@ -186,7 +201,8 @@ class BacteremiaMonitor:
         patient = self._parse_patient(patient_resource)
 
         # Get active antibiotics
-        med_requests = self.fhir.get_active_medication_requests(culture.patient_id)
+        if med_requests is None:
+            med_requests = self.fhir.get_active_medication_requests(culture.patient_id)
         antibiotics = [self._parse_medication_request(mr) for mr in med_requests]
 
         # Assess coverage
@@ -228,6 +244,17 @@ class BacteremiaMonitor:
 
         return False, None
 
+    def _fetch_patient_snapshot(self, culture_reports: list[dict]) -> PatientSnapshot:
+        """Bulk-fetch patients and medications for cultures not yet processed."""
+        patient_ids = set()
+        for report in culture_reports:
+            culture = self._parse_culture(report)
+            if culture.fhir_id in self.processed_cultures:
+                continue
+            if culture.patient_id and (culture.organism or culture.gram_stain):
+                patient_ids.add(culture.patient_id)
+        return PatientSnapshot.fetch(self.fhir.search, patient_ids)
+
     def run_once(self) -> int:
         """
         Run a single check cycle.
@@ -243,10 +270,12 @@ class BacteremiaMonitor:
 
         print(f"  Found {len(cultures)} blood culture(s) in the last {self.lookback_hours} hours")
 
+        snapshot = self._fetch_patient_snapshot(cultures)
+
         alerts_generated = 0
         for culture in cultures:
             try:
-                alerted, alert_id = self.check_culture(culture)
+                alerted, alert_id = self.check_culture(culture, snapshot)
                 if alerted:
                     alerts_generated += 1
             except Exception as e:
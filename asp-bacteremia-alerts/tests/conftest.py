@@ -0,0 +1,22 @@
+"""Shared test fixtures."""
+
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def metrics_db(tmp_path_factory):
+    """Send activity logged by the stores to a throwaway metrics database.
+
+    AlertStore logs through common.metrics_store.get_activity_sink(), which
+    otherwise writes to METRICS_DB_PATH or ~/.aegis/metrics.db.
+    """
+    path = str(tmp_path_factory.mktemp("metrics") / "metrics.db")
+    previous = os.environ.get("METRICS_DB_PATH")
+    os.environ["METRICS_DB_PATH"] = path
+    yield path
+    if previous is None:
+        del os.environ["METRICS_DB_PATH"]
+    else:
+        os.environ["METRICS_DB_PATH"] = previous
@@ -0,0 +1,253 @@
+"""Tests for AlertStore list queries."""
+
+import pytest
+
+import src.config  # noqa: F401  (puts the project root, and common/, on sys.path)
+from common.alert_store import AlertStatus, AlertStore, AlertType
+from common.alert_store.store import MIGRATIONS
+from common.db import ensure_schema, forget_schema, get_connection
+
+ACTIVE = [AlertStatus.PENDING, AlertStatus.SENT, AlertStatus.ACKNOWLEDGED, AlertStatus.SNOOZED]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AlertStore(str(tmp_path / "alerts.db"))
+
+
+def query_plan(store: AlertStore, sql: str, params: list) -> str:
+    conn = get_connection(store.db_path)
+    return " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+def list_sql(where: str) -> str:
+    return f"SELECT id FROM alerts WHERE {where} ORDER BY created_at DESC, id DESC LIMIT ?"
+
+
+class TestListAlerts:
+    """Tests for filtered and paged alert listing."""
+
+    def test_pages_cover_every_alert_once(self, store):
+        """Test following cursors returns each alert exactly once, newest first."""
+        for i in range(25):
+            store.save_alert(AlertType.BACTEREMIA, f"culture-{i}")
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = store.list_alerts_page(limit=10, cursor=cursor)
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        assert len(seen) == 25
+        assert len({a.id for a in seen}) == 25
+        created = [(a.created_at, a.id) for a in seen]
+        assert created == sorted(created, reverse=True)
+
+    def test_filters_by_type_list(self, store):
+        """Test alert_type accepts a list of types."""
+        store.save_alert(AlertType.BACTEREMIA, "a")
+        store.save_alert(AlertType.DRUG_BUG_MISMATCH, "b")
+        store.save_alert(AlertType.NHSN_CLABSI, "c")
+
+        alerts = store.list_alerts(alert_type=[AlertType.BACTEREMIA, AlertType.DRUG_BUG_MISMATCH])
+
+        assert {a.source_id for a in alerts} == {"a", "b"}
+
+    def test_invalid_cursor_rejected(self, store):
+        """Test a malformed cursor raises ValueError."""
+        with pytest.raises(ValueError):
+            store.list_alerts_page(cursor="not-a-cursor")
+
+    def test_migration_drops_superseded_indexes(self, tmp_path):
+        """Test an existing database loses the old single-column indexes."""
+        db_path = tmp_path / "old.db"
+        conn = get_connection(db_path)
+        conn.executescript("""
+            CREATE TABLE alerts (id TEXT PRIMARY KEY, alert_type TEXT, source_id TEXT,
+                status TEXT, severity TEXT, patient_id TEXT, patient_mrn TEXT,
+                patient_name TEXT, title TEXT, summary TEXT, content TEXT,
+                created_at TIMESTAMP, sent_at TIMESTAMP, acknowledged_at TIMESTAMP,
+                acknowledged_by TEXT, resolved_at TIMESTAMP, resolved_by TEXT,
+                resolution_reason TEXT, snoozed_until TIMESTAMP, notes TEXT);
+            CREATE INDEX idx_alerts_status ON alerts(status);
+            CREATE INDEX idx_alerts_created_at ON alerts(created_at);
+        """)
+        forget_schema(db_path)
+
+        AlertStore(str(db_path))
+
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_alerts_status" not in indexes
+        assert "idx_alerts_created_at" not in indexes
+        assert "idx_alerts_status_created" in indexes
+        assert ensure_schema(db_path, "alert_store", migrations=MIGRATIONS) == len(MIGRATIONS)
+
+
+class TestQueryPlans:
+    """Regression tests: list queries must use the composite indexes.
+
+    A plan that falls back to scanning alerts or sorting every matching
+    row makes the history page slow down as the table grows.
+    """
+
+    def test_history_page(self, store):
+        """Test resolved ASP alerts are read in index order without a sort."""
+        plan = query_plan(store, list_sql("status = ? AND alert_type IN (?, ?)"),
+                          ["resolved", "bacteremia", "drug_bug_mismatch", 50])
+
+        assert "idx_alerts_status_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_history_page_with_cursor(self, store):
+        """Test a deep page seeks to the cursor instead of skipping rows."""
+        plan = query_plan(store, list_sql("status = ? AND (created_at, id) < (?, ?)"),
+                          ["resolved", "2026-01-01T00:00:00", "abc", 50])
+
+        assert "idx_alerts_status_created (status=? AND (created_at,id)<(?,?))" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_type_and_status(self, store):
+        """Test a single type and status use the type/status index."""
+        plan = query_plan(store, list_sql("status = ? AND alert_type = ?"),
+                          ["resolved", "bacteremia", 50])
+
+        assert "idx_alerts_type_status_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_patient_alerts(self, store):
+        """Test MRN lookups use the MRN index in list order."""
+        plan = query_plan(store, list_sql("patient_mrn = ?"), ["MRN001", 50])
+
+        assert "idx_alerts_mrn_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_unfiltered_api_page(self, store):
+        """Test an unfiltered cursor page is an index range scan."""
+        plan = query_plan(store, list_sql("(created_at, id) < (?, ?)"),
+                          ["2026-01-01T00:00:00", "abc", 50])
+
+        assert "idx_alerts_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_active_statuses_use_index(self, store):
+        """Test the active list searches by status (sorting only active rows)."""
+        placeholders = ", ".join("?" for _ in ACTIVE)
+        plan = query_plan(store, list_sql(f"status IN ({placeholders})"),
+                          [s.value for s in ACTIVE] + [50])
+
+        assert "idx_alerts_status_created" in plan
+        assert "SCAN alerts" not in plan
+
+
+class TestSummaryProjection:
+    """Tests for summary list rows and lazy content."""
+
+    def test_summary_skips_content_and_notes(self, store):
+        """Test summary rows load only the requested content keys."""
+        alert = store.save_alert(
+            AlertType.BACTEREMIA, "c1", title="MRSA",
+            content={"coverage_status": "inadequate", "organism": "S. aureus", "big": list(range(100))},
+        )
+        store.add_note(alert.id, "Called team", "pharmacist")
+
+        summary = store.list_alerts(summary=True, content_keys=("coverage_status", "missing"))[0]
+
+        assert summary.is_summary
+        assert summary.title == "MRSA"
+        assert summary.content == {"coverage_status": "inadequate"}
+        assert summary.notes is None
+        assert "content" not in summary.to_dict()
+
+        full = store.get_alert(alert.id)
+        assert not full.is_summary
+        assert full.content["big"] == list(range(100))
+        assert full.notes
+
+    def test_content_decoded_on_first_access(self, store):
+        """Test content stays as JSON text until read."""
+        store.save_alert(AlertType.BACTEREMIA, "c1", content={"organism": "E. coli"})
+
+        alert = store.list_alerts()[0]
+
+        assert isinstance(alert._content, str)
+        assert alert.content == {"organism": "E. coli"}
+        assert alert._content is alert.content
+        assert not hasattr(alert, "__dict__")
+
+
+class TestAnalytics:
+    """Tests for single-pass, cached analytics."""
+
+    def test_analytics_figures(self, store):
+        """Test counts, breakdowns and response times from one scan."""
+        first = store.save_alert(AlertType.BACTEREMIA, "a", severity="critical")
+        store.save_alert(AlertType.BACTEREMIA, "b", severity="warning")
+        store.save_alert(AlertType.CUSTOM, "c", severity="warning")
+        conn = get_connection(store.db_path)
+        with conn:
+            conn.execute(
+                "UPDATE alerts SET status = 'resolved', resolution_reason = 'approved', "
+                "created_at = substr(created_at, 1, 19), "  # Whole seconds, like the times below
+                "acknowledged_at = datetime(substr(created_at, 1, 19), '+10 minutes'), "
+                "resolved_at = datetime(substr(created_at, 1, 19), '+90 minutes') WHERE id = ?",
+                (first.id,),
+            )
+
+        analytics = store.get_analytics(days=7)
+
+        assert analytics["total_alerts"] == 3
+        assert analytics["by_severity"] == {"warning": 2, "critical": 1}
+        assert analytics["by_status"] == {"pending": 2, "resolved": 1}
+        assert analytics["resolution_breakdown"] == [{"reason": "approved", "count": 1, "percentage": 100.0}]
+        assert analytics["response_times"]["avg_time_to_ack_minutes"] == 10
+        assert analytics["response_times_formatted"]["avg_time_to_resolve"] == "1h 30m"
+        assert sum(d["count"] for d in analytics["by_day_of_week"]) == 3
+        assert store.get_analytics(alert_type=AlertType.CUSTOM, days=7)["total_alerts"] == 1
+
+    def test_stats(self, store):
+        """Test stats totals and status filter."""
+        store.save_alert(AlertType.BACTEREMIA, "a", severity="critical")
+        store.save_alert(AlertType.BACTEREMIA, "b")
+
+        stats = store.get_stats()
+
+        assert stats == {"status_pending": 2, "severity_critical": 1, "severity_warning": 1,
+                         "total": 2, "today": 2}
+        assert store.get_stats(status=AlertStatus.RESOLVED) == {"total": 0, "today": 0}
+
+    def test_cache_invalidated_by_writes_from_other_stores(self, store):
+        """Test cached analytics refresh after any write to the database."""
+        store.save_alert(AlertType.BACTEREMIA, "a")
+        assert store.get_analytics(days=7)["total_alerts"] == 1
+
+        other = AlertStore(store.db_path)  # e.g. a monitor process
+        other.save_alert(AlertType.BACTEREMIA, "b")
+        assert store.get_analytics(days=7)["total_alerts"] == 2
+
+        other.acknowledge(other.list_alerts()[0].id, "pharmacist")
+        assert store.get_stats()["status_acknowledged"] == 1
+
+    def test_cached_result_not_shared(self, store):
+        """Test callers can't modify the cached result."""
+        store.save_alert(AlertType.BACTEREMIA, "a")
+
+        store.get_analytics(days=7)["by_status"]["pending"] = 99
+
+        assert store.get_analytics(days=7)["by_status"]["pending"] == 1
+
+
+class TestActivityLogging:
+    """Tests for the activity rows the store logs."""
+
+    def test_activity_logged_to_test_metrics_db(self, store, metrics_db):
+        """Test saved alerts are logged to the fixture's database, not ~/.aegis."""
+        from common.metrics_store import get_activity_sink
+
+        store.save_alert(AlertType.BACTEREMIA, "culture-1")
+        sink = get_activity_sink()
+
+        assert sink.store.db_path == metrics_db
+        assert sink.flush()
+        rows = get_connection(metrics_db).execute("SELECT COUNT(*) FROM provider_activity").fetchone()[0]
+        assert rows >= 1
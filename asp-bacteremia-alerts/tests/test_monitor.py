@@ -0,0 +1,89 @@
+"""Tests for per-cycle patient fetch coalescing in BacteremiaMonitor."""
+
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from src.monitor import BacteremiaMonitor
+from src.coverage_rules import RXNORM
+from common.alert_store import AlertStore
+
+
+def culture(culture_id: str, patient_id: str) -> dict:
+    return {
+        "resourceType": "DiagnosticReport",
+        "id": culture_id,
+        "status": "final",
+        "conclusion": "MRSA - Methicillin resistant Staphylococcus aureus",
+        "subject": {"reference": f"Patient/{patient_id}"},
+    }
+
+
+def patient(patient_id: str) -> dict:
+    return {
+        "resourceType": "Patient",
+        "id": patient_id,
+        "identifier": [{"system": "urn:mrn", "value": f"MRN-{patient_id}"}],
+        "name": [{"given": ["Test"], "family": patient_id}],
+    }
+
+
+def vancomycin(patient_id: str) -> dict:
+    return {
+        "resourceType": "MedicationRequest",
+        "id": f"med-{patient_id}",
+        "status": "active",
+        "subject": {"reference": f"Patient/{patient_id}"},
+        "medicationCodeableConcept": {
+            "text": "Vancomycin",
+            "coding": [{"system": "http://www.nlm.nih.gov/research/umls/rxnorm",
+                        "code": RXNORM["vancomycin"]}],
+        },
+    }
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.monitor.get_fhir_client", Mock)
+    alerter = Mock()
+    alerter.send_alert.return_value = True
+    return BacteremiaMonitor(alerter=alerter, alert_store=AlertStore(str(tmp_path / "alerts.db")))
+
+
+class TestPatientCoalescing:
+    """Tests for bulk patient/medication fetching per poll."""
+
+    def test_one_bulk_fetch_per_cycle(self, monitor):
+        """Test several cultures for the same patient share one lookup."""
+        monitor.fhir.get_recent_blood_cultures.return_value = [
+            culture("c1", "p1"), culture("c2", "p1"), culture("c3", "p1"), culture("c4", "p2"),
+        ]
+
+        def search(resource_type, params):
+            if resource_type == "Patient":
+                assert params == {"_id": "p1,p2"}
+                return [patient("p1"), patient("p2")]
+            assert params["patient"] == "p1,p2"
+            return [vancomycin("p1")]
+
+        monitor.fhir.search.side_effect = search
+
+        monitor.run_once()
+
+        assert monitor.fhir.search.call_count == 2
+        monitor.fhir.get_patient.assert_not_called()
+        monitor.fhir.get_active_medication_requests.assert_not_called()
+        assert monitor.alerter.send_alert.call_count == 1  # p2 has no MRSA coverage
+
+    def test_falls_back_per_patient_when_bulk_fails(self, monitor):
+        """Test a failed bulk search falls back to per-patient lookups."""
+        monitor.fhir.get_recent_blood_cultures.return_value = [culture("c1", "p1")]
+        monitor.fhir.search.side_effect = requests.ConnectionError("refused")
+        monitor.fhir.get_patient.return_value = patient("p1")
+        monitor.fhir.get_active_medication_requests.return_value = [vancomycin("p1")]
+
+        monitor.run_once()
+
+        monitor.fhir.get_patient.assert_called_once_with("p1")
+        monitor.alerter.send_alert.assert_not_called()
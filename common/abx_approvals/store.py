@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from ..db import Migration, ensure_schema, get_connection
 from .models import (
     ApprovalDecision,
     ApprovalStatus,
@@ -19,6 +20,11 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+
+# Schema changes for existing databases (see common.db.schema)
+MIGRATIONS: list[Migration] = []
+
 
 def _log_abx_activity(
     activity_type: str,
@@ -33,14 +39,14 @@ def _log_abx_activity(
 ) -> None:
     """Log activity to the unified metrics store.
 
-    This is a fire-and-forget operation - failures are logged but don't
-    interrupt the main operation.
+    This is a fire-and-forget operation - the row is queued and written in
+    the background (see common.metrics_store.sink), and failures are logged
+    but don't interrupt the main operation.
     """
     try:
-        from common.metrics_store import MetricsStore, ModuleSource
+        from common.metrics_store import ModuleSource, get_activity_sink
 
-        store = MetricsStore()
-        store.log_activity(
+        get_activity_sink().log_activity(
             activity_type=activity_type,
             module=ModuleSource.ABX_APPROVALS,
             provider_id=provider_id,
@@ -81,19 +87,12 @@ class AbxApprovalStore:
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize database schema."""
-        schema_path = Path(__file__).parent / "schema.sql"
-        with open(schema_path) as f:
-            schema = f.read()
-
-        with self._connect() as conn:
-            conn.executescript(schema)
+        """Initialize database schema (once per process per database)."""
+        ensure_schema(self.db_path, "abx_approvals", schema_path=SCHEMA_PATH, migrations=MIGRATIONS)
 
     def _connect(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's shared WAL connection (see common.db)."""
+        return get_connection(self.db_path)
 
     def _generate_id(self) -> str:
         """Generate a unique approval ID."""
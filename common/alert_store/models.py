@@ -1,6 +1,6 @@
 """Data models for persistent alert storage."""
 
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -90,9 +90,14 @@ class ResolutionReason(Enum):
         return [(r.value, cls.display_name(r)) for r in cls]
 
 
-@dataclass
+@dataclass(slots=True)
 class StoredAlert:
-    """A persistently stored alert with full lifecycle tracking."""
+    """A persistently stored alert with full lifecycle tracking.
+
+    ``content`` may be given as a dict or as its stored JSON text; JSON is
+    decoded on first access, so list pages that never look at content
+    don't pay for it.
+    """
     id: str
     alert_type: AlertType
     source_id: str  # FHIR order ID, culture ID, etc.
@@ -107,7 +112,7 @@ class StoredAlert:
     # Alert content (stored as JSON)
     title: str = ""
     summary: str = ""
-    content: dict = field(default_factory=dict)
+    content: InitVar[dict | str | None] = None
 
     # Timestamps
     created_at: datetime = field(default_factory=datetime.now)
@@ -124,6 +129,15 @@ class StoredAlert:
     # Notes
     notes: str | None = None
 
+    # Loaded by a summary list query: content holds only the requested keys
+    # and notes is not loaded. Use AlertStore.get_alert for the full alert.
+    is_summary: bool = False
+
+    _content: dict | str | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self, content: dict | str | None) -> None:
+        self._content = content
+
     def is_snoozed(self) -> bool:
         """Check if alert is currently snoozed (not expired)."""
         if self.status != AlertStatus.SNOOZED:
@@ -141,8 +155,11 @@ class StoredAlert:
         return True
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {
+        """Convert to dictionary for JSON serialization.
+
+        Summary alerts leave out content and notes, which weren't loaded.
+        """
+        data = {
             "id": self.id,
             "alert_type": self.alert_type.value,
             "source_id": self.source_id,
@@ -165,16 +182,17 @@ class StoredAlert:
             "snoozed_until": self.snoozed_until.isoformat() if self.snoozed_until else None,
             "notes": self.notes,
         }
+        if self.is_summary:
+            del data["content"], data["notes"]
+        return data
 
     @classmethod
-    def from_row(cls, row: tuple) -> "StoredAlert":
+    def from_row(cls, row: tuple, is_summary: bool = False) -> "StoredAlert":
         """Create from database row tuple."""
         # Row order matches schema: id, alert_type, source_id, status, severity,
         # patient_id, patient_mrn, patient_name, title, summary, content,
         # created_at, sent_at, acknowledged_at, acknowledged_by,
         # resolved_at, resolved_by, resolution_reason, snoozed_until, notes
-        content_json = row[10]
-        content = json.loads(content_json) if content_json else {}
 
         def parse_datetime(val):
             if val is None:
@@ -203,7 +221,7 @@ class StoredAlert:
             patient_name=row[7],
             title=row[8] or "",
             summary=row[9] or "",
-            content=content,
+            content=row[10],  # Decoded on first access
             created_at=parse_datetime(row[11]),
             sent_at=parse_datetime(row[12]),
             acknowledged_at=parse_datetime(row[13]),
@@ -213,9 +231,26 @@ class StoredAlert:
             resolution_reason=resolution_reason,
             snoozed_until=parse_datetime(row[18]) if len(row) > 18 else None,
             notes=row[19] if len(row) > 19 else None,
+            is_summary=is_summary,
         )
 
 
+def _get_content(self: StoredAlert) -> dict:
+    content = self._content
+    if content is None or isinstance(content, str):
+        content = self._content = json.loads(content) if content else {}
+    return content
+
+
+def _set_content(self: StoredAlert, value: dict | str | None) -> None:
+    self._content = value
+
+
+# Defined after the class: a property in the class body would be taken as
+# the default for the content init argument
+StoredAlert.content = property(_get_content, _set_content, doc="Alert content dict (decoded lazily).")
+
+
 @dataclass
 class AlertAuditEntry:
     """Audit log entry for alert actions."""
@@ -36,13 +36,40 @@ CREATE TABLE IF NOT EXISTS alerts (
     UNIQUE(alert_type, source_id)
 );
 
--- Indexes for common queries
-CREATE INDEX IF NOT EXISTS idx_alerts_status ON alerts(status);
-CREATE INDEX IF NOT EXISTS idx_alerts_type ON alerts(alert_type);
-CREATE INDEX IF NOT EXISTS idx_alerts_patient_mrn ON alerts(patient_mrn);
-CREATE INDEX IF NOT EXISTS idx_alerts_created_at ON alerts(created_at);
+-- Indexes for the list queries: filter columns first, then (created_at, id)
+-- so rows come out newest-first without a sort and a page cursor can seek
+-- straight to its position
+CREATE INDEX IF NOT EXISTS idx_alerts_status_created ON alerts(status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_alerts_type_status_created ON alerts(alert_type, status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_alerts_mrn_created ON alerts(patient_mrn, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_alerts_created ON alerts(created_at, id);
 CREATE INDEX IF NOT EXISTS idx_alerts_type_source ON alerts(alert_type, source_id);
 
+-- Daily metrics rollups count alerts by the day they were acknowledged/resolved
+CREATE INDEX IF NOT EXISTS idx_alerts_acknowledged ON alerts(acknowledged_at);
+CREATE INDEX IF NOT EXISTS idx_alerts_resolved ON alerts(resolved_at);
+
+-- Change counter for caches of data derived from alerts (analytics, stats).
+-- Bumped by triggers on every write, whichever process makes it.
+CREATE TABLE IF NOT EXISTS alert_changes (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO alert_changes (id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_alerts_insert_version AFTER INSERT ON alerts
+BEGIN
+    UPDATE alert_changes SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_alerts_update_version AFTER UPDATE ON alerts
+BEGIN
+    UPDATE alert_changes SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_alerts_delete_version AFTER DELETE ON alerts
+BEGIN
+    UPDATE alert_changes SET version = version + 1 WHERE id = 1;
+END;
+
 -- Audit trail for compliance
 CREATE TABLE IF NOT EXISTS alert_audit (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
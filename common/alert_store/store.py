@@ -7,8 +7,9 @@ import sqlite3
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+from ..db import Migration, VersionedCache, ensure_schema, get_connection, retry_on_busy
 from .models import (
     AlertType,
     AlertStatus,
@@ -20,6 +21,65 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+
+# Schema changes for existing databases (see common.db.schema)
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Replace single-column alert indexes with list-order composites", """
+        DROP INDEX IF EXISTS idx_alerts_status;
+        DROP INDEX IF EXISTS idx_alerts_type;
+        DROP INDEX IF EXISTS idx_alerts_patient_mrn;
+        DROP INDEX IF EXISTS idx_alerts_created_at;
+        ANALYZE alerts;
+    """),
+]
+
+_ALERT_COLUMNS = """
+    id, alert_type, source_id, status, severity,
+    patient_id, patient_mrn, patient_name,
+    title, summary, content,
+    created_at, sent_at, acknowledged_at, acknowledged_by,
+    resolved_at, resolved_by, resolution_reason, snoozed_until, notes
+"""
+
+
+_WEEKDAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+
+def _summary_columns(content_keys: tuple[str, ...] | list[str]) -> tuple[str, list[str]]:
+    """Select list for summary rows, and its parameters.
+
+    Same column order as _ALERT_COLUMNS, but content is cut down to the
+    requested keys (json_patch drops the ones an alert doesn't have) and
+    notes is not read.
+    """
+    if content_keys:
+        pairs = ", ".join("?, json_extract(content, ?)" for _ in content_keys)
+        content = f"json_patch('{{}}', json_object({pairs}))"
+        params = [p for key in content_keys for p in (key, f"$.{key}")]
+    else:
+        content, params = "NULL", []
+    columns = f"""
+    id, alert_type, source_id, status, severity,
+    patient_id, patient_mrn, patient_name,
+    title, summary, {content},
+    created_at, sent_at, acknowledged_at, acknowledged_by,
+    resolved_at, resolved_by, resolution_reason, snoozed_until, NULL
+"""
+    return columns, params
+
+
+def _encode_cursor(created_at: str, alert_id: str) -> str:
+    """Page cursor for the position just after an alert in list order."""
+    return f"{created_at}|{alert_id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    created_at, sep, alert_id = cursor.rpartition("|")
+    if not sep or not created_at or not alert_id:
+        raise ValueError(f"Invalid alert cursor: {cursor!r}")
+    return created_at, alert_id
+
 
 def _log_asp_activity(
     activity_type: str,
@@ -36,14 +96,14 @@ def _log_asp_activity(
 ) -> None:
     """Log activity to the unified metrics store.
 
-    This is a fire-and-forget operation - failures are logged but don't
-    interrupt the main operation.
+    This is a fire-and-forget operation - the row is queued and written in
+    the background (see common.metrics_store.sink), and failures are logged
+    but don't interrupt the main operation.
     """
     try:
-        from common.metrics_store import MetricsStore, ActivityType, ModuleSource
+        from common.metrics_store import ModuleSource, get_activity_sink
 
-        store = MetricsStore()
-        store.log_activity(
+        get_activity_sink().log_activity(
             activity_type=activity_type,
             module=ModuleSource.ASP_ALERTS,
             provider_id=provider_id,
@@ -83,22 +143,19 @@ class AlertStore:
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
 
+        # Analytics/stats results, invalidated via the alert_changes counter
+        self.analytics_cache_seconds = float(os.environ.get("ALERT_ANALYTICS_CACHE_SECONDS", "300"))
+        self._cache = VersionedCache("alert_changes")
+
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize database schema."""
-        schema_path = Path(__file__).parent / "schema.sql"
-        with open(schema_path) as f:
-            schema = f.read()
-
-        with self._connect() as conn:
-            conn.executescript(schema)
+        """Initialize database schema (once per process per database)."""
+        ensure_schema(self.db_path, "alert_store", schema_path=SCHEMA_PATH, migrations=MIGRATIONS)
 
     def _connect(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's shared WAL connection (see common.db)."""
+        return get_connection(self.db_path)
 
     def _generate_id(self) -> str:
         """Generate a unique alert ID."""
@@ -106,6 +163,7 @@ class AlertStore:
 
     # Core alert operations
 
+    @retry_on_busy
     def save_alert(
         self,
         alert_type: AlertType,
@@ -277,6 +335,7 @@ class AlertStore:
             sent_at=datetime.now()
         )
 
+    @retry_on_busy
     def acknowledge(
         self,
         alert_id: str,
@@ -333,6 +392,7 @@ class AlertStore:
 
             return False
 
+    @retry_on_busy
     def snooze(
         self,
         alert_id: str,
@@ -378,6 +438,7 @@ class AlertStore:
 
             return False
 
+    @retry_on_busy
     def resolve(
         self,
         alert_id: str,
@@ -471,6 +532,7 @@ class AlertStore:
 
             return False
 
+    @retry_on_busy
     def add_note(
         self,
         alert_id: str,
@@ -507,6 +569,7 @@ class AlertStore:
 
             return False
 
+    @retry_on_busy
     def _update_status(
         self,
         alert_id: str,
@@ -554,27 +617,75 @@ class AlertStore:
     def list_alerts(
         self,
         status: AlertStatus | list[AlertStatus] | None = None,
-        alert_type: AlertType | None = None,
+        alert_type: AlertType | list[AlertType] | None = None,
         patient_mrn: str | None = None,
         severity: str | None = None,
         resolution_reason: str | None = None,
         limit: int = 100,
         include_expired_snooze: bool = True,
+        cursor: str | None = None,
+        summary: bool = False,
+        content_keys: tuple[str, ...] | list[str] = (),
     ) -> list[StoredAlert]:
-        """List alerts with optional filters.
+        """List alerts with optional filters, newest first.
 
         Args:
             status: Filter by status (single or list)
-            alert_type: Filter by alert type
+            alert_type: Filter by alert type (single or list)
             patient_mrn: Filter by patient MRN
             severity: Filter by severity (critical, warning, info)
             resolution_reason: Filter by resolution reason
             limit: Maximum results
             include_expired_snooze: If True, include snoozed alerts past expiration
+            cursor: Start after this position (from list_alerts_page)
+            summary: Skip the content and notes columns (for list pages).
+                The alerts have is_summary set.
+            content_keys: With summary, content keys to load anyway
+                (e.g. ("coverage_status",) for a status badge)
 
         Returns:
             List of matching StoredAlert objects
         """
+        alerts, _ = self.list_alerts_page(
+            status=status,
+            alert_type=alert_type,
+            patient_mrn=patient_mrn,
+            severity=severity,
+            resolution_reason=resolution_reason,
+            limit=limit,
+            include_expired_snooze=include_expired_snooze,
+            cursor=cursor,
+            summary=summary,
+            content_keys=content_keys,
+        )
+        return alerts
+
+    def list_alerts_page(
+        self,
+        status: AlertStatus | list[AlertStatus] | None = None,
+        alert_type: AlertType | list[AlertType] | None = None,
+        patient_mrn: str | None = None,
+        severity: str | None = None,
+        resolution_reason: str | None = None,
+        limit: int = 100,
+        include_expired_snooze: bool = True,
+        cursor: str | None = None,
+        summary: bool = False,
+        content_keys: tuple[str, ...] | list[str] = (),
+    ) -> tuple[list[StoredAlert], str | None]:
+        """List one page of alerts, newest first, with a cursor for the next.
+
+        Pages are keyed on (created_at, id) rather than OFFSET, so a deep
+        page costs the same as the first one.
+
+        Takes the same arguments as list_alerts.
+
+        Returns:
+            (alerts, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If cursor is not one returned by this method
+        """
         conditions = []
         params: list[Any] = []
 
@@ -588,8 +699,13 @@ class AlertStore:
                 params.append(status.value)
 
         if alert_type:
-            conditions.append("alert_type = ?")
-            params.append(alert_type.value)
+            if isinstance(alert_type, list):
+                placeholders = ",".join("?" * len(alert_type))
+                conditions.append(f"alert_type IN ({placeholders})")
+                params.extend(t.value for t in alert_type)
+            else:
+                conditions.append("alert_type = ?")
+                params.append(alert_type.value)
 
         if patient_mrn:
             conditions.append("patient_mrn = ?")
@@ -603,26 +719,35 @@ class AlertStore:
             conditions.append("resolution_reason = ?")
             params.append(resolution_reason)
 
+        if cursor:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(_decode_cursor(cursor))
+
         where_clause = " AND ".join(conditions) if conditions else "1=1"
         params.append(limit)
 
+        columns = _ALERT_COLUMNS
+        if summary:
+            columns, column_params = _summary_columns(content_keys)
+            params = column_params + params
+
         with self._connect() as conn:
-            cursor = conn.execute(
+            rows = conn.execute(
                 f"""
-                SELECT id, alert_type, source_id, status, severity,
-                       patient_id, patient_mrn, patient_name,
-                       title, summary, content,
-                       created_at, sent_at, acknowledged_at, acknowledged_by,
-                       resolved_at, resolved_by, resolution_reason, snoozed_until, notes
+                SELECT {columns}
                 FROM alerts
                 WHERE {where_clause}
-                ORDER BY created_at DESC
+                ORDER BY created_at DESC, id DESC
                 LIMIT ?
                 """,
                 params
-            )
+            ).fetchall()
 
-            alerts = [StoredAlert.from_row(tuple(row)) for row in cursor.fetchall()]
+        next_cursor = None
+        if limit and len(rows) == limit:
+            next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+        alerts = [StoredAlert.from_row(tuple(row), is_summary=summary) for row in rows]
 
         # Filter out expired snoozes if requested
         if not include_expired_snooze:
@@ -632,7 +757,7 @@ class AlertStore:
                 if a.status != AlertStatus.SNOOZED or (a.snoozed_until and a.snoozed_until > now)
             ]
 
-        return alerts
+        return alerts, next_cursor
 
     def list_active_alerts(self) -> list[StoredAlert]:
         """List all active (non-resolved) alerts, respecting snooze expiration."""
@@ -674,58 +799,45 @@ class AlertStore:
     ) -> dict[str, int]:
         """Get alert statistics.
 
+        Computed in one grouped query and cached until the next alert
+        write (see get_analytics).
+
         Args:
             status: Filter by status (single, list, or None for all)
         """
-        with self._connect() as conn:
-            stats = {}
-
-            # Build status filter
-            status_filter = ""
-            params: list = []
-            if status:
-                if isinstance(status, list):
-                    placeholders = ",".join("?" * len(status))
-                    status_filter = f" WHERE status IN ({placeholders})"
-                    params = [s.value for s in status]
-                else:
-                    status_filter = " WHERE status = ?"
-                    params = [status.value]
-
-            # Count by status (within filter)
-            cursor = conn.execute(
-                f"SELECT status, COUNT(*) FROM alerts{status_filter} GROUP BY status",
-                params
-            )
-            for row in cursor:
-                stats[f"status_{row[0]}"] = row[1]
+        statuses = status if isinstance(status, list) else [status] if status else []
+        today = datetime.now().date().isoformat()
+        key = ("stats", tuple(s.value for s in statuses), today)
+        return self._cached(key, lambda: self._compute_stats(statuses, today))
+
+    def _compute_stats(self, statuses: list[AlertStatus], today: str) -> dict[str, int]:
+        status_filter = ""
+        params: list = [today]
+        if statuses:
+            placeholders = ",".join("?" * len(statuses))
+            status_filter = f" WHERE status IN ({placeholders})"
+            params.extend(s.value for s in statuses)
 
-            # Total (within filter)
-            cursor = conn.execute(
-                f"SELECT COUNT(*) FROM alerts{status_filter}",
-                params
-            )
-            stats["total"] = cursor.fetchone()[0]
-
-            # Today's alerts (within filter)
-            today = datetime.now().date().isoformat()
-            today_filter = status_filter.replace(" WHERE ", " WHERE date(created_at) = ? AND ") if status_filter else " WHERE date(created_at) = ?"
-            today_params = [today] + params if status_filter else [today]
-            cursor = conn.execute(
-                f"SELECT COUNT(*) FROM alerts{today_filter}",
-                today_params
-            )
-            stats["today"] = cursor.fetchone()[0]
-
-            # Count by severity (within filter)
-            cursor = conn.execute(
-                f"SELECT severity, COUNT(*) FROM alerts{status_filter} GROUP BY severity",
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT status, severity, COUNT(*), SUM(date(created_at) = ?)
+                FROM alerts{status_filter}
+                GROUP BY status, severity
+                """,
                 params
-            )
-            for row in cursor:
-                stats[f"severity_{row[0]}"] = row[1]
-
-            return stats
+            ).fetchall()
+
+        stats: dict[str, int] = {}
+        total = today_count = 0
+        for row_status, severity, count, count_today in rows:
+            stats[f"status_{row_status}"] = stats.get(f"status_{row_status}", 0) + count
+            stats[f"severity_{severity}"] = stats.get(f"severity_{severity}", 0) + count
+            total += count
+            today_count += count_today or 0
+        stats["total"] = total
+        stats["today"] = today_count
+        return stats
 
     # Analytics / Reports
 
@@ -736,6 +848,11 @@ class AlertStore:
     ) -> dict:
         """Get comprehensive analytics for reporting.
 
+        Every figure comes from a single grouped scan of the period. The
+        result is cached per (alert_type, days) until an alert is written
+        (by any process) or ALERT_ANALYTICS_CACHE_SECONDS pass, whichever
+        is first.
+
         Args:
             alert_type: Filter by alert type (None for all)
             days: Number of days to include in analysis
@@ -743,6 +860,10 @@ class AlertStore:
         Returns:
             Dictionary with analytics data
         """
+        key = ("analytics", alert_type.value if alert_type else None, days)
+        return self._cached(key, lambda: self._compute_analytics(alert_type, days))
+
+    def _compute_analytics(self, alert_type: AlertType | None, days: int) -> dict:
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
         type_filter = ""
         params: list = [cutoff]
@@ -751,169 +872,142 @@ class AlertStore:
             type_filter = " AND alert_type = ?"
             params.append(alert_type.value)
 
+        # One row per (day, severity, status, resolution_reason); response
+        # times only count resolved alerts with a resolved_at
         with self._connect() as conn:
-            analytics = {
-                "period_days": days,
-                "alert_type": alert_type.value if alert_type else "all",
-            }
-
-            # Total alerts in period
-            cursor = conn.execute(
-                f"SELECT COUNT(*) FROM alerts WHERE created_at >= ?{type_filter}",
-                params
-            )
-            analytics["total_alerts"] = cursor.fetchone()[0]
-
-            # Alerts by day
-            cursor = conn.execute(
-                f"""
-                SELECT date(created_at) as day, COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                GROUP BY date(created_at)
-                ORDER BY day DESC
-                """,
-                params
-            )
-            analytics["alerts_by_day"] = [
-                {"date": row[0], "count": row[1]} for row in cursor.fetchall()
-            ]
-
-            # Average alerts per day
-            if analytics["alerts_by_day"]:
-                analytics["avg_alerts_per_day"] = round(
-                    analytics["total_alerts"] / len(analytics["alerts_by_day"]), 1
-                )
-            else:
-                analytics["avg_alerts_per_day"] = 0
-
-            # Alerts by severity
-            cursor = conn.execute(
-                f"""
-                SELECT severity, COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                GROUP BY severity
-                ORDER BY count DESC
-                """,
-                params
-            )
-            analytics["by_severity"] = {row[0]: row[1] for row in cursor.fetchall()}
-
-            # Alerts by status
-            cursor = conn.execute(
-                f"""
-                SELECT status, COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                GROUP BY status
-                """,
-                params
-            )
-            analytics["by_status"] = {row[0]: row[1] for row in cursor.fetchall()}
-
-            # Resolution reason breakdown (for resolved alerts)
-            cursor = conn.execute(
-                f"""
-                SELECT resolution_reason, COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                  AND status = 'resolved'
-                  AND resolution_reason IS NOT NULL
-                GROUP BY resolution_reason
-                ORDER BY count DESC
-                """,
-                params
-            )
-            resolution_data = cursor.fetchall()
-            total_resolved = sum(row[1] for row in resolution_data)
-            analytics["resolution_breakdown"] = [
-                {
-                    "reason": row[0],
-                    "count": row[1],
-                    "percentage": round(row[1] / total_resolved * 100, 1) if total_resolved > 0 else 0
-                }
-                for row in resolution_data
-            ]
-            analytics["total_resolved"] = total_resolved
-
-            # Response time metrics (for resolved alerts)
-            cursor = conn.execute(
+            rows = conn.execute(
                 f"""
                 SELECT
-                    AVG(CAST((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60 AS INTEGER)) as avg_time_to_ack_min,
-                    AVG(CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS INTEGER)) as avg_time_to_resolve_min,
-                    MIN(CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS INTEGER)) as min_time_to_resolve_min,
-                    MAX(CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS INTEGER)) as max_time_to_resolve_min
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                  AND status = 'resolved'
-                  AND resolved_at IS NOT NULL
+                    day,
+                    CAST(strftime('%w', day) AS INTEGER) AS weekday,
+                    severity, status, resolution_reason,
+                    COUNT(*),
+                    SUM(CASE WHEN timed THEN ack_min END),
+                    COUNT(CASE WHEN timed THEN ack_min END),
+                    SUM(CASE WHEN timed THEN resolve_min END),
+                    COUNT(CASE WHEN timed THEN resolve_min END),
+                    MIN(CASE WHEN timed THEN resolve_min END),
+                    MAX(CASE WHEN timed THEN resolve_min END)
+                FROM (
+                    SELECT
+                        date(created_at) AS day, severity, status, resolution_reason,
+                        status = 'resolved' AND resolved_at IS NOT NULL AS timed,
+                        CAST((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60 AS INTEGER) AS ack_min,
+                        CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS INTEGER) AS resolve_min
+                    FROM alerts
+                    WHERE created_at >= ?{type_filter}
+                )
+                GROUP BY day, severity, status, resolution_reason
                 """,
                 params
+            ).fetchall()
+
+        by_day: dict[str, int] = {}
+        by_weekday: dict[int, int] = {}
+        by_severity: dict[str, int] = {}
+        by_status: dict[str, int] = {}
+        by_reason: dict[str, int] = {}
+        ack_sum = ack_count = resolve_sum = resolve_count = 0
+        resolve_min = resolve_max = None
+
+        for (day, weekday, severity, status, reason, count,
+             row_ack_sum, row_ack_count, row_resolve_sum, row_resolve_count,
+             row_resolve_min, row_resolve_max) in rows:
+            by_day[day] = by_day.get(day, 0) + count
+            by_weekday[weekday] = by_weekday.get(weekday, 0) + count
+            by_severity[severity] = by_severity.get(severity, 0) + count
+            by_status[status] = by_status.get(status, 0) + count
+            if status == AlertStatus.RESOLVED.value and reason is not None:
+                by_reason[reason] = by_reason.get(reason, 0) + count
+            ack_sum += row_ack_sum or 0
+            ack_count += row_ack_count
+            resolve_sum += row_resolve_sum or 0
+            resolve_count += row_resolve_count
+            if row_resolve_min is not None:
+                resolve_min = row_resolve_min if resolve_min is None else min(resolve_min, row_resolve_min)
+                resolve_max = row_resolve_max if resolve_max is None else max(resolve_max, row_resolve_max)
+
+        analytics = {
+            "period_days": days,
+            "alert_type": alert_type.value if alert_type else "all",
+        }
+
+        # Totals and alerts by day
+        analytics["total_alerts"] = sum(by_day.values())
+        analytics["alerts_by_day"] = [
+            {"date": day, "count": by_day[day]} for day in sorted(by_day, reverse=True)
+        ]
+        if analytics["alerts_by_day"]:
+            analytics["avg_alerts_per_day"] = round(
+                analytics["total_alerts"] / len(analytics["alerts_by_day"]), 1
             )
-            row = cursor.fetchone()
-            analytics["response_times"] = {
-                "avg_time_to_ack_minutes": round(row[0]) if row[0] else None,
-                "avg_time_to_resolve_minutes": round(row[1]) if row[1] else None,
-                "min_time_to_resolve_minutes": round(row[2]) if row[2] else None,
-                "max_time_to_resolve_minutes": round(row[3]) if row[3] else None,
-            }
-
-            # Convert minutes to human-readable format
-            def format_duration(minutes):
-                if minutes is None:
-                    return None
-                if minutes < 60:
-                    return f"{minutes} min"
-                hours = minutes // 60
-                mins = minutes % 60
-                if hours < 24:
-                    return f"{hours}h {mins}m" if mins else f"{hours}h"
-                days = hours // 24
-                hours = hours % 24
-                return f"{days}d {hours}h" if hours else f"{days}d"
-
-            analytics["response_times_formatted"] = {
-                "avg_time_to_ack": format_duration(analytics["response_times"]["avg_time_to_ack_minutes"]),
-                "avg_time_to_resolve": format_duration(analytics["response_times"]["avg_time_to_resolve_minutes"]),
-                "min_time_to_resolve": format_duration(analytics["response_times"]["min_time_to_resolve_minutes"]),
-                "max_time_to_resolve": format_duration(analytics["response_times"]["max_time_to_resolve_minutes"]),
+        else:
+            analytics["avg_alerts_per_day"] = 0
+
+        analytics["by_severity"] = dict(sorted(by_severity.items(), key=lambda kv: -kv[1]))
+        analytics["by_status"] = by_status
+
+        # Resolution reason breakdown (for resolved alerts)
+        total_resolved = sum(by_reason.values())
+        analytics["resolution_breakdown"] = [
+            {
+                "reason": reason,
+                "count": count,
+                "percentage": round(count / total_resolved * 100, 1) if total_resolved > 0 else 0
             }
+            for reason, count in sorted(by_reason.items(), key=lambda kv: -kv[1])
+        ]
+        analytics["total_resolved"] = total_resolved
+
+        # Response time metrics (for resolved alerts)
+        avg_ack = ack_sum / ack_count if ack_count else None
+        avg_resolve = resolve_sum / resolve_count if resolve_count else None
+        analytics["response_times"] = {
+            "avg_time_to_ack_minutes": round(avg_ack) if avg_ack else None,
+            "avg_time_to_resolve_minutes": round(avg_resolve) if avg_resolve else None,
+            "min_time_to_resolve_minutes": round(resolve_min) if resolve_min else None,
+            "max_time_to_resolve_minutes": round(resolve_max) if resolve_max else None,
+        }
+
+        # Convert minutes to human-readable format
+        def format_duration(minutes):
+            if minutes is None:
+                return None
+            if minutes < 60:
+                return f"{minutes} min"
+            hours = minutes // 60
+            mins = minutes % 60
+            if hours < 24:
+                return f"{hours}h {mins}m" if mins else f"{hours}h"
+            days = hours // 24
+            hours = hours % 24
+            return f"{days}d {hours}h" if hours else f"{days}d"
+
+        analytics["response_times_formatted"] = {
+            "avg_time_to_ack": format_duration(analytics["response_times"]["avg_time_to_ack_minutes"]),
+            "avg_time_to_resolve": format_duration(analytics["response_times"]["avg_time_to_resolve_minutes"]),
+            "min_time_to_resolve": format_duration(analytics["response_times"]["min_time_to_resolve_minutes"]),
+            "max_time_to_resolve": format_duration(analytics["response_times"]["max_time_to_resolve_minutes"]),
+        }
+
+        # Resolution rate
+        total_in_period = analytics["total_alerts"]
+        if total_in_period > 0:
+            analytics["resolution_rate"] = round(total_resolved / total_in_period * 100, 1)
+        else:
+            analytics["resolution_rate"] = 0
 
-            # Resolution rate
-            total_in_period = analytics["total_alerts"]
-            if total_in_period > 0:
-                analytics["resolution_rate"] = round(total_resolved / total_in_period * 100, 1)
-            else:
-                analytics["resolution_rate"] = 0
+        # Alerts by day of week
+        analytics["by_day_of_week"] = [
+            {"day": _WEEKDAYS[weekday], "count": by_weekday[weekday]} for weekday in sorted(by_weekday)
+        ]
 
-            # Alerts by day of week
-            cursor = conn.execute(
-                f"""
-                SELECT
-                    CASE CAST(strftime('%w', created_at) AS INTEGER)
-                        WHEN 0 THEN 'Sunday'
-                        WHEN 1 THEN 'Monday'
-                        WHEN 2 THEN 'Tuesday'
-                        WHEN 3 THEN 'Wednesday'
-                        WHEN 4 THEN 'Thursday'
-                        WHEN 5 THEN 'Friday'
-                        WHEN 6 THEN 'Saturday'
-                    END as day_name,
-                    COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                GROUP BY strftime('%w', created_at)
-                ORDER BY CAST(strftime('%w', created_at) AS INTEGER)
-                """,
-                params
-            )
-            analytics["by_day_of_week"] = [
-                {"day": row[0], "count": row[1]} for row in cursor.fetchall()
-            ]
+        return analytics
 
-            return analytics
+    def _cached(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """Serve a derived result from the cache while no alert has changed."""
+        version = self._cache.read_version(self._connect())
+        return self._cache.get(key, version, compute, self.analytics_cache_seconds)
 
     # Cleanup
 
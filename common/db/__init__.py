@@ -0,0 +1,39 @@
+"""Shared SQLite connection layer for AEGIS stores.
+
+Every store gets a long-lived, WAL-mode connection per thread and database
+path instead of opening a new connection per call, and initializes its
+schema once per process with versioned migrations. Results derived from
+a store's tables can be cached against a change counter (VersionedCache).
+"""
+
+from .cache import VersionedCache
+from .connections import (
+    ConnectionManager,
+    close_connections,
+    get_connection,
+    get_connection_manager,
+    is_busy_error,
+    retry_on_busy,
+)
+from .schema import (
+    Migration,
+    add_column,
+    ensure_schema,
+    forget_schema,
+    schema_version,
+)
+
+__all__ = [
+    "ConnectionManager",
+    "get_connection",
+    "get_connection_manager",
+    "close_connections",
+    "retry_on_busy",
+    "is_busy_error",
+    "Migration",
+    "ensure_schema",
+    "schema_version",
+    "forget_schema",
+    "add_column",
+    "VersionedCache",
+]
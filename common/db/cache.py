@@ -0,0 +1,70 @@
+"""Caching of results derived from a store's tables.
+
+Stores that serve expensive aggregate queries (analytics, usage reports)
+keep a one-row change counter that triggers bump on every write:
+
+    CREATE TABLE IF NOT EXISTS alert_changes (id INTEGER PRIMARY KEY, version INTEGER);
+    CREATE TRIGGER ... AFTER INSERT ON alerts BEGIN
+        UPDATE alert_changes SET version = version + 1 WHERE id = 1;
+    END;
+
+VersionedCache serves a cached result while the counter is unchanged, so
+a write from any process or connection invalidates it. A TTL bounds how
+long a result lives regardless, for queries over a rolling "last N days"
+window.
+"""
+
+import copy
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+
+class VersionedCache:
+    """Thread-safe cache of derived results, invalidated by a change counter."""
+
+    def __init__(self, version_table: str):
+        """Initialize the cache.
+
+        Args:
+            version_table: One-row (id = 1) table whose version column
+                triggers increment on every write.
+        """
+        self.version_table = version_table
+        self._entries: dict[tuple, tuple[int | None, float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def read_version(self, conn: sqlite3.Connection) -> int | None:
+        """The change counter's current value (None if the row is missing)."""
+        row = conn.execute(f"SELECT version FROM {self.version_table} WHERE id = 1").fetchone()
+        return row[0] if row else None
+
+    def get(self, key: tuple, version: int | None, compute: Callable[[], Any], ttl: float) -> Any:
+        """Return the result for key, computing it if stale.
+
+        Args:
+            key: Cache key (include the database path if the cache is
+                shared between databases).
+            version: The counter's value, read before computing.
+            compute: Builds the result on a miss.
+            ttl: Seconds a result is served at most.
+
+        Returns:
+            A deep copy of the result, so callers may modify it.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version and entry[1] > now:
+                return copy.deepcopy(entry[2])
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = (version, now + ttl, value)
+        return copy.deepcopy(value)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
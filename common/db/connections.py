@@ -0,0 +1,216 @@
+"""Thread-local, WAL-mode SQLite connections shared across stores.
+
+The stores used to call ``sqlite3.connect`` for every operation. Each call
+re-opened the file, re-read the schema, threw away SQLite's prepared
+statement cache and ran in rollback-journal mode, where a dashboard read
+blocks a monitor's write (and vice versa).
+
+ConnectionManager keeps one connection per (thread, database path) and
+hands it back on every call. Stores keep their existing pattern:
+
+    with self._connect() as conn:      # commits, or rolls back on error
+        conn.execute(...)
+
+``with conn`` only scopes a transaction - it doesn't close the connection -
+so the same connection (and its statement cache) is reused next time.
+Each new connection is configured with:
+
+- ``journal_mode=WAL``: readers never block the writer and vice versa
+- ``synchronous=NORMAL``: durable across application crashes, fsync only
+  at checkpoints (the recommended pairing with WAL)
+- ``cache_size`` / ``mmap_size``: larger page cache and memory-mapped reads
+- ``busy_timeout``: wait for a competing writer instead of failing at once
+
+Two writers can still collide in ways busy_timeout doesn't cover (a read
+transaction upgrading to a write). Wrap such operations in
+``@retry_on_busy``.
+
+Tuning (environment variables):
+    SQLITE_SYNCHRONOUS      NORMAL (default), FULL or OFF
+    SQLITE_CACHE_SIZE_KB    Page cache per connection (default 16384)
+    SQLITE_MMAP_SIZE_MB     Memory-mapped I/O size (default 128)
+    SQLITE_BUSY_TIMEOUT_MS  Lock wait before SQLITE_BUSY (default 5000)
+"""
+
+import functools
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RowFactory = Callable[[sqlite3.Cursor, tuple], Any] | None
+
+
+def _default_pragmas() -> dict[str, Any]:
+    return {
+        "journal_mode": "WAL",
+        "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "cache_size": -int(os.environ.get("SQLITE_CACHE_SIZE_KB", "16384")),  # Negative = KiB
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE_MB", "128")) * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+
+
+class ConnectionManager:
+    """Hands out one configured connection per thread and database path."""
+
+    def __init__(
+        self,
+        pragmas: dict[str, Any] | None = None,
+        busy_timeout_ms: int | None = None,
+        cached_statements: int = 256,
+    ):
+        """Initialize the manager.
+
+        Args:
+            pragmas: PRAGMAs applied to each new connection. Defaults to WAL
+                with tuned synchronous/cache_size/mmap_size.
+            busy_timeout_ms: How long to wait on a locked database.
+            cached_statements: Prepared statements kept per connection.
+        """
+        self.pragmas = pragmas if pragmas is not None else _default_pragmas()
+        self.busy_timeout_ms = busy_timeout_ms or int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    def get(self, db_path: str | Path, row_factory: RowFactory = sqlite3.Row) -> sqlite3.Connection:
+        """Get this thread's connection to db_path, opening it if needed.
+
+        Args:
+            db_path: Database file path.
+            row_factory: Row factory for this use (connections are shared by
+                every store on the same path, so it is set on each call).
+
+        Returns:
+            Connection usable as a transaction context manager.
+        """
+        key = str(db_path)
+        connections = self._connections()
+        conn = connections.get(key)
+        if conn is None:
+            conn = self._open(key)
+            connections[key] = conn
+        conn.row_factory = row_factory
+        return conn
+
+    def close(self, db_path: str | Path | None = None) -> None:
+        """Close this thread's connection to db_path (or all of them)."""
+        connections = self._connections()
+        keys = [str(db_path)] if db_path is not None else list(connections)
+        for key in keys:
+            conn = connections.pop(key, None)
+            if conn is not None:
+                conn.close()
+
+    @property
+    def opened(self) -> int:
+        """Connections opened so far, across all threads."""
+        return self._opened
+
+    def _connections(self) -> dict[str, sqlite3.Connection]:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+    def _open(self, key: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            key,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.cached_statements,
+        )
+        in_memory = key == ":memory:" or key.startswith("file::memory:")
+        for name, value in self.pragmas.items():
+            if name == "journal_mode" and in_memory:
+                continue
+            try:
+                conn.execute(f"PRAGMA {name}={value}")
+            except sqlite3.OperationalError as e:
+                # journal_mode=WAL needs a lock; another process may hold it
+                # while switching. WAL is persistent, so it'll stick next time.
+                logger.debug(f"Could not set PRAGMA {name} on {key}: {e}")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+
+        with self._lock:
+            self._opened += 1
+        return conn
+
+
+_manager: ConnectionManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_connection_manager() -> ConnectionManager:
+    """Get the process-wide connection manager."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ConnectionManager()
+    return _manager
+
+
+def get_connection(db_path: str | Path, row_factory: RowFactory = sqlite3.Row) -> sqlite3.Connection:
+    """Get this thread's shared connection to db_path."""
+    return get_connection_manager().get(db_path, row_factory)
+
+
+def close_connections(db_path: str | Path | None = None) -> None:
+    """Close this thread's shared connection(s)."""
+    get_connection_manager().close(db_path)
+
+
+def is_busy_error(error: BaseException) -> bool:
+    """Whether an exception is SQLite reporting a locked/busy database."""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    message = str(error).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+def retry_on_busy(
+    func: Callable[..., T] | None = None,
+    *,
+    attempts: int = 5,
+    base_delay: float = 0.05,
+) -> Callable[..., T]:
+    """Retry an operation that fails with SQLITE_BUSY, with jittered backoff.
+
+    The wrapped operation must be safe to re-run (its transaction is rolled
+    back by ``with conn`` before the retry).
+
+    Usage:
+        @retry_on_busy
+        def save_alert(self, ...): ...
+
+        @retry_on_busy(attempts=10)
+        def log_activity(self, ...): ...
+    """
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs) -> T:
+            for attempt in range(1, attempts + 1):
+                try:
+                    return fn(*args, **kwargs)
+                except sqlite3.OperationalError as e:
+                    if not is_busy_error(e) or attempt == attempts:
+                        raise
+                    delay = base_delay * 2 ** (attempt - 1) * (0.5 + random.random())
+                    logger.debug(f"{fn.__qualname__}: database busy, retry {attempt} in {delay:.3f}s")
+                    time.sleep(delay)
+            raise AssertionError("unreachable")
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
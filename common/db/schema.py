@@ -0,0 +1,177 @@
+"""Once-per-process schema initialization and versioned migrations.
+
+Stores used to read their ``schema.sql`` and run it with ``executescript``
+in every constructor, so code that builds a store per request (or per
+audit log entry) paid file I/O plus a full DDL script each time.
+
+``ensure_schema`` does that work once per (database path, component) per
+process and records it in a registry; later calls return immediately.
+
+Migrations are tracked in a ``schema_version`` table, one row per applied
+version per component, so several components can share one database file:
+
+    MIGRATIONS = [
+        Migration(1, "Track NHSN submission", add_column(
+            "hai_candidates", "nhsn_reported", "INTEGER DEFAULT 0")),
+        Migration(2, "Index by unit", "CREATE INDEX ... ON ..."),
+    ]
+
+    ensure_schema(db_path, "nhsn", schema_path=SCHEMA_PATH, migrations=MIGRATIONS)
+
+The base schema must stay idempotent (``CREATE ... IF NOT EXISTS``) and
+describe the current layout for new databases; migrations bring existing
+databases up to date and should tolerate already being applied by hand
+(``add_column`` checks before altering).
+"""
+
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from .connections import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema change, applied once per database."""
+    version: int
+    description: str
+    apply: str | Callable[[sqlite3.Connection], None]  # SQL statement(s) or function
+
+
+_SCHEMA_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    component TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    description TEXT,
+    applied_at TEXT NOT NULL,
+    PRIMARY KEY (component, version)
+)
+"""
+
+_initialized: dict[tuple[str, str], int] = {}
+_registry_lock = threading.Lock()
+
+
+def ensure_schema(
+    db_path: str | Path,
+    component: str,
+    schema_path: str | Path | None = None,
+    schema: str | None = None,
+    migrations: list[Migration] | tuple[Migration, ...] = (),
+) -> int:
+    """Create and migrate a component's schema, once per process.
+
+    Args:
+        db_path: Database file path.
+        component: Name the component's migrations are tracked under
+            (e.g. "alert_store").
+        schema_path: File with the base schema script.
+        schema: Base schema script (alternative to schema_path).
+        migrations: Migrations in any order; those above the database's
+            current version are applied in version order.
+
+    Returns:
+        Schema version of the component after migrating.
+    """
+    key = (str(db_path), component)
+    version = _initialized.get(key)
+    if version is not None:
+        return version
+
+    with _registry_lock:
+        if key in _initialized:
+            return _initialized[key]
+
+        if schema is None and schema_path is not None:
+            schema = Path(schema_path).read_text()
+
+        conn = get_connection(db_path)
+        if schema:
+            conn.executescript(schema)
+        version = _migrate(conn, component, migrations)
+
+        _initialized[key] = version
+        return version
+
+
+def schema_version(conn: sqlite3.Connection, component: str) -> int:
+    """Highest migration version applied for a component (0 if none)."""
+    try:
+        row = conn.execute(
+            "SELECT MAX(version) FROM schema_version WHERE component = ?", (component,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return 0  # No schema_version table yet
+    return row[0] or 0
+
+
+def forget_schema(db_path: str | Path | None = None) -> None:
+    """Drop registry entries so the next ensure_schema call re-checks.
+
+    Needed only when a database file is deleted and recreated in the same
+    process (e.g. tests).
+    """
+    with _registry_lock:
+        if db_path is None:
+            _initialized.clear()
+            return
+        for key in [k for k in _initialized if k[0] == str(db_path)]:
+            del _initialized[key]
+
+
+def add_column(table: str, column: str, definition: str) -> Callable[[sqlite3.Connection], None]:
+    """Migration step adding a column, skipped if it already exists.
+
+    Also skipped if the table doesn't exist (e.g. a table owned by another
+    component that hasn't created it in this database).
+    """
+    def apply(conn: sqlite3.Connection) -> None:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if columns and column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return apply
+
+
+def _migrate(conn: sqlite3.Connection, component: str, migrations) -> int:
+    conn.execute(_SCHEMA_VERSION_DDL)
+    current = schema_version(conn, component)
+
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version <= current:
+            continue
+        with conn:
+            if callable(migration.apply):
+                migration.apply(conn)
+            else:
+                for statement in _split_statements(migration.apply):
+                    conn.execute(statement)
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_version (component, version, description, applied_at) "
+                "VALUES (?, ?, ?, ?)",
+                (component, migration.version, migration.description, datetime.now().isoformat()),
+            )
+        logger.info(f"Applied {component} migration {migration.version}: {migration.description}")
+        current = migration.version
+
+    return current
+
+
+def _split_statements(script: str) -> list[str]:
+    """Split a SQL script into complete statements."""
+    statements = []
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        statements.append(buffer.strip())
+    return statements
@@ -0,0 +1,31 @@
+"""Shared FHIR helpers for AEGIS modules."""
+
+from .cache import FHIRResponseCache
+from .paging import (
+    BundlePager,
+    PageFetcher,
+    PagedSearchMixin,
+    SearchMetrics,
+    get_search_stats,
+    iter_bundle_entries,
+    iter_bundle_resources,
+    next_link,
+    reset_search_stats,
+    session_fetcher,
+)
+from .snapshot import PatientSnapshot
+
+__all__ = [
+    "BundlePager",
+    "PageFetcher",
+    "PagedSearchMixin",
+    "SearchMetrics",
+    "session_fetcher",
+    "iter_bundle_entries",
+    "iter_bundle_resources",
+    "next_link",
+    "get_search_stats",
+    "reset_search_stats",
+    "PatientSnapshot",
+    "FHIRResponseCache",
+]
@@ -0,0 +1,249 @@
+"""In-memory response cache for FHIR reads, with ETag revalidation.
+
+Dashboard pages re-read the same Patient, MedicationRequest and Observation
+resources as users move between alerts. FHIRResponseCache keeps recent
+200 responses in an LRU keyed by the full request URL:
+
+- A fresh entry is returned without touching the network.
+- An expired entry with an ETag is revalidated with ``If-None-Match``; a
+  304 renews it, so only changed resources are downloaded again.
+- Anything else goes to the server and replaces the entry.
+
+How long an entry stays fresh depends on the resource type in the URL
+(demographics change rarely, medication orders often):
+
+    cache = FHIRResponseCache()
+    response = cache.get(session, f"{base}/Patient/123")
+    pager = BundlePager(cache.fetcher(session), stream=False)
+
+Cached responses are shared between callers, so treat their JSON as
+read-only.
+
+Configuration (environment variables):
+    FHIR_CACHE_MAX_ENTRIES  Responses kept (default 2000)
+    FHIR_CACHE_DEFAULT_TTL  Seconds fresh for types without a TTL (default 60)
+    FHIR_CACHE_TTLS         Per-type overrides, e.g. "Patient=1800,MedicationRequest=15"
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .paging import PageFetcher
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response stays fresh, by resource type
+DEFAULT_TTLS = {
+    "Patient": 900,
+    "AllergyIntolerance": 600,
+    "Condition": 300,
+    "Procedure": 300,
+    "DiagnosticReport": 120,
+    "Observation": 120,
+    "Encounter": 60,
+    "MedicationRequest": 30,
+    "MedicationAdministration": 30,
+}
+
+_RESOURCE_TYPE = re.compile(r"^[A-Z][A-Za-z]+$")
+
+
+@dataclass
+class _Entry:
+    body: bytes
+    headers: dict[str, str]
+    etag: str | None
+    resource_type: str
+    expires_at: float
+
+
+@dataclass
+class _TypeStats:
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        total = self.hits + self.revalidated + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.revalidated) / total, 3) if total else 0.0,
+        }
+
+
+@dataclass
+class _Stats:
+    by_type: dict[str, _TypeStats] = field(default_factory=dict)
+    evictions: int = 0
+
+
+class FHIRResponseCache:
+    """Thread-safe LRU cache of FHIR GET responses with per-type TTLs."""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Responses kept before the least recently used is dropped.
+            ttls: Seconds fresh by resource type, merged over DEFAULT_TTLS.
+            default_ttl: Seconds fresh for resource types not in ttls.
+        """
+        self.max_entries = max_entries or int(os.environ.get("FHIR_CACHE_MAX_ENTRIES", "2000"))
+        self.default_ttl = (
+            default_ttl if default_ttl is not None
+            else float(os.environ.get("FHIR_CACHE_DEFAULT_TTL", "60"))
+        )
+        self.ttls = {**DEFAULT_TTLS, **_parse_ttls(os.environ.get("FHIR_CACHE_TTLS", "")), **(ttls or {})}
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+
+    def get(
+        self,
+        session: requests.Session,
+        url: str,
+        params: dict | None = None,
+        timeout: float | None = 30,
+        headers: dict | None = None,
+    ) -> requests.Response:
+        """GET a URL through the cache.
+
+        Returns a response like ``session.get`` would; error responses are
+        returned as-is and never cached.
+        """
+        key = requests.Request("GET", url, params=params).prepare().url
+        resource_type = _resource_type(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.expires_at > time.monotonic():
+                    self._count(resource_type, "hits")
+                    return _cached_response(key, entry)
+
+        request_headers = dict(headers or {})
+        if entry is not None and entry.etag:
+            request_headers["If-None-Match"] = entry.etag
+        response = session.get(key, headers=request_headers or None, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                entry.expires_at = time.monotonic() + self._ttl(resource_type)
+                self._count(resource_type, "revalidated")
+            response.close()
+            return _cached_response(key, entry)
+
+        with self._lock:
+            self._count(resource_type, "misses")
+        if response.status_code == 200:
+            self._put(key, response, resource_type)
+        return response
+
+    def fetcher(self, session: requests.Session, timeout: float | None = 30) -> PageFetcher:
+        """Page fetcher for BundlePager that reads through the cache.
+
+        Responses are always read whole, so use it with ``stream=False``.
+        """
+        def fetch(url: str, params: dict | None, stream: bool) -> requests.Response:
+            return self.get(session, url, params, timeout=timeout)
+        return fetch
+
+    def invalidate(self, resource_type: str | None = None) -> None:
+        """Drop cached responses, all or for one resource type."""
+        with self._lock:
+            if resource_type is None:
+                self._entries.clear()
+                return
+            for key in [k for k, e in self._entries.items() if e.resource_type == resource_type]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        """Hit, revalidation and miss counts, overall and by resource type."""
+        with self._lock:
+            total = _TypeStats()
+            for s in self._stats.by_type.values():
+                total.hits += s.hits
+                total.revalidated += s.revalidated
+                total.misses += s.misses
+            return {
+                **total.to_dict(),
+                "entries": len(self._entries),
+                "evictions": self._stats.evictions,
+                "by_type": {t: s.to_dict() for t, s in sorted(self._stats.by_type.items())},
+            }
+
+    def _put(self, key: str, response: requests.Response, resource_type: str) -> None:
+        entry = _Entry(
+            body=response.content,
+            headers={k: v for k, v in response.headers.items() if k.lower() in ("content-type", "etag")},
+            etag=response.headers.get("ETag"),
+            resource_type=resource_type,
+            expires_at=time.monotonic() + self._ttl(resource_type),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def _ttl(self, resource_type: str) -> float:
+        return self.ttls.get(resource_type, self.default_ttl)
+
+    def _count(self, resource_type: str, outcome: str) -> None:
+        stats = self._stats.by_type.setdefault(resource_type, _TypeStats())
+        setattr(stats, outcome, getattr(stats, outcome) + 1)
+
+
+def _cached_response(url: str, entry: _Entry) -> requests.Response:
+    """A fresh Response object serving a cached body."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = CaseInsensitiveDict(entry.headers)
+    response._content = entry.body
+    response._content_consumed = True
+    return response
+
+
+def _resource_type(url: str) -> str:
+    """Resource type a read or search URL is for ("Patient/1" -> "Patient")."""
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    if len(segments) >= 2 and _RESOURCE_TYPE.match(segments[-2]):
+        return segments[-2]  # Read: {type}/{id}
+    if segments and _RESOURCE_TYPE.match(segments[-1]):
+        return segments[-1]  # Search: {type}?...
+    return "unknown"
+
+
+def _parse_ttls(value: str) -> dict[str, float]:
+    """Parse "Patient=1800,MedicationRequest=15" into a TTL dict."""
+    ttls = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        resource_type, seconds = item.split("=", 1)
+        try:
+            ttls[resource_type.strip()] = float(seconds)
+        except ValueError:
+            logger.warning(f"Ignoring invalid FHIR cache TTL: {item!r}")
+    return ttls
@@ -0,0 +1,432 @@
+"""Lazy, paged iteration over FHIR search results.
+
+A FHIR search returns a Bundle holding one page of results plus a
+``link`` with ``relation == "next"`` pointing at the next page. Reading
+only ``bundle["entry"]`` silently drops everything past the first page,
+and raising ``_count`` to compensate means one very large JSON document.
+
+BundlePager follows next links lazily and yields entries as a generator:
+
+    pager = BundlePager(session_fetcher(session))
+    for resource in pager.resources(f"{base_url}/DiagnosticReport", params):
+        ...
+
+- Page size: ``_count`` is set from ``page_size`` (or FHIR_PAGE_SIZE) unless
+  the caller's params already set it.
+- Prefetch: as soon as a page's next link is known, the next page is
+  requested on a background thread, so the caller works on page 1 while
+  page 2 is in flight.
+- Streaming: with ``stream=True`` and ijson installed, entries are parsed
+  incrementally from the response body, so peak memory stays at roughly
+  one entry rather than one page. Without ijson it falls back to parsing
+  whole pages.
+- Metrics: each search records pages, entries, bytes, time to first page
+  and total time, aggregated per resource type (``get_search_stats()``).
+
+Configuration (environment variables):
+    FHIR_PAGE_SIZE        Default _count per page (default 100)
+    FHIR_MAX_PAGES        Pages followed before stopping (default 50)
+    FHIR_PREFETCH_PAGES   Fetch the next page in the background (default true)
+    FHIR_STREAM_BUNDLES   Parse pages incrementally with ijson (default false)
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+from urllib.parse import urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# (url, params, stream) -> response, not yet checked for errors
+PageFetcher = Callable[[str, dict | None, bool], requests.Response]
+
+
+def session_fetcher(
+    session: requests.Session,
+    headers: dict | Callable[[], dict] | None = None,
+    timeout: float | None = 30,
+) -> PageFetcher:
+    """Page fetcher for a requests session.
+
+    Args:
+        session: Session to issue GETs with.
+        headers: Extra headers, or a function returning them per request
+            (e.g. a fresh OAuth bearer token).
+        timeout: Request timeout in seconds.
+    """
+    def fetch(url: str, params: dict | None, stream: bool) -> requests.Response:
+        extra = headers() if callable(headers) else headers
+        return session.get(url, params=params, headers=extra, timeout=timeout, stream=stream)
+    return fetch
+
+
+@dataclass
+class SearchMetrics:
+    """Timing and size of one paged search."""
+    resource_type: str
+    pages: int = 0
+    entries: int = 0
+    bytes: int = 0
+    first_page_ms: float = 0.0  # Until the first page's entries were available
+    fetch_ms: float = 0.0  # Time spent in requests and parsing, summed over pages
+    total_ms: float = 0.0  # Wall time, including the caller's processing
+    truncated: bool = False  # Stopped at max_pages/limit with more pages left
+
+
+@dataclass
+class _SearchTotals:
+    searches: int = 0
+    pages: int = 0
+    entries: int = 0
+    bytes: int = 0
+    first_page_ms: float = 0.0
+    fetch_ms: float = 0.0
+    total_ms: float = 0.0
+    max_total_ms: float = 0.0
+    truncated: int = 0
+
+    def add(self, m: SearchMetrics) -> None:
+        self.searches += 1
+        self.pages += m.pages
+        self.entries += m.entries
+        self.bytes += m.bytes
+        self.first_page_ms += m.first_page_ms
+        self.fetch_ms += m.fetch_ms
+        self.total_ms += m.total_ms
+        self.max_total_ms = max(self.max_total_ms, m.total_ms)
+        self.truncated += int(m.truncated)
+
+    def to_dict(self) -> dict[str, Any]:
+        n = self.searches or 1
+        return {
+            "searches": self.searches,
+            "pages": self.pages,
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "avg_pages": round(self.pages / n, 2),
+            "avg_first_page_ms": round(self.first_page_ms / n, 1),
+            "avg_fetch_ms": round(self.fetch_ms / n, 1),
+            "avg_total_ms": round(self.total_ms / n, 1),
+            "max_total_ms": round(self.max_total_ms, 1),
+            "truncated": self.truncated,
+        }
+
+
+_stats: dict[str, _SearchTotals] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(metrics: SearchMetrics) -> None:
+    with _stats_lock:
+        _stats.setdefault(metrics.resource_type, _SearchTotals()).add(metrics)
+
+
+def get_search_stats() -> dict[str, dict[str, Any]]:
+    """Aggregated search metrics per resource type for this process."""
+    with _stats_lock:
+        return {name: totals.to_dict() for name, totals in sorted(_stats.items())}
+
+
+def reset_search_stats() -> None:
+    """Clear aggregated search metrics."""
+    with _stats_lock:
+        _stats.clear()
+
+
+@dataclass
+class _Page:
+    """One fetched page: a lazy stream of ("next", url) and ("entry", dict)."""
+    response: requests.Response
+    events: Iterator[tuple[str, Any]]
+    fetch_ms: float
+    bytes: int = 0
+    elapsed_ms: list[float] = field(default_factory=list)
+
+
+class BundlePager:
+    """Follows FHIR search Bundle next links, yielding entries lazily."""
+
+    def __init__(
+        self,
+        fetch: PageFetcher,
+        page_size: int | None = None,
+        max_pages: int | None = None,
+        prefetch: bool | None = None,
+        stream: bool | None = None,
+    ):
+        """Initialize the pager.
+
+        Args:
+            fetch: Issues a GET (see session_fetcher).
+            page_size: _count for searches that don't set one.
+            max_pages: Stop after this many pages (guards against runaway
+                next links).
+            prefetch: Request the next page while the current one is
+                being consumed.
+            stream: Parse pages incrementally (needs ijson).
+        """
+        self.fetch = fetch
+        self.page_size = page_size or int(os.environ.get("FHIR_PAGE_SIZE", "100"))
+        self.max_pages = max_pages or int(os.environ.get("FHIR_MAX_PAGES", "50"))
+        self.prefetch = (
+            prefetch if prefetch is not None
+            else os.environ.get("FHIR_PREFETCH_PAGES", "true").lower() == "true"
+        )
+        self.stream = (
+            stream if stream is not None
+            else os.environ.get("FHIR_STREAM_BUNDLES", "false").lower() == "true"
+        )
+        if self.stream and not _ijson_available():
+            logger.warning("ijson not installed; parsing FHIR Bundles without streaming")
+            self.stream = False
+
+    def entries(
+        self,
+        url: str,
+        params: dict | None = None,
+        limit: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield Bundle entries across all pages of a search.
+
+        Args:
+            url: Search URL (e.g. f"{base_url}/Observation").
+            params: Search parameters for the first page (next links
+                carry their own).
+            limit: Stop after this many entries. The next page is then only
+                requested once the current one is used up.
+        """
+        params = dict(params or {})
+        params.setdefault("_count", self.page_size)
+        metrics = SearchMetrics(resource_type=_resource_type(url))
+        start = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fhir-prefetch") if self.prefetch else None
+        pending = self._submit(executor, url, params)
+        try:
+            while pending is not None:
+                page = pending.result()
+                pending = None
+                metrics.pages += 1
+                if metrics.pages == 1:
+                    metrics.first_page_ms = (time.perf_counter() - start) * 1000
+                next_url = None
+                try:
+                    for kind, value in page.events:
+                        if kind == "next":
+                            if metrics.pages >= self.max_pages:
+                                metrics.truncated = True
+                            elif limit is None:
+                                pending = self._submit(executor, value, None)
+                            else:
+                                next_url = value  # Only needed if this page falls short
+                            continue
+                        if limit is not None and metrics.entries >= limit:
+                            metrics.truncated = True
+                            return
+                        metrics.entries += 1
+                        yield value
+                    if next_url is not None and metrics.entries < limit:
+                        pending = self._submit(executor, next_url, None)
+                finally:
+                    page.response.close()
+                    metrics.fetch_ms += page.fetch_ms + sum(page.elapsed_ms)
+                    metrics.bytes += page.bytes
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            metrics.total_ms = (time.perf_counter() - start) * 1000
+            _record(metrics)
+            if metrics.truncated and metrics.pages >= self.max_pages:
+                logger.warning(
+                    f"{metrics.resource_type} search stopped at {metrics.pages} pages "
+                    f"({metrics.entries} entries); raise FHIR_MAX_PAGES or narrow the search"
+                )
+            logger.debug(
+                f"{metrics.resource_type} search: {metrics.entries} entries in {metrics.pages} pages, "
+                f"first page {metrics.first_page_ms:.0f}ms, total {metrics.total_ms:.0f}ms"
+            )
+
+    def resources(
+        self,
+        url: str,
+        params: dict | None = None,
+        resource_type: str | None = None,
+        limit: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield the resources in a search's entries.
+
+        Args:
+            url: Search URL.
+            params: Search parameters.
+            resource_type: Only resources of this type (e.g. to skip
+                _include'd or OperationOutcome entries).
+            limit: Stop after this many entries.
+        """
+        for entry in self.entries(url, params, limit=limit):
+            resource = entry.get("resource")
+            if resource is None:
+                continue
+            if resource_type and resource.get("resourceType") != resource_type:
+                continue
+            yield resource
+
+    def _submit(self, executor: ThreadPoolExecutor | None, url: str, params: dict | None) -> Future:
+        if executor is not None:
+            return executor.submit(self._load, url, params)
+        future: Future = Future()
+        try:
+            future.set_result(self._load(url, params))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def _load(self, url: str, params: dict | None) -> _Page:
+        start = time.perf_counter()
+        response = self.fetch(url, params, self.stream)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+
+        if self.stream:
+            fetch_ms = (time.perf_counter() - start) * 1000
+            page = _Page(response, iter(()), fetch_ms)
+            page.events = _stream_events(response, page)
+            return page
+
+        bundle = response.json()
+        fetch_ms = (time.perf_counter() - start) * 1000
+        return _Page(response, _bundle_events(bundle), fetch_ms, bytes=len(response.content))
+
+
+class PagedSearchMixin:
+    """``search()`` over BundlePager for FHIR clients.
+
+    The client provides ``session`` and ``base_url``; backends needing
+    per-request auth (e.g. an OAuth bearer token) override
+    ``_auth_headers``.
+    """
+
+    session: requests.Session
+    base_url: str
+
+    def search(
+        self,
+        resource_type: str,
+        params: dict | None = None,
+        limit: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield resources across all pages of a search.
+
+        Follows Bundle next links lazily.
+        """
+        pager = BundlePager(session_fetcher(self.session, headers=self._auth_headers))
+        return pager.resources(f"{self.base_url}/{resource_type}", params, limit=limit)
+
+    def _auth_headers(self) -> dict:
+        """Per-request auth headers (none by default)."""
+        return {}
+
+
+def iter_bundle_entries(
+    session: requests.Session,
+    url: str,
+    params: dict | None = None,
+    timeout: float | None = 30,
+    limit: int | None = None,
+    **pager_options,
+) -> Iterator[dict]:
+    """Yield entries across all pages of a search made with a session."""
+    pager = BundlePager(session_fetcher(session, timeout=timeout), **pager_options)
+    return pager.entries(url, params, limit=limit)
+
+
+def iter_bundle_resources(
+    session: requests.Session,
+    url: str,
+    params: dict | None = None,
+    resource_type: str | None = None,
+    timeout: float | None = 30,
+    limit: int | None = None,
+    **pager_options,
+) -> Iterator[dict]:
+    """Yield resources across all pages of a search made with a session."""
+    pager = BundlePager(session_fetcher(session, timeout=timeout), **pager_options)
+    return pager.resources(url, params, resource_type=resource_type, limit=limit)
+
+
+def next_link(bundle: dict) -> str | None:
+    """URL of a Bundle's next page, if any."""
+    for link in bundle.get("link", []):
+        if link.get("relation") == "next":
+            return link.get("url")
+    return None
+
+
+def _bundle_events(bundle: dict) -> Iterator[tuple[str, Any]]:
+    """Events for an already-parsed page; the next link comes first."""
+    if bundle.get("resourceType") != "Bundle":
+        return
+    url = next_link(bundle)
+    if url:
+        yield "next", url
+    for entry in bundle.get("entry", []):
+        yield "entry", entry
+
+
+def _stream_events(response: requests.Response, page: _Page) -> Iterator[tuple[str, Any]]:
+    """Events parsed incrementally from a streamed response body."""
+    import ijson
+
+    start = time.perf_counter()
+    response.raw.decode_content = True
+    builder = None
+    link: dict[str, str] = {}
+    is_bundle = True
+    for prefix, event, value in ijson.parse(response.raw, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == "entry.item" and event == "end_map":
+                entry, builder = builder.value, None
+                page.elapsed_ms.append((time.perf_counter() - start) * 1000)
+                yield "entry", entry
+                start = time.perf_counter()
+            continue
+
+        if prefix == "resourceType":
+            is_bundle = value == "Bundle"
+        elif prefix == "entry.item" and event == "start_map" and is_bundle:
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix in ("link.item.relation", "link.item.url"):
+            link[prefix.rsplit(".", 1)[1]] = value
+        elif prefix == "link.item" and event == "end_map":
+            if link.get("relation") == "next" and link.get("url"):
+                yield "next", link["url"]
+            link = {}
+
+    page.elapsed_ms.append((time.perf_counter() - start) * 1000)
+    page.bytes = response.raw.tell() if hasattr(response.raw, "tell") else 0
+
+
+def _resource_type(url: str) -> str:
+    """Resource type from a search URL (last path segment)."""
+    path = urlsplit(url).path.rstrip("/")
+    return path.rsplit("/", 1)[-1] or "unknown"
+
+
+def _ijson_available() -> bool:
+    try:
+        import ijson  # noqa: F401
+    except ImportError:
+        return False
+    return True
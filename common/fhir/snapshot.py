@@ -0,0 +1,145 @@
+"""Per-cycle bulk fetch of patients and their medication requests.
+
+Monitors check a batch of results (e.g. blood cultures) per poll, and used
+to fetch the Patient and the active MedicationRequests once per result. A
+bacteremic patient with four positive bottles was fetched four times.
+
+PatientSnapshot collects the distinct patient IDs up front and fetches
+them with a few bulk searches instead, run concurrently:
+
+    Patient?_id=a,b,c
+    MedicationRequest?patient=a,b,c&status=active
+
+Each result is then served from the snapshot:
+
+    snapshot = PatientSnapshot.fetch(client.search, patient_ids)
+    patient = snapshot.patient("a")             # dict or None
+    meds = snapshot.medication_requests("a")    # list of dicts
+
+IDs are chunked (``chunk_size``) to keep search URLs short. If a bulk
+search fails, or returns a MedicationRequest whose subject can't be matched
+to a requested ID, the snapshot doesn't cover those IDs (``covers()`` is
+False) and callers fall back to their per-patient lookups.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# (resource_type, params) -> resources, following pages
+SearchFunction = Callable[[str, dict], Iterable[dict]]
+
+
+def _patient_id(reference: str) -> str:
+    """Patient ID from a subject reference, or "" if it names no Patient.
+
+    Handles relative (``Patient/123``), absolute
+    (``https://fhir.example.org/Patient/123``) and versioned
+    (``Patient/123/_history/2``) references.
+    """
+    reference = reference.split("/_history/")[0].rstrip("/")
+    if "Patient/" not in reference:
+        return ""
+    return reference.rsplit("Patient/", 1)[1]
+
+
+@dataclass
+class PatientSnapshot:
+    """Patients and medication requests fetched once for a poll cycle."""
+    patients: dict[str, dict] = field(default_factory=dict)
+    medications: dict[str, list[dict]] = field(default_factory=dict)
+    covered: set[str] = field(default_factory=set)  # IDs whose searches all succeeded
+    searches: int = 0  # FHIR searches issued
+
+    @classmethod
+    def fetch(
+        cls,
+        search: SearchFunction,
+        patient_ids: Iterable[str],
+        medication_status: str = "active",
+        chunk_size: int = 50,
+        max_workers: int = 4,
+    ) -> "PatientSnapshot":
+        """Fetch patients and their medication requests in bulk.
+
+        Args:
+            search: Client search function, e.g. FHIRClient.search.
+            patient_ids: Patient IDs needed this cycle (duplicates ignored).
+            medication_status: MedicationRequest status to search for.
+            chunk_size: Patient IDs per search.
+            max_workers: Concurrent searches.
+        """
+        snapshot = cls()
+        ids = sorted({pid for pid in patient_ids if pid})
+        if not ids:
+            return snapshot
+
+        chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+        jobs = []
+        for chunk in chunks:
+            jobs.append(("Patient", {"_id": ",".join(chunk)}, chunk))
+            jobs.append((
+                "MedicationRequest",
+                {"patient": ",".join(chunk), "status": medication_status},
+                chunk,
+            ))
+
+        def run(job):
+            resource_type, params, chunk = job
+            try:
+                return job, list(search(resource_type, params)), None
+            except Exception as e:  # HTTP errors, and malformed pages from the streaming parser
+                return job, [], e
+
+        failed: set[str] = set()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            for (resource_type, _, chunk), resources, error in executor.map(run, jobs):
+                snapshot.searches += 1
+                if error is not None:
+                    logger.warning(f"Bulk {resource_type} search for {len(chunk)} patients failed: {error}")
+                    failed.update(chunk)
+                    continue
+                if resource_type == "Patient":
+                    for resource in resources:
+                        if resource.get("resourceType", "Patient") == "Patient" and resource.get("id"):
+                            snapshot.patients[resource["id"]] = resource
+                else:
+                    by_patient: dict[str, list[dict]] = {}
+                    for resource in resources:
+                        if resource.get("resourceType", "MedicationRequest") != "MedicationRequest":
+                            continue
+                        pid = _patient_id(resource.get("subject", {}).get("reference", ""))
+                        by_patient.setdefault(pid, []).append(resource)
+                    unmatched = set(by_patient) - set(chunk)
+                    if unmatched:
+                        logger.warning(
+                            f"Bulk MedicationRequest search returned subjects outside the "
+                            f"{len(chunk)} patients searched ({sorted(unmatched)[:3]}); "
+                            f"falling back for them"
+                        )
+                        failed.update(chunk)
+                        continue
+                    for pid, meds in by_patient.items():
+                        snapshot.medications.setdefault(pid, []).extend(meds)
+
+        snapshot.covered = set(ids) - failed
+        logger.debug(
+            f"Fetched {len(snapshot.patients)}/{len(ids)} patients and medications "
+            f"in {snapshot.searches} searches"
+        )
+        return snapshot
+
+    def covers(self, patient_id: str) -> bool:
+        """Whether this snapshot has authoritative data for a patient."""
+        return patient_id in self.covered
+
+    def patient(self, patient_id: str) -> dict | None:
+        """Patient resource, or None if the patient wasn't found."""
+        return self.patients.get(patient_id)
+
+    def medication_requests(self, patient_id: str) -> list[dict]:
+        """Medication requests for a patient (empty if none)."""
+        return self.medications.get(patient_id, [])
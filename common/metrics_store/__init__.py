@@ -17,7 +17,8 @@ from .models import (
     InterventionTarget,
     InterventionOutcome,
 )
-from .store import MetricsStore
+from .store import MetricsStore, get_metrics_store
+from .sink import ActivitySink, get_activity_sink
 from .aggregator import MetricsAggregator, LocationScore, ServiceScore, ResolutionPatterns
 from .reports import MetricsReporter
 
@@ -34,6 +35,9 @@ __all__ = [
     "InterventionTarget",
     "InterventionOutcome",
     "MetricsStore",
+    "get_metrics_store",
+    "ActivitySink",
+    "get_activity_sink",
     "MetricsAggregator",
     "LocationScore",
     "ServiceScore",
@@ -2,6 +2,11 @@
 
 Provides daily snapshot creation, intervention target identification,
 and trending analysis across all monitoring modules.
+
+Daily snapshots are rolled up incrementally: update_snapshots() aggregates
+only the days since its last run (tracked as a watermark in the metrics
+store), and backfill_snapshots() computes any range of days with one
+grouped query per module database.
 """
 
 import json
@@ -22,6 +27,72 @@ from .store import MetricsStore
 
 logger = logging.getLogger(__name__)
 
+# Watermark name for the daily snapshot rollup (see update_snapshots)
+DAILY_SNAPSHOT_ROLLUP = "daily_snapshot"
+
+# Grouped rollups over a [:start, :end) date range, one query per module
+# database. Each row is (metric, day, n, extra); timestamps are compared as
+# strings, so both "YYYY-MM-DD HH:MM:SS" and ISO "T" formats work.
+_ALERT_ROLLUP_SQL = """
+    SELECT 'created' as metric, substr(created_at, 1, 10) as day,
+           COUNT(*) as n, NULL as avg_minutes
+    FROM alerts
+    WHERE created_at >= :start AND created_at < :end
+    GROUP BY day
+    UNION ALL
+    SELECT 'acknowledged', substr(acknowledged_at, 1, 10) as day, COUNT(*),
+           AVG((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60)
+    FROM alerts
+    WHERE acknowledged_at >= :start AND acknowledged_at < :end
+    GROUP BY day
+    UNION ALL
+    SELECT 'resolved', substr(resolved_at, 1, 10) as day, COUNT(*),
+           AVG((julianday(resolved_at) - julianday(created_at)) * 24 * 60)
+    FROM alerts
+    WHERE resolved_at >= :start AND resolved_at < :end
+    GROUP BY day
+"""
+
+_HAI_ROLLUP_SQL = """
+    SELECT 'created' as metric, substr(created_at, 1, 10) as day,
+           COUNT(*) as n, SUM(status = 'confirmed') as extra
+    FROM hai_candidates
+    WHERE created_at >= :start AND created_at < :end
+    GROUP BY day
+    UNION ALL
+    SELECT 'reviewed', substr(reviewed_at, 1, 10) as day, COUNT(*), SUM(is_override = 1)
+    FROM hai_reviews
+    WHERE reviewed_at >= :start AND reviewed_at < :end
+    GROUP BY day
+"""
+
+_ADHERENCE_ROLLUP_SQL = """
+    SELECT 'alerts' as metric, substr(created_at, 1, 10) as day,
+           COUNT(*) as n, NULL as extra
+    FROM bundle_alerts
+    WHERE created_at >= :start AND created_at < :end
+    GROUP BY day
+    UNION ALL
+    SELECT 'completed', substr(completed_at, 1, 10) as day, COUNT(*), AVG(adherence_percentage)
+    FROM bundle_episodes
+    WHERE completed_at >= :start AND completed_at < :end
+    GROUP BY day
+"""
+
+_INDICATION_ROLLUP_SQL = """
+    SELECT 'reviews' as metric, substr(reviewed_at, 1, 10) as day,
+           COUNT(*) as n, NULL as extra
+    FROM indication_reviews
+    WHERE reviewed_at >= :start AND reviewed_at < :end
+    GROUP BY day
+    UNION ALL
+    SELECT 'candidates', substr(created_at, 1, 10) as day,
+           SUM(final_classification IN ('A', 'S', 'P')), SUM(final_classification = 'N')
+    FROM indication_candidates
+    WHERE created_at >= :start AND created_at < :end
+    GROUP BY day
+"""
+
 
 @dataclass
 class LocationScore:
@@ -93,6 +164,9 @@ class MetricsAggregator:
         self._adherence_db_path = adherence_db_path
         self._indication_db_path = indication_db_path
 
+        # Already-aggregated days update_snapshots recomputes for late writes
+        self.rollup_lookback_days = int(os.environ.get("METRICS_ROLLUP_LOOKBACK_DAYS", "1"))
+
     def _get_alert_store(self):
         """Get AlertStore instance."""
         try:
@@ -144,218 +218,194 @@ class MetricsAggregator:
         if snapshot_date is None:
             snapshot_date = date.today() - timedelta(days=1)
 
-        snapshot = DailySnapshot(snapshot_date=snapshot_date)
+        return self.backfill_snapshots(snapshot_date, snapshot_date)[0]
 
-        # Aggregate from each module
-        self._aggregate_alert_metrics(snapshot, snapshot_date)
-        self._aggregate_hai_metrics(snapshot, snapshot_date)
-        self._aggregate_adherence_metrics(snapshot, snapshot_date)
-        self._aggregate_indication_metrics(snapshot, snapshot_date)
-        self._aggregate_activity_metrics(snapshot, snapshot_date)
+    def backfill_snapshots(self, start_date: date, end_date: date | None = None) -> list[DailySnapshot]:
+        """Create daily snapshots for every day in a date range.
 
-        # Save the snapshot
-        self.metrics_store.save_daily_snapshot(snapshot)
+        Each module database is read with one grouped query covering the
+        whole range, so a year of snapshots costs the same handful of
+        queries as a single day.
 
-        logger.info(f"Created daily snapshot for {snapshot_date}")
-        return snapshot
+        bundle_episodes_active is a point-in-time count with no history, so
+        it is only taken when the range ends yesterday or today, and recorded
+        on that last day. Every other day keeps the count stored when it
+        was the most recent day.
 
-    def _aggregate_alert_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the alert store."""
-        alert_store = self._get_alert_store()
-        if not alert_store:
-            return
+        Args:
+            start_date: First day to snapshot
+            end_date: Last day to snapshot (defaults to yesterday)
 
-        try:
-            import sqlite3
-            with sqlite3.connect(alert_store.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+        Returns:
+            Snapshots in date order
+        """
+        if end_date is None:
+            end_date = date.today() - timedelta(days=1)
+        if start_date > end_date:
+            return []
+
+        snapshots = {
+            day.isoformat(): DailySnapshot(snapshot_date=day)
+            for day in (start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1))
+        }
 
-                date_str = snapshot_date.isoformat()
+        # Half-open [start, end) bounds on the raw timestamp columns, so the
+        # created_at/resolved_at/... indexes are used instead of date(column)
+        start = start_date.isoformat()
+        end = (end_date + timedelta(days=1)).isoformat()
 
-                # Alerts created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.alerts_created = cursor.fetchone()[0]
+        today = date.today()
+        current = end_date if today - timedelta(days=1) <= end_date <= today else None
 
-                # Alerts resolved on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE date(resolved_at) = ?",
-                    (date_str,)
-                )
-                snapshot.alerts_resolved = cursor.fetchone()[0]
+        self._aggregate_alert_metrics(snapshots, start, end)
+        self._aggregate_hai_metrics(snapshots, start, end)
+        self._aggregate_adherence_metrics(snapshots, start, end, current)
+        self._aggregate_indication_metrics(snapshots, start, end)
+        self._aggregate_activity_metrics(snapshots, start_date, end_date)
 
-                # Alerts acknowledged on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE date(acknowledged_at) = ?",
-                    (date_str,)
-                )
-                snapshot.alerts_acknowledged = cursor.fetchone()[0]
+        result = list(snapshots.values())
+        self.metrics_store.save_daily_snapshots(result, point_in_time_date=current)
 
-                # Average time to acknowledge (for alerts acknowledged on this date)
-                cursor.execute(
-                    """
-                    SELECT AVG(
-                        CAST((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60 AS REAL)
-                    )
-                    FROM alerts
-                    WHERE date(acknowledged_at) = ? AND acknowledged_at IS NOT NULL
-                    """,
-                    (date_str,)
-                )
-                result = cursor.fetchone()[0]
-                snapshot.avg_time_to_ack_minutes = round(result, 1) if result else None
-
-                # Average time to resolve (for alerts resolved on this date)
-                cursor.execute(
-                    """
-                    SELECT AVG(
-                        CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS REAL)
-                    )
-                    FROM alerts
-                    WHERE date(resolved_at) = ? AND resolved_at IS NOT NULL
-                    """,
-                    (date_str,)
-                )
-                result = cursor.fetchone()[0]
-                snapshot.avg_time_to_resolve_minutes = round(result, 1) if result else None
+        if len(result) == 1:
+            logger.info(f"Created daily snapshot for {start_date}")
+        else:
+            logger.info(f"Created {len(result)} daily snapshots for {start_date} to {end_date}")
+        return result
+
+    def update_snapshots(self, through_date: date | None = None) -> list[DailySnapshot]:
+        """Create snapshots for the days since the last update.
+
+        The last day aggregated is kept as a watermark in the metrics store,
+        so each run only reads the new days. The most recent
+        ``rollup_lookback_days`` already-aggregated days are recomputed too,
+        to pick up late writes such as replayed activity spools. The first
+        run only snapshots through_date; use backfill_snapshots for history.
+
+        Args:
+            through_date: Last day to snapshot (defaults to yesterday)
+
+        Returns:
+            The snapshots created, in date order
+        """
+        if through_date is None:
+            through_date = date.today() - timedelta(days=1)
+
+        watermark = self.metrics_store.get_rollup_watermark(DAILY_SNAPSHOT_ROLLUP)
+        if watermark is None:
+            start_date = through_date
+        else:
+            start_date = watermark + timedelta(days=1 - self.rollup_lookback_days)
+
+        snapshots = self.backfill_snapshots(start_date, through_date)
+        if watermark is None or through_date > watermark:
+            self.metrics_store.set_rollup_watermark(DAILY_SNAPSHOT_ROLLUP, through_date)
+        return snapshots
+
+    def _rollup(self, db_path: str, sql: str, start: str, end: str) -> list:
+        """Run a grouped rollup query over [start, end) against a module database."""
+        import sqlite3
+        with sqlite3.connect(db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(sql, {"start": start, "end": end}).fetchall()
+
+    def _aggregate_alert_metrics(self, snapshots: dict[str, DailySnapshot], start: str, end: str) -> None:
+        """Aggregate metrics from the alert store."""
+        alert_store = self._get_alert_store()
+        if not alert_store:
+            return
+
+        try:
+            for row in self._rollup(alert_store.db_path, _ALERT_ROLLUP_SQL, start, end):
+                snapshot = snapshots.get(row["day"])
+                if snapshot is None:
+                    continue
+                avg = round(row["avg_minutes"], 1) if row["avg_minutes"] else None
+                if row["metric"] == "created":
+                    snapshot.alerts_created = row["n"]
+                elif row["metric"] == "acknowledged":
+                    snapshot.alerts_acknowledged = row["n"]
+                    snapshot.avg_time_to_ack_minutes = avg
+                else:
+                    snapshot.alerts_resolved = row["n"]
+                    snapshot.avg_time_to_resolve_minutes = avg
 
         except Exception as e:
             logger.error(f"Error aggregating alert metrics: {e}")
 
-    def _aggregate_hai_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
+    def _aggregate_hai_metrics(self, snapshots: dict[str, DailySnapshot], start: str, end: str) -> None:
         """Aggregate metrics from the HAI detection module."""
         hai_db = self._get_hai_db()
         if not hai_db:
             return
 
         try:
-            import sqlite3
-            with sqlite3.connect(hai_db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                date_str = snapshot_date.isoformat()
-
-                # Candidates created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM hai_candidates WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.hai_candidates_created = cursor.fetchone()[0]
-
-                # Candidates reviewed on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM hai_reviews WHERE date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.hai_candidates_reviewed = cursor.fetchone()[0]
-
-                # Confirmed HAI on this date
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) FROM hai_candidates
-                    WHERE status = 'confirmed'
-                    AND date(created_at) = ?
-                    """,
-                    (date_str,)
-                )
-                snapshot.hai_confirmed = cursor.fetchone()[0]
-
-                # Overrides on this date
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) FROM hai_reviews
-                    WHERE is_override = 1 AND date(reviewed_at) = ?
-                    """,
-                    (date_str,)
-                )
-                snapshot.hai_override_count = cursor.fetchone()[0]
+            for row in self._rollup(hai_db.db_path, _HAI_ROLLUP_SQL, start, end):
+                snapshot = snapshots.get(row["day"])
+                if snapshot is None:
+                    continue
+                if row["metric"] == "created":
+                    snapshot.hai_candidates_created = row["n"]
+                    snapshot.hai_confirmed = row["extra"] or 0
+                else:
+                    snapshot.hai_candidates_reviewed = row["n"]
+                    snapshot.hai_override_count = row["extra"] or 0
 
         except Exception as e:
             logger.error(f"Error aggregating HAI metrics: {e}")
 
-    def _aggregate_adherence_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the guideline adherence module."""
+    def _aggregate_adherence_metrics(
+        self,
+        snapshots: dict[str, DailySnapshot],
+        start: str,
+        end: str,
+        current: date | None = None,
+    ) -> None:
+        """Aggregate metrics from the guideline adherence module.
+
+        The active episode count is current state, so it is only taken for
+        the current day (if that is in the range).
+        """
         adherence_db = self._get_adherence_db()
         if not adherence_db:
             return
 
         try:
-            import sqlite3
-            with sqlite3.connect(adherence_db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                date_str = snapshot_date.isoformat()
-
-                # Active bundle episodes
-                cursor.execute(
-                    "SELECT COUNT(*) FROM bundle_episodes WHERE status = 'active'"
-                )
-                snapshot.bundle_episodes_active = cursor.fetchone()[0]
-
-                # Bundle alerts created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM bundle_alerts WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.bundle_alerts_created = cursor.fetchone()[0]
-
-                # Average adherence rate for episodes completed on this date
-                cursor.execute(
-                    """
-                    SELECT AVG(adherence_percentage)
-                    FROM bundle_episodes
-                    WHERE date(completed_at) = ?
-                    AND adherence_percentage IS NOT NULL
-                    """,
-                    (date_str,)
-                )
-                result = cursor.fetchone()[0]
-                snapshot.bundle_adherence_rate = round(result, 1) if result else None
+            for row in self._rollup(adherence_db.db_path, _ADHERENCE_ROLLUP_SQL, start, end):
+                snapshot = snapshots.get(row["day"])
+                if snapshot is None:
+                    continue
+                if row["metric"] == "alerts":
+                    snapshot.bundle_alerts_created = row["n"]
+                else:
+                    snapshot.bundle_adherence_rate = round(row["extra"], 1) if row["extra"] else None
+
+            if current is not None:
+                import sqlite3
+                with sqlite3.connect(adherence_db.db_path) as conn:
+                    snapshots[current.isoformat()].bundle_episodes_active = conn.execute(
+                        "SELECT COUNT(*) FROM bundle_episodes WHERE status = 'active'"
+                    ).fetchone()[0]
 
         except Exception as e:
             logger.error(f"Error aggregating adherence metrics: {e}")
 
-    def _aggregate_indication_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
+    def _aggregate_indication_metrics(self, snapshots: dict[str, DailySnapshot], start: str, end: str) -> None:
         """Aggregate metrics from the indication monitoring module."""
         indication_db = self._get_indication_db()
         if not indication_db:
             return
 
         try:
-            import sqlite3
-            with sqlite3.connect(indication_db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                date_str = snapshot_date.isoformat()
-
-                # Reviews on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM indication_reviews WHERE date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.indication_reviews = cursor.fetchone()[0]
-
-                # Classification breakdown for orders on this date
-                cursor.execute(
-                    """
-                    SELECT
-                        SUM(CASE WHEN final_classification IN ('A', 'S', 'P') THEN 1 ELSE 0 END) as appropriate,
-                        SUM(CASE WHEN final_classification = 'N' THEN 1 ELSE 0 END) as inappropriate
-                    FROM indication_candidates
-                    WHERE date(created_at) = ?
-                    """,
-                    (date_str,)
-                )
-                row = cursor.fetchone()
-                snapshot.appropriate_count = row["appropriate"] or 0
-                snapshot.inappropriate_count = row["inappropriate"] or 0
-
+            for row in self._rollup(indication_db.db_path, _INDICATION_ROLLUP_SQL, start, end):
+                snapshot = snapshots.get(row["day"])
+                if snapshot is None:
+                    continue
+                if row["metric"] == "reviews":
+                    snapshot.indication_reviews = row["n"]
+                    continue
+
+                snapshot.appropriate_count = row["n"] or 0
+                snapshot.inappropriate_count = row["extra"] or 0
                 total = snapshot.appropriate_count + snapshot.inappropriate_count
                 if total > 0:
                     snapshot.inappropriate_rate = round(
@@ -365,47 +415,39 @@ class MetricsAggregator:
         except Exception as e:
             logger.error(f"Error aggregating indication metrics: {e}")
 
-    def _aggregate_activity_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
+    def _aggregate_activity_metrics(
+        self, snapshots: dict[str, DailySnapshot], start_date: date, end_date: date
+    ) -> None:
         """Aggregate human activity metrics from the unified metrics store."""
         try:
-            activities = self.metrics_store.list_activities(
-                start_date=snapshot_date,
-                end_date=snapshot_date,
-                limit=10000,
-            )
-
-            snapshot.total_reviews = sum(
-                1 for a in activities if a.activity_type in ("review", "acknowledgment", "resolution")
-            )
-
-            provider_ids = set(a.provider_id for a in activities if a.provider_id)
-            snapshot.unique_reviewers = len(provider_ids)
-
-            snapshot.total_interventions = sum(
-                1 for a in activities if a.activity_type == "intervention"
-            )
-
-            # Build location breakdown
-            by_location: dict[str, dict] = {}
-            for a in activities:
-                if a.location_code:
-                    if a.location_code not in by_location:
-                        by_location[a.location_code] = {"activities": 0, "reviews": 0}
-                    by_location[a.location_code]["activities"] += 1
-                    if a.activity_type in ("review", "acknowledgment", "resolution"):
-                        by_location[a.location_code]["reviews"] += 1
-            snapshot.by_location = by_location
-
-            # Build service breakdown
-            by_service: dict[str, dict] = {}
-            for a in activities:
-                if a.service:
-                    if a.service not in by_service:
-                        by_service[a.service] = {"activities": 0, "reviews": 0}
-                    by_service[a.service]["activities"] += 1
-                    if a.activity_type in ("review", "acknowledgment", "resolution"):
-                        by_service[a.service]["reviews"] += 1
-            snapshot.by_service = by_service
+            providers: dict[str, set[str]] = {}
+            for row in self.metrics_store.list_activity_counts(start_date, end_date):
+                snapshot = snapshots.get(row["day"])
+                if snapshot is None:
+                    continue
+                count = row["count"]
+                is_review = row["activity_type"] in ("review", "acknowledgment", "resolution")
+
+                if is_review:
+                    snapshot.total_reviews += count
+                if row["activity_type"] == "intervention":
+                    snapshot.total_interventions += count
+                if row["provider_id"]:
+                    providers.setdefault(row["day"], set()).add(row["provider_id"])
+
+                # Location and service breakdowns
+                for breakdown, key in (
+                    (snapshot.by_location, row["location_code"]),
+                    (snapshot.by_service, row["service"]),
+                ):
+                    if key:
+                        entry = breakdown.setdefault(key, {"activities": 0, "reviews": 0})
+                        entry["activities"] += count
+                        if is_review:
+                            entry["reviews"] += count
+
+            for day, provider_ids in providers.items():
+                snapshots[day].unique_reviewers = len(provider_ids)
 
         except Exception as e:
             logger.error(f"Error aggregating activity metrics: {e}")
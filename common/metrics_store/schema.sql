@@ -30,7 +30,10 @@ CREATE TABLE IF NOT EXISTS provider_activity (
     performed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
     -- Additional context as JSON
-    details TEXT                   -- JSON blob for module-specific data
+    details TEXT,                  -- JSON blob for module-specific data
+
+    -- Set by the async activity sink so spool replays are idempotent
+    event_id TEXT
 );
 
 CREATE INDEX IF NOT EXISTS idx_activity_provider ON provider_activity(provider_id);
@@ -120,6 +123,13 @@ CREATE TABLE IF NOT EXISTS metrics_daily_snapshot (
 
 CREATE INDEX IF NOT EXISTS idx_snapshot_date ON metrics_daily_snapshot(snapshot_date);
 
+-- Rollup watermarks - the last day each rollup has been aggregated through
+CREATE TABLE IF NOT EXISTS metrics_rollup_state (
+    rollup TEXT PRIMARY KEY,       -- e.g. daily_snapshot
+    through_date DATE NOT NULL,    -- last day aggregated
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Intervention targets - identifies units/services needing attention
 CREATE TABLE IF NOT EXISTS intervention_targets (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
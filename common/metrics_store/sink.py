@@ -0,0 +1,297 @@
+"""Asynchronous, batched activity logging for the metrics store.
+
+Alert, candidate and episode actions log a provider activity row as a side
+effect. Writing that row synchronously puts the metrics database on the
+request path: a dashboard click waits for its own transaction and for any
+other writer holding the database.
+
+ActivitySink makes logging fire-and-forget. ``log_activity`` puts the row
+on a bounded in-process queue and returns; a background thread writes
+queued rows with ``executemany`` in one transaction per batch (every
+``batch_size`` rows or ``flush_interval`` seconds). If the queue is full
+the row is dropped and counted rather than blocking the caller.
+
+With a spool file configured, each row is also appended to the spool (a
+JSON line, no database involved) before it is queued. The spool is
+truncated once everything in it has been written, and replayed when the
+sink next starts, so rows queued when the process died are not lost. Each
+row carries an event ID and is inserted with ``INSERT OR IGNORE``, so a
+replay never duplicates rows that did make it to the database.
+
+Configuration (environment variables):
+    METRICS_ACTIVITY_FLUSH_SECONDS  Max delay before a row is written (default 1)
+    METRICS_ACTIVITY_BATCH_SIZE     Rows per transaction (default 200)
+    METRICS_ACTIVITY_QUEUE_SIZE     Rows buffered before dropping (default 10000)
+    METRICS_ACTIVITY_SPOOL_PATH     Spool file (default: no spool)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from ..db import get_connection
+from .models import ActivityType, ModuleSource
+from .store import MetricsStore, get_metrics_store
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    "provider_id", "provider_name", "provider_role",
+    "activity_type", "module", "entity_id", "entity_type",
+    "action_taken", "outcome", "patient_mrn", "location_code",
+    "service", "duration_minutes", "performed_at", "details", "event_id",
+)
+
+_STOP = object()
+
+
+class ActivitySink:
+    """Queue-backed provider activity logger with a background writer."""
+
+    def __init__(
+        self,
+        store: MetricsStore | None = None,
+        flush_interval: float | None = None,
+        batch_size: int | None = None,
+        max_queue: int | None = None,
+        spool_path: str | Path | None = None,
+    ):
+        """Initialize the sink.
+
+        Args:
+            store: Metrics store to write to. Defaults to the shared store.
+            flush_interval: Max seconds a row waits before being written.
+            batch_size: Write as soon as this many rows are buffered.
+            max_queue: Rows buffered before new ones are dropped.
+            spool_path: Optional file that keeps queued rows across restarts.
+        """
+        self.store = store or get_metrics_store()
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else float(os.environ.get("METRICS_ACTIVITY_FLUSH_SECONDS", "1"))
+        )
+        self.batch_size = batch_size or int(os.environ.get("METRICS_ACTIVITY_BATCH_SIZE", "200"))
+        max_queue = max_queue or int(os.environ.get("METRICS_ACTIVITY_QUEUE_SIZE", "10000"))
+        spool_path = spool_path or os.environ.get("METRICS_ACTIVITY_SPOOL_PATH")
+        self.spool_path = Path(spool_path).expanduser() if spool_path else None
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+        self.dropped = 0
+        self.written = 0
+
+        if self.spool_path:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.spool_path.exists() and self.spool_path.stat().st_size:
+                self._ensure_writer()  # Replays the spool left by the last run
+
+    def log_activity(
+        self,
+        activity_type: ActivityType | str,
+        module: ModuleSource | str,
+        provider_id: str | None = None,
+        provider_name: str | None = None,
+        provider_role: str | None = None,
+        entity_id: str | None = None,
+        entity_type: str | None = None,
+        action_taken: str | None = None,
+        outcome: str | None = None,
+        patient_mrn: str | None = None,
+        location_code: str | None = None,
+        service: str | None = None,
+        duration_minutes: int | None = None,
+        details: dict | None = None,
+    ) -> None:
+        """Queue a provider activity for writing. Never blocks.
+
+        Takes the same arguments as MetricsStore.log_activity. The row is
+        timestamped now, not when it is written.
+        """
+        row = (
+            provider_id, provider_name, provider_role,
+            activity_type.value if isinstance(activity_type, ActivityType) else activity_type,
+            module.value if isinstance(module, ModuleSource) else module,
+            entity_id, entity_type, action_taken, outcome, patient_mrn, location_code,
+            service, duration_minutes, datetime.now().isoformat(),
+            json.dumps(details) if details else None,
+            uuid.uuid4().hex,
+        )
+
+        self._ensure_writer()
+        if self.spool_path is None:
+            self._enqueue(row)
+            return
+
+        # Spool and queue together, so the writer never truncates the spool
+        # between the two
+        with self._spool_lock:
+            if self._enqueue(row):
+                try:
+                    with open(self.spool_path, "a") as f:
+                        f.write(json.dumps(row) + "\n")
+                except OSError as e:
+                    logger.warning(f"Failed to spool activity: {e}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything logged so far is written.
+
+        Returns:
+            False if the writer didn't catch up within timeout.
+        """
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write pending rows and stop the writer thread."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning(
+                f"Activity queue full at shutdown, {self._queue.qsize()} rows not written"
+                + (f" (kept in {self.spool_path})" if self.spool_path else "")
+            )
+            return
+        writer.join(timeout)
+
+    def _enqueue(self, row: tuple) -> bool:
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Activity queue full, dropped {self.dropped} activities so far")
+            return False
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run_writer, name="activity-sink-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _run_writer(self) -> None:
+        """Background loop: buffer rows, write on batch size, interval or flush."""
+        self._replay_spool()
+        batch: list[tuple] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # Flush interval elapsed
+
+            if isinstance(item, tuple):
+                batch.append(item)
+                if len(batch) == 1:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            if self._write(batch):
+                self._truncate_spool_if_idle()
+            batch = []
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _write(self, batch: list[tuple]) -> bool:
+        """Insert a batch in one transaction. Returns False on failure."""
+        if not batch:
+            return True
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        try:
+            with get_connection(self.store.db_path) as conn:
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO provider_activity ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({placeholders})",
+                    batch,
+                )
+        except sqlite3.Error as e:
+            self.dropped += len(batch)
+            logger.warning(f"Failed to write {len(batch)} activities: {e}")
+            return False
+        self.written += len(batch)
+        return True
+
+    def _replay_spool(self) -> None:
+        if self.spool_path is None:
+            return
+        with self._spool_lock:
+            try:
+                with open(self.spool_path) as f:
+                    rows = [tuple(json.loads(line)) for line in f if line.strip()]
+            except FileNotFoundError:
+                return
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read activity spool {self.spool_path}: {e}")
+                return
+            if rows and not self._write(rows):
+                return
+            if rows:
+                logger.info(f"Replayed {len(rows)} spooled activities")
+            self._truncate_spool()
+
+    def _truncate_spool_if_idle(self) -> None:
+        """Empty the spool once every row in it has been written."""
+        if self.spool_path is None:
+            return
+        with self._spool_lock:
+            if self._queue.empty():
+                self._truncate_spool()
+
+    def _truncate_spool(self) -> None:
+        try:
+            with open(self.spool_path, "w"):
+                pass
+        except OSError as e:
+            logger.warning(f"Failed to truncate activity spool: {e}")
+
+
+_sinks: dict[str, ActivitySink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_activity_sink(db_path: str | None = None) -> ActivitySink:
+    """Get the shared activity sink for a metrics database.
+
+    Pending rows are written at interpreter exit.
+
+    Args:
+        db_path: Path to SQLite database. Defaults to METRICS_DB_PATH env var
+                 or ~/.aegis/metrics.db
+    """
+    store = get_metrics_store(db_path)
+    sink = _sinks.get(store.db_path)
+    if sink is None:
+        with _sinks_lock:
+            sink = _sinks.get(store.db_path)
+            if sink is None:
+                sink = _sinks[store.db_path] = ActivitySink(store)
+                atexit.register(sink.close)
+    return sink
@@ -4,10 +4,12 @@ import json
 import logging
 import os
 import sqlite3
+import threading
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any
 
+from ..db import Migration, add_column, ensure_schema, get_connection, retry_on_busy
 from .models import (
     ActivityType,
     ModuleSource,
@@ -24,6 +26,16 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+
+# Schema changes for existing databases (see common.db.schema)
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Activity event IDs for idempotent batched writes", add_column(
+        "provider_activity", "event_id", "TEXT")),
+    Migration(2, "Unique activity event IDs", (
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_activity_event_id ON provider_activity(event_id)")),
+]
+
 
 class MetricsStore:
     """SQLite-backed storage for ASP/IP metrics and activity tracking."""
@@ -50,24 +62,18 @@ class MetricsStore:
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize database schema."""
-        schema_path = Path(__file__).parent / "schema.sql"
-        with open(schema_path) as f:
-            schema = f.read()
-
-        with self._connect() as conn:
-            conn.executescript(schema)
+        """Initialize database schema (once per process per database)."""
+        ensure_schema(self.db_path, "metrics_store", schema_path=SCHEMA_PATH, migrations=MIGRATIONS)
 
     def _connect(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's shared WAL connection (see common.db)."""
+        return get_connection(self.db_path)
 
     # =========================================================================
     # Provider Activity Operations
     # =========================================================================
 
+    @retry_on_busy
     def log_activity(
         self,
         activity_type: ActivityType | str,
@@ -193,13 +199,14 @@ class MetricsStore:
             conditions.append("location_code = ?")
             params.append(location_code)
 
+        # Half-open ranges on the raw column so idx_activity_performed_at is used
         if start_date:
-            conditions.append("date(performed_at) >= ?")
+            conditions.append("performed_at >= ?")
             params.append(start_date.isoformat())
 
         if end_date:
-            conditions.append("date(performed_at) <= ?")
-            params.append(end_date.isoformat())
+            conditions.append("performed_at < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
 
         where_clause = " AND ".join(conditions) if conditions else "1=1"
         params.append(limit)
@@ -216,6 +223,34 @@ class MetricsStore:
             )
             return [ProviderActivity.from_row(row) for row in cursor.fetchall()]
 
+    def list_activity_counts(self, start_date: date, end_date: date) -> list[dict[str, Any]]:
+        """Count activities per day, type, provider, location and service.
+
+        One grouped pass over a date range, for building daily snapshots.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+
+        Returns:
+            List of dicts with day, activity_type, provider_id, location_code,
+            service and count
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """
+                SELECT
+                    substr(performed_at, 1, 10) as day,
+                    activity_type, provider_id, location_code, service,
+                    COUNT(*) as count
+                FROM provider_activity
+                WHERE performed_at >= ? AND performed_at < ?
+                GROUP BY day, activity_type, provider_id, location_code, service
+                """,
+                (start_date.isoformat(), (end_date + timedelta(days=1)).isoformat())
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
     def get_provider_workload(
         self,
         days: int = 30,
@@ -486,6 +521,67 @@ class MetricsStore:
     # Daily Snapshot Operations
     # =========================================================================
 
+    _SNAPSHOT_INSERT = """
+        INSERT OR REPLACE INTO metrics_daily_snapshot (
+            snapshot_date,
+            alerts_created, alerts_resolved, alerts_acknowledged,
+            avg_time_to_ack_minutes, avg_time_to_resolve_minutes,
+            hai_candidates_created, hai_candidates_reviewed, hai_confirmed, hai_override_count,
+            bundle_episodes_active, bundle_alerts_created, bundle_adherence_rate,
+            indication_reviews, appropriate_count, inappropriate_count, inappropriate_rate,
+            total_reviews, unique_reviewers, total_interventions,
+            by_location, by_service, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # Recomputing a day replaces every column except bundle_episodes_active,
+    # a point-in-time count that is only overwritten on the day it describes
+    # (the last ? parameter)
+    _SNAPSHOT_UPSERT = _SNAPSHOT_INSERT.replace("INSERT OR REPLACE", "INSERT") + """
+        ON CONFLICT(snapshot_date) DO UPDATE SET
+            alerts_created = excluded.alerts_created,
+            alerts_resolved = excluded.alerts_resolved,
+            alerts_acknowledged = excluded.alerts_acknowledged,
+            avg_time_to_ack_minutes = excluded.avg_time_to_ack_minutes,
+            avg_time_to_resolve_minutes = excluded.avg_time_to_resolve_minutes,
+            hai_candidates_created = excluded.hai_candidates_created,
+            hai_candidates_reviewed = excluded.hai_candidates_reviewed,
+            hai_confirmed = excluded.hai_confirmed,
+            hai_override_count = excluded.hai_override_count,
+            bundle_episodes_active = CASE WHEN excluded.snapshot_date = ?
+                THEN excluded.bundle_episodes_active ELSE bundle_episodes_active END,
+            bundle_alerts_created = excluded.bundle_alerts_created,
+            bundle_adherence_rate = excluded.bundle_adherence_rate,
+            indication_reviews = excluded.indication_reviews,
+            appropriate_count = excluded.appropriate_count,
+            inappropriate_count = excluded.inappropriate_count,
+            inappropriate_rate = excluded.inappropriate_rate,
+            total_reviews = excluded.total_reviews,
+            unique_reviewers = excluded.unique_reviewers,
+            total_interventions = excluded.total_interventions,
+            by_location = excluded.by_location,
+            by_service = excluded.by_service,
+            created_at = excluded.created_at
+    """
+
+    @staticmethod
+    def _snapshot_params(snapshot: DailySnapshot, now: datetime) -> tuple:
+        by_location_json = json.dumps(snapshot.by_location) if snapshot.by_location else None
+        by_service_json = json.dumps(snapshot.by_service) if snapshot.by_service else None
+        return (
+            snapshot.snapshot_date.isoformat(),
+            snapshot.alerts_created, snapshot.alerts_resolved, snapshot.alerts_acknowledged,
+            snapshot.avg_time_to_ack_minutes, snapshot.avg_time_to_resolve_minutes,
+            snapshot.hai_candidates_created, snapshot.hai_candidates_reviewed,
+            snapshot.hai_confirmed, snapshot.hai_override_count,
+            snapshot.bundle_episodes_active, snapshot.bundle_alerts_created,
+            snapshot.bundle_adherence_rate,
+            snapshot.indication_reviews, snapshot.appropriate_count,
+            snapshot.inappropriate_count, snapshot.inappropriate_rate,
+            snapshot.total_reviews, snapshot.unique_reviewers, snapshot.total_interventions,
+            by_location_json, by_service_json, now.isoformat()
+        )
+
     def save_daily_snapshot(self, snapshot: DailySnapshot) -> int:
         """Save or update a daily snapshot.
 
@@ -494,40 +590,72 @@ class MetricsStore:
         Returns:
             ID of the snapshot
         """
+        with self._connect() as conn:
+            cursor = conn.execute(self._SNAPSHOT_INSERT, self._snapshot_params(snapshot, datetime.now()))
+            conn.commit()
+            return cursor.lastrowid
+
+    @retry_on_busy
+    def save_daily_snapshots(
+        self,
+        snapshots: list[DailySnapshot],
+        point_in_time_date: date | None = None,
+    ) -> None:
+        """Save or update several daily snapshots in one transaction.
+
+        bundle_episodes_active can't be recomputed for past days, so it is
+        only written for point_in_time_date; other days keep the stored
+        value (0 for new rows) and the snapshots passed in are updated to
+        match.
+        """
+        if not snapshots:
+            return
         now = datetime.now()
-        by_location_json = json.dumps(snapshot.by_location) if snapshot.by_location else None
-        by_service_json = json.dumps(snapshot.by_service) if snapshot.by_service else None
+        point_in_time = point_in_time_date.isoformat() if point_in_time_date else None
+        days = [s.snapshot_date.isoformat() for s in snapshots]
+        with self._connect() as conn:
+            conn.executemany(
+                self._SNAPSHOT_UPSERT,
+                [self._snapshot_params(s, now) + (point_in_time,) for s in snapshots],
+            )
+            stored = dict(conn.execute(
+                "SELECT snapshot_date, bundle_episodes_active FROM metrics_daily_snapshot "
+                "WHERE snapshot_date BETWEEN ? AND ?",
+                (min(days), max(days)),
+            ).fetchall())
+        for snapshot, day in zip(snapshots, days):
+            snapshot.bundle_episodes_active = stored.get(day) or 0
+
+    def get_rollup_watermark(self, rollup: str) -> date | None:
+        """Get the last day a rollup has been aggregated through.
+
+        Args:
+            rollup: Rollup name (e.g. "daily_snapshot")
 
+        Returns:
+            The watermark date, or None if the rollup has never run
+        """
         with self._connect() as conn:
-            cursor = conn.execute(
+            row = conn.execute(
+                "SELECT through_date FROM metrics_rollup_state WHERE rollup = ?",
+                (rollup,)
+            ).fetchone()
+            return date.fromisoformat(row["through_date"]) if row else None
+
+    @retry_on_busy
+    def set_rollup_watermark(self, rollup: str, through_date: date) -> None:
+        """Record the last day a rollup has been aggregated through."""
+        with self._connect() as conn:
+            conn.execute(
                 """
-                INSERT OR REPLACE INTO metrics_daily_snapshot (
-                    snapshot_date,
-                    alerts_created, alerts_resolved, alerts_acknowledged,
-                    avg_time_to_ack_minutes, avg_time_to_resolve_minutes,
-                    hai_candidates_created, hai_candidates_reviewed, hai_confirmed, hai_override_count,
-                    bundle_episodes_active, bundle_alerts_created, bundle_adherence_rate,
-                    indication_reviews, appropriate_count, inappropriate_count, inappropriate_rate,
-                    total_reviews, unique_reviewers, total_interventions,
-                    by_location, by_service, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO metrics_rollup_state (rollup, through_date, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(rollup) DO UPDATE SET
+                    through_date = excluded.through_date,
+                    updated_at = excluded.updated_at
                 """,
-                (
-                    snapshot.snapshot_date.isoformat(),
-                    snapshot.alerts_created, snapshot.alerts_resolved, snapshot.alerts_acknowledged,
-                    snapshot.avg_time_to_ack_minutes, snapshot.avg_time_to_resolve_minutes,
-                    snapshot.hai_candidates_created, snapshot.hai_candidates_reviewed,
-                    snapshot.hai_confirmed, snapshot.hai_override_count,
-                    snapshot.bundle_episodes_active, snapshot.bundle_alerts_created,
-                    snapshot.bundle_adherence_rate,
-                    snapshot.indication_reviews, snapshot.appropriate_count,
-                    snapshot.inappropriate_count, snapshot.inappropriate_rate,
-                    snapshot.total_reviews, snapshot.unique_reviewers, snapshot.total_interventions,
-                    by_location_json, by_service_json, now.isoformat()
-                )
+                (rollup, through_date.isoformat(), datetime.now().isoformat())
             )
-            conn.commit()
-            return cursor.lastrowid
 
     def get_daily_snapshot(self, snapshot_date: date) -> DailySnapshot | None:
         """Get snapshot for a specific date."""
@@ -1079,3 +1207,27 @@ class MetricsStore:
             }
 
             return summary
+
+
+_stores: dict[str, MetricsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_metrics_store(db_path: str | None = None) -> MetricsStore:
+    """Get the long-lived MetricsStore for a database path.
+
+    Use this for frequent calls such as activity logging rather than
+    constructing a MetricsStore per call.
+
+    Args:
+        db_path: Path to SQLite database. Defaults to METRICS_DB_PATH env var
+                 or ~/.aegis/metrics.db
+    """
+    path = os.path.expanduser(db_path or os.environ.get("METRICS_DB_PATH", "~/.aegis/metrics.db"))
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(path)
+            if store is None:
+                store = _stores[path] = MetricsStore(path)
+    return store
@@ -0,0 +1,10 @@
+"""Shared single-pass keyword and section-header scanning for clinical notes."""
+
+from .scanner import KeywordHit, NoteScanner, ScanResult, SectionHit
+
+__all__ = [
+    "NoteScanner",
+    "ScanResult",
+    "KeywordHit",
+    "SectionHit",
+]
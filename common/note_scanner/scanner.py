@@ -0,0 +1,259 @@
+"""Single-pass keyword and section-header scanning for clinical notes.
+
+Note pipelines used to test keywords one at a time (``any(kw in text for
+kw in keywords)``, often on a lowercased copy of the note) and to run one
+``re.search`` per section pattern. That is O(patterns x note length) per
+note.
+
+NoteScanner compiles every keyword and every section-header pattern into
+one regex, built once:
+
+- Keywords are folded into a prefix trie and emitted as nested
+  alternations, so the regex engine walks the trie instead of retrying
+  each keyword at every position.
+- The whole alternation sits inside a lookahead, so hits that overlap
+  (e.g. "foley catheter" and "catheter infection" in "foley catheter
+  infection") are all reported even when they belong to different labels.
+- Section headers are only tried at line starts, so the header patterns
+  cost nothing mid-line.
+- The text is lowercased once and matched case-sensitively, which is
+  several times faster than IGNORECASE. Hits carry offsets into the
+  original text; sections are never sliced out to be searched.
+
+Usage:
+    scanner = NoteScanner(
+        keywords={"clabsi": ["central line", "picc"], "cauti": ["foley"]},
+        sections={"assessment_plan": [r"(?:^|\\n)ASSESSMENT[:\\s]*\\n"]},
+    )
+    result = scanner.scan(note_text)
+    result.labels()                       # {"clabsi"}
+    result.first_section("assessment_plan")  # SectionHit or None
+    scanner.has_keyword(note_text, "cauti")  # stops at first hit
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Mapping
+
+
+@dataclass(frozen=True, slots=True)
+class KeywordHit:
+    """A keyword found in note text."""
+    term: str  # Canonical (lowercased) keyword
+    labels: tuple[str, ...]  # Keyword groups the term belongs to
+    start: int
+    end: int
+
+    def is_whole_word(self, text: str) -> bool:
+        """Whether the hit is bounded by non-word characters in text."""
+        before = text[self.start - 1] if self.start > 0 else " "
+        after = text[self.end] if self.end < len(text) else " "
+        return not (before.isalnum() or before == "_" or after.isalnum() or after == "_")
+
+
+@dataclass(frozen=True, slots=True)
+class SectionHit:
+    """A section header found in note text."""
+    section_type: str
+    priority: int  # Index of the matching pattern within its section type
+    start: int  # Start of the header match
+    end: int  # End of the header match (start of section content)
+
+
+@dataclass
+class ScanResult:
+    """All keyword and section-header hits in a piece of text."""
+    keywords: list[KeywordHit] = field(default_factory=list)
+    sections: list[SectionHit] = field(default_factory=list)
+
+    def labels(self) -> set[str]:
+        """Keyword labels with at least one hit."""
+        return {label for hit in self.keywords for label in hit.labels}
+
+    def label_counts(self) -> Counter:
+        """Number of keyword hits per label."""
+        return Counter(label for hit in self.keywords for label in hit.labels)
+
+    def first_section(self, section_type: str) -> SectionHit | None:
+        """Header for a section type, using pattern priority then position.
+
+        Mirrors trying each pattern in order and taking the first that
+        matches anywhere in the text.
+        """
+        candidates = [h for h in self.sections if h.section_type == section_type]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda h: (h.priority, h.start))
+
+
+class NoteScanner:
+    """Compiled multi-pattern scanner for keywords and section headers."""
+
+    def __init__(
+        self,
+        keywords: Mapping[str, Iterable[str]] | None = None,
+        sections: Mapping[str, Iterable[str]] | None = None,
+    ):
+        """Compile the scanner.
+
+        Args:
+            keywords: Label -> literal keywords (matched case-insensitively).
+                A keyword may appear under several labels.
+            sections: Section type -> header regexes, in priority order.
+                Case-insensitive and MULTILINE; tried only at line starts
+                (offset 0 or just after a newline). Must not contain
+                capturing groups.
+        """
+        self._term_labels: dict[str, tuple[str, ...]] = {}
+        self._term_prefixes: dict[str, tuple[str, ...]] = {}
+        labels_by_term: dict[str, list[str]] = {}
+        for label, terms in (keywords or {}).items():
+            for term in terms:
+                term = term.lower()
+                if term and label not in labels_by_term.setdefault(term, []):
+                    labels_by_term[term].append(label)
+
+        # The regex reports the longest term at each position; give it the
+        # labels of every shorter term that is a prefix of it too
+        for term in labels_by_term:
+            merged: list[str] = []
+            prefixes = []
+            for other, other_labels in labels_by_term.items():
+                if term.startswith(other):
+                    prefixes.append(other)
+                    merged.extend(label for label in other_labels if label not in merged)
+            self._term_labels[term] = tuple(merged)
+            self._term_prefixes[term] = tuple(prefixes)
+
+        self._section_groups: dict[str, tuple[str, int]] = {}
+        headers = []
+        for section_type, patterns in (sections or {}).items():
+            for priority, pattern in enumerate(patterns):
+                group = f"s{len(self._section_groups)}"
+                self._section_groups[group] = (section_type, priority)
+                headers.append(f"(?P<{group}>(?i:{pattern}))")
+
+        alternatives = []
+        if headers:
+            alternatives.append(f"^(?:{'|'.join(headers)})")
+
+        # Keyword-only regex, for keywords starting where a header also starts
+        # (the combined lookahead reports only the first alternative there)
+        self._keyword_regex = None
+        if labels_by_term:
+            trie = _trie_regex(labels_by_term)
+            alternatives.append(f"(?P<kw>{trie})")
+            self._keyword_regex = re.compile(trie)
+
+        # Case-sensitive regex for lowercased text, IGNORECASE fallback for
+        # the rare text whose length changes when lowercased
+        pattern = f"(?=(?:{'|'.join(alternatives)}))" if alternatives else None
+        self._regex = re.compile(pattern, re.MULTILINE) if pattern else None
+        self._regex_ignorecase = re.compile(pattern, re.MULTILINE | re.IGNORECASE) if pattern else None
+        self._keyword_regex_ignorecase = (
+            re.compile(self._keyword_regex.pattern, re.IGNORECASE) if self._keyword_regex else None
+        )
+
+    @property
+    def term_count(self) -> int:
+        """Number of distinct keywords compiled into the scanner."""
+        return len(self._term_labels)
+
+    def iter_hits(
+        self,
+        text: str,
+        pos: int = 0,
+        endpos: int | None = None,
+    ) -> Iterator[KeywordHit | SectionHit]:
+        """Yield hits in order of position.
+
+        Args:
+            text: Text to scan
+            pos: Offset to start scanning at
+            endpos: Offset to stop scanning at
+        """
+        if self._regex is None:
+            return
+        endpos = len(text) if endpos is None else endpos
+
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            subject, regex, keyword_regex = lowered, self._regex, self._keyword_regex
+        else:
+            subject, regex, keyword_regex = text, self._regex_ignorecase, self._keyword_regex_ignorecase
+
+        for match in regex.finditer(subject, pos, endpos):
+            group = match.lastgroup
+            if group == "kw":
+                start, end = match.span("kw")
+                term = subject[start:end].lower()
+                yield KeywordHit(term, self._term_labels.get(term, ()), start, end)
+            elif group is not None:
+                section_type, priority = self._section_groups[group]
+                start, end = match.span(group)
+                yield SectionHit(section_type, priority, start, end)
+
+                if keyword_regex is not None:
+                    kw_match = keyword_regex.match(subject, start)
+                    if kw_match:
+                        term = kw_match.group().lower()
+                        yield KeywordHit(term, self._term_labels.get(term, ()), start, kw_match.end())
+
+    def scan(self, text: str, pos: int = 0, endpos: int | None = None) -> ScanResult:
+        """Collect all keyword and section-header hits in one pass."""
+        result = ScanResult()
+        for hit in self.iter_hits(text, pos, endpos):
+            if isinstance(hit, KeywordHit):
+                result.keywords.append(hit)
+            else:
+                result.sections.append(hit)
+        return result
+
+    def terms_in(self, text: str) -> set[str]:
+        """All distinct keywords occurring anywhere in text.
+
+        Includes keywords that are prefixes of a longer keyword at the same
+        position (e.g. both "wound" and "wound infection").
+        """
+        found: set[str] = set()
+        for hit in self.iter_hits(text):
+            if isinstance(hit, KeywordHit):
+                found.update(self._term_prefixes.get(hit.term, (hit.term,)))
+        return found
+
+    def has_keyword(self, text: str, label: str | None = None) -> bool:
+        """Whether text contains a keyword (optionally with a given label).
+
+        Stops scanning at the first qualifying hit.
+        """
+        for hit in self.iter_hits(text):
+            if isinstance(hit, KeywordHit) and (label is None or label in hit.labels):
+                return True
+        return False
+
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """Build a regex alternation from a prefix trie of literal terms.
+
+    Matches the longest term at a given position, falling back to shorter
+    prefixes only if the longer ones fail.
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End-of-term marker
+
+    def emit(node: dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if terminal:
+            return f"(?:{body})?"
+        return body
+
+    return emit(trie)
@@ -11,7 +11,7 @@ from flask import Blueprint, render_template, current_app, request, jsonify, red
 
 from common.abx_approvals import AbxApprovalStore, ApprovalDecision, ApprovalStatus
 from common.allergy_recommendations import filter_recommendations_by_allergies
-from dashboard.services.fhir import FHIRService
+from dashboard.services.fhir import FHIRService, get_fhir_service
 from dashboard.services.user import get_user_from_request
 
 logger = logging.getLogger(__name__)
@@ -32,7 +32,7 @@ def _get_fhir_service() -> FHIRService | None:
     """Get the FHIR service from config."""
     fhir_url = current_app.config.get("FHIR_BASE_URL")
     if fhir_url:
-        return FHIRService(fhir_url)
+        return get_fhir_service(fhir_url)
     return None
 
 
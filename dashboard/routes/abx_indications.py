@@ -11,7 +11,7 @@ from pathlib import Path
 from flask import Blueprint, render_template, request, jsonify, current_app
 
 from dashboard.services.user import get_user_from_request
-from dashboard.services.fhir import FHIRService
+from dashboard.services.fhir import get_fhir_service
 
 logger = logging.getLogger(__name__)
 
@@ -170,7 +170,7 @@ def candidate_detail(candidate_id: str):
         if candidate.patient and candidate.patient.fhir_id:
             fhir_url = current_app.config.get("FHIR_SERVER_URL")
             if fhir_url:
-                fhir = FHIRService(fhir_url)
+                fhir = get_fhir_service(fhir_url)
                 try:
                     clinical_context = fhir.get_clinical_context(candidate.patient.fhir_id)
                 except Exception:
@@ -5,6 +5,7 @@ from flask import Blueprint, jsonify, request, redirect, url_for, current_app
 
 from common.alert_store import AlertStatus
 from common.channels.teams import TeamsWebhookChannel
+from dashboard.services.fhir import get_fhir_cache_stats as fhir_cache_stats
 from dashboard.services.user import get_user_from_request
 
 api_bp = Blueprint("api", __name__)
@@ -240,9 +241,12 @@ def list_alerts():
     alert_type = request.args.get("type")
     patient_mrn = request.args.get("mrn")
     limit = request.args.get("limit", type=int, default=100)
+    cursor = request.args.get("cursor")
+    # ?summary=true leaves out content and notes
+    summary = request.args.get("summary", "").lower() in ("1", "true")
 
     # Build filter kwargs
-    filter_kwargs = {"limit": limit}
+    filter_kwargs = {"limit": limit, "cursor": cursor, "summary": summary}
 
     if status_param:
         try:
@@ -260,11 +264,15 @@ def list_alerts():
     if patient_mrn:
         filter_kwargs["patient_mrn"] = patient_mrn
 
-    alerts = store.list_alerts(**filter_kwargs)
+    try:
+        alerts, next_cursor = store.list_alerts_page(**filter_kwargs)
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
 
     return jsonify({
         "alerts": [a.to_dict() for a in alerts],
         "count": len(alerts),
+        "next_cursor": next_cursor,
     })
 
 
@@ -371,3 +379,10 @@ def get_stats():
     """Get alert statistics."""
     store = current_app.alert_store
     return jsonify(store.get_stats())
+
+
+@api_bp.route("/fhir-cache/stats", methods=["GET"])
+@check_api_key
+def get_fhir_cache_stats():
+    """Get FHIR response cache hit rates."""
+    return jsonify(fhir_cache_stats())
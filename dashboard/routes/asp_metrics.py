@@ -20,7 +20,7 @@ if str(_common_path.parent) not in sys.path:
     sys.path.insert(0, str(_common_path.parent))
 
 from common.metrics_store import (
-    MetricsStore,
+    get_metrics_store,
     MetricsAggregator,
     MetricsReporter,
     InterventionType,
@@ -30,8 +30,8 @@ from common.metrics_store import (
 
 
 def _get_metrics_store():
-    """Get MetricsStore instance."""
-    return MetricsStore()
+    """Get the shared MetricsStore instance."""
+    return get_metrics_store()
 
 
 def _get_aggregator():
@@ -591,6 +591,33 @@ def api_create_snapshot():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@asp_metrics_bp.route("/api/update-snapshots", methods=["POST"])
+def api_update_snapshots():
+    """API endpoint to bring daily snapshots up to date.
+
+    With a "start" date, backfills every day from start to "end" (default
+    yesterday); otherwise only the days since the last update are created.
+    """
+    try:
+        aggregator = _get_aggregator()
+        data = request.get_json() or {}
+
+        end_date = date.fromisoformat(data["end"]) if data.get("end") else None
+        if data.get("start"):
+            snapshots = aggregator.backfill_snapshots(date.fromisoformat(data["start"]), end_date)
+        else:
+            snapshots = aggregator.update_snapshots(end_date)
+
+        return jsonify({
+            "success": True,
+            "created": len(snapshots),
+            "dates": [s.snapshot_date.isoformat() for s in snapshots],
+        })
+    except Exception as e:
+        logger.error(f"Error updating snapshots: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 # =============================================================================
 # Export and Report Endpoints
 # =============================================================================
@@ -13,7 +13,7 @@ from flask import Blueprint, render_template, request, jsonify, current_app, Res
 
 from nhsn_src.db import NHSNDatabase
 from nhsn_src.config import Config as NHSNConfig
-from nhsn_src.data import AUDataExtractor, ARDataExtractor, DenominatorCalculator
+from nhsn_src.data import AUDataExtractor, ARDataExtractor, DenominatorCalculator, ReportingCube
 
 nhsn_reporting_bp = Blueprint("nhsn_reporting", __name__, url_prefix="/nhsn-reporting")
 
@@ -46,19 +46,30 @@ def get_denominator_calculator():
     return current_app.denominator_calc
 
 
+def get_reporting_cube():
+    """Get or create the persisted monthly AU/AR/denominator cube."""
+    if not hasattr(current_app, "reporting_cube"):
+        current_app.reporting_cube = ReportingCube(
+            get_nhsn_db(),
+            get_au_extractor(),
+            get_ar_extractor(),
+            get_denominator_calculator(),
+        )
+    return current_app.reporting_cube
+
+
 @nhsn_reporting_bp.route("/")
 def dashboard():
     """AU/AR reporting dashboard overview."""
     try:
-        au_extractor = get_au_extractor()
-        ar_extractor = get_ar_extractor()
-        denom_calc = get_denominator_calculator()
+        cube = get_reporting_cube()
 
         # Get current month and quarter
         today = date.today()
         current_month = today.strftime("%Y-%m")
         current_quarter = (today.month - 1) // 3 + 1
         current_year = today.year
+        quarter_start_month = f"{current_year}-{current_quarter * 3 - 2:02d}"
 
         # Get date range for current month
         month_start = today.replace(day=1)
@@ -66,7 +77,7 @@ def dashboard():
 
         # Get AU summary for current month (may be empty if no data)
         try:
-            au_summary = au_extractor.get_monthly_summary(
+            au_summary = cube.get_au_summary(
                 start_date=month_start,
                 end_date=month_end,
             )
@@ -80,7 +91,7 @@ def dashboard():
 
         # Get AR summary for current quarter (may be empty if no data)
         try:
-            ar_summary = ar_extractor.get_quarterly_summary(
+            ar_summary = cube.get_ar_summary(
                 year=current_year,
                 quarter=current_quarter,
             )
@@ -99,7 +110,7 @@ def dashboard():
 
         # Get denominator summary (may be empty if no data)
         try:
-            denom_summary = denom_calc.get_denominator_summary(
+            denom_summary = cube.get_denominator_summary(
                 start_date=month_start,
                 end_date=month_end,
             )
@@ -118,6 +129,9 @@ def dashboard():
             current_month=current_month,
             current_year=current_year,
             current_quarter=current_quarter,
+            freshness=cube.get_freshness(quarter_start_month, current_month),
+            freshness_from=quarter_start_month,
+            freshness_to=current_month,
         )
     except Exception as e:
         current_app.logger.error(f"Error loading AU/AR dashboard: {e}")
@@ -137,7 +151,7 @@ def dashboard():
 def au_detail():
     """Detailed Antibiotic Usage reporting page."""
     try:
-        au_extractor = get_au_extractor()
+        cube = get_reporting_cube()
 
         # Get date range parameters
         from_date_str = request.args.get("from_date")
@@ -158,16 +172,17 @@ def au_detail():
             to_date = datetime.strptime(to_date_str, "%Y-%m-%d").date()
 
         locations = [location] if location else None
+        from_month, to_month = from_date.strftime("%Y-%m"), to_date.strftime("%Y-%m")
 
-        # Get AU data
-        au_summary = au_extractor.get_monthly_summary(
+        # Get AU data (from the reporting cube; partial months are read live)
+        au_summary = cube.get_au_summary(
             locations=locations,
             start_date=from_date,
             end_date=to_date,
         )
 
         # Get category breakdown
-        category_df = au_extractor.get_usage_by_category(
+        category_df = cube.get_usage_by_category(
             locations=locations,
             start_date=from_date,
             end_date=to_date,
@@ -187,6 +202,9 @@ def au_detail():
             to_date=to_date.strftime("%Y-%m-%d"),
             current_location=location or "",
             available_locations=sorted(all_locations),
+            freshness=cube.get_freshness(from_month, to_month, ("au", "denominators")),
+            freshness_from=from_month,
+            freshness_to=to_month,
         )
     except Exception as e:
         current_app.logger.error(f"Error loading AU detail: {e}")
@@ -207,7 +225,7 @@ def au_detail():
 def ar_detail():
     """Detailed Antimicrobial Resistance reporting page."""
     try:
-        ar_extractor = get_ar_extractor()
+        cube = get_reporting_cube()
 
         # Get parameters
         year = request.args.get("year", type=int)
@@ -222,16 +240,18 @@ def ar_detail():
             quarter = (today.month - 1) // 3 + 1
 
         locations = [location] if location else None
+        quarter_start_month = f"{year}-{quarter * 3 - 2:02d}"
+        quarter_end_month = f"{year}-{quarter * 3:02d}"
 
-        # Get AR data
-        ar_summary = ar_extractor.get_quarterly_summary(
+        # Get AR data (from the reporting cube)
+        ar_summary = cube.get_ar_summary(
             locations=locations,
             year=year,
             quarter=quarter,
         )
 
         # Get resistance rates
-        resistance_df = ar_extractor.calculate_resistance_rates(
+        resistance_df = cube.get_resistance_rates(
             locations=locations,
             year=year,
             quarter=quarter,
@@ -239,7 +259,7 @@ def ar_detail():
         resistance_data = resistance_df.to_dict("records") if not resistance_df.empty else []
 
         # Get phenotype data
-        phenotype_df = ar_extractor.calculate_phenotypes(
+        phenotype_df = cube.get_phenotypes(
             locations=locations,
             year=year,
             quarter=quarter,
@@ -268,6 +288,9 @@ def ar_detail():
             current_location=location or "",
             available_quarters=quarters,
             available_locations=sorted(all_locations),
+            freshness=cube.get_freshness(quarter_start_month, quarter_end_month, ("ar",)),
+            freshness_from=quarter_start_month,
+            freshness_to=quarter_end_month,
         )
     except Exception as e:
         current_app.logger.error(f"Error loading AR detail: {e}")
@@ -399,7 +422,7 @@ def hai_detail():
 def denominators():
     """Denominator data reporting page (device-days, patient-days)."""
     try:
-        denom_calc = get_denominator_calculator()
+        cube = get_reporting_cube()
 
         # Get date range parameters
         from_date_str = request.args.get("from_date")
@@ -420,19 +443,20 @@ def denominators():
             to_date = datetime.strptime(to_date_str, "%Y-%m-%d").date()
 
         locations = [location] if location else None
+        from_month, to_month = from_date.strftime("%Y-%m"), to_date.strftime("%Y-%m")
 
         # Get denominator summary
-        denom_summary = denom_calc.get_denominator_summary(
+        denom_summary = cube.get_denominator_summary(
             locations=locations,
             start_date=from_date,
             end_date=to_date,
         )
 
         # Get individual data series for detailed view
-        patient_days_df = denom_calc.get_patient_days(locations, from_date, to_date)
-        line_days_df = denom_calc.get_central_line_days(locations, from_date, to_date)
-        catheter_days_df = denom_calc.get_urinary_catheter_days(locations, from_date, to_date)
-        vent_days_df = denom_calc.get_ventilator_days(locations, from_date, to_date)
+        patient_days_df = cube.get_patient_days(locations, from_date, to_date)
+        line_days_df = cube.get_device_days(locations, from_date, to_date, "central_line_days")
+        catheter_days_df = cube.get_device_days(locations, from_date, to_date, "urinary_catheter_days")
+        vent_days_df = cube.get_device_days(locations, from_date, to_date, "ventilator_days")
 
         # Convert to records for template
         patient_days_data = patient_days_df.to_dict("records") if not patient_days_df.empty else []
@@ -456,6 +480,9 @@ def denominators():
             to_date=to_date.strftime("%Y-%m-%d"),
             current_location=location or "",
             available_locations=sorted(all_locations),
+            freshness=cube.get_freshness(from_month, to_month, ("denominators",)),
+            freshness_from=from_month,
+            freshness_to=to_month,
         )
     except Exception as e:
         current_app.logger.error(f"Error loading denominators: {e}")
@@ -481,7 +508,7 @@ def denominators():
 def api_au_summary():
     """Get AU summary as JSON."""
     try:
-        au_extractor = get_au_extractor()
+        cube = get_reporting_cube()
 
         from_date_str = request.args.get("from_date")
         to_date_str = request.args.get("to_date")
@@ -491,7 +518,7 @@ def api_au_summary():
         to_date = datetime.strptime(to_date_str, "%Y-%m-%d").date() if to_date_str else None
         locations = [location] if location else None
 
-        summary = au_extractor.get_monthly_summary(locations, from_date, to_date)
+        summary = cube.get_au_summary(locations, from_date, to_date)
         return jsonify(summary)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -501,7 +528,7 @@ def api_au_summary():
 def api_ar_summary():
     """Get AR summary as JSON."""
     try:
-        ar_extractor = get_ar_extractor()
+        cube = get_reporting_cube()
 
         year = request.args.get("year", type=int)
         quarter = request.args.get("quarter", type=int)
@@ -509,7 +536,7 @@ def api_ar_summary():
 
         locations = [location] if location else None
 
-        summary = ar_extractor.get_quarterly_summary(locations, year, quarter)
+        summary = cube.get_ar_summary(locations, year, quarter)
         return jsonify(summary)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -519,7 +546,7 @@ def api_ar_summary():
 def api_denominators():
     """Get denominator data as JSON."""
     try:
-        denom_calc = get_denominator_calculator()
+        cube = get_reporting_cube()
 
         from_date_str = request.args.get("from_date")
         to_date_str = request.args.get("to_date")
@@ -529,7 +556,7 @@ def api_denominators():
         to_date = datetime.strptime(to_date_str, "%Y-%m-%d").date() if to_date_str else None
         locations = [location] if location else None
 
-        summary = denom_calc.get_denominator_summary(locations, from_date, to_date)
+        summary = cube.get_denominator_summary(locations, from_date, to_date)
         return jsonify(summary)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -542,7 +569,7 @@ def api_au_export():
         import csv
         import io
 
-        au_extractor = get_au_extractor()
+        cube = get_reporting_cube()
 
         from_date_str = request.args.get("from_date")
         to_date_str = request.args.get("to_date")
@@ -552,7 +579,7 @@ def api_au_export():
         to_date = datetime.strptime(to_date_str, "%Y-%m-%d").date() if to_date_str else None
         locations = [location] if location else None
 
-        nhsn_df = au_extractor.export_for_nhsn(locations, from_date, to_date)
+        nhsn_df = cube.export_au_for_nhsn(locations, from_date, to_date)
 
         if nhsn_df.empty:
             return jsonify({"error": "No data to export"}), 404
@@ -609,6 +636,41 @@ def api_ar_export():
         return jsonify({"error": str(e)}), 500
 
 
+@nhsn_reporting_bp.route("/api/cube/refresh", methods=["POST"])
+def api_cube_refresh():
+    """Recompute reporting cube months.
+
+    Open and missing months are recomputed; with rebuild=1, closed months
+    are recomputed too. Form posts with a next path redirect back to it.
+    """
+    from flask import redirect
+
+    params = request.form if request.form else request.args
+    # Only redirect within the dashboard
+    next_path = params.get("next", "")
+    if not next_path.startswith("/") or next_path.startswith("//"):
+        next_path = ""
+    try:
+        cube = get_reporting_cube()
+        from_month = params.get("from_month")
+        to_month = params.get("to_month")
+        if params.get("rebuild") in ("1", "true"):
+            if not from_month:
+                return jsonify({"error": "from_month is required to rebuild"}), 400
+            computed = cube.rebuild(from_month, to_month)
+        else:
+            computed = cube.refresh(from_month, to_month)
+
+        if next_path:
+            return redirect(next_path)
+        return jsonify({"computed": computed})
+    except Exception as e:
+        current_app.logger.error(f"Error refreshing reporting cube: {e}")
+        if next_path:
+            return redirect(next_path)
+        return jsonify({"error": str(e)}), 500
+
+
 @nhsn_reporting_bp.route("/help")
 def help_page():
     """AU/AR Help and Demo Guide."""
@@ -8,6 +8,9 @@ from common.alert_store import AlertStatus, AlertType, ResolutionReason
 
 drug_bug_bp = Blueprint("drug_bug", __name__, url_prefix="/drug-bug-mismatch")
 
+# Content keys the drug-bug list templates read
+LIST_CONTENT_KEYS = ("organism", "specimen_type", "current_antibiotics", "mismatch_type")
+
 
 @drug_bug_bp.route("/")
 def dashboard():
@@ -27,6 +30,8 @@ def dashboard():
             AlertStatus.ACKNOWLEDGED,
             AlertStatus.SNOOZED,
         ],
+        "summary": True,
+        "content_keys": LIST_CONTENT_KEYS,
     }
 
     if severity:
@@ -54,6 +59,7 @@ def dashboard():
     resolved_alerts = store.list_alerts(
         alert_type=AlertType.DRUG_BUG_MISMATCH,
         status=AlertStatus.RESOLVED,
+        summary=True,
     )
     resolved_today = [
         a for a in resolved_alerts
@@ -99,6 +105,8 @@ def history():
     filter_kwargs = {
         "alert_type": AlertType.DRUG_BUG_MISMATCH,
         "status": AlertStatus.RESOLVED,
+        "summary": True,
+        "content_keys": LIST_CONTENT_KEYS,
     }
 
     if severity:
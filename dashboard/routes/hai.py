@@ -12,6 +12,7 @@ from flask import Blueprint, render_template, request, jsonify, current_app
 
 from hai_src.db import HAIDatabase
 from hai_src.config import Config as HAIConfig
+from hai_src.llm.profile_store import LLMProfileStore
 from hai_src.models import (
     HAIType, CandidateStatus, ClassificationDecision,
     ReviewQueueType, ReviewerDecision, HAICandidate
@@ -28,6 +29,26 @@ def get_hai_db():
     return current_app.hai_db
 
 
+def get_llm_profile_store():
+    """Get or create the LLM profile store (read-only use)."""
+    if not hasattr(current_app, "llm_profile_store"):
+        current_app.llm_profile_store = LLMProfileStore(HAIConfig.LLM_PROFILE_DB_PATH)
+    return current_app.llm_profile_store
+
+
+def _llm_performance_data() -> dict:
+    """LLM latency summary for the requested window/model."""
+    days = max(1, min(request.args.get("days", 7, type=int), 365))
+    model = request.args.get("model") or None
+    hai_type = request.args.get("type") or None
+
+    summary = get_llm_profile_store().get_summary(days=days, model=model, hai_type=hai_type)
+    summary["baseline_ms"] = HAIConfig.LLM_LATENCY_BASELINE_MS
+    summary["model"] = model
+    summary["hai_type"] = hai_type
+    return summary
+
+
 @hai_detection_bp.route("/")
 def dashboard():
     """HAI detection dashboard overview."""
@@ -492,6 +513,41 @@ def api_recent_overrides():
         return jsonify({"error": str(e)}), 500
 
 
+@hai_detection_bp.route("/api/llm-performance")
+def api_llm_performance():
+    """Get LLM latency percentiles by model, HAI type and day."""
+    try:
+        return jsonify(_llm_performance_data())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@hai_detection_bp.route("/llm-performance")
+def llm_performance():
+    """Show LLM latency and throughput over time."""
+    try:
+        data = _llm_performance_data()
+        error = None
+    except Exception as e:
+        current_app.logger.error(f"Error loading LLM performance: {e}")
+        data = {"overall": {"count": 0}, "by_model": {}, "by_hai_type": {}, "by_day": [],
+                "baseline_ms": HAIConfig.LLM_LATENCY_BASELINE_MS}
+        error = str(e)
+
+    p95_by_day = [
+        {"label": f"{p['date']} {p['model']}", "value": round(p["p95_total_ms"] / 1000, 1)}
+        for p in data["by_day"]
+    ]
+
+    return render_template(
+        "hai_llm_performance.html",
+        data=data,
+        p95_by_day=p95_by_day,
+        current_days=request.args.get("days", "7"),
+        error=error,
+    )
+
+
 def _send_review_notification(candidate, decision, reviewer, notes):
     """Send email notification about completed review."""
     from ..config import Config
@@ -1,13 +1,32 @@
 """ASP Alerts routes for blood culture and antimicrobial therapy alerts."""
 
+import logging
+
+import requests
 from flask import Blueprint, render_template, redirect, url_for, current_app, request
 
 from common.alert_store import AlertStatus, AlertType, ResolutionReason
 from common.allergy_recommendations import adjust_recommendation_for_allergies
-from ..services.fhir import FHIRService
+from ..services.fhir import get_fhir_service
+
+logger = logging.getLogger(__name__)
 
 asp_alerts_bp = Blueprint("asp_alerts", __name__, url_prefix="/asp-alerts")
 
+# ASP alert types (NHSN types belong on the HAI Detection page)
+ASP_ALERT_TYPES = [
+    AlertType.BACTEREMIA,
+    AlertType.DRUG_BUG_MISMATCH,
+    AlertType.GUIDELINE_DEVIATION,
+    AlertType.ABX_NO_INDICATION,
+    AlertType.BROAD_SPECTRUM_USAGE,
+    AlertType.SURGICAL_PROPHYLAXIS,
+    AlertType.CUSTOM,
+]
+
+# Content keys the alert list templates read
+LIST_CONTENT_KEYS = ("coverage_status",)
+
 
 @asp_alerts_bp.route("/")
 def index():
@@ -32,9 +51,13 @@ def alerts_active():
             AlertStatus.SENT,
             AlertStatus.ACKNOWLEDGED,
             AlertStatus.SNOOZED,
-        ]
+        ],
+        # The list only shows the coverage badge from content
+        "summary": True,
+        "content_keys": LIST_CONTENT_KEYS,
     }
 
+    filter_kwargs["alert_type"] = ASP_ALERT_TYPES
     if alert_type:
         try:
             filter_kwargs["alert_type"] = AlertType(alert_type)
@@ -49,17 +72,6 @@ def alerts_active():
 
     alerts = store.list_alerts(**filter_kwargs)
 
-    # Define ASP alert types (exclude NHSN types which belong on HAI Detection page)
-    ASP_ALERT_TYPES = {
-        AlertType.BACTEREMIA,
-        AlertType.DRUG_BUG_MISMATCH,
-        AlertType.GUIDELINE_DEVIATION,
-        AlertType.ABX_NO_INDICATION,
-        AlertType.BROAD_SPECTRUM_USAGE,
-        AlertType.SURGICAL_PROPHYLAXIS,
-        AlertType.CUSTOM,
-    }
-
     # Filter to only ASP-related alerts (exclude NHSN_CLABSI, NHSN_SSI, etc.)
     alerts = [a for a in alerts if a.alert_type in ASP_ALERT_TYPES]
 
@@ -108,9 +120,16 @@ def alerts_history():
     patient_mrn = request.args.get("mrn")
     severity = request.args.get("severity")
     resolution = request.args.get("resolution")
+    cursor = request.args.get("cursor")
 
     # Build filter kwargs
-    filter_kwargs = {"status": AlertStatus.RESOLVED}
+    filter_kwargs = {
+        "status": AlertStatus.RESOLVED,
+        "alert_type": ASP_ALERT_TYPES,
+        "limit": current_app.config.get("ALERTS_PER_PAGE", 50),
+        "summary": True,
+        "content_keys": LIST_CONTENT_KEYS,
+    }
 
     if alert_type:
         try:
@@ -127,18 +146,11 @@ def alerts_history():
     if resolution:
         filter_kwargs["resolution_reason"] = resolution
 
-    alerts = store.list_alerts(**filter_kwargs)
-
-    # Define ASP alert types (exclude NHSN types which belong on HAI Detection page)
-    ASP_ALERT_TYPES = {
-        AlertType.BACTEREMIA,
-        AlertType.DRUG_BUG_MISMATCH,
-        AlertType.GUIDELINE_DEVIATION,
-        AlertType.ABX_NO_INDICATION,
-        AlertType.BROAD_SPECTRUM_USAGE,
-        AlertType.SURGICAL_PROPHYLAXIS,
-        AlertType.CUSTOM,
-    }
+    try:
+        alerts, next_cursor = store.list_alerts_page(cursor=cursor, **filter_kwargs)
+    except ValueError:
+        alerts, next_cursor = store.list_alerts_page(**filter_kwargs)
+        cursor = None
 
     # Filter to only ASP-related alerts
     alerts = [a for a in alerts if a.alert_type in ASP_ALERT_TYPES]
@@ -159,6 +171,8 @@ def alerts_history():
         current_mrn=patient_mrn,
         current_severity=severity,
         current_resolution=resolution,
+        cursor=cursor,
+        next_cursor=next_cursor,
     )
 
 
@@ -182,7 +196,7 @@ def alert_detail(alert_id):
 
     if alert.patient_id:
         fhir_url = current_app.config.get("FHIR_BASE_URL", "http://localhost:8081/fhir")
-        fhir = FHIRService(fhir_url)
+        fhir = get_fhir_service(fhir_url)
         try:
             clinical_context = fhir.get_clinical_context(alert.patient_id)
         except Exception:
@@ -275,9 +289,13 @@ def help_page():
 def culture_detail(culture_id):
     """Show culture result with susceptibilities."""
     fhir_url = current_app.config.get("FHIR_BASE_URL", "http://localhost:8081/fhir")
-    fhir = FHIRService(fhir_url)
+    fhir = get_fhir_service(fhir_url)
 
-    culture = fhir.get_culture_with_susceptibilities(culture_id)
+    try:
+        culture = fhir.get_culture_with_susceptibilities(culture_id)
+    except requests.RequestException as e:
+        logger.error(f"Failed to get culture {culture_id}: {e}")
+        return render_template("culture_not_found.html", culture_id=culture_id), 503
     if not culture:
         return render_template("culture_not_found.html", culture_id=culture_id), 404
 
@@ -288,7 +306,7 @@ def culture_detail(culture_id):
 def patient_medications(patient_id):
     """Show current antibiotic medications for a patient."""
     fhir_url = current_app.config.get("FHIR_BASE_URL", "http://localhost:8081/fhir")
-    fhir = FHIRService(fhir_url)
+    fhir = get_fhir_service(fhir_url)
 
     # Get patient info
     patient = fhir._get(f"Patient/{patient_id}")
@@ -313,7 +331,11 @@ def patient_medications(patient_id):
                 break
 
     # Get medications
-    medications = fhir.get_patient_medications(patient_id, antibiotics_only=True)
+    try:
+        medications = fhir.get_patient_medications(patient_id, antibiotics_only=True)
+    except requests.RequestException as e:
+        logger.error(f"Failed to get medications for {patient_id}: {e}")
+        return render_template("patient_not_found.html", patient_id=patient_id), 503
 
     return render_template(
         "medications_detail.html",
@@ -1,10 +1,12 @@
 """Dashboard services."""
 
-from .fhir import FHIRService
+from .fhir import FHIRService, get_fhir_cache_stats, get_fhir_service
 from .user import get_current_user, set_current_user, get_user_from_request, clear_current_user
 
 __all__ = [
     "FHIRService",
+    "get_fhir_service",
+    "get_fhir_cache_stats",
     "get_current_user",
     "set_current_user",
     "get_user_from_request",
@@ -1,10 +1,28 @@
 """FHIR service for querying culture and medication data."""
 
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from common.fhir import BundlePager, FHIRResponseCache, session_fetcher
+
+logger = logging.getLogger(__name__)
+
+# Clinical context sources are fetched in parallel; a page waits this long
+# for them before rendering whatever has arrived
+CLINICAL_CONTEXT_TIMEOUT_SECONDS = float(os.environ.get("DASHBOARD_CLINICAL_CONTEXT_TIMEOUT_SECONDS", "4"))
+CLINICAL_CONTEXT_WORKERS = int(os.environ.get("DASHBOARD_CLINICAL_CONTEXT_WORKERS", "12"))
+
+# Keep-alive connections to the FHIR server, shared by all dashboard requests
+FHIR_POOL_SIZE = int(os.environ.get("DASHBOARD_FHIR_POOL_SIZE", "20"))
 
 
 @dataclass
@@ -47,6 +65,13 @@ class ClinicalContext:
     allergies: list[DrugAllergy] = field(default_factory=list)
     renal_status: RenalStatus = field(default_factory=RenalStatus)
     mdr_history: MDRHistory = field(default_factory=MDRHistory)
+    unavailable: list[str] = field(default_factory=list)  # Sources that failed or timed out
+    latency_ms: dict[str, float] = field(default_factory=dict)  # Per-source fetch time
+
+    @property
+    def is_partial(self) -> bool:
+        """Whether any source is missing, so absence of alerts proves nothing."""
+        return bool(self.unavailable)
 
     @property
     def has_critical_allergies(self) -> bool:
@@ -127,7 +152,11 @@ class Patient:
 
 
 class FHIRService:
-    """Service for FHIR queries from the dashboard."""
+    """Service for FHIR queries from the dashboard.
+
+    Methods built on searches raise requests.RequestException when the
+    server can't be reached rather than returning an empty list.
+    """
 
     # Common antibiotic keywords to identify antibiotics vs other medications
     ANTIBIOTIC_KEYWORDS = [
@@ -146,37 +175,57 @@ class FHIRService:
         "doripenem", "aztreonam",
     ]
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, cache: FHIRResponseCache | None = None):
+        """Initialize the service.
+
+        Args:
+            base_url: FHIR server base URL.
+            cache: Response cache for GETs. Without one every call goes to
+                the server. Routes should use get_fhir_service(), which
+                shares a cached, pooled instance.
+        """
         self.base_url = base_url.rstrip("/")
+        self.cache = cache
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=FHIR_POOL_SIZE, pool_maxsize=FHIR_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.session.headers.update({
             "Accept": "application/fhir+json",
             "Content-Type": "application/fhir+json",
         })
+        if cache is not None:
+            self._pager = BundlePager(cache.fetcher(self.session, timeout=10), stream=False)
+        else:
+            self._pager = BundlePager(session_fetcher(self.session, timeout=10))
 
     def _get(self, path: str, params: dict | None = None) -> dict | None:
         """Make a GET request to the FHIR server."""
         try:
-            response = self.session.get(
-                f"{self.base_url}/{path}",
-                params=params,
-                timeout=10,
-            )
+            url = f"{self.base_url}/{path}"
+            if self.cache is not None:
+                response = self.cache.get(self.session, url, params, timeout=10)
+            else:
+                response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             print(f"FHIR request error: {e}")
             return None
 
-    def _extract_entries(self, bundle: dict) -> list[dict]:
-        """Extract resources from a FHIR Bundle."""
-        if not bundle or bundle.get("resourceType") != "Bundle":
-            return []
-        return [
-            entry.get("resource", {})
-            for entry in bundle.get("entry", [])
-            if "resource" in entry
-        ]
+    def _search(self, path: str, params: dict | None = None, limit: int | None = None) -> list[dict]:
+        """Run a FHIR search, following Bundle next links across pages.
+
+        Args:
+            path: Resource type to search.
+            params: Search parameters.
+            limit: Stop after this many entries (all pages if None).
+
+        Raises:
+            requests.RequestException: If any page can't be fetched, so
+                callers can tell an unreachable server from no results.
+        """
+        return list(self._pager.resources(f"{self.base_url}/{path}", params, limit=limit))
 
     def get_culture_with_susceptibilities(self, culture_id: str) -> CultureResult | None:
         """Get a blood culture DiagnosticReport with its susceptibility results.
@@ -196,27 +245,43 @@ class FHIRService:
         patient_ref = report.get("subject", {}).get("reference", "")
         patient_id = patient_ref.replace("Patient/", "") if patient_ref else ""
 
+        patient = self._get(f"Patient/{patient_id}") if patient_id else None
+
+        # Susceptibility Observations are linked via note field containing "Culture: {culture_id}"
+        susceptibilities = self._get_susceptibilities_for_culture(culture_id, patient_id)
+
+        return self._culture_from_report(report, patient, susceptibilities)
+
+    def _culture_from_report(
+        self,
+        report: dict,
+        patient: dict | None,
+        susceptibilities: list[Susceptibility],
+    ) -> CultureResult:
+        """Build a CultureResult from a DiagnosticReport and its patient."""
+        culture_id = report.get("id", "")
+        patient_ref = report.get("subject", {}).get("reference", "")
+        patient_id = patient_ref.replace("Patient/", "") if patient_ref else ""
+
         # Get patient details
         patient_name = "Unknown"
         patient_mrn = "Unknown"
-        if patient_id:
-            patient = self._get(f"Patient/{patient_id}")
-            if patient:
-                # Extract name
-                names = patient.get("name", [])
-                if names:
-                    name = names[0]
-                    given = " ".join(name.get("given", []))
-                    family = name.get("family", "")
-                    patient_name = f"{given} {family}".strip() or "Unknown"
-
-                # Extract MRN
-                for ident in patient.get("identifier", []):
-                    type_coding = ident.get("type", {}).get("coding", [])
-                    for coding in type_coding:
-                        if coding.get("code") == "MR":
-                            patient_mrn = ident.get("value", "Unknown")
-                            break
+        if patient:
+            # Extract name
+            names = patient.get("name", [])
+            if names:
+                name = names[0]
+                given = " ".join(name.get("given", []))
+                family = name.get("family", "")
+                patient_name = f"{given} {family}".strip() or "Unknown"
+
+            # Extract MRN
+            for ident in patient.get("identifier", []):
+                type_coding = ident.get("type", {}).get("coding", [])
+                for coding in type_coding:
+                    if coding.get("code") == "MR":
+                        patient_mrn = ident.get("value", "Unknown")
+                        break
 
         # Extract specimen type from code (e.g., "Blood Culture", "Urine Culture")
         specimen_type = None
@@ -269,10 +334,6 @@ class FHIRService:
             except (ValueError, TypeError):
                 pass
 
-        # Get susceptibility Observations
-        # These are linked via note field containing "Culture: {culture_id}"
-        susceptibilities = self._get_susceptibilities_for_culture(culture_id, patient_id)
-
         return CultureResult(
             id=culture_id,
             patient_id=patient_id,
@@ -292,32 +353,35 @@ class FHIRService:
         In our demo data, these are linked via note field.
         In Epic, they would be linked via DiagnosticReport.result references.
         """
-        susceptibilities = []
-
-        # Search for Observations that reference this culture in notes
+        return self._get_susceptibility_index(patient_id).get(culture_id, [])
+
+    def _get_susceptibility_index(self, patient_id: str | None) -> dict[str, list[Susceptibility]]:
+        """Get a patient's susceptibilities keyed by culture ID.
+
+        One Observation search covers every culture the patient has. The
+        search goes through the service's FHIRResponseCache, so pages
+        listing a year of cultures (MDR history) or reloading a culture
+        reuse the cached response instead of searching again, and a
+        failed search raises rather than leaving an empty index behind.
+        Without a patient the search is unscoped, so only its first 200
+        Observations are read.
+        """
         # This is a workaround since HAPI FHIR doesn't support derivedFrom to DiagnosticReport
-        # We search for lab Observations and filter by note content
+        # We search for lab Observations and group them by the culture in their note
         params = {
             "category": "laboratory",
             "_count": "200",
         }
+        limit = None
         if patient_id:
             params["patient"] = patient_id
+        else:
+            limit = 200
 
-        bundle = self._get("Observation", params)
-
-        observations = self._extract_entries(bundle)
-
-        for obs in observations:
-            # Check if this observation references our culture in the note
-            notes = obs.get("note", [])
-            culture_match = False
-            for note in notes:
-                if note.get("text", "").startswith(f"Culture: {culture_id}"):
-                    culture_match = True
-                    break
-
-            if not culture_match:
+        index: dict[str, list[Susceptibility]] = {}
+        for obs in self._search("Observation", params, limit=limit):
+            culture_id = self._culture_id_from_notes(obs)
+            if not culture_id:
                 continue
 
             # Extract antibiotic name from code
@@ -347,7 +411,7 @@ class FHIRService:
                     mic = component.get("valueString")
                     break
 
-            susceptibilities.append(Susceptibility(
+            index.setdefault(culture_id, []).append(Susceptibility(
                 antibiotic=antibiotic,
                 result=result,
                 result_display=result_display,
@@ -355,8 +419,21 @@ class FHIRService:
             ))
 
         # Sort by antibiotic name
-        susceptibilities.sort(key=lambda s: s.antibiotic.lower())
-        return susceptibilities
+        for susceptibilities in index.values():
+            susceptibilities.sort(key=lambda s: s.antibiotic.lower())
+        return index
+
+    @staticmethod
+    def _culture_id_from_notes(obs: dict) -> str | None:
+        """Culture ID from a "Culture: {id}" or "Culture: DiagnosticReport/{id}" note."""
+        for note in obs.get("note", []):
+            text = note.get("text", "")
+            if not text.startswith("Culture: "):
+                continue
+            ref = text[len("Culture: "):].split()
+            if ref:
+                return ref[0].rstrip(".,;").replace("DiagnosticReport/", "")
+        return None
 
     def get_patient_medications(
         self,
@@ -380,13 +457,13 @@ class FHIRService:
         medications = []
 
         for status in include_statuses:
-            bundle = self._get("MedicationRequest", {
+            resources = self._search("MedicationRequest", {
                 "patient": patient_id,
                 "status": status,
                 "_count": "100",
             })
 
-            for resource in self._extract_entries(bundle):
+            for resource in resources:
                 # Extract medication name
                 med_name = "Unknown"
                 med_code = None
@@ -470,10 +547,10 @@ class FHIRService:
             # Search by name (FHIR does partial matching)
             params["name"] = name
 
-        bundle = self._get("Patient", params)
+        resources = self._search("Patient", params, limit=limit)
         patients = []
 
-        for resource in self._extract_entries(bundle):
+        for resource in resources:
             patient = self._parse_patient(resource)
             if patient:
                 patients.append(patient)
@@ -568,7 +645,7 @@ class FHIRService:
 
         # Query DiagnosticReport for microbiology cultures
         # Use HL7 v2 diagnostic service section code "MB" (Microbiology)
-        bundle = self._get("DiagnosticReport", {
+        resources = self._search("DiagnosticReport", {
             "patient": patient_id,
             "category": "http://terminology.hl7.org/CodeSystem/v2-0074|MB",
             "date": f"ge{cutoff_str}",
@@ -576,16 +653,20 @@ class FHIRService:
             "_sort": "-date",
         })
 
+        if not resources:
+            return []
+
+        # The search returns full DiagnosticReports; only the patient and the
+        # susceptibility index are needed on top, once for all cultures
+        patient = self._get(f"Patient/{patient_id}")
+        index = self._get_susceptibility_index(patient_id)
+
         cultures = []
-        for resource in self._extract_entries(bundle):
+        for resource in resources:
             culture_id = resource.get("id")
             if not culture_id:
                 continue
-
-            # Get full culture with susceptibilities
-            culture = self.get_culture_with_susceptibilities(culture_id)
-            if culture:
-                cultures.append(culture)
+            cultures.append(self._culture_from_report(resource, patient, index.get(culture_id, [])))
 
         return cultures
 
@@ -649,14 +730,14 @@ class FHIRService:
         Returns:
             List of DrugAllergy objects
         """
-        bundle = self._get("AllergyIntolerance", {
+        resources = self._search("AllergyIntolerance", {
             "patient": patient_id,
             "clinical-status": "active",
             "_count": "100",
         })
 
         allergies = []
-        for resource in self._extract_entries(bundle):
+        for resource in resources:
             # Extract substance name
             substance = "Unknown"
             code_concept = resource.get("code", {})
@@ -716,14 +797,14 @@ class FHIRService:
         Returns:
             List of condition dicts with code, display, category
         """
-        bundle = self._get("Condition", {
+        resources = self._search("Condition", {
             "patient": patient_id,
             "clinical-status": "active",
             "_count": "100",
         })
 
         conditions = []
-        for resource in self._extract_entries(bundle):
+        for resource in resources:
             code_concept = resource.get("code", {})
             coding = code_concept.get("coding", [])
 
@@ -761,14 +842,14 @@ class FHIRService:
         cutoff = datetime.now() - timedelta(days=days_back)
         cutoff_str = cutoff.strftime("%Y-%m-%d")
 
-        bundle = self._get("Procedure", {
+        resources = self._search("Procedure", {
             "patient": patient_id,
             "date": f"ge{cutoff_str}",
             "_count": "100",
         })
 
         procedures = []
-        for resource in self._extract_entries(bundle):
+        for resource in resources:
             code_concept = resource.get("code", {})
             coding = code_concept.get("coding", [])
 
@@ -822,10 +903,10 @@ class FHIRService:
         if loinc_codes:
             params["code"] = ",".join(loinc_codes)
 
-        bundle = self._get("Observation", params)
+        resources = self._search("Observation", params)
 
         labs = []
-        for resource in self._extract_entries(bundle):
+        for resource in resources:
             code_concept = resource.get("code", {})
             coding = code_concept.get("coding", [])
 
@@ -1009,36 +1090,116 @@ class FHIRService:
 
         return history
 
-    def get_clinical_context(self, patient_id: str) -> ClinicalContext:
+    # Clinical context sources: (label, method name)
+    CLINICAL_CONTEXT_SOURCES = [
+        ("allergies", "get_patient_allergies"),
+        ("renal status", "get_renal_status"),
+        ("MDR history", "get_mdr_history"),
+    ]
+
+    def get_clinical_context(self, patient_id: str, timeout: float | None = None) -> ClinicalContext:
         """Get aggregated clinical context for antibiotic decisions.
 
         Combines allergies, renal status, and MDR history into a single
         ClinicalContext object for display in antibiotic approval/alert pages.
+        The three sources are fetched in parallel. Any that fail or are still
+        running at the deadline are listed in ``context.unavailable`` and
+        left at their defaults.
 
         Args:
             patient_id: FHIR Patient resource ID
+            timeout: Seconds to wait for all sources (default
+                CLINICAL_CONTEXT_TIMEOUT_SECONDS)
 
         Returns:
             ClinicalContext object with all clinical alerts
         """
         context = ClinicalContext(patient_id=patient_id)
+        timeout = CLINICAL_CONTEXT_TIMEOUT_SECONDS if timeout is None else timeout
+        started = time.monotonic()
 
-        # Get allergies
-        try:
-            context.allergies = self.get_patient_allergies(patient_id)
-        except Exception as e:
-            print(f"Error getting allergies for {patient_id}: {e}")
-
-        # Get renal status
-        try:
-            context.renal_status = self.get_renal_status(patient_id)
-        except Exception as e:
-            print(f"Error getting renal status for {patient_id}: {e}")
+        def timed(label, method):
+            t0 = time.monotonic()
+            try:
+                return method(patient_id)
+            finally:
+                context.latency_ms[label] = (time.monotonic() - t0) * 1000
 
-        # Get MDR history
-        try:
-            context.mdr_history = self.get_mdr_history(patient_id)
-        except Exception as e:
-            print(f"Error getting MDR history for {patient_id}: {e}")
+        futures = {
+            _context_executor().submit(timed, label, getattr(self, name)): (label, name)
+            for label, name in self.CLINICAL_CONTEXT_SOURCES
+        }
+        done, not_done = wait(futures, timeout=timeout)
 
+        for future, (label, name) in futures.items():
+            if future in not_done:
+                logger.warning(f"Clinical context for {patient_id}: {label} timed out after {timeout:.1f}s")
+                context.unavailable.append(label)
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning(f"Clinical context for {patient_id}: error getting {label}: {e}")
+                context.unavailable.append(label)
+                continue
+            if name == "get_patient_allergies":
+                context.allergies = result
+            elif name == "get_renal_status":
+                context.renal_status = result
+            else:
+                context.mdr_history = result
+
+        logger.info(
+            f"Clinical context for {patient_id} in {(time.monotonic() - started) * 1000:.0f}ms ("
+            + ", ".join(f"{label} {ms:.0f}ms" for label, ms in dict(context.latency_ms).items())
+            + (f"; unavailable: {', '.join(context.unavailable)}" if context.unavailable else "")
+            + ")"
+        )
         return context
+
+
+_services: dict[str, FHIRService] = {}
+_services_lock = threading.Lock()
+
+
+def get_fhir_service(base_url: str) -> FHIRService:
+    """Get the shared FHIRService for a FHIR server.
+
+    The instance lives for the whole process, so its connection pool and
+    response cache are reused across dashboard requests.
+    """
+    key = base_url.rstrip("/")
+    service = _services.get(key)
+    if service is None:
+        with _services_lock:
+            service = _services.get(key)
+            if service is None:
+                service = _services[key] = FHIRService(key, cache=FHIRResponseCache())
+    return service
+
+
+def get_fhir_cache_stats() -> dict[str, dict]:
+    """Response cache stats for each shared FHIRService, by base URL."""
+    return {url: service.cache.stats() for url, service in list(_services.items())}
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _context_executor() -> ThreadPoolExecutor:
+    """Shared pool for clinical context fetches.
+
+    Shared rather than per call so that a source still running past its
+    deadline doesn't hold up the request, and bounded so slow FHIR
+    responses can't pile up threads.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=CLINICAL_CONTEXT_WORKERS,
+                    thread_name_prefix="clinical-context",
+                )
+    return _executor
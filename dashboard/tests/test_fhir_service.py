@@ -0,0 +1,169 @@
+"""Tests for the dashboard FHIR service."""
+
+import io
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from common.fhir import FHIRResponseCache
+from dashboard.services.fhir import FHIRService
+
+
+def make_service(get, cache: FHIRResponseCache | None = None) -> FHIRService:
+    """A service whose HTTP GETs go to get(url, params=..., **kwargs)."""
+    service = FHIRService("http://fhir", cache=cache)
+    service.session.get = Mock(side_effect=get)
+    return service
+
+
+def fhir_response(body: dict, status: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.url = "http://fhir"
+    response.headers["Content-Type"] = "application/fhir+json"
+    response._content = json.dumps(body).encode()
+    response.raw = io.BytesIO(response._content)
+    return response
+
+
+class TestSearch:
+    """Tests for FHIRService._search."""
+
+    def test_failed_page_raises(self):
+        """Test a failure past the first page isn't returned as a short list."""
+        pages = {
+            "http://fhir/Condition": fhir_response({
+                "resourceType": "Bundle",
+                "link": [{"relation": "next", "url": "http://fhir/page2"}],
+                "entry": [{"resource": {"resourceType": "Condition", "id": "c1"}}],
+            }),
+            "http://fhir/page2": fhir_response({}, status=503),
+        }
+        service = make_service(lambda url, **kwargs: pages[url])
+
+        with pytest.raises(requests.HTTPError):
+            service.get_patient_conditions("p1")
+
+    def test_no_results_is_empty(self):
+        """Test an empty Bundle is an empty list, not an error."""
+        service = make_service(lambda url, **kwargs: fhir_response({"resourceType": "Bundle"}))
+
+        assert service.get_patient_conditions("p1") == []
+
+    def test_search_patients_honors_limit(self):
+        """Test limit caps the results rather than only the page size."""
+        def patient_page(ids, next_url):
+            return fhir_response({
+                "resourceType": "Bundle",
+                "link": [{"relation": "next", "url": next_url}],
+                "entry": [{"resource": {"resourceType": "Patient", "id": i}} for i in ids],
+            })
+
+        pages = {
+            "http://fhir/Patient": patient_page(["p1", "p2"], "http://fhir/page2"),
+            "http://fhir/page2": patient_page(["p3", "p4"], "http://fhir/page3"),
+            "http://fhir/page3": patient_page(["p5", "p6"], "http://fhir/page4"),
+        }
+        service = make_service(lambda url, **kwargs: pages[url])
+
+        patients = service.search_patients(name="a", limit=3)
+        assert [p.id for p in patients] == ["p1", "p2", "p3"]
+        assert "http://fhir/page3" not in [c.args[0] for c in service.session.get.call_args_list]
+
+
+def susceptibility_bundle() -> dict:
+    return {
+        "resourceType": "Bundle",
+        "entry": [{"resource": {
+            "resourceType": "Observation",
+            "id": "s1",
+            "code": {"text": "Vancomycin Susceptibility"},
+            "interpretation": [{"coding": [{"code": "S", "display": "Susceptible"}]}],
+            "note": [{"text": "Culture: bc1"}],
+        }}],
+    }
+
+
+class TestSusceptibilityIndex:
+    """Tests for the per-patient susceptibility index."""
+
+    def test_failed_search_not_cached(self):
+        """Test an outage raises and the next good search is used and cached."""
+        responses = [requests.ConnectionError("refused"), fhir_response(susceptibility_bundle())]
+
+        def get(url, **kwargs):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        service = make_service(get, cache=FHIRResponseCache())
+
+        with pytest.raises(requests.ConnectionError):
+            service._get_susceptibility_index("p1")
+
+        [susceptibility] = service._get_susceptibility_index("p1")["bc1"]
+        assert susceptibility.antibiotic == "Vancomycin"
+        # Served from the response cache, without another request
+        assert service._get_susceptibility_index("p1")["bc1"] == [susceptibility]
+        assert service.session.get.call_count == 2
+
+    def test_unscoped_search_reads_one_page(self):
+        """Test a culture without a patient doesn't page through every lab Observation."""
+        first = susceptibility_bundle()
+        first["entry"] *= 200
+        first["link"] = [{"relation": "next", "url": "http://fhir/page2"}]
+        pages = {"http://fhir/Observation": fhir_response(first)}
+        service = make_service(lambda url, **kwargs: pages[url])
+
+        assert len(service._get_susceptibility_index(None)["bc1"]) == 200
+        assert service.session.get.call_count == 1
+
+
+def context_server(failures: dict[str, Exception | int], delays: dict[str, float] | None = None):
+    """GET handler returning empty Bundles, except for the failing resource types."""
+    def get(url, **kwargs):
+        resource_type = url.rsplit("/", 1)[-1]
+        time.sleep((delays or {}).get(resource_type, 0))
+        failure = failures.get(resource_type)
+        if isinstance(failure, Exception):
+            raise failure
+        if failure:
+            return fhir_response({"resourceType": "OperationOutcome"}, status=failure)
+        return fhir_response({"resourceType": "Bundle"})
+    return get
+
+
+class TestClinicalContext:
+    """Tests for get_clinical_context with failing sources."""
+
+    def test_http_error_marks_source_unavailable(self):
+        """Test a 5xx on allergies is reported, not shown as no allergies."""
+        service = make_service(context_server({"AllergyIntolerance": 500}))
+
+        context = service.get_clinical_context("p1", timeout=5)
+
+        assert context.unavailable == ["allergies"]
+        assert context.is_partial
+
+    def test_request_timeout_marks_source_unavailable(self):
+        """Test a timed-out request inside a source marks that source."""
+        service = make_service(context_server({"Condition": requests.Timeout("read timed out")}))
+
+        context = service.get_clinical_context("p1", timeout=5)
+
+        assert context.unavailable == ["renal status"]
+
+    def test_slow_source_marked_unavailable_at_deadline(self):
+        """Test the page doesn't wait past the deadline for a slow source."""
+        service = make_service(context_server({}, delays={"DiagnosticReport": 0.5}))
+
+        started = time.monotonic()
+        context = service.get_clinical_context("p1", timeout=0.1)
+
+        assert time.monotonic() - started < 0.4
+        assert context.unavailable == ["MDR history"]
+        assert "allergies" in context.latency_ms
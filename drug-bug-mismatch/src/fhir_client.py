@@ -10,7 +10,8 @@ from typing import Optional
 
 import requests
 
-from .config import config
+from .config import config  # This adds the project root to sys.path
+from common.fhir import PagedSearchMixin, PatientSnapshot
 from .models import (
     Antibiotic,
     CultureWithSusceptibilities,
@@ -19,7 +20,7 @@ from .models import (
 )
 
 
-class FHIRClient(ABC):
+class FHIRClient(PagedSearchMixin, ABC):
     """Abstract FHIR client - implement for different backends."""
 
     @abstractmethod
@@ -43,11 +44,10 @@ class FHIRClient(ABC):
 
     def get_active_medication_requests(self, patient_id: str) -> list[dict]:
         """Get active medication requests for a patient."""
-        response = self.get("MedicationRequest", {
+        return list(self.search("MedicationRequest", {
             "patient": patient_id,
             "status": "active",
-        })
-        return self._extract_entries(response)
+        }))
 
     def get_recent_microbiology_reports(
         self,
@@ -61,27 +61,23 @@ class FHIRClient(ABC):
             "category": "MB",
             "status": status,
             "date": f"ge{date_from.strftime('%Y-%m-%dT%H:%M:%S')}",
-            "_count": "500",
         }
-        response = self.get("DiagnosticReport", params)
-        return self._extract_entries(response)
+        return list(self.search("DiagnosticReport", params))
 
     def get_observations_for_report(self, report_id: str) -> list[dict]:
         """Get Observation resources linked to a DiagnosticReport."""
         # Observations can be linked via result array or derived-from
-        response = self.get("Observation", {
+        observations = list(self.search("Observation", {
             "derived-from": f"DiagnosticReport/{report_id}",
             "_count": "100",
-        })
-        observations = self._extract_entries(response)
+        }))
 
         # Also try based-on reference
         if not observations:
-            response = self.get("Observation", {
+            observations = list(self.search("Observation", {
                 "based-on": f"DiagnosticReport/{report_id}",
                 "_count": "100",
-            })
-            observations = self._extract_entries(response)
+            }))
 
         return observations
 
@@ -94,17 +90,6 @@ class FHIRClient(ABC):
                 return None
             raise
 
-    @staticmethod
-    def _extract_entries(bundle: dict) -> list[dict]:
-        """Extract resource entries from a FHIR Bundle."""
-        if bundle.get("resourceType") != "Bundle":
-            return []
-        return [
-            entry.get("resource", {})
-            for entry in bundle.get("entry", [])
-            if "resource" in entry
-        ]
-
 
 class HAPIFHIRClient(FHIRClient):
     """Client for local HAPI FHIR server (no auth required)."""
@@ -213,6 +198,10 @@ class EpicFHIRClient(FHIRClient):
 
         return self.access_token
 
+    def _auth_headers(self) -> dict:
+        """Bearer token header, refreshed when it expires."""
+        return {"Authorization": f"Bearer {self._get_access_token()}"}
+
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request with OAuth authentication."""
         token = self._get_access_token()
@@ -541,6 +530,14 @@ class DrugBugFHIRClient:
     def get_current_antibiotics(self, patient_id: str) -> list[Antibiotic]:
         """Get current antibiotic orders for a patient."""
         med_requests = self.fhir.get_active_medication_requests(patient_id)
+        return self.antibiotics_from(med_requests)
+
+    def fetch_patient_snapshot(self, patient_ids) -> PatientSnapshot:
+        """Bulk-fetch patients and active medication requests for a poll cycle."""
+        return PatientSnapshot.fetch(self.fhir.search, patient_ids)
+
+    def antibiotics_from(self, med_requests: list[dict]) -> list[Antibiotic]:
+        """Parse MedicationRequests into antibiotics usable for matching."""
         antibiotics = []
         for mr in med_requests:
             abx = self.parse_medication_request(mr)
@@ -13,6 +13,7 @@ from .matcher import assess_mismatch, should_alert
 from .models import AlertSeverity
 
 from common.alert_store import AlertStore, AlertType, AlertStatus
+from common.fhir import PatientSnapshot
 
 
 class DrugBugMismatchMonitor:
@@ -30,10 +31,19 @@ class DrugBugMismatchMonitor:
         self.processed_cultures: set[str] = set()  # In-memory cache
         self.alerts_generated = 0
 
-    def check_culture(self, culture) -> tuple[bool, str | None]:
+    def check_culture(
+        self,
+        culture,
+        snapshot: PatientSnapshot | None = None,
+    ) -> tuple[bool, str | None]:
         """
         Check a single culture for drug-bug mismatches.
 
+        Args:
+            culture: CultureWithSusceptibilities to check
+            snapshot: Patients/medications prefetched for this cycle. Patients
+                it doesn't cover are fetched individually.
+
         Returns:
             Tuple of (alert_generated, alert_id)
         """
@@ -62,13 +72,20 @@ class DrugBugMismatchMonitor:
             print(f"  Warning: Culture {culture.fhir_id} has no patient reference")
             return False, None
 
-        patient = self.fhir.get_patient(culture.patient_id)
+        if snapshot and snapshot.covers(culture.patient_id):
+            patient_resource = snapshot.patient(culture.patient_id)
+            patient = self.fhir.parse_patient(patient_resource) if patient_resource else None
+        else:
+            patient = self.fhir.get_patient(culture.patient_id)
         if not patient:
             print(f"  Warning: Patient {culture.patient_id} not found")
             return False, None
 
         # Get active antibiotics
-        antibiotics = self.fhir.get_current_antibiotics(culture.patient_id)
+        if snapshot and snapshot.covers(culture.patient_id):
+            antibiotics = self.fhir.antibiotics_from(snapshot.medication_requests(culture.patient_id))
+        else:
+            antibiotics = self.fhir.get_current_antibiotics(culture.patient_id)
 
         # Assess coverage
         assessment = assess_mismatch(patient, culture, antibiotics)
@@ -183,11 +200,17 @@ class DrugBugMismatchMonitor:
             f"in the last {self.lookback_hours} hours"
         )
 
+        # One bulk fetch for every patient with a new culture this cycle
+        snapshot = self.fhir.fetch_patient_snapshot(
+            c.patient_id for c in cultures
+            if c.fhir_id not in self.processed_cultures and c.susceptibilities
+        )
+
         cycle_alerts = 0
         for culture in cultures:
             try:
                 print(f"  Checking: {culture.organism} (Culture {culture.fhir_id[:8]}...)")
-                alerted, alert_id = self.check_culture(culture)
+                alerted, alert_id = self.check_culture(culture, snapshot)
                 if alerted:
                     cycle_alerts += 1
             except Exception as e:
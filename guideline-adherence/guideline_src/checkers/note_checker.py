@@ -10,7 +10,11 @@ from pathlib import Path
 GUIDELINE_ADHERENCE_PATH = Path(__file__).parent.parent.parent
 if str(GUIDELINE_ADHERENCE_PATH) not in sys.path:
     sys.path.insert(0, str(GUIDELINE_ADHERENCE_PATH))
+PROJECT_ROOT = GUIDELINE_ADHERENCE_PATH.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
+from common.note_scanner import NoteScanner
 from guideline_adherence import BundleElement
 
 from ..models import ElementCheckResult, ElementCheckStatus
@@ -47,6 +51,41 @@ REASSESSMENT_KEYWORDS = [
     "infectious disease",
 ]
 
+# Keywords indicating cellulitis margins were marked
+MARGIN_KEYWORDS = [
+    "margins marked",
+    "borders marked",
+    "demarcated",
+    "outlined",
+    "border outlined",
+    "circumscribed",
+]
+
+# Keywords indicating risk stratification was documented
+RISK_KEYWORDS = [
+    "high risk",
+    "low risk",
+    "risk stratification",
+    "risk assessment",
+    "mascc score",
+    "risk category",
+    "risk classification",
+]
+
+_keyword_scanner: NoteScanner | None = None
+
+
+def _get_keyword_scanner() -> NoteScanner:
+    """Compiled scanner for the fixed keyword lists (built once per process)."""
+    global _keyword_scanner
+    if _keyword_scanner is None:
+        _keyword_scanner = NoteScanner(keywords={
+            "reassessment": REASSESSMENT_KEYWORDS,
+            "margins": MARGIN_KEYWORDS,
+            "risk": RISK_KEYWORDS,
+        })
+    return _keyword_scanner
+
 
 class NoteChecker(ElementChecker):
     """Check note-based bundle elements."""
@@ -127,9 +166,8 @@ class NoteChecker(ElementChecker):
 
                 # Check if note is in reassessment window
                 if reassess_start <= note_date <= reassess_end:
-                    note_text = note.get("text", "").lower()
                     # Check for reassessment keywords
-                    if any(kw in note_text for kw in REASSESSMENT_KEYWORDS):
+                    if _get_keyword_scanner().has_keyword(note.get("text", ""), "reassessment"):
                         return self._create_result(
                             element=element,
                             status=ElementCheckStatus.MET,
@@ -177,20 +215,12 @@ class NoteChecker(ElementChecker):
             since_hours=24,
         )
 
-        margin_keywords = [
-            "margins marked",
-            "borders marked",
-            "demarcated",
-            "outlined",
-            "border outlined",
-            "circumscribed",
-        ]
+        scanner = _get_keyword_scanner()
 
         for note in notes:
-            note_text = note.get("text", "").lower()
             note_date = note.get("date")
 
-            if any(kw in note_text for kw in margin_keywords):
+            if scanner.has_keyword(note.get("text", ""), "margins"):
                 if isinstance(note_date, str):
                     try:
                         note_date = datetime.fromisoformat(note_date.replace("Z", "+00:00"))
@@ -241,21 +271,13 @@ class NoteChecker(ElementChecker):
             since_hours=48,
         )
 
-        risk_keywords = [
-            "high risk",
-            "low risk",
-            "risk stratification",
-            "risk assessment",
-            "mascc score",
-            "risk category",
-            "risk classification",
-        ]
+        scanner = _get_keyword_scanner()
 
         for note in notes:
-            note_text = note.get("text", "").lower()
             note_date = note.get("date")
+            found = scanner.terms_in(note.get("text", "")) & set(RISK_KEYWORDS)
 
-            if any(kw in note_text for kw in risk_keywords):
+            if found:
                 if isinstance(note_date, str):
                     try:
                         note_date = datetime.fromisoformat(note_date.replace("Z", "+00:00"))
@@ -264,9 +286,9 @@ class NoteChecker(ElementChecker):
 
                 # Determine which risk category was documented
                 risk_level = "documented"
-                if "high risk" in note_text:
+                if "high risk" in found:
                     risk_level = "high risk"
-                elif "low risk" in note_text:
+                elif "low risk" in found:
                     risk_level = "low risk"
 
                 return self._create_result(
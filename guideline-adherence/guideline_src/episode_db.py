@@ -4,6 +4,7 @@ Handles persistence of bundle episodes, element results, and alerts.
 """
 
 import sqlite3
+import sys
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -12,6 +13,13 @@ from dataclasses import dataclass, field, asdict
 
 from .config import config
 
+# Add project root to path for common.* (shared connection layer, metrics store)
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.db import get_connection
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,14 +37,14 @@ def _log_guideline_activity(
 ) -> None:
     """Log activity to the unified metrics store.
 
-    This is a fire-and-forget operation - failures are logged but don't
-    interrupt the main operation.
+    This is a fire-and-forget operation - the row is queued and written in
+    the background (see common.metrics_store.sink), and failures are logged
+    but don't interrupt the main operation.
     """
     try:
-        from common.metrics_store import MetricsStore, ModuleSource
+        from common.metrics_store import ModuleSource, get_activity_sink
 
-        store = MetricsStore()
-        store.log_activity(
+        get_activity_sink().log_activity(
             activity_type=activity_type,
             module=ModuleSource.GUIDELINE_ADHERENCE,
             provider_id=provider_id,
@@ -173,10 +181,8 @@ class EpisodeDB:
         self._ensure_schema()
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's shared WAL connection (see common.db)."""
+        return get_connection(self.db_path)
 
     def _ensure_schema(self):
         """Ensure database schema exists."""
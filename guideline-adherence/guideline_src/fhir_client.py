@@ -5,19 +5,28 @@ to the base FHIR client pattern.
 """
 
 import logging
+import sys
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 import requests
 
 from .config import config
 
+# Add project root to path for common.fhir
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.fhir import PagedSearchMixin
+
 logger = logging.getLogger(__name__)
 
 
-class GuidelineFHIRClient(ABC):
+class GuidelineFHIRClient(PagedSearchMixin, ABC):
     """Abstract FHIR client for guideline adherence monitoring."""
 
     @abstractmethod
@@ -25,17 +34,6 @@ class GuidelineFHIRClient(ABC):
         """GET a FHIR resource or search."""
         pass
 
-    @staticmethod
-    def _extract_entries(bundle: dict) -> list[dict]:
-        """Extract resource entries from a FHIR Bundle."""
-        if bundle.get("resourceType") != "Bundle":
-            return []
-        return [
-            entry.get("resource", {})
-            for entry in bundle.get("entry", [])
-            if "resource" in entry
-        ]
-
     @staticmethod
     def _parse_datetime(dt_str: str | None) -> datetime | None:
         """Parse FHIR datetime string to Python datetime."""
@@ -111,8 +109,7 @@ class GuidelineFHIRClient(ABC):
         }
 
         try:
-            response = self.get("Condition", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("Condition", params))
         except Exception as e:
             logger.warning(f"Failed to get conditions for patient {patient_id}: {e}")
             return []
@@ -146,8 +143,7 @@ class GuidelineFHIRClient(ABC):
         }
 
         try:
-            response = self.get("Condition", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("Condition", params))
         except Exception as e:
             logger.warning(f"Failed to get sepsis conditions: {e}")
             return []
@@ -209,8 +205,7 @@ class GuidelineFHIRClient(ABC):
         }
 
         try:
-            response = self.get("Condition", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("Condition", params))
         except Exception as e:
             logger.warning(f"Failed to get conditions for ICD-10 {icd10_prefixes}: {e}")
             return []
@@ -306,8 +301,7 @@ class GuidelineFHIRClient(ABC):
             params["date"] = f"ge{since_time.strftime('%Y-%m-%dT%H:%M:%S')}"
 
         try:
-            response = self.get("Observation", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("Observation", params))
         except Exception as e:
             logger.warning(f"Failed to get lab results: {e}")
             return []
@@ -375,8 +369,7 @@ class GuidelineFHIRClient(ABC):
         }
 
         try:
-            response = self.get("Observation", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("Observation", params))
         except Exception as e:
             logger.warning(f"Failed to get vital signs: {e}")
             return []
@@ -443,8 +436,7 @@ class GuidelineFHIRClient(ABC):
         }
 
         try:
-            response = self.get("MedicationAdministration", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("MedicationAdministration", params))
         except Exception as e:
             logger.warning(f"Failed to get medication administrations: {e}")
             return []
@@ -533,8 +525,7 @@ class GuidelineFHIRClient(ABC):
             params["type"] = ",".join(note_types)
 
         try:
-            response = self.get("DocumentReference", params)
-            resources = self._extract_entries(response)
+            resources = list(self.search("DocumentReference", params, limit=50))
         except Exception as e:
             logger.warning(f"Failed to get notes for patient {patient_id}: {e}")
             return []
@@ -684,6 +675,10 @@ class EpicGuidelineFHIRClient(GuidelineFHIRClient):
 
         return self.access_token
 
+    def _auth_headers(self) -> dict:
+        """Bearer token header, refreshed when it expires."""
+        return {"Authorization": f"Bearer {self._get_access_token()}"}
+
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request with OAuth authentication."""
         token = self._get_access_token()
@@ -11,14 +11,14 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 # Add paths for imports
-COMMON_PATH = Path(__file__).parent.parent.parent / "common"
+PROJECT_ROOT = Path(__file__).parent.parent.parent
 GUIDELINE_PATH = Path(__file__).parent.parent
-if str(COMMON_PATH) not in sys.path:
-    sys.path.insert(0, str(COMMON_PATH))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 if str(GUIDELINE_PATH) not in sys.path:
     sys.path.insert(0, str(GUIDELINE_PATH))
 
-from alert_store import AlertStore, AlertType
+from common.alert_store import AlertStore, AlertType
 
 from guideline_adherence import (
     BundleElement,
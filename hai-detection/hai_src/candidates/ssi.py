@@ -15,6 +15,8 @@ import logging
 import uuid
 from datetime import datetime, timedelta
 
+from common.note_scanner import NoteScanner
+
 from ..config import Config
 from ..models import (
     HAICandidate,
@@ -37,6 +39,16 @@ from .base import BaseCandidateDetector
 
 logger = logging.getLogger(__name__)
 
+_ssi_keyword_scanner: NoteScanner | None = None
+
+
+def _get_ssi_keyword_scanner() -> NoteScanner:
+    """Compiled scanner for SSI_DETECTION_KEYWORDS (built once per process)."""
+    global _ssi_keyword_scanner
+    if _ssi_keyword_scanner is None:
+        _ssi_keyword_scanner = NoteScanner(keywords={"ssi": SSI_DETECTION_KEYWORDS})
+    return _ssi_keyword_scanner
+
 
 class SSICandidateDetector(BaseCandidateDetector):
     """Detector for SSI candidates based on NHSN criteria.
@@ -300,11 +312,9 @@ class SSICandidateDetector(BaseCandidateDetector):
 
             keywords_found = set()
 
+            scanner = _get_ssi_keyword_scanner()
             for note in notes:
-                content_lower = note.content.lower()
-                for keyword in SSI_DETECTION_KEYWORDS:
-                    if keyword in content_lower:
-                        keywords_found.add(keyword)
+                keywords_found |= scanner.terms_in(note.content)
 
             return list(keywords_found)
 
@@ -152,6 +152,7 @@ Respond with JSON: {{"decision": "hai_confirmed"|"not_hai"|"pending_review", "co
                 prompt=prompt,
                 output_schema=output_schema,
                 temperature=0.0,
+                prompt_version=self.PROMPT_VERSION,
             )
 
             elapsed_ms = int((time.time() - start_time) * 1000)
@@ -38,9 +38,42 @@ class Config:
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3.3:70b")
     VLLM_BASE_URL: str = os.getenv("VLLM_BASE_URL", "http://localhost:8000")
     VLLM_MODEL: str = os.getenv("VLLM_MODEL", "Qwen/Qwen2.5-72B-Instruct")
+    # Requests kept in flight by batched calls (generate_structured_many);
+    # vLLM batches them continuously on the GPU
+    VLLM_MAX_CONCURRENCY: int = int(os.getenv("VLLM_MAX_CONCURRENCY", "16"))
+    # Triage model (fast first pass; see extraction/triage_extractor.py).
+    # With TRIAGE_BACKEND=vllm a day's candidates are triaged concurrently.
+    TRIAGE_BACKEND: str = os.getenv("TRIAGE_BACKEND", "ollama")  # ollama or vllm
+    VLLM_TRIAGE_BASE_URL: str = os.getenv("VLLM_TRIAGE_BASE_URL", VLLM_BASE_URL)
+    VLLM_TRIAGE_MODEL: str = os.getenv("VLLM_TRIAGE_MODEL", "Qwen/Qwen2.5-7B-Instruct")
     CLAUDE_API_KEY: str | None = os.getenv("CLAUDE_API_KEY")
     CLAUDE_MODEL: str = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
 
+    # --- LLM Response Cache ---
+    # Deterministic (temperature 0) structured extractions are cached by
+    # content hash so re-classifying unchanged notes skips the GPU
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH: str = os.getenv(
+        "LLM_CACHE_PATH",
+        str(Path.home() / ".aegis" / "llm_cache.db"),
+    )
+    LLM_CACHE_TTL_HOURS: float = float(os.getenv("LLM_CACHE_TTL_HOURS", "720"))  # 30 days
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+    # --- LLM Profiling ---
+    # Per-call latency/token profiles, written in batches by a background
+    # thread and summarized on the dashboard (HAI Detection > LLM Performance)
+    LLM_PROFILING_ENABLED: bool = os.getenv("LLM_PROFILING_ENABLED", "true").lower() == "true"
+    LLM_PROFILE_DB_PATH: str = os.getenv(
+        "LLM_PROFILE_DB_PATH",
+        str(Path.home() / ".aegis" / "llm_profiles.db"),
+    )
+    LLM_PROFILE_FLUSH_SECONDS: float = float(os.getenv("LLM_PROFILE_FLUSH_SECONDS", "5"))
+    LLM_PROFILE_BATCH_SIZE: int = int(os.getenv("LLM_PROFILE_BATCH_SIZE", "100"))
+    LLM_PROFILE_RETENTION_DAYS: int = int(os.getenv("LLM_PROFILE_RETENTION_DAYS", "180"))
+    # Reference latency per note for the dashboard (TODO_LLM_OPTIMIZATION.md)
+    LLM_LATENCY_BASELINE_MS: float = float(os.getenv("LLM_LATENCY_BASELINE_MS", "85000"))
+
     # --- Classification Thresholds ---
     # Above this confidence: auto-classify as HAI (no review needed)
     AUTO_CLASSIFY_THRESHOLD: float = float(
@@ -98,6 +131,20 @@ class Config:
     POLL_INTERVAL: int = int(os.getenv("POLL_INTERVAL", "300"))  # seconds
     LOOKBACK_HOURS: int = int(os.getenv("LOOKBACK_HOURS", "24"))
 
+    # --- Classification Pipeline ---
+    # Concurrent note retrievals (I/O bound, can be generous)
+    CLASSIFY_FETCH_WORKERS: int = int(os.getenv("CLASSIFY_FETCH_WORKERS", "4"))
+    # Concurrent LLM requests (match the backend's parallel slots,
+    # e.g. OLLAMA_NUM_PARALLEL or vLLM max concurrent sequences)
+    CLASSIFY_INFERENCE_WORKERS: int = int(os.getenv("CLASSIFY_INFERENCE_WORKERS", "1"))
+    # Concurrent SQLite writers (1 avoids lock contention)
+    CLASSIFY_PERSIST_WORKERS: int = int(os.getenv("CLASSIFY_PERSIST_WORKERS", "1"))
+    # Max candidates buffered between stages before upstream workers block
+    CLASSIFY_QUEUE_SIZE: int = int(os.getenv("CLASSIFY_QUEUE_SIZE", "8"))
+    # Max queued candidates an inference worker classifies in one batch
+    # (only for classifiers that support batching, e.g. CLABSI triage)
+    CLASSIFY_INFERENCE_BATCH_SIZE: int = int(os.getenv("CLASSIFY_INFERENCE_BATCH_SIZE", "8"))
+
     # --- Notifications ---
     TEAMS_WEBHOOK_URL: str | None = os.getenv("TEAMS_WEBHOOK_URL")
     DASHBOARD_BASE_URL: str = os.getenv("DASHBOARD_BASE_URL", "http://localhost:5000")
@@ -117,6 +164,20 @@ class Config:
     # Maximum notes to retrieve per patient
     MAX_NOTES_PER_PATIENT: int = int(os.getenv("MAX_NOTES_PER_PATIENT", "20"))
 
+    # --- Context Packing ---
+    # Token budget for the notes portion of each extraction prompt. Note
+    # sections and paragraphs are ranked by relevance and packed greedily
+    # up to this budget, so prompt size no longer grows with length of stay.
+    CONTEXT_TOKEN_BUDGETS: dict[str, int] = {
+        "clabsi": int(os.getenv("CONTEXT_TOKEN_BUDGET_CLABSI", "6000")),
+        "cauti": int(os.getenv("CONTEXT_TOKEN_BUDGET_CAUTI", "6000")),
+        "cdi": int(os.getenv("CONTEXT_TOKEN_BUDGET_CDI", "6000")),
+        "vae": int(os.getenv("CONTEXT_TOKEN_BUDGET_VAE", "6000")),
+        "ssi": int(os.getenv("CONTEXT_TOKEN_BUDGET_SSI", "1000")),
+    }
+    # Budget used for HAI types without an entry above
+    CONTEXT_TOKEN_BUDGET_DEFAULT: int = int(os.getenv("CONTEXT_TOKEN_BUDGET_DEFAULT", "6000"))
+
     # --- Epic FHIR (if using Epic) ---
     EPIC_CLIENT_ID: str | None = os.getenv("EPIC_CLIENT_ID")
     EPIC_PRIVATE_KEY_PATH: str | None = os.getenv("EPIC_PRIVATE_KEY_PATH")
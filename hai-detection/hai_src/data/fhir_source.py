@@ -12,6 +12,8 @@ from ..models import (
 )
 from .base import BaseNoteSource, BaseDeviceSource, BaseCultureSource, BaseVentilatorSource
 
+from common.fhir import iter_bundle_entries
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,14 +52,14 @@ class FHIRNoteSource(BaseNoteSource):
                 params["type"] = ",".join(type_codes)
 
         try:
-            response = self.session.get(
+            entries = iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/DocumentReference",
-                params=params,
+                params,
+                limit=Config.MAX_NOTES_PER_PATIENT,
             )
-            response.raise_for_status()
-            bundle = response.json()
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 note = self._parse_document_reference(resource)
                 if note:
@@ -208,15 +210,14 @@ class FHIRDeviceSource(BaseDeviceSource):
         }
 
         try:
-            response = self.session.get(
+            entries = iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/DeviceUseStatement",
-                params=params,
+                params,
                 timeout=10,
             )
-            response.raise_for_status()
-            bundle = response.json()
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 # Skip entered-in-error status
                 if resource.get("status") == "entered-in-error":
@@ -248,14 +249,9 @@ class FHIRDeviceSource(BaseDeviceSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DeviceUseStatement",
-                params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            entries = iter_bundle_entries(self.session, f"{self.base_url}/DeviceUseStatement", params)
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 device = self._parse_device_use_statement(resource)
                 if device:
@@ -437,17 +433,16 @@ class FHIRCultureSource(BaseCultureSource):
         }
 
         try:
-            response = self.session.get(
+            entries = list(iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/DiagnosticReport",
-                params=params,
+                params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            ))
 
             # Build patient lookup from included resources
             patients = {}
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Patient":
                     patient = self._parse_patient(resource)
@@ -455,7 +450,7 @@ class FHIRCultureSource(BaseCultureSource):
                         patients[patient.fhir_id] = patient
 
             # Parse DiagnosticReports and filter for positive results
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "DiagnosticReport":
                     culture = self._parse_diagnostic_report(resource)
@@ -472,7 +467,7 @@ class FHIRCultureSource(BaseCultureSource):
                             if patient:
                                 results.append((patient, culture))
 
-            logger.info(f"Found {len(results)} positive blood cultures from {len(bundle.get('entry', []))} total reports")
+            logger.info(f"Found {len(results)} positive blood cultures from {len(entries)} total entries")
 
         except requests.RequestException as e:
             logger.error(f"FHIR culture query failed: {e}")
@@ -501,14 +496,9 @@ class FHIRCultureSource(BaseCultureSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DiagnosticReport",
-                params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            entries = iter_bundle_entries(self.session, f"{self.base_url}/DiagnosticReport", params)
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "DiagnosticReport":
                     culture = self._parse_diagnostic_report(resource)
@@ -661,15 +651,14 @@ class FHIRCultureSource(BaseCultureSource):
         }
 
         try:
-            response = self.session.get(
+            entries = iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/DiagnosticReport",
-                params=params,
+                params,
                 timeout=30,
             )
-            response.raise_for_status()
-            bundle = response.json()
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "DiagnosticReport":
                     culture = self._parse_other_culture(resource)
@@ -847,17 +836,16 @@ class FHIRVentilatorSource(BaseVentilatorSource):
         }
 
         try:
-            response = self.session.get(
+            entries = list(iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/Procedure",
-                params=params,
+                params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            ))
 
             # Build patient lookup from included resources
             patients = {}
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Patient":
                     patient = self._parse_patient(resource)
@@ -866,7 +854,7 @@ class FHIRVentilatorSource(BaseVentilatorSource):
 
             # Parse Procedure resources to find ventilation episodes
             episodes_by_patient = {}
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Procedure":
                     episode = self._parse_ventilation_procedure(resource)
@@ -975,15 +963,9 @@ class FHIRVentilatorSource(BaseVentilatorSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/Procedure",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            entries = iter_bundle_entries(self.session, f"{self.base_url}/Procedure", params, timeout=30)
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Procedure":
                     episode = self._parse_ventilation_procedure(resource)
@@ -1080,15 +1062,9 @@ class FHIRVentilatorSource(BaseVentilatorSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/Observation",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            entries = iter_bundle_entries(self.session, f"{self.base_url}/Observation", params, timeout=30)
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") != "Observation":
                     continue
@@ -1239,15 +1215,14 @@ class FHIRUrinaryCatheterSource(FHIRDeviceSource):
         }
 
         try:
-            response = self.session.get(
+            entries = iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/DeviceUseStatement",
-                params=params,
+                params,
                 timeout=10,
             )
-            response.raise_for_status()
-            bundle = response.json()
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
 
                 # Skip entered-in-error status
@@ -1289,15 +1264,14 @@ class FHIRUrinaryCatheterSource(FHIRDeviceSource):
         }
 
         try:
-            response = self.session.get(
+            entries = iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/DeviceUseStatement",
-                params=params,
+                params,
                 timeout=10,
             )
-            response.raise_for_status()
-            bundle = response.json()
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
 
                 if resource.get("status") == "entered-in-error":
@@ -1470,17 +1444,16 @@ class FHIRUrineCultureSource(FHIRCultureSource):
         }
 
         try:
-            response = self.session.get(
+            entries = list(iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/DiagnosticReport",
-                params=params,
+                params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            ))
 
             # Build patient lookup from included resources
             patients = {}
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Patient":
                     patient = self._parse_patient(resource)
@@ -1488,7 +1461,7 @@ class FHIRUrineCultureSource(FHIRCultureSource):
                         patients[patient.fhir_id] = patient
 
             # Parse urine culture DiagnosticReports
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "DiagnosticReport":
                     culture = self._parse_urine_culture(resource)
@@ -1537,15 +1510,14 @@ class FHIRUrineCultureSource(FHIRCultureSource):
         }
 
         try:
-            response = self.session.get(
+            entries = iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/DiagnosticReport",
-                params=params,
+                params,
                 timeout=30,
             )
-            response.raise_for_status()
-            bundle = response.json()
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "DiagnosticReport":
                     culture = self._parse_urine_culture(resource)
@@ -1764,17 +1736,16 @@ class FHIRCDITestSource:
         }
 
         try:
-            response = self.session.get(
+            entries = list(iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/Observation",
-                params=params,
+                params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            ))
 
             # Build patient lookup from included resources
             patients = {}
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Patient":
                     patient = self._parse_patient(resource)
@@ -1782,7 +1753,7 @@ class FHIRCDITestSource:
                         patients[patient.fhir_id] = patient
 
             # Parse Observation resources for positive CDI tests
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Observation":
                     cdi_test = self._parse_cdi_observation(resource)
@@ -1846,15 +1817,9 @@ class FHIRCDITestSource:
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/Observation",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            entries = iter_bundle_entries(self.session, f"{self.base_url}/Observation", params, timeout=30)
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Observation":
                     cdi_test = self._parse_cdi_observation(resource)
@@ -1892,15 +1857,15 @@ class FHIRCDITestSource:
                 "_count": "1",
             }
 
-            response = self.session.get(
+            entries = iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/Encounter",
-                params=params,
+                params,
                 timeout=10,
+                limit=1,
             )
-            response.raise_for_status()
-            bundle = response.json()
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Encounter":
                     period = resource.get("period", {})
@@ -1946,15 +1911,15 @@ class FHIRCDITestSource:
                 "_count": "1",
             }
 
-            response = self.session.get(
+            entries = iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/Encounter",
-                params=params,
+                params,
                 timeout=10,
+                limit=1,
             )
-            response.raise_for_status()
-            bundle = response.json()
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Encounter":
                     period = resource.get("period", {})
@@ -2003,15 +1968,15 @@ class FHIRCDITestSource:
                 "_count": "1",
             }
 
-            response = self.session.get(
+            entries = iter_bundle_entries(
+                self.session,
                 f"{self.base_url}/Encounter",
-                params=params,
+                params,
                 timeout=10,
+                limit=1,
             )
-            response.raise_for_status()
-            bundle = response.json()
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Encounter":
                     info["encounter_id"] = resource.get("id")
@@ -2280,15 +2245,9 @@ class FHIRCDITestSource:
                 ("_sort", "-date"),
             ]
 
-            response = self.session.get(
-                f"{self.base_url}/Observation",
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            entries = iter_bundle_entries(self.session, f"{self.base_url}/Observation", params, timeout=10)
 
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") != "Observation":
                     continue
@@ -7,6 +7,7 @@ from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any
 
+from . import config  # noqa: F401 - puts the project root on sys.path for common.*
 from .models import (
     HAICandidate,
     HAIType,
@@ -27,8 +28,23 @@ from .models import (
     VentilationEpisode,
 )
 
+from common.db import Migration, add_column, ensure_schema, get_connection
+
 logger = logging.getLogger(__name__)
 
+SCHEMA_PATH = Path(__file__).parent.parent / "schema.sql"
+
+
+def _add_nhsn_reported_columns(conn: sqlite3.Connection) -> None:
+    add_column("hai_candidates", "nhsn_reported", "INTEGER DEFAULT 0")(conn)
+    add_column("hai_candidates", "nhsn_reported_at", "TEXT")(conn)
+
+
+# Schema changes for existing databases (see common.db.schema)
+MIGRATIONS = [
+    Migration(1, "Track NHSN submission of candidates", _add_nhsn_reported_columns),
+]
+
 
 def _log_hai_activity(
     activity_type: str,
@@ -44,14 +60,14 @@ def _log_hai_activity(
 ) -> None:
     """Log activity to the unified metrics store.
 
-    This is a fire-and-forget operation - failures are logged but don't
-    interrupt the main operation.
+    This is a fire-and-forget operation - the row is queued and written in
+    the background (see common.metrics_store.sink), and failures are logged
+    but don't interrupt the main operation.
     """
     try:
-        from common.metrics_store import MetricsStore, ModuleSource
+        from common.metrics_store import ModuleSource, get_activity_sink
 
-        store = MetricsStore()
-        store.log_activity(
+        get_activity_sink().log_activity(
             activity_type=activity_type,
             module=ModuleSource.HAI,
             provider_id=provider_id,
@@ -77,19 +93,12 @@ class HAIDatabase:
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize the database schema."""
-        schema_path = Path(__file__).parent.parent / "schema.sql"
-        with open(schema_path) as f:
-            schema = f.read()
-
-        with self._get_connection() as conn:
-            conn.executescript(schema)
+        """Initialize the database schema (once per process per database)."""
+        ensure_schema(self.db_path, "hai", schema_path=SCHEMA_PATH, migrations=MIGRATIONS)
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's shared WAL connection (see common.db)."""
+        return get_connection(self.db_path)
 
     # --- Candidate Operations ---
 
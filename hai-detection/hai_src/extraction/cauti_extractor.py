@@ -15,8 +15,8 @@ import json
 import logging
 from pathlib import Path
 
-from ..config import Config
 from ..models import HAICandidate, ClinicalNote
+from ..notes.packer import ContextPacker
 from ..rules.cauti_schemas import (
     CAUTIExtraction,
     UrinarySymptomExtraction,
@@ -50,6 +50,7 @@ class CAUTIExtractor:
         self.llm_client = llm_client
         self.prompt_version = prompt_version
         self.prompt_template = self._load_prompt_template()
+        self.packer = ContextPacker()
 
     def _load_prompt_template(self) -> str:
         """Load the extraction prompt template."""
@@ -144,16 +145,20 @@ Extract only what is documented. Do not infer or assume.
             "patient_age": cauti_data.patient_age if cauti_data else "Unknown",
         }
 
-        # Combine relevant notes
-        notes_text = self._prepare_notes(notes)
-        context["notes"] = notes_text
+        # Pack the most relevant note content into the CAUTI token budget
+        packed = self.packer.pack(notes, "cauti", anchor_date=candidate.culture.collection_date)
+        context["notes"] = packed.text
+        logger.info(
+            f"Context for {candidate.id}: kept {packed.tokens_kept} tokens, "
+            f"dropped {packed.tokens_dropped}"
+        )
 
         # Build prompt
         prompt = self.prompt_template.format(**context)
 
         # Call LLM
         try:
-            response = self._call_llm(prompt)
+            response = self._call_llm(prompt, context_stats=packed.to_dict())
             extraction = self._parse_response(response, len(notes))
             return extraction
         except Exception as e:
@@ -175,35 +180,28 @@ Extract only what is documented. Do not infer or assume.
 
         return "; ".join(parts) if parts else "Positive urine culture"
 
-    def _prepare_notes(self, notes: list[ClinicalNote]) -> str:
-        """Prepare notes for LLM input.
-
-        Sorts by date and formats with metadata.
-        """
-        # Sort by date, most recent first
-        sorted_notes = sorted(notes, key=lambda n: n.date, reverse=True)
-
-        formatted = []
-        for note in sorted_notes[:Config.MAX_NOTES_PER_PATIENT]:
-            header = f"--- {note.note_type.upper()} ({note.date.date()}) ---"
-            # Truncate very long notes
-            content = note.content[:8000] if len(note.content) > 8000 else note.content
-            formatted.append(f"{header}\n{content}")
-
-        return "\n\n".join(formatted)
-
-    def _call_llm(self, prompt: str) -> str:
+    def _call_llm(self, prompt: str, context_stats: dict | None = None) -> str:
         """Call LLM for extraction.
 
-        Uses configured LLM client or falls back to default.
+        Uses configured LLM client or falls back to default. The expected
+        JSON shape is spelled out in the prompt, so the schema passed to
+        the client only constrains output to a JSON object.
         """
-        if self.llm_client:
-            return self.llm_client.complete(prompt)
-
-        # Use default client from config
-        from ..llm import get_llm_client
-        client = get_llm_client()
-        return client.complete(prompt)
+        client = self.llm_client
+        if client is None:
+            # Use default client from config
+            from ..llm import get_llm_client
+            client = get_llm_client()
+
+        result = client.generate_structured(
+            prompt=prompt,
+            output_schema={"type": "object"},
+            temperature=0.0,  # Deterministic extraction
+            profile_context="cauti_extraction",
+            prompt_version=f"cauti_extraction_{self.prompt_version}",
+            context_stats=context_stats,
+        )
+        return json.dumps(result)
 
     def _parse_response(self, response: str, notes_count: int) -> CAUTIExtraction:
         """Parse LLM response to CAUTIExtraction.
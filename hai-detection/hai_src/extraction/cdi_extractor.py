@@ -22,6 +22,7 @@ from pathlib import Path
 
 from ..models import HAICandidate, ClinicalNote
 from ..llm.factory import get_llm_client
+from ..notes.packer import ContextPacker
 from ..rules.schemas import ConfidenceLevel, EvidenceSource
 from ..rules.cdi_schemas import (
     CDIExtraction,
@@ -113,6 +114,7 @@ class CDIExtractor:
         self._llm_client = llm_client
         self.prompt_version = prompt_version
         self.prompt_template = self._load_prompt_template()
+        self.packer = ContextPacker()
 
     @property
     def llm_client(self):
@@ -143,8 +145,13 @@ class CDIExtractor:
                 extraction_notes="No clinical notes available",
             )
 
-        # Format notes for prompt
-        notes_text = self._format_notes(notes)
+        # Pack the most relevant note content into the CDI token budget
+        packed = self.packer.pack(notes, "cdi", anchor_date=candidate.culture.collection_date)
+        notes_text = packed.text
+        logger.info(
+            f"Context for {candidate.id}: kept {packed.tokens_kept} tokens, "
+            f"dropped {packed.tokens_dropped}"
+        )
 
         # Get CDI-specific context from candidate
         cdi_data = getattr(candidate, "_cdi_data", None)
@@ -167,6 +174,8 @@ class CDIExtractor:
                 output_schema=CDI_EXTRACTION_SCHEMA,
                 temperature=0.0,  # Deterministic extraction
                 profile_context="cdi_extraction",
+                prompt_version=f"cdi_extraction_{self.prompt_version}",
+                context_stats=packed.to_dict(),
             )
             extraction = self._parse_response(result)
         except ValueError as e:
@@ -188,24 +197,6 @@ class CDIExtractor:
         extraction.notes_reviewed_count = len(notes)
         return extraction
 
-    def _format_notes(self, notes: list[ClinicalNote]) -> str:
-        """Format clinical notes for the prompt."""
-        formatted = []
-
-        for note in notes:
-            header = f"=== {note.note_type.upper()} ({note.date.strftime('%Y-%m-%d')}) ==="
-            if note.author:
-                header += f" by {note.author}"
-
-            # Truncate very long notes
-            content = note.content
-            if len(content) > 4000:
-                content = content[:4000] + "\n... [truncated]"
-
-            formatted.append(f"{header}\n{content}")
-
-        return "\n\n".join(formatted)
-
     def _parse_response(self, data: dict) -> CDIExtraction:
         """Parse LLM structured response into CDIExtraction.
 
@@ -16,6 +16,7 @@ from ..config import Config
 from ..models import HAICandidate, ClinicalNote, LLMAuditEntry
 from ..llm.factory import get_llm_client
 from ..notes.chunker import NoteChunker
+from ..notes.packer import ContextPacker, PackedContext
 from ..db import HAIDatabase
 from ..rules.schemas import (
     ClinicalExtraction,
@@ -187,6 +188,7 @@ class CLABSIExtractor:
         self._llm_client = llm_client
         self.db = db
         self.chunker = NoteChunker()
+        self.packer = ContextPacker(self.chunker)
         self._prompt_template = self._load_prompt_template()
 
     @property
@@ -236,7 +238,8 @@ Respond with JSON matching the ClinicalExtraction schema."""
         start_time = time.time()
 
         # Build prompt
-        prompt = self._build_prompt(candidate, notes)
+        packed = self._pack_notes(candidate, notes)
+        prompt = self._build_prompt(candidate, notes, packed)
 
         try:
             # Call LLM with structured output
@@ -245,6 +248,8 @@ Respond with JSON matching the ClinicalExtraction schema."""
                 output_schema=EXTRACTION_OUTPUT_SCHEMA,
                 temperature=0.0,  # Deterministic extraction
                 profile_context="clabsi_extraction",
+                prompt_version=self.PROMPT_VERSION,
+                context_stats=packed.to_dict(),
             )
 
             elapsed_ms = int((time.time() - start_time) * 1000)
@@ -273,14 +278,30 @@ Respond with JSON matching the ClinicalExtraction schema."""
                 extraction_notes=f"LLM extraction error: {e}",
             )
 
+    def _pack_notes(
+        self,
+        candidate: HAICandidate,
+        notes: list[ClinicalNote],
+    ) -> PackedContext:
+        """Pack the most relevant note content into the CLABSI token budget."""
+        packed = self.packer.pack(notes, "clabsi", anchor_date=candidate.culture.collection_date)
+        logger.info(
+            f"Context for {candidate.id}: kept {packed.tokens_kept} tokens, "
+            f"dropped {packed.tokens_dropped}"
+        )
+        return packed
+
     def _build_prompt(
         self,
         candidate: HAICandidate,
         notes: list[ClinicalNote],
+        packed: PackedContext | None = None,
     ) -> str:
         """Build the extraction prompt."""
-        # Extract relevant context from notes
-        notes_context = self.chunker.extract_relevant_context(notes)
+        # Relevance-ranked note context within the token budget
+        if packed is None:
+            packed = self._pack_notes(candidate, notes)
+        notes_context = packed.text
 
         # Format prompt
         return self._prompt_template.format(
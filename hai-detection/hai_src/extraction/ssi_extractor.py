@@ -17,6 +17,7 @@ from ..config import Config
 from ..models import HAICandidate, ClinicalNote, LLMAuditEntry, SurgicalProcedure
 from ..llm.factory import get_llm_client
 from ..notes.chunker import NoteChunker
+from ..notes.packer import ContextPacker, PackedContext
 from ..db import HAIDatabase
 from ..rules.schemas import ConfidenceLevel, EvidenceSource
 from ..rules.ssi_schemas import (
@@ -207,6 +208,7 @@ class SSIExtractor:
         self._llm_client = llm_client
         self.db = db
         self.chunker = NoteChunker()
+        self.packer = ContextPacker(self.chunker)
         self._prompt_template = self._load_prompt_template()
 
     @property
@@ -276,7 +278,8 @@ Respond with JSON matching the SSIExtraction schema."""
             )
 
         # Build prompt
-        prompt = self._build_prompt(candidate, notes, procedure)
+        packed = self._pack_notes(candidate, notes, procedure)
+        prompt = self._build_prompt(candidate, notes, procedure, packed)
 
         try:
             # Call LLM with structured output
@@ -285,6 +288,8 @@ Respond with JSON matching the SSIExtraction schema."""
                 output_schema=SSI_EXTRACTION_OUTPUT_SCHEMA,
                 temperature=0.0,  # Deterministic extraction
                 profile_context="ssi_extraction",
+                prompt_version=self.PROMPT_VERSION,
+                context_stats=packed.to_dict(),
             )
 
             elapsed_ms = int((time.time() - start_time) * 1000)
@@ -313,17 +318,42 @@ Respond with JSON matching the SSIExtraction schema."""
                 extraction_notes=f"LLM extraction error: {e}",
             )
 
+    def _pack_notes(
+        self,
+        candidate: HAICandidate,
+        notes: list[ClinicalNote],
+        procedure: SurgicalProcedure | None = None,
+    ) -> PackedContext:
+        """Pack the most relevant note content into the SSI token budget.
+
+        The surveillance window opens at the procedure, so notes are ranked
+        by proximity to the procedure date when it is known.
+        """
+        if procedure is not None:
+            anchor_date = procedure.procedure_date
+        else:
+            anchor_date = candidate.culture.collection_date
+        packed = self.packer.pack(notes, "ssi", anchor_date=anchor_date)
+        logger.info(
+            f"Context for {candidate.id}: kept {packed.tokens_kept} tokens, "
+            f"dropped {packed.tokens_dropped}"
+        )
+        return packed
+
     def _build_prompt(
         self,
         candidate: HAICandidate,
         notes: list[ClinicalNote],
         procedure: SurgicalProcedure,
+        packed: PackedContext | None = None,
     ) -> str:
         """Build the extraction prompt."""
-        # Extract relevant context from notes
-        # With 70B Q4 model on limited VRAM, context is limited to ~4K tokens
-        # Keep notes to ~4K chars to fit within context window
-        notes_context = self.chunker.extract_relevant_context(notes, max_length=4000)
+        # Relevance-ranked note context within the token budget
+        # With 70B Q4 model on limited VRAM, context is limited to ~4K tokens,
+        # so the SSI budget defaults to ~1K tokens of notes
+        if packed is None:
+            packed = self._pack_notes(candidate, notes, procedure)
+        notes_context = packed.text
 
         # Calculate days post-op
         now = datetime.now()
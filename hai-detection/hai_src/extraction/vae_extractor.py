@@ -23,6 +23,7 @@ from ..config import Config
 from ..models import HAICandidate, ClinicalNote, LLMAuditEntry, VAECandidate
 from ..llm.factory import get_llm_client
 from ..notes.chunker import NoteChunker
+from ..notes.packer import ContextPacker, PackedContext
 from ..db import HAIDatabase
 from ..rules.schemas import ConfidenceLevel, EvidenceSource
 from ..rules.vae_schemas import (
@@ -188,6 +189,7 @@ class VAEExtractor:
         self._llm_client = llm_client
         self.db = db
         self.chunker = NoteChunker()
+        self.packer = ContextPacker(self.chunker)
         self._prompt_template = self._load_prompt_template()
 
     @property
@@ -255,7 +257,8 @@ Respond with JSON matching the VAEExtraction schema."""
             )
 
         # Build prompt
-        prompt = self._build_prompt(candidate, notes, vae_data)
+        packed = self._pack_notes(candidate, notes, vae_data)
+        prompt = self._build_prompt(candidate, notes, vae_data, packed)
 
         try:
             # Call LLM with structured output
@@ -264,6 +267,8 @@ Respond with JSON matching the VAEExtraction schema."""
                 output_schema=VAE_EXTRACTION_OUTPUT_SCHEMA,
                 temperature=0.0,  # Deterministic extraction
                 profile_context="vae_extraction",
+                prompt_version=self.PROMPT_VERSION,
+                context_stats=packed.to_dict(),
             )
 
             elapsed_ms = int((time.time() - start_time) * 1000)
@@ -292,15 +297,33 @@ Respond with JSON matching the VAEExtraction schema."""
                 extraction_notes=f"LLM extraction error: {e}",
             )
 
+    def _pack_notes(
+        self,
+        candidate: HAICandidate,
+        notes: list[ClinicalNote],
+        vae_data: VAECandidate,
+    ) -> PackedContext:
+        """Pack the most relevant note content into the VAE token budget."""
+        anchor_date = vae_data.vac_onset_date or candidate.culture.collection_date
+        packed = self.packer.pack(notes, "vae", anchor_date=anchor_date)
+        logger.info(
+            f"Context for {candidate.id}: kept {packed.tokens_kept} tokens, "
+            f"dropped {packed.tokens_dropped}"
+        )
+        return packed
+
     def _build_prompt(
         self,
         candidate: HAICandidate,
         notes: list[ClinicalNote],
         vae_data: VAECandidate,
+        packed: PackedContext | None = None,
     ) -> str:
         """Build the extraction prompt."""
-        # Extract relevant context from notes
-        notes_context = self.chunker.extract_relevant_context(notes)
+        # Relevance-ranked note context within the token budget
+        if packed is None:
+            packed = self._pack_notes(candidate, notes, vae_data)
+        notes_context = packed.text
 
         # Get VAE-specific context
         vac_onset_date = vae_data.vac_onset_date.strftime("%Y-%m-%d") if vae_data.vac_onset_date else "Unknown"
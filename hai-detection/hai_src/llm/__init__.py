@@ -1,11 +1,15 @@
 """LLM backend abstraction layer."""
 
-from .base import BaseLLMClient, LLMResponse, LLMProfile, StructuredLLMResponse
+from .base import BaseLLMClient, LLMResponse, LLMProfile, StructuredLLMResponse, StructuredRequest
 from .ollama import OllamaClient
 from .factory import get_llm_client
+from .cache import LLMResponseCache, get_llm_cache
 
 # Profiling utilities
-from .ollama import (
+from .profile_store import (
+    LLMProfileStore,
+    QuantileSketch,
+    get_profile_store,
     get_profile_history,
     get_profile_summary,
     clear_profile_history,
@@ -17,9 +21,16 @@ __all__ = [
     "LLMResponse",
     "LLMProfile",
     "StructuredLLMResponse",
+    "StructuredRequest",
     "OllamaClient",
     "get_llm_client",
+    # Response cache
+    "LLMResponseCache",
+    "get_llm_cache",
     # Profiling
+    "LLMProfileStore",
+    "QuantileSketch",
+    "get_profile_store",
     "get_profile_history",
     "get_profile_summary",
     "clear_profile_history",
@@ -1,5 +1,6 @@
 """Abstract base class for LLM clients."""
 
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -23,6 +24,10 @@ class LLMProfile:
     prefill_ms: float = 0.0  # Time to process input (prompt_eval)
     generation_ms: float = 0.0  # Time to generate output (eval)
 
+    # Note context packing (see notes.packer.ContextPacker)
+    context_tokens_kept: int = 0
+    context_tokens_dropped: int = 0
+
     # Derived metrics
     @property
     def tokens_per_second(self) -> float:
@@ -55,6 +60,8 @@ class LLMProfile:
             "tokens_per_second": round(self.tokens_per_second, 1),
             "prefill_tokens_per_second": round(self.prefill_tokens_per_second, 1),
             "model_was_cold": self.model_was_cold,
+            "context_tokens_kept": self.context_tokens_kept,
+            "context_tokens_dropped": self.context_tokens_dropped,
         }
 
     def summary(self) -> str:
@@ -71,6 +78,8 @@ class LLMProfile:
             f"gen={self.generation_ms:.0f}ms",
             f"({self.tokens_per_second:.1f}tok/s)",
         ])
+        if self.context_tokens_dropped:
+            parts.append(f"ctx_dropped={self.context_tokens_dropped}tok")
         return " | ".join(parts)
 
 
@@ -92,6 +101,19 @@ class StructuredLLMResponse:
     data: dict[str, Any]  # Parsed JSON response
     profile: LLMProfile
     raw_response: dict[str, Any] | None = None
+    from_cache: bool = False  # Served from LLMResponseCache (no model call)
+
+
+@dataclass
+class StructuredRequest:
+    """One structured generation request for generate_structured_many()."""
+    prompt: str
+    output_schema: dict[str, Any]
+    system_prompt: str | None = None
+    temperature: float = 0.0
+    profile_context: str = ""
+    prompt_version: str = ""
+    context_stats: dict[str, Any] | None = None
 
 
 class BaseLLMClient(ABC):
@@ -125,6 +147,9 @@ class BaseLLMClient(ABC):
         output_schema: dict[str, Any],
         system_prompt: str | None = None,
         temperature: float = 0.0,
+        profile_context: str = "",
+        prompt_version: str = "",
+        context_stats: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """Generate a structured response matching a JSON schema.
 
@@ -133,12 +158,82 @@ class BaseLLMClient(ABC):
             output_schema: JSON schema for the expected output
             system_prompt: Optional system prompt
             temperature: Sampling temperature
+            profile_context: Label for profiling/logging (e.g., "clabsi_extraction")
+            prompt_version: Prompt template version, used to key cached responses
+            context_stats: Token accounting from context packing
+                (PackedContext.to_dict()), recorded on the call's LLMProfile
 
         Returns:
             Parsed JSON response matching the schema
         """
         pass
 
+    def generate_structured_with_profile(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        profile_context: str = "",
+        prompt_version: str = "",
+        context_stats: dict[str, Any] | None = None,
+    ) -> StructuredLLMResponse:
+        """Generate a structured response with profiling data.
+
+        Backends that report token counts and timings override this. The
+        default wraps generate_structured() and records wall-clock time only.
+        """
+        start = time.perf_counter()
+        data = self.generate_structured(
+            prompt=prompt,
+            output_schema=output_schema,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            profile_context=profile_context,
+            prompt_version=prompt_version,
+            context_stats=context_stats,
+        )
+        profile = LLMProfile(total_ms=(time.perf_counter() - start) * 1000)
+        if context_stats:
+            profile.context_tokens_kept = context_stats.get("tokens_kept", 0)
+            profile.context_tokens_dropped = context_stats.get("tokens_dropped", 0)
+        return StructuredLLMResponse(data=data, profile=profile)
+
+    def generate_structured_many(
+        self,
+        requests: list[StructuredRequest],
+        max_concurrency: int | None = None,
+    ) -> list[StructuredLLMResponse | Exception]:
+        """Run several structured requests, returning results in input order.
+
+        The default runs them one after another. Backends that batch
+        concurrent requests on the server (vLLM) override this to submit
+        them together, so a batch takes about as long as its slowest member.
+
+        Args:
+            requests: Requests to run
+            max_concurrency: Maximum requests in flight (backend default if None)
+
+        Returns:
+            One entry per request: the response, or the exception it raised.
+            A failed request never aborts the rest of the batch.
+        """
+        results: list[StructuredLLMResponse | Exception] = []
+        for request in requests:
+            try:
+                results.append(self.generate_structured_with_profile(
+                    prompt=request.prompt,
+                    output_schema=request.output_schema,
+                    system_prompt=request.system_prompt,
+                    temperature=request.temperature,
+                    profile_context=request.profile_context,
+                    prompt_version=request.prompt_version,
+                    context_stats=request.context_stats,
+                ))
+            except Exception as e:
+                results.append(e)
+        return results
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the LLM backend is available."""
@@ -0,0 +1,283 @@
+"""Persistent, content-addressed cache for structured LLM extractions.
+
+Re-classifying a candidate whose notes haven't changed (a crash mid-batch,
+a rolled-back prompt bump, a dry-run followed by the real run) sends the
+exact same prompt to the model again. Extraction runs at temperature 0, so
+the answer is the same too - this cache returns it in milliseconds instead
+of minutes of GPU time.
+
+Entries are keyed on a SHA-256 of everything that determines the output:
+model name, prompt version, output schema, system prompt, temperature and
+the fully rendered prompt. Any change to the notes or the template
+produces a new key, so stale answers are never served.
+
+Storage is a small SQLite table. Entries expire after a TTL and the
+least-recently-used entries are evicted once the table exceeds its size
+limit.
+
+Usage:
+    from hai_src.llm.cache import get_llm_cache
+
+    cache = get_llm_cache()
+    key = cache.make_key(model, prompt_version, schema, system_prompt, prompt)
+    data = cache.get(key)
+    if data is None:
+        data = call_llm(...)
+        cache.put(key, data, model=model, prompt_version=prompt_version)
+
+    print(cache.get_stats())
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt_version TEXT,
+    response_json TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_accessed_at REAL NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_accessed ON llm_cache(last_accessed_at);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created_at);
+"""
+
+
+class LLMResponseCache:
+    """SQLite-backed cache of parsed structured LLM responses.
+
+    Thread-safe: each operation opens its own connection, and in-memory
+    hit/miss counters are guarded by a lock.
+    """
+
+    # Evict every N puts rather than on every write
+    EVICTION_INTERVAL = 50
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        ttl_hours: float | None = None,
+        max_entries: int | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            db_path: SQLite file for cache storage. Uses config if None.
+            ttl_hours: Entry lifetime in hours. Uses config if None; 0 disables expiry.
+            max_entries: Maximum number of entries kept. Uses config if None.
+        """
+        self.db_path = Path(db_path or Config.LLM_CACHE_PATH).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = (ttl_hours if ttl_hours is not None else Config.LLM_CACHE_TTL_HOURS) * 3600
+        self.max_entries = max_entries if max_entries is not None else Config.LLM_CACHE_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt_version: str,
+        output_schema: dict[str, Any] | None,
+        system_prompt: str | None,
+        prompt: str,
+        temperature: float = 0.0,
+    ) -> str:
+        """Build the content-addressed cache key for a request."""
+        material = json.dumps(
+            {
+                "model": model,
+                "prompt_version": prompt_version or "",
+                "schema": output_schema,
+                "system_prompt": system_prompt or "",
+                "temperature": temperature,
+                "prompt": prompt,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Look up a cached response.
+
+        Returns:
+            The cached parsed JSON response, or None on miss/expiry.
+        """
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response_json, created_at FROM llm_cache WHERE cache_key = ?",
+                    (key,),
+                ).fetchone()
+
+                if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                    row = None
+
+                if row is not None:
+                    conn.execute(
+                        """
+                        UPDATE llm_cache
+                        SET last_accessed_at = ?, hit_count = hit_count + 1
+                        WHERE cache_key = ?
+                        """,
+                        (now, key),
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        return json.loads(row[0]) if row is not None else None
+
+    def put(
+        self,
+        key: str,
+        data: dict[str, Any],
+        model: str = "",
+        prompt_version: str = "",
+    ) -> None:
+        """Store a parsed response."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO llm_cache (
+                        cache_key, model, prompt_version, response_json,
+                        created_at, last_accessed_at, hit_count
+                    ) VALUES (?, ?, ?, ?, ?, ?, 0)
+                    """,
+                    (key, model, prompt_version, json.dumps(data), now, now),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._writes += 1
+            run_eviction = self._writes % self.EVICTION_INTERVAL == 0
+
+        if run_eviction:
+            self.evict()
+
+    def evict(self) -> int:
+        """Remove expired entries and trim to max_entries (least recently used first).
+
+        Returns:
+            Number of entries removed.
+        """
+        removed = 0
+        try:
+            with self._connect() as conn:
+                if self.ttl_seconds:
+                    cursor = conn.execute(
+                        "DELETE FROM llm_cache WHERE created_at < ?",
+                        (time.time() - self.ttl_seconds,),
+                    )
+                    removed += cursor.rowcount
+
+                if self.max_entries:
+                    cursor = conn.execute(
+                        """
+                        DELETE FROM llm_cache WHERE cache_key IN (
+                            SELECT cache_key FROM llm_cache
+                            ORDER BY last_accessed_at DESC
+                            LIMIT -1 OFFSET ?
+                        )
+                        """,
+                        (self.max_entries,),
+                    )
+                    removed += cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache eviction failed: {e}")
+            return 0
+
+        if removed:
+            with self._lock:
+                self._evictions += removed
+            logger.debug(f"LLM cache evicted {removed} entries")
+        return removed
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache")
+        with self._lock:
+            self._hits = self._misses = self._writes = self._evictions = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit/miss counters for this process plus table size."""
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            writes, evictions = self._writes, self._evictions
+
+        entries = 0
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        except sqlite3.Error:
+            pass
+
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "writes": writes,
+            "evictions": evictions,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_hours": self.ttl_seconds / 3600,
+        }
+
+
+# Process-wide cache instance
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """Get the shared LLM response cache.
+
+    Returns:
+        The process-wide cache, or None if caching is disabled in config.
+    """
+    global _cache
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
@@ -6,21 +6,17 @@ requiring a BAA.
 
 import json
 import logging
-import time
 from typing import Any
 
 import requests
 
 from ..config import Config
 from .base import BaseLLMClient, LLMResponse, LLMProfile, StructuredLLMResponse
+from .cache import LLMResponseCache, get_llm_cache
+from .profile_store import record_profile
 
 logger = logging.getLogger(__name__)
 
-# Module-level profiling storage for analysis
-_profile_history: list[dict[str, Any]] = []
-_profile_history_max = 100  # Keep last N profiles
-
-
 def _extract_profile(data: dict[str, Any]) -> LLMProfile:
     """Extract profiling data from Ollama response.
 
@@ -38,67 +34,6 @@ def _extract_profile(data: dict[str, Any]) -> LLMProfile:
     )
 
 
-def _store_profile(profile: LLMProfile, context: str = "") -> None:
-    """Store profile in history for analysis."""
-    global _profile_history
-    _profile_history.append({
-        "timestamp": time.time(),
-        "context": context,
-        **profile.to_dict(),
-    })
-    # Trim to max size
-    if len(_profile_history) > _profile_history_max:
-        _profile_history = _profile_history[-_profile_history_max:]
-
-
-def get_profile_history() -> list[dict[str, Any]]:
-    """Get stored profile history for analysis."""
-    return _profile_history.copy()
-
-
-def get_profile_summary() -> dict[str, Any]:
-    """Get summary statistics from profile history."""
-    if not _profile_history:
-        return {"count": 0, "message": "No profiles recorded"}
-
-    profiles = _profile_history
-    n = len(profiles)
-
-    def avg(key: str) -> float:
-        vals = [p[key] for p in profiles if key in p]
-        return sum(vals) / len(vals) if vals else 0
-
-    def percentile(key: str, pct: float) -> float:
-        vals = sorted(p[key] for p in profiles if key in p)
-        if not vals:
-            return 0
-        idx = int(len(vals) * pct)
-        return vals[min(idx, len(vals) - 1)]
-
-    cold_starts = sum(1 for p in profiles if p.get("model_was_cold", False))
-
-    return {
-        "count": n,
-        "cold_starts": cold_starts,
-        "avg_total_ms": round(avg("total_ms"), 1),
-        "avg_prefill_ms": round(avg("prefill_ms"), 1),
-        "avg_generation_ms": round(avg("generation_ms"), 1),
-        "avg_input_tokens": round(avg("input_tokens"), 0),
-        "avg_output_tokens": round(avg("output_tokens"), 0),
-        "avg_tokens_per_second": round(avg("tokens_per_second"), 1),
-        "p50_total_ms": round(percentile("total_ms", 0.5), 1),
-        "p95_total_ms": round(percentile("total_ms", 0.95), 1),
-        "p50_generation_ms": round(percentile("generation_ms", 0.5), 1),
-        "p95_generation_ms": round(percentile("generation_ms", 0.95), 1),
-    }
-
-
-def clear_profile_history() -> None:
-    """Clear stored profile history."""
-    global _profile_history
-    _profile_history = []
-
-
 class OllamaClient(BaseLLMClient):
     """Ollama API client for local LLM inference."""
 
@@ -109,6 +44,8 @@ class OllamaClient(BaseLLMClient):
         timeout: int = 300,  # Increased for large models like 70b
         num_ctx: int = 8192,  # Context window size
         enable_profiling: bool = True,  # Store profiles for analysis
+        cache: LLMResponseCache | None = None,
+        use_cache: bool = True,
     ):
         """Initialize Ollama client.
 
@@ -117,13 +54,16 @@ class OllamaClient(BaseLLMClient):
             model: Model to use. Uses config if None.
             timeout: Request timeout in seconds.
             num_ctx: Context window size in tokens.
-            enable_profiling: Whether to store profiles in history.
+            enable_profiling: Whether to record profiles in the profile store.
+            cache: Structured response cache. Uses the shared cache if None.
+            use_cache: If False, never read or write the response cache.
         """
         self.base_url = (base_url or Config.OLLAMA_BASE_URL).rstrip("/")
         self.model = model or Config.OLLAMA_MODEL
         self.timeout = timeout
         self.num_ctx = num_ctx
         self.enable_profiling = enable_profiling
+        self.cache = (cache or get_llm_cache()) if use_cache else None
         self.session = requests.Session()
 
     def generate(
@@ -182,7 +122,7 @@ class OllamaClient(BaseLLMClient):
 
             # Store for analysis
             if self.enable_profiling:
-                _store_profile(profile, profile_context)
+                record_profile(profile, profile_context, model=self.model)
 
             return LLMResponse(
                 content=data.get("message", {}).get("content", ""),
@@ -205,6 +145,8 @@ class OllamaClient(BaseLLMClient):
         system_prompt: str | None = None,
         temperature: float = 0.0,
         profile_context: str = "",
+        prompt_version: str = "",
+        context_stats: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """Generate a structured JSON response.
 
@@ -218,6 +160,8 @@ class OllamaClient(BaseLLMClient):
             system_prompt=system_prompt,
             temperature=temperature,
             profile_context=profile_context,
+            prompt_version=prompt_version,
+            context_stats=context_stats,
         )
         return result.data
 
@@ -228,19 +172,38 @@ class OllamaClient(BaseLLMClient):
         system_prompt: str | None = None,
         temperature: float = 0.0,
         profile_context: str = "",
+        prompt_version: str = "",
+        context_stats: dict[str, Any] | None = None,
     ) -> StructuredLLMResponse:
         """Generate a structured JSON response with profiling data.
 
+        Deterministic calls (temperature 0) are served from the response
+        cache when the same model, prompt version, schema and rendered
+        prompt have been seen before.
+
         Args:
             prompt: The user prompt.
             output_schema: JSON schema for the expected output.
             system_prompt: Optional system prompt.
             temperature: Sampling temperature (0.0 = deterministic).
             profile_context: Optional context string for profiling.
+            prompt_version: Prompt template version (part of the cache key).
+            context_stats: Token accounting from context packing, copied
+                onto the returned profile.
 
         Returns:
             StructuredLLMResponse with parsed data and profiling.
         """
+        cache_key = None
+        if self.cache is not None and temperature == 0.0:
+            cache_key = self.cache.make_key(
+                self.model, prompt_version, output_schema, system_prompt, prompt, temperature
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"LLM structured [{profile_context or 'unnamed'}]: cache hit")
+                return StructuredLLMResponse(data=cached, profile=LLMProfile(), from_cache=True)
+
         # Build system prompt with JSON schema
         schema_prompt = f"""You must respond with valid JSON matching this schema:
 {json.dumps(output_schema, indent=2)}
@@ -276,17 +239,29 @@ class OllamaClient(BaseLLMClient):
 
             # Extract detailed profiling
             profile = _extract_profile(data)
+            if context_stats:
+                profile.context_tokens_kept = context_stats.get("tokens_kept", 0)
+                profile.context_tokens_dropped = context_stats.get("tokens_dropped", 0)
 
             # Log profiling summary
             logger.info(f"LLM structured [{profile_context or 'unnamed'}]: {profile.summary()}")
 
             # Store for analysis
             if self.enable_profiling:
-                _store_profile(profile, profile_context)
+                record_profile(
+                    profile,
+                    profile_context,
+                    model=self.model,
+                    prompt_version=prompt_version,
+                    context_stats=context_stats,
+                )
 
             # Parse JSON response
             parsed = json.loads(content)
 
+            if cache_key is not None:
+                self.cache.put(cache_key, parsed, model=self.model, prompt_version=prompt_version)
+
             return StructuredLLMResponse(
                 data=parsed,
                 profile=profile,
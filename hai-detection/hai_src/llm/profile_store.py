@@ -0,0 +1,518 @@
+"""Persistent LLM call profiling.
+
+Every profiled LLM call (token counts, load/prefill/generation time, cold
+starts) is written to a compact SQLite table so latency can be tracked
+across runs, models and prompt versions - e.g. against the ~85 s/note
+baseline in TODO_LLM_OPTIMIZATION.md - and shown on the dashboard.
+
+Writes go through a bounded queue to a background thread that inserts
+in batches, so recording a profile never blocks an extraction on disk I/O.
+If the queue is full the profile is dropped and counted.
+
+Percentiles come from QuantileSketch, a log-bucketed streaming sketch with
+bounded relative error, so summaries are built in one pass over the rows
+without holding or sorting them.
+
+Usage:
+    store = get_profile_store()
+    store.record(profile, context="clabsi_extraction", model="llama3.3:70b")
+    store.get_summary(days=7)["overall"]["p95_total_ms"]
+"""
+
+import atexit
+import logging
+import math
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from ..config import Config
+from ..models import HAIType
+from .base import LLMProfile
+
+logger = logging.getLogger(__name__)
+
+
+_HAI_TYPES = {t.value for t in HAIType}
+
+_COLUMNS = (
+    "recorded_at", "model", "context", "hai_type", "prompt_version",
+    "input_tokens", "output_tokens", "total_ms", "load_ms", "prefill_ms",
+    "generation_ms", "context_tokens_kept", "context_tokens_dropped", "cold_start",
+)
+
+# Queue sentinel asking the writer to exit after flushing
+_STOP = object()
+
+
+class QuantileSketch:
+    """Streaming quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets (bucket i covers
+    (gamma^(i-1), gamma^i]), so any quantile is returned within
+    ``relative_accuracy`` of the true value using O(log(max/min)) memory.
+    Sketches with the same accuracy can be merged.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: dict[int, int] = defaultdict(int)
+        self._zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add a non-negative value."""
+        self.count += 1
+        if value <= 1e-9:
+            self._zero_count += 1
+        else:
+            self._buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch (same accuracy) into this one."""
+        for index, count in other._buckets.items():
+            self._buckets[index] += count
+        self._zero_count += other._zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1). Returns 0.0 if empty."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                # Midpoint (in relative terms) of the bucket's range
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+
+class ProfileStats:
+    """Running averages and percentile sketches for a group of profiles."""
+
+    _SKETCHED = ("total_ms", "prefill_ms", "generation_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.cold_starts = 0
+        self._sums: dict[str, float] = defaultdict(float)
+        self._sketches = {key: QuantileSketch() for key in self._SKETCHED}
+
+    def add(self, row: dict[str, Any]) -> None:
+        """Add one profile (a row dict with _COLUMNS keys)."""
+        self.count += 1
+        self.cold_starts += 1 if row["cold_start"] else 0
+        for key in ("total_ms", "prefill_ms", "generation_ms", "input_tokens", "output_tokens"):
+            self._sums[key] += row[key] or 0
+        if row["generation_ms"]:
+            self._sums["tokens_per_second"] += row["output_tokens"] / (row["generation_ms"] / 1000)
+        for key, sketch in self._sketches.items():
+            sketch.add(row[key] or 0.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary with the same keys get_profile_summary() has always returned."""
+        if self.count == 0:
+            return {"count": 0, "message": "No profiles recorded"}
+
+        def avg(key: str) -> float:
+            return self._sums[key] / self.count
+
+        summary = {
+            "count": self.count,
+            "cold_starts": self.cold_starts,
+            "avg_total_ms": round(avg("total_ms"), 1),
+            "avg_prefill_ms": round(avg("prefill_ms"), 1),
+            "avg_generation_ms": round(avg("generation_ms"), 1),
+            "avg_input_tokens": round(avg("input_tokens"), 0),
+            "avg_output_tokens": round(avg("output_tokens"), 0),
+            "avg_tokens_per_second": round(avg("tokens_per_second"), 1),
+        }
+        for key, sketch in self._sketches.items():
+            for pct in (50, 95, 99):
+                summary[f"p{pct}_{key}"] = round(sketch.quantile(pct / 100), 1)
+        return summary
+
+
+class LLMProfileStore:
+    """SQLite-backed LLM profile store with a buffered background writer."""
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        flush_interval: float | None = None,
+        batch_size: int | None = None,
+        max_queue: int = 10000,
+        retention_days: int | None = None,
+    ):
+        """Initialize the store.
+
+        Args:
+            db_path: SQLite file. Uses LLM_PROFILE_DB_PATH config if None.
+            flush_interval: Max seconds a recorded profile waits before being
+                written. Uses LLM_PROFILE_FLUSH_SECONDS config if None.
+            batch_size: Write as soon as this many profiles are buffered.
+            max_queue: Profiles buffered before new ones are dropped.
+            retention_days: Rows older than this are pruned when the writer
+                starts. Uses LLM_PROFILE_RETENTION_DAYS config if None.
+        """
+        self.db_path = Path(db_path or Config.LLM_PROFILE_DB_PATH)
+        self.flush_interval = flush_interval if flush_interval is not None else Config.LLM_PROFILE_FLUSH_SECONDS
+        self.batch_size = batch_size or Config.LLM_PROFILE_BATCH_SIZE
+        self.retention_days = retention_days if retention_days is not None else Config.LLM_PROFILE_RETENTION_DAYS
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+        self.dropped = 0
+
+        # In-process stats since start (or reset_live()), for runners/scripts
+        self._live = ProfileStats()
+        self._live_lock = threading.Lock()
+
+    def _init_db(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS llm_profiles (
+                    recorded_at REAL NOT NULL,
+                    model TEXT NOT NULL,
+                    context TEXT,
+                    hai_type TEXT,
+                    prompt_version TEXT,
+                    input_tokens INTEGER,
+                    output_tokens INTEGER,
+                    total_ms REAL,
+                    load_ms REAL,
+                    prefill_ms REAL,
+                    generation_ms REAL,
+                    context_tokens_kept INTEGER,
+                    context_tokens_dropped INTEGER,
+                    cold_start INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_llm_profiles_time
+                    ON llm_profiles(recorded_at);
+            """)
+
+    def record(
+        self,
+        profile: LLMProfile,
+        context: str = "",
+        model: str = "",
+        prompt_version: str = "",
+        hai_type: str | None = None,
+    ) -> None:
+        """Queue a profile for writing. Never blocks.
+
+        Args:
+            profile: Profile of one LLM call
+            context: Call label (e.g. "clabsi_extraction", "triage_cdi")
+            model: Model name
+            prompt_version: Prompt template version
+            hai_type: HAI type. Inferred from the context label if None.
+        """
+        row = {
+            "recorded_at": time.time(),
+            "model": model,
+            "context": context,
+            "hai_type": hai_type or self._infer_hai_type(context),
+            "prompt_version": prompt_version,
+            "input_tokens": profile.input_tokens,
+            "output_tokens": profile.output_tokens,
+            "total_ms": profile.total_ms,
+            "load_ms": profile.load_ms,
+            "prefill_ms": profile.prefill_ms,
+            "generation_ms": profile.generation_ms,
+            "context_tokens_kept": profile.context_tokens_kept,
+            "context_tokens_dropped": profile.context_tokens_dropped,
+            "cold_start": int(profile.model_was_cold),
+        }
+
+        with self._live_lock:
+            self._live.add(row)
+
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(tuple(row[c] for c in _COLUMNS))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"LLM profile queue full, dropped {self.dropped} profiles so far")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything recorded so far is written.
+
+        Returns:
+            False if the writer didn't catch up within timeout.
+        """
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending profiles and stop the writer thread."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("LLM profile queue full at shutdown, pending profiles lost")
+            return
+        writer.join(timeout)
+
+    def live_summary(self) -> dict[str, Any]:
+        """Summary of profiles recorded by this process since the last reset."""
+        with self._live_lock:
+            return self._live.to_dict()
+
+    def reset_live(self) -> None:
+        """Reset the in-process summary (persisted rows are kept)."""
+        with self._live_lock:
+            self._live = ProfileStats()
+
+    def recent(self, limit: int = 100, model: str | None = None) -> list[dict[str, Any]]:
+        """Most recent persisted profiles, oldest first.
+
+        Each dict has the LLMProfile.to_dict() keys plus timestamp,
+        context, model, hai_type and prompt_version.
+        """
+        self.flush()
+        query = f"SELECT {', '.join(_COLUMNS)} FROM llm_profiles"
+        params: list[Any] = []
+        if model:
+            query += " WHERE model = ?"
+            params.append(model)
+        query += " ORDER BY recorded_at DESC LIMIT ?"
+        params.append(limit)
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(query, params).fetchall()
+
+        history = []
+        for row in reversed(rows):
+            profile = LLMProfile(
+                input_tokens=row["input_tokens"],
+                output_tokens=row["output_tokens"],
+                total_ms=row["total_ms"],
+                load_ms=row["load_ms"],
+                prefill_ms=row["prefill_ms"],
+                generation_ms=row["generation_ms"],
+                context_tokens_kept=row["context_tokens_kept"],
+                context_tokens_dropped=row["context_tokens_dropped"],
+            )
+            history.append({
+                "timestamp": row["recorded_at"],
+                "context": row["context"],
+                "model": row["model"],
+                "hai_type": row["hai_type"],
+                "prompt_version": row["prompt_version"],
+                **profile.to_dict(),
+            })
+        return history
+
+    def get_summary(
+        self,
+        days: int | None = 7,
+        model: str | None = None,
+        hai_type: str | None = None,
+    ) -> dict[str, Any]:
+        """Latency summary over persisted profiles, built in one pass.
+
+        Args:
+            days: Look-back window. All rows if None.
+            model: Only this model.
+            hai_type: Only this HAI type.
+
+        Returns:
+            Dict with "overall", "by_model", "by_hai_type" and "by_day"
+            (per day, per model p50/p95 total latency) summaries.
+        """
+        self.flush()
+        clauses, params = [], []
+        if days is not None:
+            clauses.append("recorded_at >= ?")
+            params.append(time.time() - days * 86400)
+        if model:
+            clauses.append("model = ?")
+            params.append(model)
+        if hai_type:
+            clauses.append("hai_type = ?")
+            params.append(hai_type)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        overall = ProfileStats()
+        by_model: dict[str, ProfileStats] = defaultdict(ProfileStats)
+        by_hai_type: dict[str, ProfileStats] = defaultdict(ProfileStats)
+        by_day: dict[tuple[str, str], ProfileStats] = defaultdict(ProfileStats)
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            for row in conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM llm_profiles{where}", params):
+                overall.add(row)
+                by_model[row["model"]].add(row)
+                by_hai_type[row["hai_type"] or "other"].add(row)
+                day = datetime.fromtimestamp(row["recorded_at"]).strftime("%Y-%m-%d")
+                by_day[(day, row["model"])].add(row)
+
+        return {
+            "days": days,
+            "overall": overall.to_dict(),
+            "by_model": {name: stats.to_dict() for name, stats in sorted(by_model.items())},
+            "by_hai_type": {name: stats.to_dict() for name, stats in sorted(by_hai_type.items())},
+            "by_day": [
+                {"date": day, "model": name, **self._trend_point(stats)}
+                for (day, name), stats in sorted(by_day.items())
+            ],
+            "dropped": self.dropped,
+        }
+
+    @staticmethod
+    def _trend_point(stats: ProfileStats) -> dict[str, Any]:
+        summary = stats.to_dict()
+        return {
+            "count": summary["count"],
+            "p50_total_ms": summary["p50_total_ms"],
+            "p95_total_ms": summary["p95_total_ms"],
+        }
+
+    def clear(self) -> None:
+        """Delete all persisted profiles and reset the in-process summary."""
+        self.flush()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM llm_profiles")
+        self.reset_live()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run_writer, name="llm-profile-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _run_writer(self) -> None:
+        """Background loop: buffer rows, write on batch size, interval or flush."""
+        self._prune()
+        batch: list[tuple] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # Flush interval elapsed
+
+            if isinstance(item, tuple):
+                batch.append(item)
+                if len(batch) == 1:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            self._write(batch)
+            batch = []
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _write(self, batch: list[tuple]) -> None:
+        if not batch:
+            return
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    f"INSERT INTO llm_profiles ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                    batch,
+                )
+        except sqlite3.Error as e:
+            self.dropped += len(batch)
+            logger.warning(f"Failed to write {len(batch)} LLM profiles: {e}")
+
+    def _prune(self) -> None:
+        if not self.retention_days:
+            return
+        cutoff = time.time() - self.retention_days * 86400
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("DELETE FROM llm_profiles WHERE recorded_at < ?", (cutoff,))
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to prune LLM profiles: {e}")
+
+    @staticmethod
+    def _infer_hai_type(context: str) -> str | None:
+        """HAI type from a label like "clabsi_extraction" or "triage_cdi"."""
+        for part in (context or "").lower().split("_"):
+            if part in _HAI_TYPES:
+                return part
+        return None
+
+
+_store: LLMProfileStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> LLMProfileStore:
+    """Get the shared profile store (flushed at interpreter exit)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = LLMProfileStore()
+                atexit.register(_store.close)
+    return _store
+
+
+def record_profile(
+    profile: LLMProfile,
+    context: str = "",
+    model: str = "",
+    prompt_version: str = "",
+    context_stats: dict[str, Any] | None = None,
+) -> None:
+    """Record a profile in the shared store (no-op if profiling is disabled)."""
+    if not Config.LLM_PROFILING_ENABLED:
+        return
+    hai_type = context_stats.get("hai_type") if context_stats else None
+    try:
+        get_profile_store().record(profile, context, model, prompt_version, hai_type)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"LLM profiling unavailable: {e}")
+
+
+def get_profile_history(limit: int = 100) -> list[dict[str, Any]]:
+    """Get the most recent persisted profiles for analysis."""
+    return get_profile_store().recent(limit)
+
+
+def get_profile_summary() -> dict[str, Any]:
+    """Get summary statistics for profiles recorded by this process."""
+    return get_profile_store().live_summary()
+
+
+def clear_profile_history() -> None:
+    """Reset this process's profile summary (persisted rows are kept)."""
+    get_profile_store().reset_live()
@@ -9,12 +9,16 @@ vLLM provides optimized LLM inference with:
 import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ..config import Config
-from .base import BaseLLMClient, LLMResponse
+from .base import BaseLLMClient, LLMProfile, LLMResponse, StructuredLLMResponse, StructuredRequest
+from .cache import LLMResponseCache, get_llm_cache
+from .profile_store import record_profile
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +35,10 @@ class VLLMClient(BaseLLMClient):
         base_url: str | None = None,
         model: str | None = None,
         timeout: int = 300,
+        cache: LLMResponseCache | None = None,
+        use_cache: bool = True,
+        max_concurrency: int | None = None,
+        enable_profiling: bool = True,
     ):
         """Initialize vLLM client.
 
@@ -39,11 +47,24 @@ class VLLMClient(BaseLLMClient):
                      Uses VLLM_BASE_URL config if None.
             model: Model name. Uses VLLM_MODEL config if None.
             timeout: Request timeout in seconds.
+            cache: Structured response cache. Uses the shared cache if None.
+            use_cache: If False, never read or write the response cache.
+            max_concurrency: Requests in flight for generate_structured_many().
+                Uses VLLM_MAX_CONCURRENCY config if None.
+            enable_profiling: Whether to record profiles in the profile store.
         """
         self.base_url = (base_url or getattr(Config, 'VLLM_BASE_URL', 'http://localhost:8000')).rstrip("/")
         self.model = model or getattr(Config, 'VLLM_MODEL', 'Qwen/Qwen2.5-72B-Instruct')
         self.timeout = timeout
+        self.cache = (cache or get_llm_cache()) if use_cache else None
+        self.max_concurrency = max_concurrency or Config.VLLM_MAX_CONCURRENCY
+        self.enable_profiling = enable_profiling
+
+        # One pooled connection per concurrent request
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def generate(
         self,
@@ -106,11 +127,55 @@ class VLLMClient(BaseLLMClient):
         output_schema: dict[str, Any],
         system_prompt: str | None = None,
         temperature: float = 0.0,
+        profile_context: str = "",
+        prompt_version: str = "",
+        context_stats: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """Generate a structured JSON response.
 
-        Uses guided generation if available, otherwise prompts for JSON.
+        Note: For profiling data, use generate_structured_with_profile() instead.
+        """
+        result = self.generate_structured_with_profile(
+            prompt=prompt,
+            output_schema=output_schema,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            profile_context=profile_context,
+            prompt_version=prompt_version,
+            context_stats=context_stats,
+        )
+        return result.data
+
+    def generate_structured_with_profile(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        profile_context: str = "",
+        prompt_version: str = "",
+        context_stats: dict[str, Any] | None = None,
+    ) -> StructuredLLMResponse:
+        """Generate a structured JSON response with profiling data.
+
+        Uses vLLM guided decoding (guided_json) so the output always matches
+        the schema. Deterministic calls (temperature 0) are served from the
+        response cache when the same request has been answered before.
+
+        The OpenAI-compatible API reports token counts but not a prefill /
+        decode split, so the profile attributes the whole request time to
+        generation.
         """
+        cache_key = None
+        if self.cache is not None and temperature == 0.0:
+            cache_key = self.cache.make_key(
+                self.model, prompt_version, output_schema, system_prompt, prompt, temperature
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"vLLM structured [{profile_context or 'unnamed'}]: cache hit")
+                return StructuredLLMResponse(data=cached, profile=LLMProfile(), from_cache=True)
+
         # Build system prompt with JSON schema instruction
         schema_prompt = f"""You must respond with valid JSON matching this schema:
 {json.dumps(output_schema, indent=2)}
@@ -124,31 +189,26 @@ Respond ONLY with the JSON object, no other text.
             {"role": "user", "content": prompt},
         ]
 
+        # guided_json is a vLLM extension to the OpenAI request body; it
+        # goes at the top level (extra_body is an OpenAI SDK argument name)
         payload = {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": 4096,
+            "guided_json": output_schema,
         }
 
-        # Try to use vLLM's guided decoding if available
-        # This ensures valid JSON output
-        try:
-            # vLLM supports guided_json parameter for structured output
-            payload["extra_body"] = {
-                "guided_json": output_schema,
-            }
-        except Exception:
-            # Fall back to regular generation with JSON prompt
-            pass
-
+        content = ""
         try:
+            start_time = time.perf_counter()
             response = self.session.post(
                 f"{self.base_url}/v1/chat/completions",
                 json=payload,
                 timeout=self.timeout,
             )
             response.raise_for_status()
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
 
             data = response.json()
             content = data.get("choices", [{}])[0].get("message", {}).get("content", "{}")
@@ -163,7 +223,34 @@ Respond ONLY with the JSON object, no other text.
                 content = content[:-3]
             content = content.strip()
 
-            return json.loads(content)
+            parsed = json.loads(content)
+
+            usage = data.get("usage", {})
+            profile = LLMProfile(
+                input_tokens=usage.get("prompt_tokens", 0),
+                output_tokens=usage.get("completion_tokens", 0),
+                total_ms=elapsed_ms,
+                generation_ms=elapsed_ms,
+            )
+            if context_stats:
+                profile.context_tokens_kept = context_stats.get("tokens_kept", 0)
+                profile.context_tokens_dropped = context_stats.get("tokens_dropped", 0)
+
+            logger.info(f"vLLM structured [{profile_context or 'unnamed'}]: {profile.summary()}")
+
+            if self.enable_profiling:
+                record_profile(
+                    profile,
+                    profile_context,
+                    model=self.model,
+                    prompt_version=prompt_version,
+                    context_stats=context_stats,
+                )
+
+            if cache_key is not None:
+                self.cache.put(cache_key, parsed, model=self.model, prompt_version=prompt_version)
+
+            return StructuredLLMResponse(data=parsed, profile=profile, raw_response=data)
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse vLLM JSON response: {e}")
@@ -173,6 +260,61 @@ Respond ONLY with the JSON object, no other text.
             logger.error(f"vLLM request failed: {e}")
             raise
 
+    def generate_structured_many(
+        self,
+        requests: list[StructuredRequest],
+        max_concurrency: int | None = None,
+    ) -> list[StructuredLLMResponse | Exception]:
+        """Submit structured requests concurrently.
+
+        vLLM's continuous batching schedules in-flight requests together,
+        so N concurrent prompts finish in roughly the time of the slowest
+        one rather than the sum of all of them.
+
+        Args:
+            requests: Requests to run
+            max_concurrency: Maximum requests in flight. Uses the client's
+                max_concurrency if None.
+
+        Returns:
+            One entry per request, in input order: the response, or the
+            exception it raised.
+        """
+        if not requests:
+            return []
+
+        workers = max(1, min(max_concurrency or self.max_concurrency, len(requests)))
+        start_time = time.perf_counter()
+
+        def run(request: StructuredRequest) -> StructuredLLMResponse | Exception:
+            try:
+                return self.generate_structured_with_profile(
+                    prompt=request.prompt,
+                    output_schema=request.output_schema,
+                    system_prompt=request.system_prompt,
+                    temperature=request.temperature,
+                    profile_context=request.profile_context,
+                    prompt_version=request.prompt_version,
+                    context_stats=request.context_stats,
+                )
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vllm-batch") as executor:
+            results = list(executor.map(run, requests))
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        failed = sum(1 for r in results if isinstance(r, Exception))
+        slowest_ms = max(
+            (r.profile.total_ms for r in results if isinstance(r, StructuredLLMResponse)),
+            default=0.0,
+        )
+        logger.info(
+            f"vLLM batch: {len(requests)} requests ({workers} concurrent) in {elapsed_ms:.0f}ms "
+            f"| slowest={slowest_ms:.0f}ms | failed={failed}"
+        )
+        return results
+
     def is_available(self) -> bool:
         """Check if vLLM server is running and model is loaded."""
         try:
@@ -24,6 +24,8 @@ from .models import (
 from .candidates import CLABSICandidateDetector, SSICandidateDetector, VAECandidateDetector, CAUTICandidateDetector, CDICandidateDetector
 from .classifiers import CLABSIClassifierV2, SSIClassifierV2, VAEClassifier, CAUTIClassifier, CDIClassifier
 from .notes.retriever import NoteRetriever
+from .pipeline import ClassificationPipeline, PipelineConfig
+from .llm.cache import get_llm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -78,7 +80,6 @@ class HAIMonitor:
                 self._classifiers[hai_type] = CLABSIClassifierV2(
                     db=self.db,
                     use_triage=True,  # Use fast 7B model for triage, only escalate complex cases
-                    triage_model="qwen2.5:7b",
                 )
             elif hai_type == HAIType.SSI:
                 self._classifiers[hai_type] = SSIClassifierV2(db=self.db)
@@ -712,12 +713,18 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
         self,
         limit: int | None = None,
         dry_run: bool = False,
+        pipeline_config: PipelineConfig | None = None,
     ) -> dict:
         """Classify pending candidates using LLM extraction + rules engine.
 
+        Candidates flow through a staged pipeline (see ``pipeline.py``) so
+        note retrieval, LLM inference and database writes overlap instead
+        of running one candidate at a time.
+
         Args:
             limit: Maximum number of candidates to classify. None for all.
             dry_run: If True, don't save classifications.
+            pipeline_config: Per-stage concurrency. Uses Config if None.
 
         Returns:
             Dict with classification summary.
@@ -736,6 +743,21 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
 
         logger.info(f"Found {len(candidates)} pending candidates")
 
+        # Resolve lazy-loaded components up front so worker threads never
+        # race to construct them
+        _ = self.note_retriever
+        for hai_type in {c.hai_type for c in candidates}:
+            self.get_classifier(hai_type)
+
+        pipeline = ClassificationPipeline(
+            fetch_fn=self._fetch_notes_for_classification,
+            classify_fn=self._classify_candidate,
+            persist_fn=None if dry_run else self._persist_classification,
+            config=pipeline_config,
+            classify_many_fn=self._classify_candidates,
+        )
+        pipeline_results = pipeline.run(candidates)
+
         classified_count = 0
         error_count = 0
         results = {
@@ -745,84 +767,131 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
             "details": [],
         }
 
-        for candidate in candidates:
-            try:
-                # Retrieve clinical notes for this patient
-                notes = self.note_retriever.get_notes_for_candidate(candidate)
+        for item in pipeline_results:
+            if not item.succeeded:
+                error_count += 1
+                continue
 
-                if not notes:
-                    logger.warning(
-                        f"No notes found for candidate {candidate.id} "
-                        f"(patient {candidate.patient.mrn})"
-                    )
-                    # Still run classification - will get low confidence
-                    notes = []
+            candidate = item.candidate
+            classification = item.classification
 
+            if dry_run:
                 logger.info(
-                    f"Classifying {candidate.hai_type.value} candidate {candidate.id}: "
-                    f"patient={candidate.patient.mrn}, "
-                    f"organism={candidate.culture.organism}, "
-                    f"notes={len(notes)}"
+                    f"[DRY RUN] Would classify {candidate.id} as "
+                    f"{classification.decision.value} "
+                    f"(confidence={classification.confidence:.2f})"
                 )
 
-                # Get the appropriate classifier for this HAI type
-                classifier = self.get_classifier(candidate.hai_type)
+            # Track results
+            decision = classification.decision.value
+            results["by_decision"][decision] = results["by_decision"].get(decision, 0) + 1
+            results["details"].append({
+                "candidate_id": candidate.id,
+                "patient_mrn": candidate.patient.mrn,
+                "organism": candidate.culture.organism,
+                "decision": decision,
+                "confidence": classification.confidence,
+            })
 
-                # Run classification
-                classification = classifier.classify(candidate, notes)
+            classified_count += 1
 
-                if dry_run:
-                    logger.info(
-                        f"[DRY RUN] Would classify {candidate.id} as "
-                        f"{classification.decision.value} "
-                        f"(confidence={classification.confidence:.2f})"
-                    )
-                else:
-                    # Save classification
-                    self.db.save_classification(classification)
+        results["classified"] = classified_count
+        results["errors"] = error_count
+        if pipeline.last_stats:
+            results["pipeline"] = pipeline.last_stats.to_dict()
+        llm_cache = get_llm_cache()
+        if llm_cache is not None:
+            results["llm_cache"] = llm_cache.get_stats()
+
+        logger.info(
+            f"Classification complete: {classified_count} classified, "
+            f"{error_count} errors"
+        )
+
+        return results
+
+    def _fetch_notes_for_classification(self, candidate: HAICandidate) -> list:
+        """Pipeline fetch stage: retrieve clinical notes for a candidate."""
+        notes = self.note_retriever.get_notes_for_candidate(candidate)
+
+        if not notes:
+            logger.warning(
+                f"No notes found for candidate {candidate.id} "
+                f"(patient {candidate.patient.mrn})"
+            )
+            # Still run classification - will get low confidence
+            notes = []
+
+        return notes
+
+    def _classify_candidate(self, candidate: HAICandidate, notes: list):
+        """Pipeline inference stage: run the HAI-specific classifier."""
+        logger.info(
+            f"Classifying {candidate.hai_type.value} candidate {candidate.id}: "
+            f"patient={candidate.patient.mrn}, "
+            f"organism={candidate.culture.organism}, "
+            f"notes={len(notes)}"
+        )
+
+        classifier = self.get_classifier(candidate.hai_type)
+        return classifier.classify(candidate, notes)
 
-                    # Update candidate status based on decision
-                    new_status = self._determine_status(classification)
-                    self.db.update_candidate_status(candidate.id, new_status)
+    def _classify_candidates(self, cases: list[tuple[HAICandidate, list]]) -> list:
+        """Pipeline inference stage for a batch of queued candidates.
 
-                    # Create review entry so it appears in pending reviews queue
-                    self._create_review_entry(candidate, classification)
+        Candidates whose classifier supports batching (CLABSI, whose triage
+        prompts are submitted together) go through classify_many; the rest
+        are classified one at a time.
 
+        Returns:
+            One Classification, or the Exception that stopped it, per case.
+        """
+        outcomes: list = [None] * len(cases)
+        by_type: dict[HAIType, list[int]] = {}
+        for i, (candidate, _) in enumerate(cases):
+            by_type.setdefault(candidate.hai_type, []).append(i)
+
+        for hai_type, indexes in by_type.items():
+            classifier = self.get_classifier(hai_type)
+            if len(indexes) > 1 and hasattr(classifier, "classify_many"):
+                group = [cases[i] for i in indexes]
+                for candidate, notes in group:
                     logger.info(
-                        f"Classified {candidate.id} as {classification.decision.value} "
-                        f"(confidence={classification.confidence:.2f}, status={new_status.value})"
+                        f"Classifying {hai_type.value} candidate {candidate.id} (batched): "
+                        f"patient={candidate.patient.mrn}, notes={len(notes)}"
                     )
+                try:
+                    for i, classification in zip(indexes, classifier.classify_many(group)):
+                        outcomes[i] = classification
+                    continue
+                except Exception as e:
+                    # Retry one by one so the failure lands on the case that caused it
+                    logger.warning(f"Batch {hai_type.value} classification failed ({e}), retrying individually")
 
-                # Track results
-                decision = classification.decision.value
-                results["by_decision"][decision] = results["by_decision"].get(decision, 0) + 1
-                results["details"].append({
-                    "candidate_id": candidate.id,
-                    "patient_mrn": candidate.patient.mrn,
-                    "organism": candidate.culture.organism,
-                    "decision": decision,
-                    "confidence": classification.confidence,
-                })
+            for i in indexes:
+                try:
+                    outcomes[i] = self._classify_candidate(*cases[i])
+                except Exception as e:
+                    outcomes[i] = e
 
-                classified_count += 1
+        return outcomes
 
-            except Exception as e:
-                logger.error(
-                    f"Error classifying candidate {candidate.id}: {e}",
-                    exc_info=True
-                )
-                error_count += 1
+    def _persist_classification(self, candidate: HAICandidate, classification) -> None:
+        """Pipeline persist stage: save classification, status and review entry."""
+        self.db.save_classification(classification)
 
-        results["classified"] = classified_count
-        results["errors"] = error_count
+        # Update candidate status based on decision
+        new_status = self._determine_status(classification)
+        self.db.update_candidate_status(candidate.id, new_status)
+
+        # Create review entry so it appears in pending reviews queue
+        self._create_review_entry(candidate, classification)
 
         logger.info(
-            f"Classification complete: {classified_count} classified, "
-            f"{error_count} errors"
+            f"Classified {candidate.id} as {classification.decision.value} "
+            f"(confidence={classification.confidence:.2f}, status={new_status.value})"
         )
 
-        return results
-
     def _determine_status(self, classification) -> CandidateStatus:
         """Determine candidate status based on classification result.
 
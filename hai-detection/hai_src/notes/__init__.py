@@ -2,5 +2,6 @@
 
 from .retriever import NoteRetriever
 from .chunker import NoteChunker
+from .packer import ContextPacker, PackedContext
 
-__all__ = ["NoteRetriever", "NoteChunker"]
+__all__ = ["NoteRetriever", "NoteChunker", "ContextPacker", "PackedContext"]
@@ -5,6 +5,7 @@ import re
 from dataclasses import dataclass
 
 from ..models import ClinicalNote, NoteChunk
+from .scanning import get_note_scanner
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +61,8 @@ class NoteChunker:
         r"\n(?:Electronically signed|Signed by|Attending)",  # Signatures
     ]
 
+    _end_regex: re.Pattern | None = None
+
     def extract_sections(
         self,
         note: ClinicalNote,
@@ -80,42 +83,43 @@ class NoteChunker:
         chunks = []
         content = note.content
 
+        # One pass finds every header; patterns keep their priority order
+        scan = get_note_scanner().scan(content)
+
         for section_type in section_types:
-            patterns = self.SECTION_PATTERNS.get(section_type, [])
-
-            for pattern in patterns:
-                match = re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
-                if match:
-                    start_pos = match.end()
-                    end_pos = self._find_section_end(content, start_pos)
-
-                    section_content = content[start_pos:end_pos].strip()
-
-                    if section_content:
-                        chunks.append(NoteChunk(
-                            note_id=note.id,
-                            section_type=section_type,
-                            content=section_content,
-                            start_pos=start_pos,
-                            end_pos=end_pos,
-                        ))
-                    break  # Found this section, move to next type
+            header = scan.first_section(section_type)
+            if header:
+                start_pos = header.end
+                end_pos = self._find_section_end(content, start_pos)
+
+                section_content = content[start_pos:end_pos].strip()
+
+                if section_content:
+                    chunks.append(NoteChunk(
+                        note_id=note.id,
+                        section_type=section_type,
+                        content=section_content,
+                        start_pos=start_pos,
+                        end_pos=end_pos,
+                    ))
 
         return chunks
 
     def _find_section_end(self, content: str, start_pos: int) -> int:
-        """Find where a section ends."""
-        remaining = content[start_pos:]
-
-        # Try each end pattern
-        earliest_end = len(remaining)
+        """Find where a section ends.
 
-        for pattern in self.SECTION_END_PATTERNS:
-            match = re.search(pattern, remaining)
-            if match and match.start() < earliest_end:
-                earliest_end = match.start()
-
-        return start_pos + earliest_end
+        Searches from start_pos in place (no slice copy); the combined end
+        regex returns the earliest of SECTION_END_PATTERNS.
+        """
+        match = self._section_end_regex().search(content, start_pos)
+        return match.start() if match else len(content)
+
+    @classmethod
+    def _section_end_regex(cls) -> re.Pattern:
+        """Compiled alternation of SECTION_END_PATTERNS (cached per class)."""
+        if cls.__dict__.get("_end_regex") is None:
+            cls._end_regex = re.compile("|".join(f"(?:{p})" for p in cls.SECTION_END_PATTERNS))
+        return cls._end_regex
 
     def extract_assessment_plan(self, note: ClinicalNote) -> str | None:
         """Extract the Assessment and Plan section."""
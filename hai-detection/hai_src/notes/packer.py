@@ -0,0 +1,314 @@
+"""Token-budgeted, relevance-ranked packing of note context for LLM prompts.
+
+Extractors used to concatenate whole notes (or the first sections that fit
+a character limit), so prompt size - and prefill time - grew with the
+length of the stay and the passages that made the cut depended on note
+order rather than relevance.
+
+ContextPacker splits each note into segments (NoteChunker sections plus the
+remaining paragraphs), scores every segment and greedily fills a per-HAI-type
+token budget with the highest-scoring ones. Segments are scored on:
+
+- HAI keyword density (HAI_KEYWORDS hits per 100 words)
+- Proximity of the note date to the culture/procedure date
+- Section type (Assessment/Plan and ID sections outrank free text)
+- Note type (ID consults and discharge summaries get a bonus)
+
+Kept segments are emitted grouped by note, most recent note first, in their
+original order within the note, with the same headers as
+NoteChunker.extract_relevant_context.
+
+Usage:
+    packer = ContextPacker()
+    packed = packer.pack(notes, "clabsi", anchor_date=culture_date)
+    prompt = template.format(clinical_notes=packed.text)
+    llm.generate_structured(..., context_stats=packed.to_dict())
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from ..config import Config
+from ..models import ClinicalNote, HAIType
+from .chunker import NoteChunker
+from .retriever import ALWAYS_INCLUDE_NOTE_TYPES, HAI_KEYWORDS
+from .scanning import get_note_scanner
+
+logger = logging.getLogger(__name__)
+
+
+# Rough chars-per-token ratio for llama/qwen tokenizers on clinical text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a piece of text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class ContextSegment:
+    """A scored span of a clinical note."""
+    note: ClinicalNote
+    section_type: str | None  # None for free-text paragraphs
+    content: str
+    position: int  # Offset within the note, for stable ordering
+    score: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.content)
+
+
+@dataclass
+class PackedContext:
+    """Result of packing notes into a token budget."""
+    text: str
+    hai_type: str
+    token_budget: int
+    tokens_kept: int = 0
+    tokens_dropped: int = 0
+    segments_kept: int = 0
+    segments_dropped: int = 0
+    notes_total: int = 0
+    notes_used: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging/profiling."""
+        return {
+            "hai_type": self.hai_type,
+            "token_budget": self.token_budget,
+            "tokens_kept": self.tokens_kept,
+            "tokens_dropped": self.tokens_dropped,
+            "segments_kept": self.segments_kept,
+            "segments_dropped": self.segments_dropped,
+            "notes_total": self.notes_total,
+            "notes_used": self.notes_used,
+        }
+
+
+class ContextPacker:
+    """Ranks note segments by relevance and packs them into a token budget."""
+
+    # Score bonus by NoteChunker section type (free text scores 0)
+    SECTION_WEIGHTS = {
+        "assessment_plan": 3.0,
+        "id_section": 3.0,
+        "hospital_course": 2.0,
+        "wound_assessment": 2.0,
+        "physical_exam": 1.5,
+        "active_problems": 1.0,
+    }
+
+    # Score per keyword hit per 100 words, capped so a keyword-stuffed
+    # fragment can't outrank an A/P section on its own
+    KEYWORD_WEIGHT = 0.5
+    MAX_KEYWORD_SCORE = 4.0
+
+    # Proximity bonus halves every N days from the anchor date
+    PROXIMITY_WEIGHT = 2.0
+    PROXIMITY_HALF_LIFE_DAYS = 2.0
+
+    # Bonus for ALWAYS_INCLUDE_NOTE_TYPES (ID consults, discharge summaries)
+    NOTE_TYPE_BONUS = 1.0
+
+    # Segments longer than this are split on line boundaries so one huge
+    # paragraph can't take the whole budget
+    MAX_SEGMENT_TOKENS = 500
+
+    def __init__(self, chunker: NoteChunker | None = None):
+        """Initialize the packer.
+
+        Args:
+            chunker: Section extractor to use. Creates one if None.
+        """
+        self.chunker = chunker or NoteChunker()
+
+    def pack(
+        self,
+        notes: list[ClinicalNote],
+        hai_type: str | HAIType,
+        anchor_date: datetime | None = None,
+        token_budget: int | None = None,
+    ) -> PackedContext:
+        """Pack the most relevant note segments into a token budget.
+
+        Args:
+            notes: Notes to pack
+            hai_type: HAI type for keyword scoring and default budget
+            anchor_date: Culture/procedure date for proximity scoring
+            token_budget: Override the configured budget for this HAI type
+
+        Returns:
+            PackedContext with prompt text and token accounting
+        """
+        type_key = self._type_key(hai_type)
+        budget = token_budget if token_budget is not None else Config.CONTEXT_TOKEN_BUDGETS.get(
+            type_key, Config.CONTEXT_TOKEN_BUDGET_DEFAULT
+        )
+
+        segments = [seg for note in notes for seg in self.segment_note(note)]
+        for seg in segments:
+            seg.score = self.score_segment(seg, type_key, anchor_date)
+
+        # Greedy fill: best first, skipping segments that no longer fit
+        ranked = sorted(
+            segments,
+            key=lambda s: (-s.score, self._days_from(s.note.date, anchor_date), s.position),
+        )
+        kept: list[ContextSegment] = []
+        remaining = budget
+        for seg in ranked:
+            if seg.tokens <= remaining:
+                kept.append(seg)
+                remaining -= seg.tokens
+
+        kept_ids = {id(s) for s in kept}
+        dropped = [s for s in segments if id(s) not in kept_ids]
+
+        packed = PackedContext(
+            text=self._render(kept),
+            hai_type=type_key,
+            token_budget=budget,
+            tokens_kept=sum(s.tokens for s in kept),
+            tokens_dropped=sum(s.tokens for s in dropped),
+            segments_kept=len(kept),
+            segments_dropped=len(dropped),
+            notes_total=len(notes),
+            notes_used=len({s.note.id for s in kept}),
+        )
+
+        logger.debug(
+            f"Packed {type_key} context: kept {packed.tokens_kept} tokens "
+            f"({packed.segments_kept} segments from {packed.notes_used}/{packed.notes_total} notes), "
+            f"dropped {packed.tokens_dropped} tokens"
+        )
+        return packed
+
+    def segment_note(self, note: ClinicalNote) -> list[ContextSegment]:
+        """Split a note into section segments and free-text paragraphs."""
+        content = note.content
+        chunks = sorted(self.chunker.extract_sections(note), key=lambda c: c.start_pos)
+
+        segments = []
+        cursor = 0
+        for chunk in chunks:
+            if chunk.start_pos < cursor:
+                continue  # Overlaps a section already taken
+            segments.extend(self._paragraph_segments(note, content[cursor:chunk.start_pos], cursor))
+            segments.extend(self._split_long(note, chunk.section_type, chunk.content, chunk.start_pos))
+            cursor = chunk.end_pos
+        segments.extend(self._paragraph_segments(note, content[cursor:], cursor))
+
+        return segments
+
+    def score_segment(
+        self,
+        segment: ContextSegment,
+        hai_type: str,
+        anchor_date: datetime | None = None,
+    ) -> float:
+        """Score a segment's relevance to an HAI evaluation."""
+        score = self.SECTION_WEIGHTS.get(segment.section_type, 0.0)
+
+        if hai_type in HAI_KEYWORDS:
+            text = segment.content
+            words = max(len(text.split()), 1)
+            hits = sum(
+                1 for hit in get_note_scanner().scan(text).keywords
+                if hai_type in hit.labels and hit.is_whole_word(text)
+            )
+            density = hits * 100 / words
+            score += min(density * self.KEYWORD_WEIGHT, self.MAX_KEYWORD_SCORE)
+
+        if anchor_date is not None:
+            days = self._days_from(segment.note.date, anchor_date)
+            score += self.PROXIMITY_WEIGHT * 0.5 ** (days / self.PROXIMITY_HALF_LIFE_DAYS)
+
+        if segment.note.note_type.lower() in ALWAYS_INCLUDE_NOTE_TYPES:
+            score += self.NOTE_TYPE_BONUS
+
+        return score
+
+    def _paragraph_segments(self, note: ClinicalNote, text: str, offset: int) -> list[ContextSegment]:
+        """Split free text into paragraph segments."""
+        segments = []
+        pos = 0
+        for part in re.split(r'(\n\s*\n)', text):
+            if part.strip():
+                segments.extend(self._split_long(note, None, part, offset + pos))
+            pos += len(part)
+        return segments
+
+    def _split_long(
+        self,
+        note: ClinicalNote,
+        section_type: str | None,
+        text: str,
+        position: int,
+    ) -> list[ContextSegment]:
+        """Split text exceeding MAX_SEGMENT_TOKENS on line boundaries."""
+        text = text.strip()
+        if not text:
+            return []
+
+        max_chars = self.MAX_SEGMENT_TOKENS * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return [ContextSegment(note, section_type, text, position)]
+
+        pieces = []
+        current: list[str] = []
+        current_len = 0
+        for line in text.splitlines():
+            while len(line) > max_chars:
+                pieces.append(line[:max_chars])
+                line = line[max_chars:]
+            if current and current_len + len(line) + 1 > max_chars:
+                pieces.append("\n".join(current))
+                current, current_len = [], 0
+            current.append(line)
+            current_len += len(line) + 1
+        if current:
+            pieces.append("\n".join(current))
+
+        return [
+            ContextSegment(note, section_type, piece.strip(), position + i)
+            for i, piece in enumerate(pieces)
+            if piece.strip()
+        ]
+
+    def _render(self, segments: list[ContextSegment]) -> str:
+        """Render kept segments grouped by note, most recent note first."""
+        by_note: dict[str, list[ContextSegment]] = {}
+        for seg in segments:
+            by_note.setdefault(seg.note.id, []).append(seg)
+
+        parts = []
+        for note_segments in sorted(by_note.values(), key=lambda segs: segs[0].note.date, reverse=True):
+            note = note_segments[0].note
+            author_str = f" by {note.author}" if note.author else ""
+            lines = [f"[{note.note_type.upper()} - {note.date.strftime('%Y-%m-%d')}{author_str}]"]
+            for seg in sorted(note_segments, key=lambda s: s.position):
+                if seg.section_type:
+                    label = seg.section_type.replace("_", " ").title()
+                    lines.append(f"{label}:\n{seg.content}")
+                else:
+                    lines.append(seg.content)
+            parts.append("\n".join(lines))
+
+        return "\n\n---\n\n".join(parts)
+
+    @staticmethod
+    def _type_key(hai_type: str | HAIType) -> str:
+        if isinstance(hai_type, HAIType):
+            return hai_type.value.lower()
+        return str(hai_type).lower()
+
+    @staticmethod
+    def _days_from(date: datetime, anchor_date: datetime | None) -> float:
+        if anchor_date is None:
+            return 0.0
+        return abs((date - anchor_date).total_seconds()) / 86400
@@ -1,12 +1,12 @@
 """Clinical note retrieval for LLM context."""
 
 import logging
-import re
 from datetime import datetime, timedelta
 
 from ..config import Config
 from ..models import ClinicalNote, HAICandidate, HAIType
 from ..data.factory import get_note_source
+from .scanning import get_note_scanner
 
 logger = logging.getLogger(__name__)
 
@@ -220,12 +220,8 @@ class NoteRetriever:
             logger.warning(f"No keywords defined for HAI type '{type_key}', returning all notes")
             return notes
 
-        # Build regex pattern for efficient matching
-        # Use word boundaries where appropriate
-        pattern = re.compile(
-            "|".join(re.escape(kw) for kw in keywords),
-            re.IGNORECASE
-        )
+        # Shared compiled scanner: one pass per note, stops at the first hit
+        scanner = get_note_scanner()
 
         filtered = []
         skipped = 0
@@ -237,7 +233,7 @@ class NoteRetriever:
                 continue
 
             # Check if note contains any keywords
-            if pattern.search(note.content):
+            if scanner.has_keyword(note.content, type_key):
                 filtered.append(note)
             else:
                 skipped += 1
@@ -0,0 +1,29 @@
+"""Process-wide note scanner for HAI keywords and section headers.
+
+Built once from HAI_KEYWORDS and NoteChunker.SECTION_PATTERNS and shared
+by NoteRetriever, NoteChunker and ContextPacker, so each note is scanned
+in a single pass instead of once per keyword or section pattern.
+"""
+
+import threading
+
+from common.note_scanner import NoteScanner
+
+_scanner: NoteScanner | None = None
+_scanner_lock = threading.Lock()
+
+
+def get_note_scanner() -> NoteScanner:
+    """Get the shared HAI note scanner (labels are lowercase HAI types)."""
+    global _scanner
+    if _scanner is None:
+        with _scanner_lock:
+            if _scanner is None:
+                from .chunker import NoteChunker
+                from .retriever import HAI_KEYWORDS
+
+                _scanner = NoteScanner(
+                    keywords=HAI_KEYWORDS,
+                    sections=NoteChunker.SECTION_PATTERNS,
+                )
+    return _scanner
@@ -0,0 +1,348 @@
+"""Staged, bounded-parallel classification pipeline.
+
+Classifying a pending candidate has three phases with very different
+resource profiles:
+
+1. Note retrieval - I/O bound (FHIR / Clarity round-trips)
+2. LLM inference  - bound by the inference server's parallel slots
+3. Persistence    - short SQLite writes (classification, status, review)
+
+Running them strictly one candidate at a time leaves the GPU idle while
+notes are fetched and the note source idle while the GPU works. This
+module runs each phase in its own worker pool, connected by bounded
+queues so a fast stage can never run arbitrarily far ahead of a slow one
+(backpressure). A failure in any stage is recorded against that candidate
+only; the rest of the batch keeps flowing.
+
+Architecture:
+    candidates → [fetch x N] → queue → [inference x M] → queue → [persist x K]
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .config import Config
+from .models import HAICandidate, ClinicalNote, Classification
+
+logger = logging.getLogger(__name__)
+
+
+FetchFn = Callable[[HAICandidate], list[ClinicalNote]]
+ClassifyFn = Callable[[HAICandidate, list[ClinicalNote]], Classification]
+PersistFn = Callable[[HAICandidate, Classification], None]
+# Classifies several candidates at once; one Classification or Exception per case
+ClassifyManyFn = Callable[
+    [list[tuple[HAICandidate, list[ClinicalNote]]]], list["Classification | Exception"]
+]
+
+# Queue sentinel telling a worker its upstream stage is finished
+_DONE = object()
+
+
+@dataclass
+class PipelineConfig:
+    """Concurrency settings for the classification pipeline."""
+
+    fetch_workers: int = field(default_factory=lambda: Config.CLASSIFY_FETCH_WORKERS)
+    inference_workers: int = field(default_factory=lambda: Config.CLASSIFY_INFERENCE_WORKERS)
+    persist_workers: int = field(default_factory=lambda: Config.CLASSIFY_PERSIST_WORKERS)
+    # Max items waiting between two stages before upstream workers block
+    queue_size: int = field(default_factory=lambda: Config.CLASSIFY_QUEUE_SIZE)
+    # Max candidates an inference worker takes off the queue at once when
+    # the pipeline has a classify_many_fn
+    inference_batch_size: int = field(default_factory=lambda: Config.CLASSIFY_INFERENCE_BATCH_SIZE)
+
+    def __post_init__(self) -> None:
+        for name in (
+            "fetch_workers",
+            "inference_workers",
+            "persist_workers",
+            "queue_size",
+            "inference_batch_size",
+        ):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be >= 1")
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one candidate's trip through the pipeline."""
+
+    index: int  # Position in the input list (results are returned in this order)
+    candidate: HAICandidate
+    notes_count: int = 0
+    classification: Classification | None = None
+    error: str | None = None
+    failed_stage: str | None = None  # fetch, inference, or persist
+    fetch_ms: int = 0
+    inference_ms: int = 0
+    persist_ms: int = 0
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the candidate was classified (and persisted) without error."""
+        return self.error is None and self.classification is not None
+
+
+@dataclass
+class PipelineStats:
+    """Aggregate timing for a pipeline run."""
+
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    wall_ms: int = 0
+    fetch_ms: int = 0
+    inference_ms: int = 0
+    persist_ms: int = 0
+    errors_by_stage: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def overlap_ratio(self) -> float:
+        """Summed stage time divided by wall time (>1 means stages overlapped)."""
+        if self.wall_ms <= 0:
+            return 0.0
+        return (self.fetch_ms + self.inference_ms + self.persist_ms) / self.wall_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging/serialization."""
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "wall_ms": self.wall_ms,
+            "fetch_ms": self.fetch_ms,
+            "inference_ms": self.inference_ms,
+            "persist_ms": self.persist_ms,
+            "overlap_ratio": round(self.overlap_ratio, 2),
+            "errors_by_stage": dict(self.errors_by_stage),
+        }
+
+
+class ClassificationPipeline:
+    """Runs fetch → classify → persist across bounded worker pools.
+
+    The pipeline is agnostic of where notes come from or how results are
+    stored; HAIMonitor supplies the three stage callables. Pass
+    ``persist_fn=None`` (e.g. for a dry run) to skip the persistence stage.
+
+    With ``classify_many_fn``, each inference worker takes whatever is
+    already waiting on the queue (up to ``inference_batch_size``) and
+    classifies it in one call, so batch-capable backends see several
+    cases together. It never waits for a batch to fill.
+    """
+
+    def __init__(
+        self,
+        fetch_fn: FetchFn,
+        classify_fn: ClassifyFn,
+        persist_fn: PersistFn | None = None,
+        config: PipelineConfig | None = None,
+        classify_many_fn: ClassifyManyFn | None = None,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            fetch_fn: Retrieves notes for a candidate.
+            classify_fn: Classifies a candidate given its notes.
+            persist_fn: Stores a classification. Skipped if None.
+            config: Concurrency settings. Uses Config defaults if None.
+            classify_many_fn: Classifies a batch of candidates. If given,
+                used instead of classify_fn.
+        """
+        self.fetch_fn = fetch_fn
+        self.classify_fn = classify_fn
+        self.classify_many_fn = classify_many_fn
+        self.persist_fn = persist_fn
+        self.config = config or PipelineConfig()
+        self.last_stats: PipelineStats | None = None
+
+    def run(self, candidates: list[HAICandidate]) -> list[PipelineResult]:
+        """Push candidates through all stages and wait for completion.
+
+        Args:
+            candidates: Candidates to classify.
+
+        Returns:
+            One PipelineResult per candidate, in input order.
+        """
+        cfg = self.config
+        results = [PipelineResult(index=i, candidate=c) for i, c in enumerate(candidates)]
+        if not candidates:
+            self.last_stats = PipelineStats()
+            return results
+
+        start = time.time()
+
+        # Input queue is pre-filled, so it needs no bound; the inter-stage
+        # queues are bounded to apply backpressure.
+        input_q: queue.Queue = queue.Queue()
+        notes_q: queue.Queue = queue.Queue(maxsize=cfg.queue_size)
+        persist_q: queue.Queue = queue.Queue(maxsize=cfg.queue_size)
+
+        for result in results:
+            input_q.put(result)
+        for _ in range(cfg.fetch_workers):
+            input_q.put(_DONE)
+
+        def fetch_worker() -> None:
+            while True:
+                item = input_q.get()
+                if item is _DONE:
+                    return
+                t0 = time.time()
+                try:
+                    notes = self.fetch_fn(item.candidate) or []
+                except Exception as e:
+                    logger.error(
+                        f"Note retrieval failed for candidate {item.candidate.id}: {e}",
+                        exc_info=True,
+                    )
+                    self._fail(item, "fetch", e)
+                    continue
+                finally:
+                    item.fetch_ms = int((time.time() - t0) * 1000)
+                item.notes_count = len(notes)
+                notes_q.put((item, notes))  # Blocks while inference is saturated
+
+        def inference_worker() -> None:
+            while True:
+                entry = notes_q.get()
+                if entry is _DONE:
+                    return
+                if self.classify_many_fn is not None:
+                    if not classify_batch(entry):
+                        return
+                    continue
+                item, notes = entry
+                t0 = time.time()
+                try:
+                    item.classification = self.classify_fn(item.candidate, notes)
+                except Exception as e:
+                    logger.error(
+                        f"Error classifying candidate {item.candidate.id}: {e}",
+                        exc_info=True,
+                    )
+                    self._fail(item, "inference", e)
+                    continue
+                finally:
+                    item.inference_ms = int((time.time() - t0) * 1000)
+                if self.persist_fn is not None:
+                    persist_q.put(item)
+
+        def classify_batch(first) -> bool:
+            """Classify first plus whatever is queued; False once _DONE is taken."""
+            batch = [first]
+            more = True
+            while len(batch) < cfg.inference_batch_size:
+                try:
+                    entry = notes_q.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _DONE:
+                    more = False
+                    break
+                batch.append(entry)
+
+            t0 = time.time()
+            try:
+                outcomes = self.classify_many_fn([(item.candidate, notes) for item, notes in batch])
+            except Exception as e:
+                outcomes = [e] * len(batch)
+            # The batch's time is shared evenly so stage totals stay comparable
+            share_ms = int((time.time() - t0) * 1000 / len(batch))
+
+            for (item, _), outcome in zip(batch, outcomes):
+                item.inference_ms = share_ms
+                if isinstance(outcome, Exception):
+                    logger.error(
+                        f"Error classifying candidate {item.candidate.id}: {outcome}",
+                        exc_info=outcome,
+                    )
+                    self._fail(item, "inference", outcome)
+                    continue
+                item.classification = outcome
+                if self.persist_fn is not None:
+                    persist_q.put(item)
+            return more
+
+        def persist_worker() -> None:
+            while True:
+                item = persist_q.get()
+                if item is _DONE:
+                    return
+                t0 = time.time()
+                try:
+                    self.persist_fn(item.candidate, item.classification)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to persist classification for candidate {item.candidate.id}: {e}",
+                        exc_info=True,
+                    )
+                    self._fail(item, "persist", e)
+                finally:
+                    item.persist_ms = int((time.time() - t0) * 1000)
+
+        fetchers = self._start(fetch_worker, cfg.fetch_workers, "fetch")
+        inferers = self._start(inference_worker, cfg.inference_workers, "inference")
+        persisters = []
+        if self.persist_fn is not None:
+            persisters = self._start(persist_worker, cfg.persist_workers, "persist")
+
+        # Drain stage by stage: once every upstream worker has exited, tell
+        # each downstream worker there is nothing more coming.
+        self._join(fetchers)
+        for _ in inferers:
+            notes_q.put(_DONE)
+        self._join(inferers)
+        for _ in persisters:
+            persist_q.put(_DONE)
+        self._join(persisters)
+
+        self.last_stats = self._build_stats(results, int((time.time() - start) * 1000))
+        logger.info(f"Classification pipeline finished: {self.last_stats.to_dict()}")
+        return results
+
+    @staticmethod
+    def _fail(item: PipelineResult, stage: str, error: Exception) -> None:
+        item.error = str(error)
+        item.failed_stage = stage
+        if stage != "persist":
+            item.classification = None
+
+    @staticmethod
+    def _start(target: Callable[[], None], count: int, stage: str) -> list[threading.Thread]:
+        threads = []
+        for i in range(count):
+            thread = threading.Thread(
+                target=target,
+                name=f"hai-classify-{stage}-{i}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    @staticmethod
+    def _join(threads: list[threading.Thread]) -> None:
+        for thread in threads:
+            thread.join()
+
+    @staticmethod
+    def _build_stats(results: list[PipelineResult], wall_ms: int) -> PipelineStats:
+        stats = PipelineStats(total=len(results), wall_ms=wall_ms)
+        for r in results:
+            stats.fetch_ms += r.fetch_ms
+            stats.inference_ms += r.inference_ms
+            stats.persist_ms += r.persist_ms
+            if r.succeeded:
+                stats.succeeded += 1
+            else:
+                stats.failed += 1
+                stage = r.failed_stage or "unknown"
+                stats.errors_by_stage[stage] = stats.errors_by_stage.get(stage, 0) + 1
+        return stats
@@ -15,6 +15,7 @@ from datetime import datetime, timedelta
 from .config import Config
 from .monitor import HAIMonitor
 from .models import HAIType
+from .pipeline import PipelineConfig
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -33,6 +34,17 @@ def setup_logging(verbose: bool = False) -> None:
     logging.getLogger("requests").setLevel(logging.WARNING)
 
 
+def positive_int(value: str) -> int:
+    """argparse type for worker and queue counts (at least 1)."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def run_once(
     monitor: HAIMonitor,
     dry_run: bool = False,
@@ -100,6 +112,7 @@ def run_classify(
     monitor: HAIMonitor,
     limit: int | None = None,
     dry_run: bool = False,
+    pipeline_config: PipelineConfig | None = None,
 ) -> dict:
     """Run classification on pending candidates.
 
@@ -107,11 +120,16 @@ def run_classify(
         monitor: The monitor instance.
         limit: Maximum candidates to classify.
         dry_run: If True, don't persist classifications.
+        pipeline_config: Per-stage concurrency. Uses Config if None.
 
     Returns:
         Classification results dict.
     """
-    return monitor.classify_pending(limit=limit, dry_run=dry_run)
+    return monitor.classify_pending(
+        limit=limit,
+        dry_run=dry_run,
+        pipeline_config=pipeline_config,
+    )
 
 
 def run_full_pipeline(monitor: HAIMonitor, dry_run: bool = False) -> dict:
@@ -133,6 +151,23 @@ def show_classification_results(results: dict) -> None:
     print(f"Classified: {results['classified']}")
     print(f"Errors: {results['errors']}")
 
+    if results.get('pipeline'):
+        p = results['pipeline']
+        print(
+            f"Pipeline: wall={p['wall_ms'] / 1000:.1f}s "
+            f"(fetch={p['fetch_ms'] / 1000:.1f}s, "
+            f"inference={p['inference_ms'] / 1000:.1f}s, "
+            f"persist={p['persist_ms'] / 1000:.1f}s, "
+            f"overlap={p['overlap_ratio']:.2f}x)"
+        )
+
+    if results.get('llm_cache'):
+        c = results['llm_cache']
+        print(
+            f"LLM cache: {c['hits']} hits / {c['misses']} misses "
+            f"(hit rate {c['hit_rate']:.0%}, {c['entries']} entries)"
+        )
+
     if results.get('by_decision'):
         print("\nBy Decision:")
         for decision, count in results['by_decision'].items():
@@ -173,6 +208,9 @@ Examples:
     # Look back 48 hours for cultures
     python -m src.runner --once --lookback 48
 
+    # Overnight batch: 8 note fetchers, 4 concurrent LLM requests
+    python -m src.runner --classify --fetch-workers 8 --inference-workers 4
+
     # Continuous monitoring mode
     python -m src.runner
 
@@ -213,6 +251,40 @@ Examples:
         help="Limit number of candidates to classify (for testing)",
     )
 
+    parser.add_argument(
+        "--fetch-workers",
+        type=positive_int,
+        default=None,
+        help=f"Concurrent note retrievals during classification (default: {Config.CLASSIFY_FETCH_WORKERS})",
+    )
+
+    parser.add_argument(
+        "--inference-workers",
+        type=positive_int,
+        default=None,
+        help=f"Concurrent LLM requests; match the backend's parallel slots (default: {Config.CLASSIFY_INFERENCE_WORKERS})",
+    )
+
+    parser.add_argument(
+        "--persist-workers",
+        type=positive_int,
+        default=None,
+        help=f"Concurrent database writers (default: {Config.CLASSIFY_PERSIST_WORKERS})",
+    )
+
+    parser.add_argument(
+        "--queue-size",
+        type=positive_int,
+        default=None,
+        help=f"Candidates buffered between pipeline stages (default: {Config.CLASSIFY_QUEUE_SIZE})",
+    )
+
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always call the LLM, bypassing the extraction response cache",
+    )
+
     parser.add_argument(
         "--lookback",
         type=int,
@@ -264,6 +336,19 @@ Examples:
     if args.db_path:
         Config.HAI_DB_PATH = args.db_path
 
+    if args.no_llm_cache:
+        Config.LLM_CACHE_ENABLED = False
+
+    # Override classification pipeline concurrency if specified
+    if args.fetch_workers is not None:
+        Config.CLASSIFY_FETCH_WORKERS = args.fetch_workers
+    if args.inference_workers is not None:
+        Config.CLASSIFY_INFERENCE_WORKERS = args.inference_workers
+    if args.persist_workers is not None:
+        Config.CLASSIFY_PERSIST_WORKERS = args.persist_workers
+    if args.queue_size is not None:
+        Config.CLASSIFY_QUEUE_SIZE = args.queue_size
+
     # Create monitor
     try:
         monitor = HAIMonitor(lookback_hours=args.lookback)
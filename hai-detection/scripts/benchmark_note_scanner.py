@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Microbenchmark for the shared note scanner.
+
+Compares the compiled single-pass scanner (common.note_scanner) against the
+previous approach - one regex per HAI type for keyword filtering, and one
+re.search per section pattern plus per end pattern on a sliced copy - and
+reports throughput in MB/s of note text.
+
+Usage:
+    python scripts/benchmark_note_scanner.py
+    python scripts/benchmark_note_scanner.py --notes 500 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from hai_src.notes.chunker import NoteChunker
+from hai_src.notes.retriever import HAI_KEYWORDS
+from hai_src.notes.scanning import get_note_scanner
+
+
+FILLER = (
+    "Patient seen and examined at bedside with family present. Tolerating diet, "
+    "ambulating with physical therapy. Pain controlled on current regimen. "
+    "Discussed plan of care with nursing staff and the primary team this morning. "
+)
+
+SECTIONS = [
+    "HPI:\n",
+    "PHYSICAL EXAM:\n",
+    "MICROBIOLOGY:\n",
+    "ASSESSMENT/PLAN:\n",
+    "WOUND ASSESSMENT: ",
+]
+
+
+def make_notes(count: int, seed: int = 42) -> list[str]:
+    """Generate synthetic notes (~3-4K chars) with headers and keywords."""
+    rng = random.Random(seed)
+    keywords = [kw for terms in HAI_KEYWORDS.values() for kw in terms]
+    notes = []
+    for _ in range(count):
+        parts = []
+        for header in SECTIONS:
+            body = FILLER * rng.randint(2, 4)
+            words = body.split()
+            for _ in range(rng.randint(1, 6)):
+                words.insert(rng.randrange(len(words)), rng.choice(keywords))
+            parts.append(header + " ".join(words))
+        parts.append("Electronically signed by Dr. Smith")
+        notes.append("\n\n".join(parts))
+    return notes
+
+
+def legacy_scan(notes: list[str]) -> int:
+    """Per-type keyword regexes and per-pattern section searches."""
+    chunker = NoteChunker
+    hits = 0
+    for content in notes:
+        for keywords in HAI_KEYWORDS.values():
+            pattern = re.compile("|".join(re.escape(kw) for kw in keywords), re.IGNORECASE)
+            if pattern.search(content):
+                hits += 1
+        for patterns in chunker.SECTION_PATTERNS.values():
+            for pattern in patterns:
+                match = re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
+                if match:
+                    remaining = content[match.end():]
+                    for end_pattern in chunker.SECTION_END_PATTERNS:
+                        re.search(end_pattern, remaining)
+                    hits += 1
+                    break
+    return hits
+
+
+def scanner_scan(notes: list[str]) -> int:
+    """Single pass per note with the shared compiled scanner."""
+    scanner = get_note_scanner()
+    hits = 0
+    for content in notes:
+        result = scanner.scan(content)
+        hits += len(result.labels())
+        for section_type in NoteChunker.SECTION_PATTERNS:
+            header = result.first_section(section_type)
+            if header:
+                NoteChunker._section_end_regex().search(content, header.end)
+                hits += 1
+    return hits
+
+
+def bench(name: str, fn, notes: list[str], repeat: int) -> float:
+    """Run fn over notes and print best-of-N throughput."""
+    total_mb = sum(len(n) for n in notes) / 1_000_000
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(notes)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {name:<10} {best * 1000:8.1f} ms   {total_mb / best:7.2f} MB/s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark note keyword/section scanning")
+    parser.add_argument("--notes", type=int, default=200, help="Number of synthetic notes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per approach (best is reported)")
+    args = parser.parse_args()
+
+    notes = make_notes(args.notes)
+    scanner = get_note_scanner()
+    total_mb = sum(len(n) for n in notes) / 1_000_000
+    print(f"{len(notes)} notes, {total_mb:.2f} MB, {scanner.term_count} keywords")
+
+    legacy = bench("legacy", legacy_scan, notes, args.repeat)
+    shared = bench("scanner", scanner_scan, notes, args.repeat)
+    print(f"  speedup    {legacy / shared:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
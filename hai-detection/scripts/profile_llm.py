@@ -7,13 +7,13 @@ This script provides tools to analyze LLM inference performance:
 3. Generate performance reports
 
 Usage:
-    # Show profile summary from recent runs
-    python scripts/profile_llm.py summary
+    # Show profile summary from recent runs (persisted, last 7 days)
+    python scripts/profile_llm.py summary --days 7
 
     # Run profiling on demo cases
     python scripts/profile_llm.py demo --scenario clabsi
 
-    # Clear profile history
+    # Delete persisted profile history
     python scripts/profile_llm.py clear
 
     # Export profiles to JSON
@@ -30,11 +30,11 @@ from pathlib import Path
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from hai_src.llm.ollama import (
-    OllamaClient,
+from hai_src.llm.ollama import OllamaClient
+from hai_src.llm.profile_store import (
+    get_profile_store,
     get_profile_history,
     get_profile_summary,
-    clear_profile_history,
 )
 from hai_src.llm.factory import get_llm_client
 from hai_src.config import Config
@@ -48,7 +48,11 @@ logger = logging.getLogger(__name__)
 
 def cmd_summary(args):
     """Show summary of collected profiles."""
-    summary = get_profile_summary()
+    days = getattr(args, "days", None)
+    if days is None:
+        summary = get_profile_summary()  # This process only (demo runs)
+    else:
+        summary = get_profile_store().get_summary(days=days)["overall"]
 
     if summary.get("count", 0) == 0:
         print("No profiles collected yet.")
@@ -65,6 +69,7 @@ def cmd_summary(args):
     print(f"  Average generation: {summary['avg_generation_ms']:>8.1f} ms")
     print(f"  P50 total:          {summary['p50_total_ms']:>8.1f} ms")
     print(f"  P95 total:          {summary['p95_total_ms']:>8.1f} ms")
+    print(f"  P99 total:          {summary['p99_total_ms']:>8.1f} ms")
     print()
     print("Tokens:")
     print(f"  Average input:      {summary['avg_input_tokens']:>8.0f} tokens")
@@ -108,8 +113,8 @@ def cmd_history(args):
 
 
 def cmd_clear(args):
-    """Clear profile history."""
-    clear_profile_history()
+    """Delete persisted profile history."""
+    get_profile_store().clear()
     print("Profile history cleared.")
 
 
@@ -277,6 +282,8 @@ def main():
 
     # summary command
     sub = subparsers.add_parser("summary", help="Show profile summary")
+    sub.add_argument("--days", "-d", type=int, default=7,
+                     help="Look-back window in days")
     sub.set_defaults(func=cmd_summary)
 
     # history command
@@ -284,7 +291,7 @@ def main():
     sub.set_defaults(func=cmd_history)
 
     # clear command
-    sub = subparsers.add_parser("clear", help="Clear profile history")
+    sub = subparsers.add_parser("clear", help="Delete persisted profile history")
     sub.set_defaults(func=cmd_clear)
 
     # export command
@@ -203,20 +203,32 @@ def test_triage_only(args):
     """Test just the triage extractor."""
     print("\n=== Testing Triage Extractor Only ===\n")
 
-    triage = TriageExtractor(model=args.triage_model)
+    triage = TriageExtractor(model=args.triage_model, backend=args.backend)
 
     # Check model availability
     if not triage.client.is_available():
-        print(f"ERROR: Triage model '{args.triage_model}' not available.")
+        print(f"ERROR: Triage model '{triage.model}' not available.")
         print("Available models can be seen with: ollama list")
         print("Pull the 8B model with: ollama pull llama3.1:8b")
         return 1
 
-    print(f"Triage model: {args.triage_model}")
+    print(f"Triage model: {triage.model}")
     print()
 
     scenarios = ["clear_clabsi", "clear_not_clabsi", "complex_mbi", "alternate_source"]
 
+    if args.batch:
+        cases = [create_test_case(scenario) for scenario in scenarios]
+        start = time.time()
+        results = triage.extract_many(cases, hai_type=HAIType.CLABSI)
+        elapsed = time.time() - start
+
+        for scenario, result in zip(scenarios, results):
+            request_ms = result.profile.total_ms if result.profile else 0
+            print(f"{scenario:<20} {result.decision.value:<22} {request_ms:6.0f}ms")
+        print(f"\nBatch of {len(cases)}: {elapsed*1000:.0f}ms total")
+        return 0
+
     for scenario in scenarios:
         print(f"\n--- Scenario: {scenario} ---")
         candidate, notes = create_test_case(scenario)
@@ -322,6 +334,17 @@ def main():
         action="store_true",
         help="Only test triage extractor, not full pipeline"
     )
+    parser.add_argument(
+        "--backend",
+        choices=["ollama", "vllm"],
+        default=None,
+        help="Triage backend (default: TRIAGE_BACKEND config)"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="With --triage-only, triage all scenarios in one batch"
+    )
 
     args = parser.parse_args()
 
@@ -0,0 +1,86 @@
+"""Tests for the asynchronous activity-logging sink."""
+
+import json
+
+# hai_src.config puts the project root (common/) on sys.path
+import hai_src.db
+from common.metrics_store import ActivitySink, MetricsStore, ModuleSource
+
+
+def make_sink(tmp_path, **kwargs) -> ActivitySink:
+    store = MetricsStore(str(tmp_path / "metrics.db"))
+    return ActivitySink(store, flush_interval=60, **kwargs)
+
+
+def log(sink: ActivitySink, entity_id: str) -> None:
+    sink.log_activity(
+        activity_type="acknowledgment",
+        module=ModuleSource.HAI,
+        entity_id=entity_id,
+        entity_type="candidate",
+        details={"source": "test"},
+    )
+
+
+class TestActivitySink:
+    """Tests for ActivitySink."""
+
+    def test_rows_written_in_batches_on_flush(self, tmp_path):
+        """Test queued rows are written together and readable after flush."""
+        sink = make_sink(tmp_path, batch_size=100)
+        for i in range(5):
+            log(sink, f"c{i}")
+
+        assert sink.flush()
+
+        activities = sink.store.list_activities(module=ModuleSource.HAI)
+        assert sorted(a.entity_id for a in activities) == [f"c{i}" for i in range(5)]
+        assert activities[0].details == {"source": "test"}
+        sink.close()
+
+    def test_full_queue_drops_and_counts(self, tmp_path):
+        """Test logging never blocks when the queue is full."""
+        sink = make_sink(tmp_path, max_queue=2)
+        sink._ensure_writer = lambda: None  # No writer draining the queue
+
+        for i in range(5):
+            log(sink, f"c{i}")
+
+        assert sink.dropped == 3
+
+    def test_spool_replayed_without_duplicates(self, tmp_path):
+        """Test rows spooled before a crash are written once on restart."""
+        spool = tmp_path / "activity.spool"
+        sink = make_sink(tmp_path, spool_path=spool)
+        log(sink, "written")
+        sink.flush()
+        assert spool.read_text() == ""
+
+        # Simulate a crash: one row written, one only spooled
+        log(sink, "pending")
+        pending = spool.read_text()
+        sink._queue.queue.clear()
+        row = json.loads(pending)
+        spool.write_text(pending + json.dumps(row) + "\n")
+
+        restarted = make_sink(tmp_path, spool_path=spool)
+        restarted.flush()
+
+        entity_ids = sorted(a.entity_id for a in restarted.store.list_activities())
+        assert entity_ids == ["pending", "written"]
+        assert spool.read_text() == ""
+
+    def test_hai_activity_goes_through_sink(self, tmp_path, monkeypatch):
+        """Test HAI activity logging is queued rather than written inline."""
+        logged = []
+
+        class FakeSink:
+            def log_activity(self, **kwargs):
+                logged.append(kwargs)
+
+        monkeypatch.setattr("common.metrics_store.get_activity_sink", lambda: FakeSink())
+
+        hai_src.db._log_hai_activity("review", "c1", "candidate", "confirmed")
+
+        assert logged[0]["module"] == ModuleSource.HAI
+        assert logged[0]["entity_id"] == "c1"
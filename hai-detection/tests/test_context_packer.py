@@ -0,0 +1,152 @@
+"""Tests for token-budgeted note context packing."""
+
+from datetime import datetime, timedelta
+
+from hai_src.config import Config
+from hai_src.extraction.ssi_extractor import SSIExtractor
+from hai_src.models import (
+    ClinicalNote,
+    CultureResult,
+    HAICandidate,
+    HAIType,
+    Patient,
+    SurgicalProcedure,
+)
+from hai_src.notes.packer import ContextPacker, estimate_tokens
+
+
+CULTURE_DATE = datetime(2026, 1, 10, 8, 0)
+
+FILLER = (
+    "Patient seen and examined at bedside with family present. Tolerating diet, "
+    "ambulating in the hallway with physical therapy. Pain well controlled on the "
+    "current regimen. Discussed plan of care with nursing staff this morning."
+)
+
+RELEVANT_AP = (
+    "ASSESSMENT/PLAN:\n"
+    "Fever to 39.2 with positive blood culture growing S. aureus. PICC line in "
+    "place since admission, exit site with erythema. Concern for CLABSI versus "
+    "line infection. Plan line removal and repeat blood culture.\n"
+)
+
+
+def make_note(note_id: str, day_offset: int, content: str, note_type: str = "progress_note") -> ClinicalNote:
+    """Create a note N days from the culture date."""
+    return ClinicalNote(
+        id=note_id,
+        patient_id="P1",
+        note_type=note_type,
+        date=CULTURE_DATE + timedelta(days=day_offset),
+        content=content,
+        source="fhir",
+    )
+
+
+def long_stay_notes() -> list[ClinicalNote]:
+    """A 30-note stay with one clearly relevant A/P near the culture date."""
+    notes = [
+        make_note(f"n{i}", i - 20, "\n\n".join([FILLER] * 4))
+        for i in range(30)
+        if i != 20
+    ]
+    notes.append(make_note("n20", 0, f"{FILLER}\n\n{RELEVANT_AP}"))
+    return notes
+
+
+class TestContextPacker:
+    """Tests for ContextPacker."""
+
+    def test_respects_token_budget(self):
+        """Test packed context never exceeds the budget."""
+        packed = ContextPacker().pack(long_stay_notes(), "clabsi", CULTURE_DATE, token_budget=500)
+
+        assert packed.tokens_kept <= 500
+        assert estimate_tokens(packed.text) < 500 + 200  # Headers only
+        assert packed.tokens_dropped > 0
+        assert packed.segments_kept + packed.segments_dropped > packed.segments_kept
+
+    def test_relevant_section_ranked_first(self):
+        """Test the keyword-dense A/P near the culture date survives a tight budget."""
+        packed = ContextPacker().pack(long_stay_notes(), "clabsi", CULTURE_DATE, token_budget=100)
+
+        assert "line removal and repeat blood culture" in packed.text
+        assert packed.notes_used == 1
+        assert packed.notes_total == 30
+
+    def test_everything_kept_under_large_budget(self):
+        """Test nothing is dropped when the notes fit."""
+        notes = [make_note("n1", 0, f"{FILLER}\n\n{RELEVANT_AP}")]
+
+        packed = ContextPacker().pack(notes, "clabsi", CULTURE_DATE, token_budget=10_000)
+
+        assert packed.tokens_dropped == 0
+        assert packed.segments_dropped == 0
+        assert FILLER in packed.text
+
+    def test_proximity_breaks_ties(self):
+        """Test identical content closer to the culture date wins."""
+        notes = [
+            make_note("far", -7, RELEVANT_AP),
+            make_note("near", -1, RELEVANT_AP),
+        ]
+        budget = ContextPacker().segment_note(notes[0])[0].tokens
+
+        packed = ContextPacker().pack(notes, "clabsi", CULTURE_DATE, token_budget=budget)
+
+        assert packed.notes_used == 1
+        assert CULTURE_DATE.strftime("%Y-%m-%d") not in packed.text
+        assert (CULTURE_DATE - timedelta(days=1)).strftime("%Y-%m-%d") in packed.text
+
+    def test_long_paragraph_is_split(self):
+        """Test oversized paragraphs are split so they can partially fit."""
+        wall = "\n".join([FILLER] * 40)
+        segments = ContextPacker().segment_note(make_note("n1", 0, wall))
+
+        assert len(segments) > 1
+        assert all(s.tokens <= ContextPacker.MAX_SEGMENT_TOKENS for s in segments)
+
+    def test_keyword_match_is_whole_word(self):
+        """Test short keywords don't match inside other words."""
+        packer = ContextPacker()
+        [segment] = packer.segment_note(make_note("n1", 0, "Global assessment unchanged today."))
+
+        assert packer.score_segment(segment, "vae") == 0.0
+
+    def test_profile_fields_in_dict(self):
+        """Test to_dict exposes the token accounting used by LLMProfile."""
+        packed = ContextPacker().pack(long_stay_notes(), "cdi", CULTURE_DATE, token_budget=200)
+
+        stats = packed.to_dict()
+        assert stats["hai_type"] == "cdi"
+        assert stats["tokens_kept"] == packed.tokens_kept
+        assert stats["tokens_dropped"] == packed.tokens_dropped
+
+    def test_ssi_anchored_on_procedure_date(self, monkeypatch):
+        """Test SSI context favours notes near the procedure over the culture."""
+        notes = [
+            make_note("post-op", -13, RELEVANT_AP),
+            make_note("pre-culture", -1, RELEVANT_AP),
+        ]
+        budget = ContextPacker().segment_note(notes[0])[0].tokens
+        monkeypatch.setitem(Config.CONTEXT_TOKEN_BUDGETS, "ssi", budget)
+
+        candidate = HAICandidate(
+            id="ssi-1",
+            hai_type=HAIType.SSI,
+            patient=Patient(fhir_id="P1", mrn="MRN1", name="Test"),
+            culture=CultureResult(fhir_id="c1", collection_date=CULTURE_DATE),
+        )
+        procedure = SurgicalProcedure(
+            id="proc-1",
+            procedure_code="44140",
+            procedure_name="Colectomy",
+            procedure_date=CULTURE_DATE - timedelta(days=14),
+            patient_id="P1",
+        )
+
+        packed = SSIExtractor(llm_client=object())._pack_notes(candidate, notes, procedure)
+
+        assert packed.notes_used == 1
+        assert (CULTURE_DATE - timedelta(days=13)).strftime("%Y-%m-%d") in packed.text
+        assert (CULTURE_DATE - timedelta(days=1)).strftime("%Y-%m-%d") not in packed.text
@@ -0,0 +1,140 @@
+"""Tests for the shared SQLite connection and schema layer used by HAIDatabase."""
+
+import sqlite3
+import threading
+
+from hai_src.db import HAIDatabase, MIGRATIONS
+
+# hai_src.config puts the project root (common/) on sys.path
+from common.db import (
+    ConnectionManager,
+    Migration,
+    VersionedCache,
+    add_column,
+    ensure_schema,
+    get_connection,
+    retry_on_busy,
+    schema_version,
+)
+from common.metrics_store import get_metrics_store
+
+
+class TestSharedConnections:
+    """Tests for common.db connections."""
+
+    def test_database_uses_wal(self, tmp_path):
+        """Test module databases open in WAL mode."""
+        db = HAIDatabase(str(tmp_path / "hai.db"))
+
+        with db._get_connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode == "wal"
+
+    def test_connection_reused_per_thread(self, tmp_path):
+        """Test a thread gets the same connection back and others get their own."""
+        manager = ConnectionManager()
+        path = tmp_path / "test.db"
+
+        first = manager.get(path)
+        with first:
+            first.execute("CREATE TABLE t (x)")
+        other = []
+        thread = threading.Thread(target=lambda: other.append(manager.get(path)))
+        thread.start()
+        thread.join()
+
+        assert manager.get(path) is first
+        assert other[0] is not first
+        assert manager.opened == 2
+
+    def test_retry_on_busy(self):
+        """Test busy errors are retried and other errors are not."""
+        calls = []
+
+        @retry_on_busy(base_delay=0)
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise sqlite3.OperationalError("database is locked")
+            return "ok"
+
+        assert flaky() == "ok"
+        assert len(calls) == 3
+
+
+class TestSchemaRegistry:
+    """Tests for once-per-process schema initialization and migrations."""
+
+    def test_schema_runs_once_per_process(self, tmp_path, monkeypatch):
+        """Test constructing a database again doesn't re-run the schema script."""
+        path = tmp_path / "hai.db"
+        HAIDatabase(str(path))
+        calls = []
+        monkeypatch.setattr("pathlib.Path.read_text", lambda *a, **k: calls.append(a) or "")
+
+        HAIDatabase(str(path))
+
+        assert calls == []
+        assert schema_version(get_connection(path), "hai") == len(MIGRATIONS)
+
+    def test_migrations_apply_in_order_once(self, tmp_path):
+        """Test pending migrations run once, in version order, per component."""
+        path = tmp_path / "test.db"
+        migrations = [
+            Migration(2, "add column", "ALTER TABLE items ADD COLUMN size INTEGER"),
+            Migration(1, "create table", "CREATE TABLE items (id INTEGER PRIMARY KEY)"),
+        ]
+
+        assert ensure_schema(path, "items", migrations=migrations) == 2
+        assert ensure_schema(path, "items", migrations=migrations) == 2
+        assert ensure_schema(path, "other") == 0
+
+        columns = [row[1] for row in get_connection(path).execute("PRAGMA table_info(items)")]
+        assert columns == ["id", "size"]
+
+    def test_add_column_skips_missing_table(self, tmp_path):
+        """Test a column migration on another component's table is a no-op without it."""
+        path = tmp_path / "test.db"
+        migrations = [Migration(1, "add column", add_column("items", "size", "INTEGER"))]
+
+        assert ensure_schema(path, "items", migrations=migrations) == 1
+        assert get_connection(path).execute("PRAGMA table_info(items)").fetchall() == []
+
+    def test_metrics_store_is_shared(self, tmp_path):
+        """Test activity logging reuses one MetricsStore per database."""
+        path = str(tmp_path / "metrics.db")
+
+        assert get_metrics_store(path) is get_metrics_store(path)
+
+
+class TestVersionedCache:
+    """Tests for caching derived results against a change counter."""
+
+    def test_served_until_version_changes(self, tmp_path):
+        """Test a result is reused until a write bumps the counter, and copied out."""
+        conn = get_connection(tmp_path / "test.db")
+        conn.executescript("""
+            CREATE TABLE changes (id INTEGER PRIMARY KEY, version INTEGER);
+            INSERT INTO changes VALUES (1, 0);
+        """)
+        cache = VersionedCache("changes")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"total": len(calls)}
+
+        def read():
+            return cache.get(("totals",), cache.read_version(conn), compute, ttl=60)
+
+        first = read()
+        first["total"] = 99
+        assert read() == {"total": 1}
+
+        conn.execute("UPDATE changes SET version = version + 1 WHERE id = 1")
+        assert read() == {"total": 2}
+
+        # Expired entries are recomputed even at the same version
+        assert cache.get(("expiring",), 1, compute, ttl=0) == {"total": 3}
+        assert cache.get(("expiring",), 1, compute, ttl=0) == {"total": 4}
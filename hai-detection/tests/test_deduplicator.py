@@ -0,0 +1,114 @@
+"""Tests for copy-forward note deduplication."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from hai_src.models import ClinicalNote
+from hai_src.notes.deduplicator import NoteDeduplicator
+
+
+ASSESSMENT = (
+    "Patient remains febrile overnight with Tmax 39.1. Central line in right "
+    "subclavian, site clean without erythema or drainage. Blood cultures drawn "
+    "from line and periphery, pending. Continue vancomycin and cefepime, follow "
+    "up cultures and reassess line need daily with the primary team."
+)
+
+SOCIAL = (
+    "Lives at home with both parents and two siblings. No recent travel. Attends "
+    "daycare three days per week. Immunizations are up to date per the family "
+    "and the state registry was reviewed on admission without any concerns."
+)
+
+
+def make_note(note_id: str, day: int, content: str) -> ClinicalNote:
+    """Create a progress note on admission day N."""
+    return ClinicalNote(
+        id=note_id,
+        patient_id="P1",
+        note_type="progress_note",
+        date=datetime(2026, 1, 1) + timedelta(days=day),
+        content=content,
+        source="fhir",
+    )
+
+
+def copy_forward_notes() -> list[ClinicalNote]:
+    """Three notes where later ones copy forward with re-punctuated text."""
+    return [
+        make_note("n1", 0, f"{ASSESSMENT}\n\n{SOCIAL}"),
+        make_note("n2", 1, f"{ASSESSMENT.replace('. ', '; ')}\n\n{SOCIAL}"),
+        make_note("n3", 2, f"{ASSESSMENT.replace(', ', ' - ')}\n\n{SOCIAL}"),
+    ]
+
+
+class TestNoteDeduplicator:
+    """Tests for NoteDeduplicator."""
+
+    def test_exact_mode_misses_edited_paragraphs(self):
+        """Test exact hashing only catches the untouched paragraph."""
+        stats = NoteDeduplicator().get_duplication_stats(copy_forward_notes())
+
+        assert stats["total_paragraphs"] == 6
+        assert stats["duplicate_paragraphs"] == 2  # SOCIAL in n2, n3
+
+    def test_near_mode_catches_edited_paragraphs(self):
+        """Test near mode collapses copies that were only re-punctuated."""
+        stats = NoteDeduplicator(mode="near").get_duplication_stats(copy_forward_notes())
+
+        assert stats["duplicate_paragraphs"] == 4
+        assert stats["mode"] == "near"
+        assert stats["duplicate_tokens_est"] == stats["duplicate_chars"] // 4
+        assert stats["token_savings_rate"] > 0.6
+
+    def test_near_mode_keeps_distinct_paragraphs(self):
+        """Test unrelated paragraphs are not collapsed."""
+        notes = [make_note("n1", 0, ASSESSMENT), make_note("n2", 1, SOCIAL)]
+
+        stats = NoteDeduplicator(mode="near").get_duplication_stats(notes)
+
+        assert stats["duplicate_paragraphs"] == 0
+
+    def test_near_mode_respects_threshold(self):
+        """Test a stricter threshold keeps moderately edited paragraphs."""
+        edited = ASSESSMENT.replace("vancomycin and cefepime", "meropenem alone")
+        notes = [make_note("n1", 0, ASSESSMENT), make_note("n2", 1, edited)]
+
+        loose = NoteDeduplicator(mode="near", similarity_threshold=0.7)
+        strict = NoteDeduplicator(mode="near", similarity_threshold=0.95)
+
+        assert loose.get_duplication_stats(notes)["duplicate_paragraphs"] == 1
+        assert strict.get_duplication_stats(notes)["duplicate_paragraphs"] == 0
+
+    def test_remove_duplicates_keeps_first_occurrence(self):
+        """Test removal keeps the oldest note intact and marks later copies."""
+        result = NoteDeduplicator(mode="near").deduplicate_notes(
+            copy_forward_notes(), remove_duplicates=True
+        )
+        by_id = {n.id: n for n in result}
+
+        assert ASSESSMENT in by_id["n1"].content
+        assert "; " not in by_id["n2"].content
+        assert by_id["n3"].content.count("[Content copied from previous note]") == 2
+        assert [n.id for n in result] == ["n3", "n2", "n1"]
+
+    def test_near_mode_keeps_updated_values(self):
+        """Test copies that differ only in values keep every note's values."""
+        notes = [
+            make_note("n1", 0, ASSESSMENT),
+            make_note("n2", 1, ASSESSMENT.replace("39.1", "38.4")),
+        ]
+
+        dedup = NoteDeduplicator(mode="near")
+        result = {n.id: n for n in dedup.deduplicate_notes(notes, remove_duplicates=True)}
+
+        assert "39.1" in result["n1"].content
+        assert "38.4" in result["n2"].content
+        assert "[Content copied from previous note]" not in result["n2"].content
+        assert dedup.get_duplication_stats(notes)["duplicate_paragraphs"] == 0
+
+    def test_invalid_mode(self):
+        """Test unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            NoteDeduplicator(mode="fuzzy")
@@ -0,0 +1,269 @@
+"""Tests for paged FHIR search iteration."""
+
+import io
+import json
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from hai_src.data.fhir_source import FHIRCultureSource
+
+# hai_src.config puts the project root (common/) on sys.path
+from common.fhir import (
+    BundlePager,
+    FHIRResponseCache,
+    PagedSearchMixin,
+    get_search_stats,
+    reset_search_stats,
+)
+
+
+def bundle_page(ids: list[str], next_url: str | None = None) -> dict:
+    page = {
+        "resourceType": "Bundle",
+        "entry": [{"resource": {"resourceType": "Observation", "id": i}} for i in ids],
+    }
+    if next_url:
+        page["link"] = [{"relation": "self", "url": "x"}, {"relation": "next", "url": next_url}]
+    return page
+
+
+class FakeServer:
+    """Page fetcher serving a chain of Bundles, recording requests."""
+
+    def __init__(self, pages: dict[str, dict], delay: float = 0.0):
+        self.pages = pages
+        self.delay = delay
+        self.requests: list[tuple[str, dict | None]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, params, stream):
+        with self.lock:
+            self.requests.append((url, params))
+        time.sleep(self.delay)
+        response = Mock()
+        response.json.return_value = self.pages[url]
+        response.content = b"{}"
+        return response
+
+
+def three_pages() -> dict[str, dict]:
+    return {
+        "http://fhir/Observation": bundle_page(["a", "b"], "http://fhir/page2"),
+        "http://fhir/page2": bundle_page(["c", "d"], "http://fhir/page3"),
+        "http://fhir/page3": bundle_page(["e"]),
+    }
+
+
+class TestBundlePager:
+    """Tests for BundlePager."""
+
+    def test_follows_next_links(self):
+        """Test every page is read, with _count on the first request only."""
+        server = FakeServer(three_pages())
+        pager = BundlePager(server, page_size=2, prefetch=False)
+
+        ids = [r["id"] for r in pager.resources("http://fhir/Observation", {"patient": "p1"})]
+
+        assert ids == ["a", "b", "c", "d", "e"]
+        assert server.requests[0] == ("http://fhir/Observation", {"patient": "p1", "_count": 2})
+        assert server.requests[1] == ("http://fhir/page2", None)
+
+    def test_prefetches_next_page(self):
+        """Test page 2 is requested while the caller is still on page 1."""
+        server = FakeServer(three_pages(), delay=0.05)
+        pager = BundlePager(server, prefetch=True)
+
+        results = pager.resources("http://fhir/Observation")
+        next(results)
+        time.sleep(0.1)
+
+        assert [url for url, _ in server.requests][:2] == ["http://fhir/Observation", "http://fhir/page2"]
+        assert len(list(results)) == 4
+
+    def test_limit_and_max_pages(self):
+        """Test limit stops without fetching further pages and max_pages caps the search."""
+        server = FakeServer(three_pages())
+
+        limited = list(BundlePager(server, prefetch=True).resources("http://fhir/Observation", limit=1))
+        assert [r["id"] for r in limited] == ["a"]
+        assert len(server.requests) == 1
+
+        capped = list(BundlePager(server, max_pages=2, prefetch=False).resources("http://fhir/Observation"))
+        assert [r["id"] for r in capped] == ["a", "b", "c", "d"]
+
+    def test_metrics_recorded_per_resource_type(self):
+        """Test searches are aggregated by resource type."""
+        reset_search_stats()
+        list(BundlePager(FakeServer(three_pages()), prefetch=False).entries("http://fhir/Observation"))
+
+        stats = get_search_stats()["Observation"]
+
+        assert stats["searches"] == 1
+        assert stats["pages"] == 3
+        assert stats["entries"] == 5
+
+    def test_streaming_parse_matches(self):
+        """Test incremental parsing yields the same entries and follows links."""
+        pytest.importorskip("ijson")
+        pages = three_pages()
+
+        def fetch(url, params, stream):
+            response = Mock()
+            response.raw = io.BytesIO(json.dumps(pages[url]).encode())
+            return response
+
+        ids = [r["id"] for r in BundlePager(fetch, stream=True).resources("http://fhir/Observation")]
+
+        assert ids == ["a", "b", "c", "d", "e"]
+
+    def test_http_error_raised_to_caller(self):
+        """Test request failures surface as requests exceptions."""
+        def fetch(url, params, stream):
+            response = Mock()
+            response.raise_for_status.side_effect = requests.HTTPError("503")
+            return response
+
+        with pytest.raises(requests.HTTPError):
+            list(BundlePager(fetch).entries("http://fhir/Observation"))
+
+
+    def test_search_mixin_sends_auth_headers(self):
+        """Test client search() pages through results with per-request auth."""
+        server = FakeServer(three_pages())
+
+        class Client(PagedSearchMixin):
+            base_url = "http://fhir"
+
+            def __init__(self):
+                self.session = Mock()
+                self.session.get.side_effect = lambda url, params=None, **kwargs: server(url, params, False)
+                self.tokens = 0
+
+            def _auth_headers(self):
+                self.tokens += 1
+                return {"Authorization": f"Bearer {self.tokens}"}
+
+        client = Client()
+        ids = [r["id"] for r in client.search("Observation", {"patient": "p1"})]
+
+        assert ids == ["a", "b", "c", "d", "e"]
+        assert client.tokens == 3
+        assert client.session.get.call_args.kwargs["headers"] == {"Authorization": "Bearer 3"}
+
+
+class TestFHIRSourcePaging:
+    """Tests for HAI FHIR sources reading every page."""
+
+    def test_cultures_for_patient_reads_all_pages(self):
+        """Test a multi-page culture search returns results from every page."""
+        def report(report_id: str) -> dict:
+            return {
+                "resource": {
+                    "resourceType": "DiagnosticReport",
+                    "id": report_id,
+                    "code": {"coding": [{"code": "600-7"}]},
+                    "effectiveDateTime": "2026-01-10T08:00:00",
+                    "conclusion": "Staphylococcus aureus",
+                    "subject": {"reference": "Patient/p1"},
+                }
+            }
+
+        pages = [
+            {"resourceType": "Bundle", "entry": [report("r1")],
+             "link": [{"relation": "next", "url": "http://fhir/next"}]},
+            {"resourceType": "Bundle", "entry": [report("r2")]},
+        ]
+        source = FHIRCultureSource(base_url="http://fhir")
+        source.session = Mock()
+        source.session.get.side_effect = lambda url, **kwargs: Mock(
+            json=Mock(return_value=pages[0] if url.endswith("DiagnosticReport") else pages[1]),
+            content=b"{}",
+        )
+
+        cultures = source.get_cultures_for_patient("p1", datetime(2026, 1, 1), datetime(2026, 1, 31))
+
+        assert [c.fhir_id for c in cultures] == ["r1", "r2"]
+
+
+class FakeETagSession:
+    """Session answering GETs with a fixed body and ETag, honoring If-None-Match."""
+
+    def __init__(self, body: dict, etag: str = 'W/"1"'):
+        self.body = body
+        self.etag = etag
+        self.calls: list[tuple[str, dict | None]] = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append((url, headers))
+        response = requests.Response()
+        response.url = url
+        if headers and headers.get("If-None-Match") == self.etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response.headers["ETag"] = self.etag
+            response._content = json.dumps(self.body).encode()
+        response._content_consumed = True
+        return response
+
+
+class TestFHIRResponseCache:
+    """Tests for the FHIR response cache."""
+
+    def test_fresh_entry_served_without_request(self):
+        """Test a repeated read is answered from the cache."""
+        session = FakeETagSession({"resourceType": "Patient", "id": "p1"})
+        cache = FHIRResponseCache(ttls={"Patient": 60})
+
+        first = cache.get(session, "http://fhir/Patient/p1")
+        second = cache.get(session, "http://fhir/Patient/p1")
+
+        assert second.json() == first.json() == {"resourceType": "Patient", "id": "p1"}
+        assert len(session.calls) == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert stats["by_type"]["Patient"]["hits"] == 1
+
+    def test_expired_entry_revalidated_with_etag(self):
+        """Test an expired entry is renewed by a 304 instead of re-downloaded."""
+        session = FakeETagSession({"resourceType": "Bundle", "entry": []})
+        cache = FHIRResponseCache(ttls={"MedicationRequest": 0})
+
+        cache.get(session, "http://fhir/MedicationRequest", {"patient": "p1"})
+        response = cache.get(session, "http://fhir/MedicationRequest", {"patient": "p1"})
+
+        assert response.status_code == 200
+        assert response.json() == {"resourceType": "Bundle", "entry": []}
+        assert session.calls[1] == ("http://fhir/MedicationRequest?patient=p1", {"If-None-Match": 'W/"1"'})
+        assert cache.stats()["revalidated"] == 1
+
+    def test_least_recently_used_entry_evicted(self):
+        """Test the cache holds at most max_entries responses."""
+        session = FakeETagSession({"resourceType": "Patient"})
+        cache = FHIRResponseCache(max_entries=2)
+
+        for pid in ("a", "b", "a", "c"):
+            cache.get(session, f"http://fhir/Patient/{pid}")
+        cache.get(session, "http://fhir/Patient/a")
+
+        assert [url for url, _ in session.calls] == [
+            "http://fhir/Patient/a", "http://fhir/Patient/b", "http://fhir/Patient/c",
+        ]
+        assert cache.stats()["evictions"] == 1
+
+    def test_pager_reads_through_cache(self):
+        """Test a repeated paged search is served from the cache."""
+        session = FakeETagSession(bundle_page(["a", "b"]))
+        cache = FHIRResponseCache()
+        pager = BundlePager(cache.fetcher(session), prefetch=False, stream=False)
+
+        for _ in range(2):
+            ids = [r["id"] for r in pager.resources("http://fhir/Observation", {"patient": "p1"})]
+            assert ids == ["a", "b"]
+        assert len(session.calls) == 1
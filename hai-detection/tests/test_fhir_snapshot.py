@@ -0,0 +1,68 @@
+"""Tests for the per-cycle bulk patient snapshot."""
+
+import pytest
+
+# hai_src.config puts the project root (common/) on sys.path
+import hai_src.config  # noqa: F401
+from common.fhir import PatientSnapshot
+
+
+def medication(pid_reference: str, med_id: str) -> dict:
+    return {
+        "resourceType": "MedicationRequest",
+        "id": med_id,
+        "subject": {"reference": pid_reference},
+    }
+
+
+def fake_search(medications: list[dict], fail: Exception | None = None):
+    """Search function serving the given MedicationRequests."""
+
+    def search(resource_type, params):
+        if resource_type == "Patient":
+            return [{"resourceType": "Patient", "id": pid} for pid in params["_id"].split(",")]
+        if fail is not None:
+            raise fail
+        # Served for the chunk containing p1 only
+        return medications if "p1" in params["patient"].split(",") else []
+
+    return search
+
+
+class TestPatientSnapshot:
+    """Tests for PatientSnapshot.fetch."""
+
+    @pytest.mark.parametrize("reference", [
+        "Patient/p1",
+        "https://fhir.example.org/fhir/Patient/p1",
+        "Patient/p1/_history/2",
+        "https://fhir.example.org/fhir/Patient/p1/_history/2",
+    ])
+    def test_reference_forms_matched(self, reference):
+        """Test relative, absolute and versioned subjects map to the searched ID."""
+        search = fake_search([medication(reference, "m1")])
+        snapshot = PatientSnapshot.fetch(search, ["p1", "p2"])
+
+        assert snapshot.covers("p1") and snapshot.covers("p2")
+        assert [m["id"] for m in snapshot.medication_requests("p1")] == ["m1"]
+        assert snapshot.medication_requests("p2") == []
+
+    def test_unmatched_subject_uncovers_chunk(self):
+        """Test an unmatchable subject leaves the chunk to per-patient lookups."""
+        search = fake_search([
+            medication("Patient/p1", "m1"),
+            medication("urn:uuid:5a1c0d2e-0000-4000-8000-000000000001", "m2"),
+        ])
+        snapshot = PatientSnapshot.fetch(search, ["p1", "p2", "p3"], chunk_size=2)
+
+        assert not snapshot.covers("p1") and not snapshot.covers("p2")
+        assert snapshot.medication_requests("p1") == []
+        assert snapshot.covers("p3")
+
+    def test_malformed_page_uncovers_chunk(self):
+        """Test a parse error in a bulk search falls back instead of aborting the cycle."""
+        search = fake_search([], fail=ValueError("malformed JSON in bundle page"))
+        snapshot = PatientSnapshot.fetch(search, ["p1", "p2"])
+
+        assert snapshot.patient("p1") is not None
+        assert not snapshot.covers("p1") and not snapshot.covers("p2")
@@ -0,0 +1,181 @@
+"""Tests for batched structured generation and batch triage."""
+
+import json
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+import requests
+
+from hai_src.extraction.triage_extractor import TriageDecision, TriageExtractor
+from hai_src.llm.base import StructuredLLMResponse, StructuredRequest, LLMProfile
+from hai_src.llm.ollama import OllamaClient
+from hai_src.llm.vllm import VLLMClient
+from hai_src.models import (
+    ClinicalNote,
+    CultureResult,
+    DeviceInfo,
+    HAICandidate,
+    HAIType,
+    Patient,
+)
+
+
+SCHEMA = {"type": "object", "properties": {"fever": {"type": "string"}}}
+
+
+def vllm_response(content: dict, delay: float = 0.0):
+    """Fake session.post returning an OpenAI-style completion after delay."""
+    def post(url, **kwargs):
+        time.sleep(delay)
+        response = Mock()
+        response.json.return_value = {
+            "choices": [{"message": {"content": json.dumps(content)}}],
+            "usage": {"prompt_tokens": 900, "completion_tokens": 40},
+        }
+        return response
+    return post
+
+
+def make_case(case_id: str) -> tuple[HAICandidate, list[ClinicalNote]]:
+    patient = Patient(fhir_id=f"p-{case_id}", mrn=f"MRN-{case_id}", name="Test")
+    candidate = HAICandidate(
+        id=case_id,
+        hai_type=HAIType.CLABSI,
+        patient=patient,
+        culture=CultureResult(
+            fhir_id=f"c-{case_id}",
+            collection_date=datetime(2026, 1, 10),
+            organism="Staphylococcus aureus",
+        ),
+        device_info=DeviceInfo(device_type="PICC"),
+        device_days_at_culture=5,
+    )
+    note = ClinicalNote(
+        id=f"n-{case_id}",
+        patient_id=patient.fhir_id,
+        note_type="progress_note",
+        date=datetime(2026, 1, 10),
+        content="ASSESSMENT/PLAN:\nCLABSI likely, PICC site erythema.",
+        source="fhir",
+    )
+    return candidate, [note]
+
+
+class TestGenerateStructuredMany:
+    """Tests for BaseLLMClient.generate_structured_many backends."""
+
+    def test_vllm_requests_run_concurrently(self):
+        """Test a vLLM batch takes about as long as one request."""
+        client = VLLMClient(
+            base_url="http://vllm", model="m", use_cache=False, max_concurrency=8, enable_profiling=False
+        )
+        client.session = Mock()
+        client.session.post.side_effect = vllm_response({"fever": "definite"}, delay=0.2)
+
+        start = time.perf_counter()
+        results = client.generate_structured_many(
+            [StructuredRequest(prompt=f"p{i}", output_schema=SCHEMA) for i in range(8)]
+        )
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.2 * 3  # Sequential would take 1.6s
+        assert all(r.data == {"fever": "definite"} for r in results)
+        assert all(r.profile.input_tokens == 900 for r in results)
+        assert all(r.profile.total_ms >= 200 for r in results)
+
+    def test_vllm_uses_top_level_guided_json(self):
+        """Test the schema is sent as vLLM's guided_json request field."""
+        client = VLLMClient(base_url="http://vllm", model="m", use_cache=False, enable_profiling=False)
+        client.session = Mock()
+        client.session.post.side_effect = vllm_response({"fever": "definite"})
+
+        client.generate_structured("prompt", SCHEMA)
+
+        payload = client.session.post.call_args.kwargs["json"]
+        assert payload["guided_json"] == SCHEMA
+        assert "extra_body" not in payload
+
+    def test_failures_are_returned_in_place(self):
+        """Test one failed request doesn't abort the batch or reorder results."""
+        client = VLLMClient(base_url="http://vllm", model="m", use_cache=False, enable_profiling=False)
+        ok = vllm_response({"fever": "definite"})
+
+        def post(url, **kwargs):
+            if kwargs["json"]["messages"][1]["content"] == "bad":
+                raise requests.ConnectionError("connection reset")
+            return ok(url, **kwargs)
+
+        client.session = Mock()
+        client.session.post.side_effect = post
+
+        results = client.generate_structured_many([
+            StructuredRequest(prompt="good", output_schema=SCHEMA),
+            StructuredRequest(prompt="bad", output_schema=SCHEMA),
+            StructuredRequest(prompt="good", output_schema=SCHEMA),
+        ])
+
+        assert isinstance(results[0], StructuredLLMResponse)
+        assert isinstance(results[1], requests.ConnectionError)
+        assert isinstance(results[2], StructuredLLMResponse)
+
+    def test_ollama_falls_back_to_sequential(self):
+        """Test the default implementation runs requests in order."""
+        client = OllamaClient(base_url="http://ollama", model="m", use_cache=False, enable_profiling=False)
+        response = Mock()
+        response.json.return_value = {"message": {"content": '{"fever": "none"}'}}
+        client.session = Mock()
+        client.session.post.return_value = response
+
+        results = client.generate_structured_many(
+            [StructuredRequest(prompt=p, output_schema=SCHEMA) for p in ("a", "b")]
+        )
+
+        prompts = [c.kwargs["json"]["messages"][1]["content"] for c in client.session.post.call_args_list]
+        assert prompts == ["a", "b"]
+        assert [r.data for r in results] == [{"fever": "none"}] * 2
+
+
+class TestBatchTriage:
+    """Tests for TriageExtractor.extract_many."""
+
+    def test_extract_many_preserves_order_and_escalates_errors(self):
+        """Test each case gets its own decision and failures escalate."""
+        clear = {"documentation_quality": "detailed", "obvious_hai_signals": True}
+        client = Mock()
+        client.generate_structured_many.return_value = [
+            StructuredLLMResponse(data=clear, profile=LLMProfile(total_ms=900)),
+            ValueError("Invalid JSON response"),
+        ]
+        extractor = TriageExtractor(llm_client=client)
+
+        results = extractor.extract_many([make_case("a"), make_case("b")], hai_type=HAIType.CLABSI)
+
+        [batch], _ = client.generate_structured_many.call_args
+        assert len(batch) == 2
+        assert all(r.profile_context == "triage_clabsi" for r in batch)
+        assert results[0].decision == TriageDecision.CLEAR_HAI
+        assert results[0].profile.total_ms == 900
+        assert results[1].decision == TriageDecision.NEEDS_FULL_ANALYSIS
+        assert results[1].documentation_quality == "error"
+
+    def test_extract_many_isolates_bad_cases(self):
+        """Test a case that can't be prompted or parsed doesn't sink the batch."""
+        clear = {"documentation_quality": "detailed", "obvious_hai_signals": True}
+        client = Mock()
+        client.generate_structured_many.return_value = [
+            StructuredLLMResponse(data=clear, profile=LLMProfile(total_ms=900)),
+            StructuredLLMResponse(data=None, profile=LLMProfile(total_ms=800)),
+        ]
+        extractor = TriageExtractor(llm_client=client)
+        unpromptable = (make_case("b")[0], None)
+
+        results = extractor.extract_many(
+            [make_case("a"), unpromptable, make_case("c")], hai_type=HAIType.CLABSI
+        )
+
+        [batch], _ = client.generate_structured_many.call_args
+        assert len(batch) == 2
+        assert results[0].decision == TriageDecision.CLEAR_HAI
+        assert [r.decision for r in results[1:]] == [TriageDecision.NEEDS_FULL_ANALYSIS] * 2
+        assert all(r.documentation_quality == "error" for r in results[1:])
@@ -0,0 +1,111 @@
+"""Tests for the persistent LLM response cache."""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from hai_src.llm.cache import LLMResponseCache
+from hai_src.llm.ollama import OllamaClient
+
+
+SCHEMA = {"type": "object", "properties": {"fever": {"type": "string"}}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache backed by a temporary database."""
+    return LLMResponseCache(db_path=tmp_path / "llm_cache.db", ttl_hours=1, max_entries=100)
+
+
+class TestLLMResponseCache:
+    """Tests for LLMResponseCache."""
+
+    def test_key_depends_on_every_input(self):
+        """Test changing any key component produces a different key."""
+        base = ("llama3.3:70b", "clabsi_extraction_v1", SCHEMA, None, "notes...")
+        key = LLMResponseCache.make_key(*base)
+
+        assert key == LLMResponseCache.make_key(*base)
+        assert key != LLMResponseCache.make_key("qwen2.5:7b", *base[1:])
+        assert key != LLMResponseCache.make_key(base[0], "clabsi_extraction_v2", *base[2:])
+        assert key != LLMResponseCache.make_key(*base[:2], {"type": "object"}, *base[3:])
+        assert key != LLMResponseCache.make_key(*base[:4], "notes!")
+
+    def test_hit_and_miss_counters(self, cache):
+        """Test get/put round trip and counters."""
+        key = cache.make_key("m", "v1", SCHEMA, None, "prompt")
+
+        assert cache.get(key) is None
+        cache.put(key, {"fever": "definite"}, model="m", prompt_version="v1")
+        assert cache.get(key) == {"fever": "definite"}
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+
+    def test_expired_entry_is_a_miss(self, tmp_path):
+        """Test entries older than the TTL are not served."""
+        cache = LLMResponseCache(db_path=tmp_path / "c.db", ttl_hours=0.5 / 3600)
+        key = cache.make_key("m", "v1", SCHEMA, None, "prompt")
+        cache.put(key, {"fever": "definite"})
+
+        time.sleep(0.6)
+
+        assert cache.get(key) is None
+        assert cache.get_stats()["entries"] == 0
+
+    def test_evict_trims_least_recently_used(self, tmp_path):
+        """Test size-based eviction keeps the most recently used entries."""
+        cache = LLMResponseCache(db_path=tmp_path / "c.db", ttl_hours=0, max_entries=2)
+        keys = [cache.make_key("m", "v1", SCHEMA, None, f"prompt {i}") for i in range(3)]
+        for key in keys:
+            cache.put(key, {"i": key})
+            time.sleep(0.01)
+
+        cache.get(keys[0])  # Touch the oldest so it survives
+        removed = cache.evict()
+
+        assert removed == 1
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[2]) is not None
+
+
+class TestOllamaClientCaching:
+    """Tests for cache integration in OllamaClient."""
+
+    def _client(self, cache):
+        client = OllamaClient(base_url="http://ollama", model="m", cache=cache, enable_profiling=False)
+        response = Mock()
+        response.json.return_value = {
+            "message": {"content": '{"fever": "definite"}'},
+            "prompt_eval_count": 1000,
+            "eval_count": 50,
+        }
+        client.session = Mock()
+        client.session.post.return_value = response
+        return client
+
+    def test_repeat_call_served_from_cache(self, cache):
+        """Test an identical deterministic request skips the HTTP call."""
+        client = self._client(cache)
+
+        first = client.generate_structured_with_profile("prompt", SCHEMA, prompt_version="v1")
+        second = client.generate_structured_with_profile("prompt", SCHEMA, prompt_version="v1")
+
+        assert client.session.post.call_count == 1
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.data == first.data
+
+    def test_non_deterministic_calls_bypass_cache(self, cache):
+        """Test temperature > 0 always calls the model."""
+        client = self._client(cache)
+
+        client.generate_structured("prompt", SCHEMA, temperature=0.7)
+        client.generate_structured("prompt", SCHEMA, temperature=0.7)
+
+        assert client.session.post.call_count == 2
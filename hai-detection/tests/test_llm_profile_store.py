@@ -0,0 +1,116 @@
+"""Tests for persistent LLM profiling."""
+
+import random
+import sqlite3
+
+import pytest
+
+from hai_src.llm.base import LLMProfile
+from hai_src.llm.profile_store import LLMProfileStore, QuantileSketch
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store with a long flush interval so writes only happen on flush."""
+    store = LLMProfileStore(db_path=tmp_path / "profiles.db", flush_interval=60, batch_size=1000)
+    yield store
+    store.close()
+
+
+def make_profile(total_ms: float, load_ms: float = 0.0) -> LLMProfile:
+    return LLMProfile(
+        input_tokens=4000,
+        output_tokens=200,
+        total_ms=total_ms,
+        load_ms=load_ms,
+        prefill_ms=total_ms * 0.6,
+        generation_ms=total_ms * 0.4,
+    )
+
+
+def row_count(store: LLMProfileStore) -> int:
+    with sqlite3.connect(store.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM llm_profiles").fetchone()[0]
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Test p50/p95/p99 are within the sketch's relative error."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(10, 1) for _ in range(20000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_merge_matches_single_sketch(self):
+        """Test merged sketches give the same quantiles as one sketch."""
+        a, b, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i in range(1, 1001):
+            (a if i % 2 else b).add(i)
+            combined.add(i)
+
+        a.merge(b)
+
+        assert a.count == 1000
+        assert a.quantile(0.95) == combined.quantile(0.95)
+
+
+class TestLLMProfileStore:
+    """Tests for LLMProfileStore."""
+
+    def test_writes_are_buffered_until_flush(self, store):
+        """Test recording doesn't write until the batch is flushed."""
+        for ms in (1000, 2000, 3000):
+            store.record(make_profile(ms), context="clabsi_extraction", model="m")
+
+        assert row_count(store) == 0
+        assert store.flush()
+        assert row_count(store) == 3
+
+    def test_recent_round_trips_profiles(self, store):
+        """Test persisted rows carry model, HAI type and prompt version."""
+        store.record(
+            make_profile(85000, load_ms=5000),
+            context="triage_cdi",
+            model="qwen2.5:7b",
+            prompt_version="triage_v1",
+        )
+
+        [entry] = store.recent()
+
+        assert entry["model"] == "qwen2.5:7b"
+        assert entry["hai_type"] == "cdi"
+        assert entry["prompt_version"] == "triage_v1"
+        assert entry["total_ms"] == 85000
+        assert entry["model_was_cold"] is True
+
+    def test_summary_groups_by_model_and_hai_type(self, store):
+        """Test one-pass summary groups and percentiles."""
+        for ms in range(1000, 101000, 1000):
+            store.record(make_profile(ms), context="clabsi_extraction", model="llama3.3:70b")
+        store.record(make_profile(500), context="triage_cauti", model="qwen2.5:7b")
+
+        summary = store.get_summary(days=1)
+
+        assert summary["overall"]["count"] == 101
+        assert summary["by_model"]["llama3.3:70b"]["p95_total_ms"] == pytest.approx(95000, rel=0.02)
+        assert summary["by_model"]["qwen2.5:7b"]["count"] == 1
+        assert set(summary["by_hai_type"]) == {"clabsi", "cauti"}
+        assert {p["model"] for p in summary["by_day"]} == {"llama3.3:70b", "qwen2.5:7b"}
+
+    def test_live_summary_resets_without_deleting_rows(self, store):
+        """Test reset_live() clears the process summary but keeps history."""
+        store.record(make_profile(1000), context="vae_extraction", model="m")
+        assert store.live_summary()["count"] == 1
+
+        store.reset_live()
+
+        assert store.live_summary()["count"] == 0
+        assert len(store.recent()) == 1
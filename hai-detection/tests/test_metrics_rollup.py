@@ -0,0 +1,170 @@
+"""Tests for incremental daily snapshot rollups."""
+
+from datetime import date, datetime, timedelta
+
+# hai_src.config puts the project root (common/) on sys.path
+from hai_src.db import HAIDatabase
+from common.alert_store import AlertStore
+from common.db import get_connection
+from common.metrics_store import MetricsAggregator, MetricsStore
+from common.metrics_store.aggregator import _ALERT_ROLLUP_SQL
+
+DAY1 = date(2026, 3, 1)
+DAY2 = date(2026, 3, 2)
+
+
+def make_aggregator(tmp_path) -> MetricsAggregator:
+    return MetricsAggregator(
+        metrics_store=MetricsStore(str(tmp_path / "metrics.db")),
+        alert_db_path=str(tmp_path / "alerts.db"),
+        hai_db_path=str(tmp_path / "hai.db"),
+        adherence_db_path=str(tmp_path / "adherence.db"),
+        indication_db_path=str(tmp_path / "indications.db"),
+    )
+
+
+def at(day: date, hour: int, minute: int = 0) -> str:
+    return datetime(day.year, day.month, day.day, hour, minute).isoformat()
+
+
+def populate(tmp_path) -> None:
+    """Alerts and HAI candidates spread over DAY1 and DAY2."""
+    alerts = [
+        # id, created, acknowledged, resolved
+        ("a1", at(DAY1, 8), at(DAY1, 8, 30), at(DAY1, 10)),
+        ("a2", at(DAY1, 23, 50), at(DAY2, 0, 10), at(DAY2, 1, 50)),
+        ("a3", at(DAY2, 12), None, None),
+    ]
+    conn = get_connection(AlertStore(db_path=str(tmp_path / "alerts.db")).db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO alerts (id, alert_type, source_id, status, severity, created_at, "
+            "acknowledged_at, resolved_at) VALUES (?, 'bacteremia', ?, 'pending', 'warning', ?, ?, ?)",
+            [(a[0], a[0], a[1], a[2], a[3]) for a in alerts],
+        )
+
+    # HAI uses CURRENT_TIMESTAMP's "YYYY-MM-DD HH:MM:SS" format
+    conn = get_connection(HAIDatabase(str(tmp_path / "hai.db")).db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO hai_candidates (id, patient_id, patient_mrn, culture_id, culture_date, "
+            "status, created_at) VALUES (?, 'p', 'mrn', ?, ?, ?, ?)",
+            [
+                ("h1", "c1", "2026-03-01", "confirmed", "2026-03-01 09:00:00"),
+                ("h2", "c2", "2026-03-01", "pending", "2026-03-01 22:00:00"),
+                ("h3", "c3", "2026-03-02", "confirmed", "2026-03-02 00:00:00"),
+            ],
+        )
+
+
+class TestSnapshotRollups:
+    """Tests for MetricsAggregator snapshot rollups."""
+
+    def test_backfill_buckets_by_day(self, tmp_path):
+        """Test one backfill fills each day from its own rows."""
+        populate(tmp_path)
+        aggregator = make_aggregator(tmp_path)
+
+        day1, day2 = aggregator.backfill_snapshots(DAY1, DAY2)
+
+        assert (day1.alerts_created, day1.alerts_acknowledged, day1.alerts_resolved) == (2, 1, 1)
+        assert day1.avg_time_to_ack_minutes == 30.0
+        assert day1.avg_time_to_resolve_minutes == 120.0
+        assert (day2.alerts_created, day2.alerts_acknowledged, day2.alerts_resolved) == (1, 1, 1)
+        assert day2.avg_time_to_ack_minutes == 20.0
+        assert (day1.hai_candidates_created, day1.hai_confirmed) == (2, 1)
+        assert (day2.hai_candidates_created, day2.hai_confirmed) == (1, 1)
+
+        stored = aggregator.metrics_store.get_daily_snapshot(DAY2)
+        assert stored.alerts_created == 1
+
+    def test_single_day_matches_backfill(self, tmp_path):
+        """Test create_daily_snapshot gives the same figures as a backfill."""
+        populate(tmp_path)
+        aggregator = make_aggregator(tmp_path)
+
+        single = aggregator.create_daily_snapshot(DAY2)
+        backfilled = aggregator.backfill_snapshots(DAY1, DAY2)[1]
+
+        assert single.to_dict() | {"created_at": None} == backfilled.to_dict() | {"created_at": None}
+
+    def test_update_only_aggregates_new_days(self, tmp_path):
+        """Test the watermark limits each update to the days since the last."""
+        populate(tmp_path)
+        aggregator = make_aggregator(tmp_path)
+        aggregator.rollup_lookback_days = 0
+
+        first = aggregator.update_snapshots(DAY1)
+        assert [s.snapshot_date for s in first] == [DAY1]
+        assert aggregator.metrics_store.get_rollup_watermark("daily_snapshot") == DAY1
+
+        later = DAY1 + timedelta(days=3)
+        second = aggregator.update_snapshots(later)
+        assert [s.snapshot_date for s in second] == [DAY2, DAY1 + timedelta(days=2), later]
+        assert aggregator.metrics_store.get_rollup_watermark("daily_snapshot") == later
+
+        assert aggregator.update_snapshots(later) == []
+
+    def test_update_recomputes_lookback_days(self, tmp_path):
+        """Test already-aggregated days in the lookback window are redone."""
+        aggregator = make_aggregator(tmp_path)
+        aggregator.rollup_lookback_days = 1
+        aggregator.update_snapshots(DAY1)
+
+        # Rows written after DAY1 was aggregated
+        populate(tmp_path)
+        snapshots = aggregator.update_snapshots(DAY2)
+
+        assert [s.snapshot_date for s in snapshots] == [DAY1, DAY2]
+        assert aggregator.metrics_store.get_daily_snapshot(DAY1).alerts_created == 2
+
+    def test_rollup_queries_use_indexes(self, tmp_path):
+        """Test each alert timestamp range is an index search, not a scan."""
+        store = AlertStore(db_path=str(tmp_path / "alerts.db"))
+        plan = get_connection(store.db_path).execute(
+            f"EXPLAIN QUERY PLAN {_ALERT_ROLLUP_SQL}", {"start": "2026-03-01", "end": "2026-03-02"}
+        ).fetchall()
+        details = [row["detail"] for row in plan if row["detail"].startswith(("SCAN", "SEARCH"))]
+
+        assert len(details) == 3
+        assert all(d.startswith("SEARCH alerts USING") for d in details), details
+
+    def test_episodes_active_only_written_for_current_day(self, tmp_path, monkeypatch):
+        """Test the live active-episode count never lands on, or wipes, past days."""
+        import sqlite3
+        from types import SimpleNamespace
+
+        adherence_path = str(tmp_path / "adherence.db")
+        with sqlite3.connect(adherence_path) as conn:
+            conn.executescript("""
+                CREATE TABLE bundle_alerts (created_at TEXT);
+                CREATE TABLE bundle_episodes (status TEXT, completed_at TEXT, adherence_percentage REAL);
+                INSERT INTO bundle_episodes (status) VALUES ('active'), ('active'), ('active');
+            """)
+        aggregator = make_aggregator(tmp_path)
+        monkeypatch.setattr(aggregator, "_get_adherence_db", lambda: SimpleNamespace(db_path=adherence_path))
+        yesterday = date.today() - timedelta(days=1)
+
+        [current] = aggregator.backfill_snapshots(yesterday, yesterday)
+        assert current.bundle_episodes_active == 3
+
+        with sqlite3.connect(adherence_path) as conn:
+            conn.execute("UPDATE bundle_episodes SET status = 'complete' WHERE rowid = 1")
+
+        # A past range doesn't get today's count
+        past = aggregator.backfill_snapshots(yesterday - timedelta(days=3), yesterday - timedelta(days=1))
+        assert [s.bundle_episodes_active for s in past] == [0, 0, 0]
+
+        # Once yesterday is no longer current, recomputing it keeps its count
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return date.today() + timedelta(days=1)
+
+        monkeypatch.setattr("common.metrics_store.aggregator.date", Tomorrow)
+        recomputed = aggregator.backfill_snapshots(yesterday - timedelta(days=1), yesterday)
+        assert [s.bundle_episodes_active for s in recomputed] == [0, 3]
+        assert aggregator.metrics_store.get_daily_snapshot(yesterday).bundle_episodes_active == 3
+
+        [today] = aggregator.backfill_snapshots(date.today(), date.today())
+        assert today.bundle_episodes_active == 2
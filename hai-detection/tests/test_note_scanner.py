@@ -0,0 +1,138 @@
+"""Tests for the shared single-pass note scanner."""
+
+import re
+from datetime import datetime
+
+from hai_src.models import ClinicalNote
+from hai_src.notes.chunker import NoteChunker
+from hai_src.notes.retriever import HAI_KEYWORDS
+from hai_src.notes.scanning import get_note_scanner
+
+# hai_src.config puts the project root (common/) on sys.path
+from common.note_scanner import KeywordHit, NoteScanner
+
+
+NOTE = """HPI:
+Febrile infant with PICC line, Foley catheter infection suspected.
+
+PHYSICAL EXAM:
+Exit site with erythema. Abdomen soft.
+
+MICROBIOLOGY:
+Blood culture positive for S. aureus.
+
+ASSESSMENT/PLAN:
+CLABSI likely. Plan line removal, start vancomycin.
+Electronically signed by Dr. Smith
+"""
+
+
+def make_note(content: str) -> ClinicalNote:
+    return ClinicalNote(
+        id="n1",
+        patient_id="P1",
+        note_type="progress_note",
+        date=datetime(2026, 1, 10),
+        content=content,
+        source="fhir",
+    )
+
+
+def legacy_extract_sections(content: str) -> list[tuple[str, str]]:
+    """Per-pattern re.search implementation the scanner replaced."""
+    found = []
+    for section_type, patterns in NoteChunker.SECTION_PATTERNS.items():
+        for pattern in patterns:
+            match = re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
+            if match:
+                remaining = content[match.end():]
+                end = len(remaining)
+                for end_pattern in NoteChunker.SECTION_END_PATTERNS:
+                    end_match = re.search(end_pattern, remaining)
+                    if end_match and end_match.start() < end:
+                        end = end_match.start()
+                section = remaining[:end].strip()
+                if section:
+                    found.append((section_type, section))
+                break
+    return found
+
+
+class TestNoteScanner:
+    """Tests for NoteScanner."""
+
+    def test_overlapping_hits_across_labels(self):
+        """Test overlapping keywords with different labels are all reported."""
+        scanner = NoteScanner(keywords={
+            "cauti": ["foley catheter"],
+            "clabsi": ["catheter infection"],
+        })
+
+        hits = scanner.scan("Foley catheter infection").keywords
+
+        assert [(h.term, h.labels) for h in hits] == [
+            ("foley catheter", ("cauti",)),
+            ("catheter infection", ("clabsi",)),
+        ]
+
+    def test_offsets_point_into_original_text(self):
+        """Test hits are case-insensitive and offsets match the input."""
+        text = "Central LINE placed; PICC removed."
+        scanner = NoteScanner(keywords={"clabsi": ["central line", "picc"]})
+
+        hits = scanner.scan(text).keywords
+
+        assert [text[h.start:h.end] for h in hits] == ["Central LINE", "PICC"]
+
+    def test_prefix_terms_share_labels(self):
+        """Test a shorter keyword inside a longer one at the same offset counts."""
+        scanner = NoteScanner(keywords={"ssi": ["wound"], "other": ["wound vac"]})
+
+        assert scanner.has_keyword("wound vac applied", "ssi")
+        assert scanner.terms_in("wound vac applied") == {"wound", "wound vac"}
+
+    def test_length_changing_lowercase_falls_back(self):
+        """Test text whose lowercase form changes length still scans correctly."""
+        text = "İstanbul traveler with PICC"
+        scanner = NoteScanner(keywords={"clabsi": ["picc"]})
+
+        [hit] = scanner.scan(text).keywords
+
+        assert text[hit.start:hit.end] == "PICC"
+
+    def test_whole_word(self):
+        """Test whole-word check on substring hits."""
+        text = "global assessment; BAL sent"
+        hits = NoteScanner(keywords={"vae": ["bal"]}).scan(text).keywords
+
+        assert [h.is_whole_word(text) for h in hits] == [False, True]
+
+    def test_keyword_at_header_start_is_reported(self):
+        """Test a keyword starting at a section header isn't shadowed."""
+        scanner = NoteScanner(
+            keywords={"ssi": ["wound"]},
+            sections={"wound_assessment": [r"(?:^|\n)WOUND\s*ASSESSMENT[:\s]*"]},
+        )
+
+        result = scanner.scan("WOUND ASSESSMENT: clean")
+
+        assert result.first_section("wound_assessment").end == len("WOUND ASSESSMENT: ")
+        assert isinstance(result.keywords[0], KeywordHit)
+
+
+class TestHAIScanning:
+    """Tests for the HAI pipeline's use of the shared scanner."""
+
+    def test_chunker_matches_legacy_sections(self):
+        """Test single-pass section extraction matches per-pattern searches."""
+        chunks = NoteChunker().extract_sections(make_note(NOTE))
+
+        assert [(c.section_type, c.content) for c in chunks] == legacy_extract_sections(NOTE)
+        assert {c.section_type for c in chunks} == {"assessment_plan", "physical_exam", "id_section"}
+
+    def test_keyword_filter_matches_legacy(self):
+        """Test has_keyword agrees with the per-type regex it replaced."""
+        scanner = get_note_scanner()
+        for hai_type, keywords in HAI_KEYWORDS.items():
+            legacy = re.compile("|".join(re.escape(kw) for kw in keywords), re.IGNORECASE)
+            assert scanner.has_keyword(NOTE, hai_type) == bool(legacy.search(NOTE)), hai_type
@@ -0,0 +1,223 @@
+"""Tests for the staged classification pipeline."""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from hai_src.models import (
+    Patient,
+    CultureResult,
+    HAICandidate,
+    HAIType,
+    Classification,
+    ClassificationDecision,
+)
+from hai_src.pipeline import ClassificationPipeline, PipelineConfig
+
+
+def make_candidate(i: int) -> HAICandidate:
+    """Build a minimal candidate."""
+    return HAICandidate(
+        id=f"cand-{i}",
+        hai_type=HAIType.CLABSI,
+        patient=Patient(fhir_id=f"patient-{i}", mrn=f"MRN{i:03d}", name=None),
+        culture=CultureResult(
+            fhir_id=f"culture-{i}",
+            collection_date=datetime(2024, 1, 15, 10, 0),
+            organism="Staphylococcus aureus",
+        ),
+    )
+
+
+def make_classification(candidate: HAICandidate) -> Classification:
+    """Build a classification for a candidate."""
+    return Classification(
+        id=f"cls-{candidate.id}",
+        candidate_id=candidate.id,
+        decision=ClassificationDecision.HAI_CONFIRMED,
+        confidence=0.9,
+    )
+
+
+class TestClassificationPipeline:
+    """Tests for ClassificationPipeline."""
+
+    def test_results_returned_in_input_order(self):
+        """Test results line up with input candidates regardless of finish order."""
+        candidates = [make_candidate(i) for i in range(10)]
+
+        def classify(candidate, notes):
+            # Later candidates finish first
+            time.sleep(0.001 * (10 - int(candidate.id.split("-")[1])))
+            return make_classification(candidate)
+
+        pipeline = ClassificationPipeline(
+            fetch_fn=lambda c: [],
+            classify_fn=classify,
+            config=PipelineConfig(fetch_workers=3, inference_workers=3, persist_workers=1),
+        )
+        results = pipeline.run(candidates)
+
+        assert [r.candidate.id for r in results] == [c.id for c in candidates]
+        assert all(r.succeeded for r in results)
+        assert pipeline.last_stats.succeeded == 10
+
+    def test_error_isolated_to_single_candidate(self):
+        """Test a failure in one stage doesn't affect other candidates."""
+        candidates = [make_candidate(i) for i in range(5)]
+        persisted = []
+
+        def fetch(candidate):
+            if candidate.id == "cand-1":
+                raise ConnectionError("FHIR timeout")
+            return []
+
+        def classify(candidate, notes):
+            if candidate.id == "cand-2":
+                raise ValueError("Invalid JSON response")
+            return make_classification(candidate)
+
+        def persist(candidate, classification):
+            if candidate.id == "cand-3":
+                raise RuntimeError("database is locked")
+            persisted.append(candidate.id)
+
+        pipeline = ClassificationPipeline(
+            fetch_fn=fetch,
+            classify_fn=classify,
+            persist_fn=persist,
+            config=PipelineConfig(fetch_workers=2, inference_workers=2, persist_workers=1),
+        )
+        results = pipeline.run(candidates)
+
+        assert [r.failed_stage for r in results] == [None, "fetch", "inference", "persist", None]
+        assert sorted(persisted) == ["cand-0", "cand-4"]
+        assert pipeline.last_stats.errors_by_stage == {"fetch": 1, "inference": 1, "persist": 1}
+
+    def test_inference_concurrency_is_bounded(self):
+        """Test no more than inference_workers LLM calls run at once."""
+        candidates = [make_candidate(i) for i in range(12)]
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def classify(candidate, notes):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return make_classification(candidate)
+
+        pipeline = ClassificationPipeline(
+            fetch_fn=lambda c: [],
+            classify_fn=classify,
+            config=PipelineConfig(fetch_workers=6, inference_workers=2, queue_size=1),
+        )
+        results = pipeline.run(candidates)
+
+        assert all(r.succeeded for r in results)
+        assert peak == 2
+
+    def test_dry_run_skips_persistence(self):
+        """Test persist_fn=None still classifies every candidate."""
+        candidates = [make_candidate(i) for i in range(3)]
+
+        pipeline = ClassificationPipeline(
+            fetch_fn=lambda c: [],
+            classify_fn=lambda c, n: make_classification(c),
+            persist_fn=None,
+        )
+        results = pipeline.run(candidates)
+
+        assert all(r.succeeded for r in results)
+        assert all(r.persist_ms == 0 for r in results)
+
+    def test_empty_input(self):
+        """Test running with no candidates."""
+        pipeline = ClassificationPipeline(
+            fetch_fn=lambda c: [],
+            classify_fn=lambda c, n: make_classification(c),
+        )
+        assert pipeline.run([]) == []
+        assert pipeline.last_stats.total == 0
+
+    def test_batched_inference(self):
+        """Test queued candidates are classified in batches with errors per case."""
+        candidates = [make_candidate(i) for i in range(6)]
+        batches = []
+
+        def classify_many(cases):
+            if not batches:
+                # The rest of the candidates queue up behind the first call
+                time.sleep(0.1)
+            batches.append([c.id for c, _ in cases])
+            return [
+                ValueError("Invalid JSON response") if c.id == "cand-4" else make_classification(c)
+                for c, _ in cases
+            ]
+
+        pipeline = ClassificationPipeline(
+            fetch_fn=lambda c: [],
+            classify_fn=lambda c, n: pytest.fail("classify_fn used with classify_many_fn"),
+            classify_many_fn=classify_many,
+            config=PipelineConfig(
+                fetch_workers=6, inference_workers=1, queue_size=8, inference_batch_size=4
+            ),
+        )
+        results = pipeline.run(candidates)
+
+        assert max(len(b) for b in batches) == 4
+        assert sorted(sum(batches, [])) == [c.id for c in candidates]
+        assert [r.failed_stage for r in results] == [None, None, None, None, "inference", None]
+
+    def test_monitor_batches_clabsi_only(self):
+        """Test the monitor sends CLABSI cases to classify_many, others singly."""
+        from unittest.mock import Mock
+
+        from hai_src.monitor import HAIMonitor
+
+        cases = [(make_candidate(i), []) for i in range(3)]
+        cases[1][0].hai_type = HAIType.CAUTI
+        clabsi = Mock()
+        clabsi.classify_many.side_effect = lambda group: [make_classification(c) for c, _ in group]
+        cauti = Mock(spec=["classify"])
+        cauti.classify.side_effect = lambda c, n: make_classification(c)
+
+        monitor = HAIMonitor.__new__(HAIMonitor)
+        monitor._classifiers = {HAIType.CLABSI: clabsi, HAIType.CAUTI: cauti}
+        outcomes = monitor._classify_candidates(cases)
+
+        assert [o.candidate_id for o in outcomes] == ["cand-0", "cand-1", "cand-2"]
+        [group], _ = clabsi.classify_many.call_args
+        assert [c.id for c, _ in group] == ["cand-0", "cand-2"]
+        clabsi.classify.assert_not_called()
+        cauti.classify.assert_called_once()
+
+        # A failed batch is retried per case so the error stays with its case
+        clabsi.classify_many.side_effect = RuntimeError("vLLM unavailable")
+        clabsi.classify.side_effect = [make_classification(cases[0][0]), ValueError("bad case")]
+        outcomes = monitor._classify_candidates(cases)
+
+        assert outcomes[0].candidate_id == "cand-0"
+        assert isinstance(outcomes[2], ValueError)
+
+    def test_invalid_config(self):
+        """Test worker counts must be positive."""
+        with pytest.raises(ValueError):
+            PipelineConfig(inference_workers=0)
+
+    def test_cli_worker_counts_must_be_positive(self):
+        """Test the runner rejects an explicit 0 instead of ignoring it."""
+        import argparse
+
+        from hai_src.runner import positive_int
+
+        assert positive_int("4") == 4
+        for value in ("0", "-2", "two"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                positive_int(value)
@@ -39,6 +39,14 @@ class Config:
     AU_LOCATION_TYPES: str = os.getenv("AU_LOCATION_TYPES", "ICU,Ward,NICU,BMT")
     # Include oral antibiotics in AU reporting
     AU_INCLUDE_ORAL: bool = os.getenv("AU_INCLUDE_ORAL", "true").lower() == "true"
+    # "sql" queries MAR per calculation; "frame" extracts a period's
+    # administrations once and derives DOT/DDD in memory (same results)
+    AU_BACKEND: str = os.getenv("AU_BACKEND", "sql")
+
+    # --- Denominators ---
+    # "sql" aggregates in the database; "interval" computes patient/device
+    # days from stay intervals in NumPy (identical results)
+    DENOMINATOR_BACKEND: str = os.getenv("DENOMINATOR_BACKEND", "sql")
 
     # --- AR Reporting ---
     # Specimen types to include in AR reporting
@@ -56,6 +64,12 @@ class Config:
         str(Path.home() / ".aegis" / "mock_clarity.db"),
     )
 
+    # --- Dashboard Reporting Cube ---
+    # Days after a month ends before its cube rows are frozen (late charting)
+    NHSN_CUBE_CLOSE_DAYS: int = int(os.getenv("NHSN_CUBE_CLOSE_DAYS", "7"))
+    # Open months older than this are recomputed when a page reads them
+    NHSN_CUBE_MAX_AGE_MINUTES: int = int(os.getenv("NHSN_CUBE_MAX_AGE_MINUTES", "60"))
+
     # --- Notifications ---
     DASHBOARD_BASE_URL: str = os.getenv("DASHBOARD_BASE_URL", "http://localhost:5000")
 
@@ -3,9 +3,11 @@
 from .denominator import DenominatorCalculator
 from .au_extractor import AUDataExtractor
 from .ar_extractor import ARDataExtractor
+from .cube import ReportingCube
 
 __all__ = [
     "DenominatorCalculator",
     "AUDataExtractor",
     "ARDataExtractor",
+    "ReportingCube",
 ]
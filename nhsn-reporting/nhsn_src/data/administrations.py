@@ -0,0 +1,200 @@
+"""In-memory AU calculations from one extraction of MAR administrations.
+
+AUDataExtractor's SQL path runs the same seven-table MAR join once for DOT,
+again for DDD and again for patient-level administrations. In its "frame"
+backend the administrations for a period are pulled once
+(AUDataExtractor.load_administrations) into a compact columnar frame:
+administration facts carry only IDs and per-row values, drug and location
+columns are attached from small dimension tables as categorical codes, and
+doses are converted to grams up front. DOT, DDD and the patient-level view
+are then derived from that frame:
+
+    admins = extractor.load_administrations(locations, start_date, end_date)
+    dot_df = days_of_therapy(admins, include_oral=True)
+    ddd_df = defined_daily_doses(admins)
+
+Each function returns the same columns and rows as the matching SQL query.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Administration-level string columns stored as categoricals
+CATEGORICAL_COLUMNS = ["patient_id", "route", "admin_date", "dose_unit"]
+
+# Per-drug columns, from the medication dimension (one row per MEDICATION_ID)
+MEDICATION_COLUMNS = ["medication_name", "nhsn_code", "nhsn_category", "ddd_value", "ddd_unit"]
+
+# Column order of get_antimicrobial_administrations
+ADMINISTRATION_COLUMNS = [
+    "patient_id", "encounter_id", "nhsn_location_code", "medication_name", "nhsn_code",
+    "nhsn_category", "ddd_value", "ddd_unit", "route", "admin_time", "admin_date", "month",
+    "dose_given", "dose_unit", "action_name",
+]
+
+DOT_KEYS = ["nhsn_location_code", "month", "nhsn_code", "nhsn_category", "medication_name", "route"]
+DDD_KEYS = [
+    "nhsn_location_code", "month", "nhsn_code", "nhsn_category",
+    "medication_name", "ddd_standard", "ddd_unit",
+]
+
+# Divisor converting DOSE_GIVEN to grams; other units count as 0 g
+_GRAM_DIVISORS = {
+    "g": 1.0, "gram": 1.0, "grams": 1.0,
+    "mg": 1000.0, "milligram": 1000.0, "milligrams": 1000.0,
+    "mcg": 1000000.0, "microgram": 1000000.0, "micrograms": 1000000.0,
+}
+
+ORAL_ROUTES = ("PO", "ORAL")
+
+
+def _lookup(keys: pd.Series, dimension: pd.DataFrame, key: str, column: str) -> pd.Categorical:
+    """Categorical of dimension[column] for each key, via integer codes."""
+    row = pd.Index(dimension[key]).get_indexer(keys)
+    values = dimension[column].astype("category")
+    codes = np.where(row >= 0, values.cat.codes.to_numpy()[row], -1)
+    return pd.Categorical.from_codes(codes, categories=values.cat.categories)
+
+
+def compact_administrations(
+    facts: pd.DataFrame,
+    medications: pd.DataFrame,
+    locations: pd.DataFrame,
+) -> pd.DataFrame:
+    """Build the compact frame from administration facts and dimensions.
+
+    Args:
+        facts: One row per administration with patient_id, encounter_id,
+            department_id, medication_id, route, admin_time, admin_date,
+            dose_given and dose_unit.
+        medications: medication_id plus MEDICATION_COLUMNS.
+        locations: department_id and nhsn_location_code.
+
+    Returns:
+        ADMINISTRATION_COLUMNS plus dose_grams; strings are categoricals.
+    """
+    df = pd.DataFrame({"patient_id": facts["patient_id"], "encounter_id": facts["encounter_id"]})
+    df["nhsn_location_code"] = _lookup(facts["department_id"], locations, "department_id", "nhsn_location_code")
+
+    med_row = pd.Index(medications["medication_id"]).get_indexer(facts["medication_id"])
+    for column in MEDICATION_COLUMNS:
+        if column == "ddd_value":
+            ddd = pd.to_numeric(medications["ddd_value"]).to_numpy(dtype="float64")
+            df[column] = np.where(med_row >= 0, ddd[med_row], np.nan)
+        else:
+            df[column] = _lookup(facts["medication_id"], medications, "medication_id", column)
+
+    df["route"] = facts["route"]
+    df["admin_time"] = facts["admin_time"]
+    df["admin_date"] = facts["admin_date"].astype("category")
+    # Month of each distinct date, spread to the rows through the date codes
+    date_codes = df["admin_date"].cat.codes.to_numpy()
+    date_months = pd.Index([str(d)[:7] for d in df["admin_date"].cat.categories])
+    months = date_months.unique()
+    month_codes = months.get_indexer(date_months)
+    df["month"] = pd.Categorical.from_codes(
+        np.where(date_codes >= 0, month_codes[date_codes], -1), categories=months
+    )
+    df["dose_given"] = facts["dose_given"]
+    df["dose_unit"] = facts["dose_unit"]
+    df["action_name"] = pd.Categorical(["Given"] * len(df))
+
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype("category")
+
+    dose = pd.to_numeric(df["dose_given"], errors="coerce")
+    divisor = df["dose_unit"].astype(object).map(_GRAM_DIVISORS).astype("float64")
+    df["dose_grams"] = np.where(divisor.notna(), dose / divisor, 0.0)
+
+    # Rows whose drug or department is outside the dimensions are not AU rows
+    return df[(med_row >= 0) & df["nhsn_location_code"].notna().to_numpy()].reset_index(drop=True)
+
+
+def _with_patient(admins: pd.DataFrame, include_oral: bool) -> pd.DataFrame:
+    """Rows with a PATIENT row (DOT's inner join), optionally without oral routes."""
+    rows = admins[admins["patient_id"].notna()]
+    if not include_oral:
+        # NOT IN drops NULL routes as well
+        rows = rows[rows["route"].notna() & ~rows["route"].isin(ORAL_ROUTES)]
+    return rows
+
+
+def _plain_strings(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """Turn categorical result columns back into strings like read_sql returns."""
+    for column in columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(df[column].cat.categories.dtype)
+    return df
+
+
+def days_of_therapy(admins: pd.DataFrame, include_oral: bool = True) -> pd.DataFrame:
+    """DOT by location, month, antimicrobial and route.
+
+    Each distinct patient, NHSN code and administration date counts as one
+    day of therapy within its group.
+
+    Returns:
+        DataFrame with DOT_KEYS and days_of_therapy, in calculate_dot's order.
+    """
+    if admins.empty:
+        return pd.DataFrame(columns=[*DOT_KEYS, "days_of_therapy"])
+
+    rows = _with_patient(admins, include_oral)
+    if rows.empty:
+        return pd.DataFrame(columns=[*DOT_KEYS, "days_of_therapy"])
+
+    groups = rows.groupby(DOT_KEYS, observed=True, dropna=False).size()
+    counted = rows.dropna(subset=["nhsn_code", "admin_date"]).drop_duplicates(
+        subset=[*DOT_KEYS, "patient_id", "admin_date"]
+    )
+    dot = counted.groupby(DOT_KEYS, observed=True, dropna=False).size()
+    dot = dot.reindex(groups.index, fill_value=0).rename("days_of_therapy").reset_index()
+
+    dot = dot.sort_values(
+        ["month", "nhsn_location_code", "nhsn_category", "nhsn_code", "medication_name", "route"],
+        kind="stable",
+        ignore_index=True,
+    )
+    dot["days_of_therapy"] = dot["days_of_therapy"].astype("int64")
+    return _plain_strings(dot, DOT_KEYS)
+
+
+def defined_daily_doses(admins: pd.DataFrame) -> pd.DataFrame:
+    """Total grams and DDDs by location, month and antimicrobial (all routes).
+
+    Returns:
+        DataFrame with DDD_KEYS, total_grams and defined_daily_doses, in
+        calculate_ddd's order.
+    """
+    columns = [*DDD_KEYS, "total_grams", "defined_daily_doses"]
+    if admins.empty:
+        return pd.DataFrame(columns=columns)
+
+    rows = admins.rename(columns={"ddd_value": "ddd_standard"})
+    ddd = (
+        rows.groupby(DDD_KEYS, observed=True, dropna=False)["dose_grams"]
+        .sum(min_count=1)
+        .rename("total_grams")
+        .reset_index()
+    )
+    standard = ddd["ddd_standard"]
+    ddd["defined_daily_doses"] = (ddd["total_grams"] / standard).where(standard > 0)
+
+    ddd = ddd.sort_values(
+        ["month", "nhsn_location_code", "nhsn_category", "nhsn_code", "medication_name"],
+        kind="stable",
+        ignore_index=True,
+    )
+    return _plain_strings(ddd[columns], DDD_KEYS)
+
+
+def patient_administrations(admins: pd.DataFrame, include_oral: bool = True) -> pd.DataFrame:
+    """Patient-level administration rows, as get_antimicrobial_administrations returns."""
+    if admins.empty:
+        return pd.DataFrame()
+
+    rows = _with_patient(admins, include_oral)[ADMINISTRATION_COLUMNS]
+    rows = rows.sort_values(["patient_id", "admin_time"], kind="stable", ignore_index=True)
+    return _plain_strings(
+        rows, [c for c in ADMINISTRATION_COLUMNS if isinstance(rows[c].dtype, pd.CategoricalDtype)]
+    )
@@ -15,12 +15,13 @@ Reference: CDC NHSN Antimicrobial Use and Resistance Module Protocol
 import logging
 import re
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
 from typing import Any
 
 import pandas as pd
 
 from ..config import Config
+from .phenotypes import PhenotypeRule, compile_phenotypes, phenotype_prevalence
 
 logger = logging.getLogger(__name__)
 
@@ -126,6 +127,19 @@ class ARDataExtractor:
         """Check if using SQLite (mock) database."""
         return "sqlite" in (self.connection_string or "").lower()
 
+    @staticmethod
+    def _date_params(start_date: date, end_date: date) -> dict[str, date]:
+        """Query parameters for an inclusive date range.
+
+        Timestamps on end_date sort after the bare date, so queries bound
+        the range with ``< :end_before`` (the following day) instead.
+        """
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "end_before": end_date + timedelta(days=1),
+        }
+
     def _get_quarter_dates(self, year: int, quarter: int) -> tuple[date, date]:
         """Get start and end dates for a quarter."""
         quarter_starts = {1: 1, 2: 4, 3: 7, 4: 10}
@@ -156,6 +170,7 @@ class ARDataExtractor:
         start_date: date | None = None,
         end_date: date | None = None,
         specimen_types: list[str] | None = None,
+        raise_errors: bool = False,
     ) -> pd.DataFrame:
         """Get culture results with organism identification.
 
@@ -164,6 +179,7 @@ class ARDataExtractor:
             start_date: Start of date range.
             end_date: End of date range.
             specimen_types: Specimen types to include (defaults to Config.AR_SPECIMEN_TYPES).
+            raise_errors: Re-raise a failed query instead of returning an empty frame.
 
         Returns:
             DataFrame with culture and organism information.
@@ -224,7 +240,7 @@ class ARDataExtractor:
         LEFT JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         WHERE cr.CULTURE_STATUS = 'Positive'
             AND cr.SPECIMEN_TAKEN_TIME >= :start_date
-            AND cr.SPECIMEN_TAKEN_TIME <= :end_date
+            AND cr.SPECIMEN_TAKEN_TIME < :end_before
             {location_filter}
             {specimen_filter}
         ORDER BY pat.PAT_MRN_ID, cr.SPECIMEN_TAKEN_TIME, co.ORGANISM_NAME
@@ -238,23 +254,27 @@ class ARDataExtractor:
                 df = pd.read_sql(
                     text(query),
                     conn,
-                    params={"start_date": start_date, "end_date": end_date},
+                    params=self._date_params(start_date, end_date),
                 )
                 df.columns = df.columns.str.lower()
                 return df
         except Exception as e:
             logger.error(f"Culture results query failed: {e}")
+            if raise_errors:
+                raise
             return pd.DataFrame()
 
     def get_susceptibility_results(
         self,
         isolate_ids: list[int] | None = None,
+        raise_errors: bool = False,
     ) -> pd.DataFrame:
         """Get susceptibility results for isolates.
 
         Args:
             isolate_ids: List of culture_organism_ids to fetch susceptibilities for.
                         If None, returns all susceptibilities.
+            raise_errors: Re-raise a failed query instead of returning an empty frame.
 
         Returns:
             DataFrame with susceptibility test results.
@@ -289,11 +309,14 @@ class ARDataExtractor:
                 return df
         except Exception as e:
             logger.error(f"Susceptibility results query failed: {e}")
+            if raise_errors:
+                raise
             return pd.DataFrame()
 
     def apply_first_isolate_rule(
         self,
         cultures_df: pd.DataFrame,
+        per_location: bool = False,
     ) -> pd.DataFrame:
         """Apply NHSN first-isolate deduplication rule.
 
@@ -302,6 +325,9 @@ class ARDataExtractor:
 
         Args:
             cultures_df: DataFrame from get_culture_results()
+            per_location: Deduplicate within each location, giving each
+                location the first isolates it would have if the cultures
+                were pulled for that location alone.
 
         Returns:
             DataFrame with is_first_isolate column added, filtered to first isolates only.
@@ -318,9 +344,10 @@ class ARDataExtractor:
         df = df.sort_values(["patient_id", "organism_name", "quarter", "specimen_date"])
 
         # Mark first isolate per patient/organism/quarter
-        df["is_first_isolate"] = ~df.duplicated(
-            subset=["patient_id", "organism_name", "quarter"], keep="first"
-        )
+        subset = ["patient_id", "organism_name", "quarter"]
+        if per_location:
+            subset.append("nhsn_location_code")
+        df["is_first_isolate"] = ~df.duplicated(subset=subset, keep="first")
 
         # Return only first isolates
         return df[df["is_first_isolate"]]
@@ -366,36 +393,7 @@ class ARDataExtractor:
         if suscept_df.empty:
             return pd.DataFrame()
 
-        # Merge cultures with susceptibilities
-        merged = pd.merge(
-            first_isolates[["isolate_id", "nhsn_location_code", "quarter", "organism_name"]],
-            suscept_df[["isolate_id", "antibiotic", "antibiotic_code", "interpretation"]],
-            on="isolate_id",
-        )
-
-        # Calculate resistance rates
-        resistance_df = (
-            merged.groupby(["nhsn_location_code", "quarter", "organism_name", "antibiotic"])
-            .agg(
-                total_isolates=("isolate_id", "nunique"),
-                resistant_isolates=("interpretation", lambda x: (x == "R").sum()),
-                intermediate_isolates=("interpretation", lambda x: (x == "I").sum()),
-                susceptible_isolates=("interpretation", lambda x: (x == "S").sum()),
-            )
-            .reset_index()
-        )
-
-        # Calculate percentages
-        resistance_df["percent_resistant"] = (
-            resistance_df["resistant_isolates"] / resistance_df["total_isolates"] * 100
-        ).round(1)
-        resistance_df["percent_non_susceptible"] = (
-            (resistance_df["resistant_isolates"] + resistance_df["intermediate_isolates"])
-            / resistance_df["total_isolates"]
-            * 100
-        ).round(1)
-
-        return resistance_df
+        return resistance_rates(first_isolates, suscept_df)
 
     def _check_phenotype_match(
         self,
@@ -461,6 +459,30 @@ class ARDataExtractor:
 
         return True
 
+    def get_phenotype_rules(self) -> list[PhenotypeRule] | None:
+        """Get the compiled NHSN_PHENOTYPE_MAP definitions.
+
+        Returns:
+            Phenotype rules in table order, or None if the query fails.
+        """
+        phenotype_query = """
+        SELECT PHENOTYPE_CODE, PHENOTYPE_NAME, ORGANISM_PATTERN, RESISTANCE_PATTERN
+        FROM NHSN_PHENOTYPE_MAP
+        """
+
+        try:
+            from sqlalchemy import text
+
+            engine = self._get_engine()
+            with engine.connect() as conn:
+                phenotypes = pd.read_sql(text(phenotype_query), conn)
+                phenotypes.columns = phenotypes.columns.str.lower()
+        except Exception as e:
+            logger.error(f"Phenotype query failed: {e}")
+            return None
+
+        return compile_phenotypes(phenotypes)
+
     def calculate_phenotypes(
         self,
         locations: list[str] | None = None,
@@ -499,72 +521,12 @@ class ARDataExtractor:
         isolate_ids = first_isolates["isolate_id"].tolist()
         suscept_df = self.get_susceptibility_results(isolate_ids)
 
-        # Get phenotype definitions
-        phenotype_query = """
-        SELECT PHENOTYPE_CODE, PHENOTYPE_NAME, ORGANISM_PATTERN, RESISTANCE_PATTERN
-        FROM NHSN_PHENOTYPE_MAP
-        """
-
-        try:
-            from sqlalchemy import text
-
-            engine = self._get_engine()
-            with engine.connect() as conn:
-                phenotypes = pd.read_sql(text(phenotype_query), conn)
-                phenotypes.columns = phenotypes.columns.str.lower()
-        except Exception as e:
-            logger.error(f"Phenotype query failed: {e}")
+        # Evaluate all isolates against all rules, each parsed once
+        rules = self.get_phenotype_rules()
+        if rules is None:
             return pd.DataFrame()
 
-        results = []
-
-        # For each location and phenotype, calculate prevalence
-        for loc in first_isolates["nhsn_location_code"].unique():
-            loc_isolates = first_isolates[first_isolates["nhsn_location_code"] == loc]
-            quarter_str = f"{year}-Q{quarter}"
-
-            for _, pheno in phenotypes.iterrows():
-                phenotype_matches = 0
-                eligible_isolates = 0
-
-                for _, isolate in loc_isolates.iterrows():
-                    # Get susceptibilities for this isolate
-                    iso_suscept = suscept_df[suscept_df["isolate_id"] == isolate["isolate_id"]]
-
-                    # Check organism eligibility
-                    org_pattern = pheno["organism_pattern"] or ""
-                    if org_pattern:
-                        regex_pattern = org_pattern.replace("%", ".*")
-                        if not re.search(regex_pattern, isolate["organism_name"], re.IGNORECASE):
-                            continue
-
-                    eligible_isolates += 1
-
-                    # Check phenotype match
-                    if self._check_phenotype_match(
-                        isolate["organism_name"],
-                        iso_suscept,
-                        pheno["organism_pattern"] or "",
-                        pheno["resistance_pattern"] or "",
-                    ):
-                        phenotype_matches += 1
-
-                if eligible_isolates > 0:
-                    results.append(
-                        {
-                            "nhsn_location_code": loc,
-                            "quarter": quarter_str,
-                            "phenotype_code": pheno["phenotype_code"],
-                            "phenotype_name": pheno["phenotype_name"],
-                            "eligible_isolates": eligible_isolates,
-                            "phenotype_isolates": phenotype_matches,
-                            "percent_positive": round(
-                                phenotype_matches / eligible_isolates * 100, 1
-                            ),
-                        }
-                    )
-
-        return pd.DataFrame(results)
+        return phenotype_prevalence(first_isolates, suscept_df, rules, f"{year}-Q{quarter}")
 
     def get_quarterly_summary(
         self,
@@ -728,3 +690,52 @@ class ARDataExtractor:
             susceptibilities_df = pd.DataFrame()
 
         return {"isolates": isolates_df, "susceptibilities": susceptibilities_df}
+
+
+def resistance_rates(
+    first_isolates: pd.DataFrame,
+    suscept_df: pd.DataFrame,
+    keys: tuple[str, ...] = ("nhsn_location_code", "quarter", "organism_name", "antibiotic"),
+) -> pd.DataFrame:
+    """Resistance counts and percentages of first isolates.
+
+    Args:
+        first_isolates: First isolates from apply_first_isolate_rule().
+        suscept_df: Susceptibility results for those isolates.
+        keys: Columns to group by: isolate columns, then "antibiotic".
+
+    Returns:
+        DataFrame with one row per group, as calculate_resistance_rates returns.
+    """
+    keys = list(keys)
+
+    # Merge cultures with susceptibilities
+    merged = pd.merge(
+        first_isolates[["isolate_id", *keys[:-1]]],
+        suscept_df[["isolate_id", "antibiotic", "antibiotic_code", "interpretation"]],
+        on="isolate_id",
+    )
+
+    # Calculate resistance rates
+    resistance_df = (
+        merged.groupby(keys)
+        .agg(
+            total_isolates=("isolate_id", "nunique"),
+            resistant_isolates=("interpretation", lambda x: (x == "R").sum()),
+            intermediate_isolates=("interpretation", lambda x: (x == "I").sum()),
+            susceptible_isolates=("interpretation", lambda x: (x == "S").sum()),
+        )
+        .reset_index()
+    )
+
+    # Calculate percentages
+    resistance_df["percent_resistant"] = (
+        resistance_df["resistant_isolates"] / resistance_df["total_isolates"] * 100
+    ).round(1)
+    resistance_df["percent_non_susceptible"] = (
+        (resistance_df["resistant_isolates"] + resistance_df["intermediate_isolates"])
+        / resistance_df["total_isolates"]
+        * 100
+    ).round(1)
+
+    return resistance_df
@@ -13,15 +13,23 @@ Reference: CDC NHSN Antimicrobial Use and Resistance Module Protocol
 
 import logging
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
 from typing import Any
 
 import pandas as pd
 
 from ..config import Config
+from .administrations import (
+    compact_administrations,
+    days_of_therapy,
+    defined_daily_doses,
+    patient_administrations,
+)
 
 logger = logging.getLogger(__name__)
 
+AU_BACKENDS = ("sql", "frame")
+
 
 @dataclass
 class AntimicrobialUsage:
@@ -62,6 +70,16 @@ class AUDataExtractor:
     calendar days on which a patient received an antimicrobial agent.
     Data is aggregated by NHSN location and month.
 
+    Two backends produce the same results:
+    - "sql": DOT, DDD and patient-level rows each run their own MAR query
+    - "frame": administrations for the period are extracted once
+      (load_administrations) and everything is derived from that frame
+      in memory (see nhsn_src.data.administrations)
+
+    The calculation methods also accept a frame from load_administrations
+    directly, so callers can extract a period once and derive several
+    views from it.
+
     Example:
         extractor = AUDataExtractor()
         summary = extractor.get_monthly_summary(
@@ -71,15 +89,22 @@ class AUDataExtractor:
         )
     """
 
-    def __init__(self, connection_string: str | None = None):
+    def __init__(self, connection_string: str | None = None, backend: str | None = None):
         """Initialize the extractor.
 
         Args:
             connection_string: Database connection string. If not provided,
                 uses Config.get_clarity_connection_string().
+            backend: "sql" or "frame". Defaults to Config.AU_BACKEND.
         """
         self.connection_string = connection_string or Config.get_clarity_connection_string()
+        self.backend = backend or Config.AU_BACKEND
+        if self.backend not in AU_BACKENDS:
+            raise ValueError(
+                f"Unknown AU backend {self.backend!r}; expected one of {', '.join(AU_BACKENDS)}"
+            )
         self._engine = None
+        self._denominator_calc = None
 
     def _get_engine(self):
         """Lazy initialization of SQLAlchemy engine."""
@@ -101,12 +126,142 @@ class AUDataExtractor:
         """Check if using SQLite (mock) database."""
         return "sqlite" in (self.connection_string or "").lower()
 
+    @staticmethod
+    def _date_params(start_date: date, end_date: date) -> dict[str, date]:
+        """Query parameters for an inclusive date range.
+
+        Timestamps on end_date sort after the bare date, so queries bound
+        the range with ``< :end_before`` (the following day) instead.
+        """
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "end_before": end_date + timedelta(days=1),
+        }
+
+    def _get_denominator_calculator(self):
+        """Shared DenominatorCalculator for patient days."""
+        if self._denominator_calc is None:
+            from .denominator import DenominatorCalculator
+
+            self._denominator_calc = DenominatorCalculator(self.connection_string)
+        return self._denominator_calc
+
+    def load_administrations(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        raise_errors: bool = False,
+    ) -> pd.DataFrame:
+        """Extract a period's given administrations once, as a compact frame.
+
+        Includes every route, and rows without a PATIENT match (DDD counts
+        them; DOT and patient-level views drop them), so DOT, DDD and
+        patient-level administrations can all be derived from the result.
+
+        Args:
+            locations: List of NHSN location codes.
+            start_date: Start of date range. Defaults to the first of this month.
+            end_date: End of date range. Defaults to today.
+            raise_errors: Re-raise a failed query instead of returning an empty frame.
+
+        Returns:
+            Frame for days_of_therapy, defined_daily_doses and
+            patient_administrations (empty if the query fails).
+        """
+        if start_date is None:
+            start_date = date.today().replace(day=1)
+        if end_date is None:
+            end_date = date.today()
+
+        location_filter = ""
+        if locations:
+            location_list = ", ".join(f"'{loc}'" for loc in locations)
+            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
+
+        if self._is_sqlite():
+            date_expr = "date(mar.TAKEN_TIME)"
+            month_expr = "strftime('%Y-%m', mar.TAKEN_TIME)"
+        else:
+            date_expr = "CONVERT(DATE, mar.TAKEN_TIME)"
+            month_expr = "FORMAT(mar.TAKEN_TIME, 'yyyy-MM')"
+
+        if self._is_sqlite():
+            date_expr = "date(mar.TAKEN_TIME)"
+        else:
+            date_expr = "CONVERT(DATE, mar.TAKEN_TIME)"
+
+        # Administration facts: IDs and per-row values only
+        facts_query = f"""
+        SELECT
+            pat.PAT_MRN_ID as patient_id,
+            pe.PAT_ENC_CSN_ID as encounter_id,
+            pe.DEPARTMENT_ID as department_id,
+            om.MEDICATION_ID as medication_id,
+            om.ADMIN_ROUTE as route,
+            mar.TAKEN_TIME as admin_time,
+            {date_expr} as admin_date,
+            mar.DOSE_GIVEN as dose_given,
+            mar.DOSE_UNIT as dose_unit
+        FROM MAR_ADMIN_INFO mar
+        JOIN ORDER_MED om ON mar.ORDER_MED_ID = om.ORDER_MED_ID
+        JOIN RX_MED_ONE rx ON om.MEDICATION_ID = rx.MEDICATION_ID
+        JOIN NHSN_ANTIMICROBIAL_MAP nm ON rx.MEDICATION_ID = nm.MEDICATION_ID
+        JOIN PAT_ENC pe ON om.PAT_ENC_CSN_ID = pe.PAT_ENC_CSN_ID
+        LEFT JOIN PATIENT pat ON pe.PAT_ID = pat.PAT_ID
+        JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+        WHERE mar.ACTION_NAME = 'Given'
+            AND mar.TAKEN_TIME >= :start_date
+            AND mar.TAKEN_TIME < :end_before
+            {location_filter}
+        """
+
+        medications_query = """
+        SELECT
+            nm.MEDICATION_ID as medication_id,
+            rx.GENERIC_NAME as medication_name,
+            nm.NHSN_CODE as nhsn_code,
+            nm.NHSN_CATEGORY as nhsn_category,
+            nm.DDD as ddd_value,
+            nm.DDD_UNIT as ddd_unit
+        FROM NHSN_ANTIMICROBIAL_MAP nm
+        JOIN RX_MED_ONE rx ON nm.MEDICATION_ID = rx.MEDICATION_ID
+        """
+
+        locations_query = """
+        SELECT EPIC_DEPT_ID as department_id, NHSN_LOCATION_CODE as nhsn_location_code
+        FROM NHSN_LOCATION_MAP
+        """
+
+        try:
+            from sqlalchemy import text
+
+            engine = self._get_engine()
+            with engine.connect() as conn:
+                facts = pd.read_sql(
+                    text(facts_query),
+                    conn,
+                    params=self._date_params(start_date, end_date),
+                )
+                medications = pd.read_sql(text(medications_query), conn)
+                location_map = pd.read_sql(text(locations_query), conn)
+            for df in (facts, medications, location_map):
+                df.columns = df.columns.str.lower()
+            return compact_administrations(facts, medications, location_map)
+        except Exception as e:
+            logger.error(f"Administration extraction query failed: {e}")
+            if raise_errors:
+                raise
+            return pd.DataFrame()
+
     def get_antimicrobial_administrations(
         self,
         locations: list[str] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
         include_oral: bool | None = None,
+        administrations: pd.DataFrame | None = None,
     ) -> pd.DataFrame:
         """Get raw antimicrobial administration records.
 
@@ -115,6 +270,8 @@ class AUDataExtractor:
             start_date: Start of date range.
             end_date: End of date range.
             include_oral: Include oral (PO) administrations. Defaults to Config.AU_INCLUDE_ORAL.
+            administrations: Frame from load_administrations to derive the
+                rows from (the period arguments are then ignored).
 
         Returns:
             DataFrame with administration details including patient, medication,
@@ -127,6 +284,11 @@ class AUDataExtractor:
         if include_oral is None:
             include_oral = Config.AU_INCLUDE_ORAL
 
+        if administrations is None and self.backend == "frame":
+            administrations = self.load_administrations(locations, start_date, end_date)
+        if administrations is not None:
+            return patient_administrations(administrations, include_oral)
+
         # Build location filter
         location_filter = ""
         if locations:
@@ -172,7 +334,7 @@ class AUDataExtractor:
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         WHERE mar.ACTION_NAME = 'Given'
             AND mar.TAKEN_TIME >= :start_date
-            AND mar.TAKEN_TIME <= :end_date
+            AND mar.TAKEN_TIME < :end_before
             {location_filter}
             {route_filter}
         ORDER BY pat.PAT_MRN_ID, mar.TAKEN_TIME
@@ -186,7 +348,7 @@ class AUDataExtractor:
                 df = pd.read_sql(
                     text(query),
                     conn,
-                    params={"start_date": start_date, "end_date": end_date},
+                    params=self._date_params(start_date, end_date),
                 )
                 df.columns = df.columns.str.lower()
                 return df
@@ -200,6 +362,8 @@ class AUDataExtractor:
         start_date: date | None = None,
         end_date: date | None = None,
         include_oral: bool | None = None,
+        administrations: pd.DataFrame | None = None,
+        raise_errors: bool = False,
     ) -> pd.DataFrame:
         """Calculate Days of Therapy (DOT) by location, month, and antimicrobial.
 
@@ -212,6 +376,9 @@ class AUDataExtractor:
             start_date: Start of date range.
             end_date: End of date range.
             include_oral: Include oral administrations.
+            administrations: Frame from load_administrations to derive DOT
+                from (the period arguments are then ignored).
+            raise_errors: Re-raise a failed query instead of returning an empty frame.
 
         Returns:
             DataFrame with columns:
@@ -230,6 +397,13 @@ class AUDataExtractor:
         if include_oral is None:
             include_oral = Config.AU_INCLUDE_ORAL
 
+        if administrations is None and self.backend == "frame":
+            administrations = self.load_administrations(
+                locations, start_date, end_date, raise_errors=raise_errors
+            )
+        if administrations is not None:
+            return days_of_therapy(administrations, include_oral)
+
         # Build filters
         location_filter = ""
         if locations:
@@ -266,7 +440,7 @@ class AUDataExtractor:
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         WHERE mar.ACTION_NAME = 'Given'
             AND mar.TAKEN_TIME >= :start_date
-            AND mar.TAKEN_TIME <= :end_date
+            AND mar.TAKEN_TIME < :end_before
             {location_filter}
             {route_filter}
         GROUP BY loc.NHSN_LOCATION_CODE, {month_expr}, nm.NHSN_CODE, nm.NHSN_CATEGORY, rx.GENERIC_NAME, om.ADMIN_ROUTE
@@ -281,12 +455,14 @@ class AUDataExtractor:
                 df = pd.read_sql(
                     text(query),
                     conn,
-                    params={"start_date": start_date, "end_date": end_date},
+                    params=self._date_params(start_date, end_date),
                 )
                 df.columns = df.columns.str.lower()
                 return df
         except Exception as e:
             logger.error(f"DOT calculation query failed: {e}")
+            if raise_errors:
+                raise
             return pd.DataFrame()
 
     def calculate_ddd(
@@ -294,6 +470,8 @@ class AUDataExtractor:
         locations: list[str] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
+        administrations: pd.DataFrame | None = None,
+        raise_errors: bool = False,
     ) -> pd.DataFrame:
         """Calculate Defined Daily Doses (DDD) by location, month, and antimicrobial.
 
@@ -304,6 +482,9 @@ class AUDataExtractor:
             locations: List of NHSN location codes.
             start_date: Start of date range.
             end_date: End of date range.
+            administrations: Frame from load_administrations to derive DDD
+                from (the period arguments are then ignored).
+            raise_errors: Re-raise a failed query instead of returning an empty frame.
 
         Returns:
             DataFrame with columns:
@@ -320,6 +501,13 @@ class AUDataExtractor:
         if end_date is None:
             end_date = date.today()
 
+        if administrations is None and self.backend == "frame":
+            administrations = self.load_administrations(
+                locations, start_date, end_date, raise_errors=raise_errors
+            )
+        if administrations is not None:
+            return defined_daily_doses(administrations)
+
         location_filter = ""
         if locations:
             location_list = ", ".join(f"'{loc}'" for loc in locations)
@@ -364,7 +552,7 @@ class AUDataExtractor:
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         WHERE mar.ACTION_NAME = 'Given'
             AND mar.TAKEN_TIME >= :start_date
-            AND mar.TAKEN_TIME <= :end_date
+            AND mar.TAKEN_TIME < :end_before
             {location_filter}
         GROUP BY loc.NHSN_LOCATION_CODE, {month_expr}, nm.NHSN_CODE, nm.NHSN_CATEGORY, rx.GENERIC_NAME, nm.DDD, nm.DDD_UNIT
         ORDER BY {month_expr}, loc.NHSN_LOCATION_CODE, nm.NHSN_CATEGORY, nm.NHSN_CODE
@@ -378,12 +566,14 @@ class AUDataExtractor:
                 df = pd.read_sql(
                     text(query),
                     conn,
-                    params={"start_date": start_date, "end_date": end_date},
+                    params=self._date_params(start_date, end_date),
                 )
                 df.columns = df.columns.str.lower()
                 return df
         except Exception as e:
             logger.error(f"DDD calculation query failed: {e}")
+            if raise_errors:
+                raise
             return pd.DataFrame()
 
     def get_monthly_summary(
@@ -392,6 +582,7 @@ class AUDataExtractor:
         start_date: date | None = None,
         end_date: date | None = None,
         include_oral: bool | None = None,
+        administrations: pd.DataFrame | None = None,
     ) -> dict[str, Any]:
         """Get comprehensive monthly AU summary for NHSN reporting.
 
@@ -402,6 +593,8 @@ class AUDataExtractor:
             start_date: Start of date range.
             end_date: End of date range.
             include_oral: Include oral administrations.
+            administrations: Frame from load_administrations to derive DOT
+                and DDD from.
 
         Returns:
             Dictionary with:
@@ -409,149 +602,27 @@ class AUDataExtractor:
             - locations: List of location summaries with monthly AU data
             - overall_totals: Aggregate totals across all locations
         """
-        from .denominator import DenominatorCalculator
-
-        # Get DOT data
-        dot_df = self.calculate_dot(locations, start_date, end_date, include_oral)
-        ddd_df = self.calculate_ddd(locations, start_date, end_date)
+        # Get DOT and DDD data (from one extraction in the frame backend)
+        if administrations is None and self.backend == "frame":
+            administrations = self.load_administrations(locations, start_date, end_date)
+        dot_df = self.calculate_dot(
+            locations, start_date, end_date, include_oral, administrations=administrations
+        )
+        ddd_df = self.calculate_ddd(locations, start_date, end_date, administrations=administrations)
 
         # Get patient days for rate calculation
-        denom_calc = DenominatorCalculator(self.connection_string)
-        patient_days_df = denom_calc.get_patient_days(locations, start_date, end_date)
-
-        if dot_df.empty:
-            return {
-                "date_range": {
-                    "start": str(start_date) if start_date else None,
-                    "end": str(end_date) if end_date else None,
-                },
-                "locations": [],
-                "overall_totals": {
-                    "total_dot": 0,
-                    "total_patient_days": 0,
-                    "dot_per_1000_pd": 0,
-                },
-            }
-
-        # Merge DOT with patient days
-        merged = pd.merge(
-            dot_df,
-            patient_days_df[["nhsn_location_code", "month", "patient_days"]],
-            on=["nhsn_location_code", "month"],
-            how="left",
-        )
-        merged["patient_days"] = merged["patient_days"].fillna(0).astype(int)
-
-        # Calculate rates
-        merged["dot_per_1000_pd"] = merged.apply(
-            lambda row: round(row["days_of_therapy"] / row["patient_days"] * 1000, 2)
-            if row["patient_days"] > 0
-            else 0,
-            axis=1,
+        patient_days_df = self._get_denominator_calculator().get_patient_days(
+            locations, start_date, end_date
         )
 
-        # Merge with DDD data if available
-        if not ddd_df.empty:
-            merged = pd.merge(
-                merged,
-                ddd_df[["nhsn_location_code", "month", "nhsn_code", "defined_daily_doses"]],
-                on=["nhsn_location_code", "month", "nhsn_code"],
-                how="left",
-            )
-
-        # Build result structure
-        result = {
-            "date_range": {
-                "start": str(start_date) if start_date else None,
-                "end": str(end_date) if end_date else None,
-            },
-            "locations": [],
-            "overall_totals": {
-                "total_dot": int(merged["days_of_therapy"].sum()),
-                "total_patient_days": int(patient_days_df["patient_days"].sum()),
-            },
-        }
-
-        # Calculate overall rate
-        if result["overall_totals"]["total_patient_days"] > 0:
-            result["overall_totals"]["dot_per_1000_pd"] = round(
-                result["overall_totals"]["total_dot"]
-                / result["overall_totals"]["total_patient_days"]
-                * 1000,
-                2,
-            )
-        else:
-            result["overall_totals"]["dot_per_1000_pd"] = 0
-
-        # Group by location
-        for loc_code in sorted(merged["nhsn_location_code"].unique()):
-            loc_data = merged[merged["nhsn_location_code"] == loc_code]
-
-            loc_summary = {
-                "nhsn_location_code": loc_code,
-                "months": [],
-                "totals": {
-                    "total_dot": int(loc_data["days_of_therapy"].sum()),
-                    "patient_days": int(loc_data["patient_days"].sum()),
-                },
-            }
-
-            # Calculate location rate
-            if loc_summary["totals"]["patient_days"] > 0:
-                loc_summary["totals"]["dot_per_1000_pd"] = round(
-                    loc_summary["totals"]["total_dot"]
-                    / loc_summary["totals"]["patient_days"]
-                    * 1000,
-                    2,
-                )
-            else:
-                loc_summary["totals"]["dot_per_1000_pd"] = 0
-
-            # Group by month within location
-            for month in sorted(loc_data["month"].unique()):
-                month_data = loc_data[loc_data["month"] == month]
-                month_patient_days = int(month_data["patient_days"].iloc[0]) if len(month_data) > 0 else 0
-
-                month_summary = {
-                    "month": month,
-                    "patient_days": month_patient_days,
-                    "total_dot": int(month_data["days_of_therapy"].sum()),
-                    "antimicrobials": [],
-                }
-
-                # Calculate month rate
-                if month_patient_days > 0:
-                    month_summary["dot_per_1000_pd"] = round(
-                        month_summary["total_dot"] / month_patient_days * 1000, 2
-                    )
-                else:
-                    month_summary["dot_per_1000_pd"] = 0
-
-                # Add antimicrobial details
-                for _, row in month_data.iterrows():
-                    antimicrobial = {
-                        "nhsn_code": row["nhsn_code"],
-                        "nhsn_category": row["nhsn_category"],
-                        "medication_name": row["medication_name"],
-                        "route": row["route"],
-                        "days_of_therapy": int(row["days_of_therapy"]),
-                        "dot_per_1000_pd": row["dot_per_1000_pd"],
-                    }
-                    if "defined_daily_doses" in row and pd.notna(row["defined_daily_doses"]):
-                        antimicrobial["defined_daily_doses"] = round(row["defined_daily_doses"], 2)
-                    month_summary["antimicrobials"].append(antimicrobial)
-
-                loc_summary["months"].append(month_summary)
-
-            result["locations"].append(loc_summary)
-
-        return result
+        return monthly_summary(dot_df, ddd_df, patient_days_df, start_date, end_date)
 
     def get_usage_by_category(
         self,
         locations: list[str] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
+        administrations: pd.DataFrame | None = None,
     ) -> pd.DataFrame:
         """Get antimicrobial usage aggregated by NHSN category.
 
@@ -561,26 +632,46 @@ class AUDataExtractor:
             locations: List of NHSN location codes.
             start_date: Start of date range.
             end_date: End of date range.
+            administrations: Frame from load_administrations to derive DOT from.
 
         Returns:
             DataFrame with DOT totals by NHSN category.
         """
-        dot_df = self.calculate_dot(locations, start_date, end_date)
+        dot_df = self.calculate_dot(locations, start_date, end_date, administrations=administrations)
+
+        return usage_by_category(dot_df)
+
+    def get_usage_by_route(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        administrations: pd.DataFrame | None = None,
+    ) -> pd.DataFrame:
+        """Get antimicrobial usage split by administration route.
+
+        Args:
+            locations: List of NHSN location codes.
+            start_date: Start of date range.
+            end_date: End of date range.
+            administrations: Frame from load_administrations to derive DOT from.
+
+        Returns:
+            DataFrame with DOT totals by location, month and route.
+        """
+        dot_df = self.calculate_dot(
+            locations, start_date, end_date, include_oral=True, administrations=administrations
+        )
 
         if dot_df.empty:
-            return pd.DataFrame(
-                columns=["nhsn_location_code", "month", "nhsn_category", "total_dot"]
-            )
+            return pd.DataFrame(columns=["nhsn_location_code", "month", "route", "total_dot"])
 
-        # Aggregate by category
-        category_df = (
-            dot_df.groupby(["nhsn_location_code", "month", "nhsn_category"])
+        route_df = (
+            dot_df.groupby(["nhsn_location_code", "month", "route"])
             .agg({"days_of_therapy": "sum"})
             .reset_index()
         )
-        category_df = category_df.rename(columns={"days_of_therapy": "total_dot"})
-
-        return category_df
+        return route_df.rename(columns={"days_of_therapy": "total_dot"})
 
     def export_for_nhsn(
         self,
@@ -600,35 +691,204 @@ class AUDataExtractor:
         Returns:
             DataFrame formatted for NHSN submission.
         """
-        from .denominator import DenominatorCalculator
-
         dot_df = self.calculate_dot(locations, start_date, end_date)
-        denom_calc = DenominatorCalculator(self.connection_string)
-        patient_days_df = denom_calc.get_patient_days(locations, start_date, end_date)
+        patient_days_df = self._get_denominator_calculator().get_patient_days(
+            locations, start_date, end_date
+        )
 
-        if dot_df.empty:
-            return pd.DataFrame()
+        return nhsn_export(dot_df, patient_days_df)
+
+
+def monthly_summary(
+    dot_df: pd.DataFrame,
+    ddd_df: pd.DataFrame,
+    patient_days_df: pd.DataFrame,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> dict[str, Any]:
+    """Assemble get_monthly_summary's result from DOT, DDD and patient days.
+
+    Args:
+        dot_df: DOT rows as calculate_dot returns them.
+        ddd_df: DDD rows as calculate_ddd returns them.
+        patient_days_df: Patient days by location and month.
+        start_date: Start of date range (for date_range).
+        end_date: End of date range (for date_range).
+
+    Returns:
+        The get_monthly_summary dictionary.
+    """
+    if dot_df.empty:
+        return {
+            "date_range": {
+                "start": str(start_date) if start_date else None,
+                "end": str(end_date) if end_date else None,
+            },
+            "locations": [],
+            "overall_totals": {
+                "total_dot": 0,
+                "total_patient_days": 0,
+                "dot_per_1000_pd": 0,
+            },
+        }
 
-        # Merge with patient days
+    # Merge DOT with patient days
+    merged = pd.merge(
+        dot_df,
+        patient_days_df[["nhsn_location_code", "month", "patient_days"]],
+        on=["nhsn_location_code", "month"],
+        how="left",
+    )
+    merged["patient_days"] = merged["patient_days"].fillna(0).astype(int)
+
+    # Calculate rates
+    merged["dot_per_1000_pd"] = (
+        (merged["days_of_therapy"] / merged["patient_days"].where(merged["patient_days"] > 0) * 1000)
+        .round(2)
+        .fillna(0)
+    )
+
+    # Merge with DDD data if available
+    if not ddd_df.empty:
         merged = pd.merge(
-            dot_df,
-            patient_days_df[["nhsn_location_code", "month", "patient_days"]],
-            on=["nhsn_location_code", "month"],
+            merged,
+            ddd_df[["nhsn_location_code", "month", "nhsn_code", "defined_daily_doses"]],
+            on=["nhsn_location_code", "month", "nhsn_code"],
             how="left",
         )
 
-        # Format for NHSN
-        nhsn_df = pd.DataFrame(
-            {
-                "orgID": Config.NHSN_FACILITY_ID or "",
-                "locationCode": merged["nhsn_location_code"],
-                "summaryYM": merged["month"].str.replace("-", ""),  # YYYYMM format
-                "antimicrobialCode": merged["nhsn_code"],
-                "antimicrobialCategory": merged["nhsn_category"],
-                "route": merged["route"],
-                "daysOfTherapy": merged["days_of_therapy"],
-                "patientDays": merged["patient_days"].fillna(0).astype(int),
+    # Build result structure
+    result = {
+        "date_range": {
+            "start": str(start_date) if start_date else None,
+            "end": str(end_date) if end_date else None,
+        },
+        "locations": [],
+        "overall_totals": {
+            "total_dot": int(merged["days_of_therapy"].sum()),
+            "total_patient_days": int(patient_days_df["patient_days"].sum()),
+        },
+    }
+
+    # Calculate overall rate
+    if result["overall_totals"]["total_patient_days"] > 0:
+        result["overall_totals"]["dot_per_1000_pd"] = round(
+            result["overall_totals"]["total_dot"]
+            / result["overall_totals"]["total_patient_days"]
+            * 1000,
+            2,
+        )
+    else:
+        result["overall_totals"]["dot_per_1000_pd"] = 0
+
+    # Group by location
+    for loc_code in sorted(merged["nhsn_location_code"].unique()):
+        loc_data = merged[merged["nhsn_location_code"] == loc_code]
+
+        loc_summary = {
+            "nhsn_location_code": loc_code,
+            "months": [],
+            "totals": {
+                "total_dot": int(loc_data["days_of_therapy"].sum()),
+                "patient_days": int(loc_data["patient_days"].sum()),
+            },
+        }
+
+        # Calculate location rate
+        if loc_summary["totals"]["patient_days"] > 0:
+            loc_summary["totals"]["dot_per_1000_pd"] = round(
+                loc_summary["totals"]["total_dot"]
+                / loc_summary["totals"]["patient_days"]
+                * 1000,
+                2,
+            )
+        else:
+            loc_summary["totals"]["dot_per_1000_pd"] = 0
+
+        # Group by month within location
+        for month in sorted(loc_data["month"].unique()):
+            month_data = loc_data[loc_data["month"] == month]
+            month_patient_days = int(month_data["patient_days"].iloc[0]) if len(month_data) > 0 else 0
+
+            month_summary = {
+                "month": month,
+                "patient_days": month_patient_days,
+                "total_dot": int(month_data["days_of_therapy"].sum()),
+                "antimicrobials": [],
             }
+
+            # Calculate month rate
+            if month_patient_days > 0:
+                month_summary["dot_per_1000_pd"] = round(
+                    month_summary["total_dot"] / month_patient_days * 1000, 2
+                )
+            else:
+                month_summary["dot_per_1000_pd"] = 0
+
+            # Add antimicrobial details
+            for _, row in month_data.iterrows():
+                antimicrobial = {
+                    "nhsn_code": row["nhsn_code"],
+                    "nhsn_category": row["nhsn_category"],
+                    "medication_name": row["medication_name"],
+                    "route": row["route"],
+                    "days_of_therapy": int(row["days_of_therapy"]),
+                    "dot_per_1000_pd": row["dot_per_1000_pd"],
+                }
+                if "defined_daily_doses" in row and pd.notna(row["defined_daily_doses"]):
+                    antimicrobial["defined_daily_doses"] = round(row["defined_daily_doses"], 2)
+                month_summary["antimicrobials"].append(antimicrobial)
+
+            loc_summary["months"].append(month_summary)
+
+        result["locations"].append(loc_summary)
+
+    return result
+
+
+def usage_by_category(dot_df: pd.DataFrame) -> pd.DataFrame:
+    """DOT totals by location, month and NHSN category."""
+    if dot_df.empty:
+        return pd.DataFrame(
+            columns=["nhsn_location_code", "month", "nhsn_category", "total_dot"]
         )
 
-        return nhsn_df
+    # Aggregate by category
+    category_df = (
+        dot_df.groupby(["nhsn_location_code", "month", "nhsn_category"])
+        .agg({"days_of_therapy": "sum"})
+        .reset_index()
+    )
+    category_df = category_df.rename(columns={"days_of_therapy": "total_dot"})
+
+    return category_df
+
+
+def nhsn_export(dot_df: pd.DataFrame, patient_days_df: pd.DataFrame) -> pd.DataFrame:
+    """Format DOT and patient days as NHSN AU submission rows."""
+    if dot_df.empty:
+        return pd.DataFrame()
+
+    # Merge with patient days
+    merged = pd.merge(
+        dot_df,
+        patient_days_df[["nhsn_location_code", "month", "patient_days"]],
+        on=["nhsn_location_code", "month"],
+        how="left",
+    )
+
+    # Format for NHSN
+    nhsn_df = pd.DataFrame(
+        {
+            "orgID": Config.NHSN_FACILITY_ID or "",
+            "locationCode": merged["nhsn_location_code"],
+            "summaryYM": merged["month"].str.replace("-", ""),  # YYYYMM format
+            "antimicrobialCode": merged["nhsn_code"],
+            "antimicrobialCategory": merged["nhsn_category"],
+            "route": merged["route"],
+            "daysOfTherapy": merged["days_of_therapy"],
+            "patientDays": merged["patient_days"].fillna(0).astype(int),
+        }
+    )
+
+    return nhsn_df
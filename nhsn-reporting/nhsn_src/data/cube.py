@@ -0,0 +1,725 @@
+"""Persisted monthly reporting cube for the NHSN AU/AR dashboard pages.
+
+The dashboard's AU, AR and denominator pages used to recompute DOT,
+first isolates, resistance rates and patient/device days against Clarity
+on every load. ReportingCube stores those aggregates by location x month
+(x antimicrobial / organism / phenotype) in the NHSN SQLite database and
+assembles the same summaries from the stored rows:
+
+    cube = ReportingCube(NHSNDatabase(Config.NHSN_DB_PATH))
+    cube.refresh()                          # open and missing months
+    summary = cube.get_au_summary(start_date=date(2026, 7, 1), end_date=date(2026, 9, 30))
+
+- Months are computed whole, from the first day through the last (or
+  through today for the current month), one Clarity extraction per cube
+  for a run of months. Ranges of whole months are read from the cube;
+  ranges starting or ending mid-month go to the live extractors.
+- A month is "closed" once NHSN_CUBE_CLOSE_DAYS have passed since it
+  ended. A closed month computed after closing is frozen and never
+  recomputed unless rebuilt; open months are recomputed by refresh(), or
+  on read once older than NHSN_CUBE_MAX_AGE_MINUTES.
+- AR first isolates are deduplicated per quarter, so AR months are
+  computed a quarter at a time. Rows are kept for facility-wide and
+  per-location deduplication, matching unfiltered and single-location
+  ARDataExtractor results (a multi-location filter deduplicates within
+  each location rather than across the selected ones).
+- Patient and device days go to the existing denominators_monthly table.
+"""
+
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import pandas as pd
+
+from ..config import Config
+from .administrations import ORAL_ROUTES
+from .ar_extractor import ARDataExtractor, resistance_rates
+from .au_extractor import AUDataExtractor, monthly_summary, nhsn_export, usage_by_category
+from .denominator import DEVICE_DAY_COLUMNS, DenominatorCalculator, denominator_summary
+from .phenotypes import phenotype_prevalence
+
+logger = logging.getLogger(__name__)
+
+CUBES = ("au", "ar", "denominators")
+
+# AR first-isolate scopes: across all locations, or within each location
+AR_SCOPES = ("facility", "location")
+
+DOT_COLUMNS = [
+    "nhsn_location_code", "month", "nhsn_code", "nhsn_category",
+    "medication_name", "route", "days_of_therapy",
+]
+DDD_COLUMNS = [
+    "nhsn_location_code", "month", "nhsn_code", "nhsn_category", "medication_name",
+    "ddd_standard", "ddd_unit", "total_grams", "defined_daily_doses",
+]
+RESISTANCE_KEYS = ["nhsn_location_code", "quarter", "organism_name", "antibiotic"]
+RESISTANCE_COUNTS = [
+    "total_isolates", "resistant_isolates", "intermediate_isolates", "susceptible_isolates",
+]
+
+
+def month_key(day: date) -> str:
+    """YYYY-MM month of a date."""
+    return day.strftime("%Y-%m")
+
+
+def month_start(month: str) -> date:
+    """First day of a YYYY-MM month."""
+    return datetime.strptime(month, "%Y-%m").date()
+
+
+def next_month_start(month: str) -> date:
+    """First day of the month after a YYYY-MM month."""
+    return (month_start(month) + timedelta(days=32)).replace(day=1)
+
+
+def months_between(start_month: str, end_month: str) -> list[str]:
+    """YYYY-MM months from start_month through end_month."""
+    months = []
+    month = start_month
+    while month <= end_month:
+        months.append(month)
+        month = month_key(next_month_start(month))
+    return months
+
+
+def quarter_of(month: str) -> tuple[int, int]:
+    """(year, quarter) of a YYYY-MM month."""
+    return int(month[:4]), (int(month[5:7]) - 1) // 3 + 1
+
+
+def quarter_months(year: int, quarter: int) -> list[str]:
+    """The three YYYY-MM months of a quarter."""
+    return [f"{year}-{number:02d}" for number in range(quarter * 3 - 2, quarter * 3 + 1)]
+
+
+def _frame(rows: list[dict[str, Any]], columns: list[str]) -> pd.DataFrame:
+    """Cube rows as a DataFrame with the extractors' column names."""
+    df = pd.DataFrame(rows).rename(columns={"location_code": "nhsn_location_code"})
+    return df.reindex(columns=columns)
+
+
+def _records(df: pd.DataFrame, columns: list[str], **values) -> list[dict[str, Any]]:
+    """Frame rows as dicts for the cube tables, NaN as None."""
+    df = df[columns].rename(columns={"nhsn_location_code": "location_code"})
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+    return [{**record, **values} for record in records] if values else records
+
+
+class ReportingCube:
+    """Monthly AU/AR/denominator aggregates stored in the NHSN database.
+
+    Reads assemble the same structures as AUDataExtractor,
+    ARDataExtractor and DenominatorCalculator. Partial-month ranges are
+    passed through to those.
+    """
+
+    def __init__(
+        self,
+        db,
+        au_extractor: AUDataExtractor | None = None,
+        ar_extractor: ARDataExtractor | None = None,
+        denominator_calc: DenominatorCalculator | None = None,
+    ):
+        """Initialize the cube.
+
+        Args:
+            db: NHSNDatabase holding the cube tables.
+            au_extractor: AU extractor to compute from (created if None).
+            ar_extractor: AR extractor to compute from (created if None).
+            denominator_calc: Denominator calculator (created if None).
+        """
+        self.db = db
+        self.au_extractor = au_extractor or AUDataExtractor()
+        self.ar_extractor = ar_extractor or ARDataExtractor()
+        self.denominator_calc = denominator_calc or DenominatorCalculator()
+        self.close_days = Config.NHSN_CUBE_CLOSE_DAYS
+        self.max_age = timedelta(minutes=Config.NHSN_CUBE_MAX_AGE_MINUTES)
+        self._lock = threading.Lock()
+
+    # --- Building ---
+
+    def is_closed(self, month: str, today: date | None = None) -> bool:
+        """Whether a month is past its close date (and can be frozen)."""
+        today = today or date.today()
+        return today >= next_month_start(month) + timedelta(days=self.close_days)
+
+    def refresh(
+        self,
+        start_month: str | None = None,
+        end_month: str | None = None,
+        cubes: tuple[str, ...] = CUBES,
+        max_age: timedelta | None = None,
+    ) -> dict[str, list[str]]:
+        """Compute the cube months that are missing or open.
+
+        Frozen months are skipped. Months after the current month are
+        never computed.
+
+        Args:
+            start_month: First month (YYYY-MM). Defaults to end_month.
+            end_month: Last month (YYYY-MM). Defaults to the current month.
+            cubes: Cubes to refresh.
+            max_age: Only recompute open months computed longer ago than
+                this (all open months if None).
+
+        Returns:
+            Dict of cube name to the months computed.
+        """
+        today = date.today()
+        end_month = min(end_month or month_key(today), month_key(today))
+        start_month = start_month or end_month
+        months = months_between(start_month, end_month)
+
+        computed = {}
+        with self._lock:
+            now = datetime.now()
+            for cube in cubes:
+                state = self.db.get_cube_months(cube)
+                stale = [
+                    month for month in months
+                    if month not in state
+                    or not state[month]["closed"]
+                    and (max_age is None or now - state[month]["computed_at"] > max_age)
+                ]
+                if stale:
+                    self._compute(cube, stale, today)
+                computed[cube] = stale
+        return computed
+
+    def rebuild(
+        self,
+        start_month: str,
+        end_month: str | None = None,
+        cubes: tuple[str, ...] = CUBES,
+    ) -> dict[str, list[str]]:
+        """Recompute months from Clarity, including frozen ones.
+
+        Args:
+            start_month: First month (YYYY-MM).
+            end_month: Last month (YYYY-MM). Defaults to the current month.
+            cubes: Cubes to rebuild.
+
+        Returns:
+            Dict of cube name to the months computed.
+        """
+        end_month = end_month or month_key(date.today())
+        months = months_between(start_month, end_month)
+        for cube in cubes:
+            self.db.reopen_cube_months(cube, months)
+        return self.refresh(start_month, end_month, cubes)
+
+    def _compute(self, cube: str, months: list[str], today: date) -> None:
+        """Compute and store a cube's months.
+
+        The extractors are called with raise_errors, so a failed Clarity
+        query propagates before anything is saved or frozen.
+        """
+        logger.info(f"Computing {cube} cube for {months[0]} to {months[-1]}")
+        if cube == "au":
+            rows = self._compute_au(months, today)
+        elif cube == "ar":
+            rows = self._compute_ar(months, today)
+        elif cube == "denominators":
+            rows = self._compute_denominators(months, today)
+        else:
+            raise ValueError(f"Unknown cube {cube!r}; expected one of {', '.join(CUBES)}")
+
+        closed = {month for month in months if self.is_closed(month, today)}
+        self.db.save_cube_months(cube, months, rows, closed)
+
+    @staticmethod
+    def _query_end(last_month: str, today: date) -> date:
+        """Last day of last_month, or today for the current month."""
+        return min(next_month_start(last_month) - timedelta(days=1), today)
+
+    def _compute_au(self, months: list[str], today: date) -> dict[str, list[dict[str, Any]]]:
+        """DOT (all routes) and DDD rows for the months."""
+        au = self.au_extractor
+        start, end = month_start(months[0]), self._query_end(months[-1], today)
+        administrations = None
+        if au.backend == "frame":
+            administrations = au.load_administrations(None, start, end, raise_errors=True)
+
+        # Oral routes are filtered out on read when AU_INCLUDE_ORAL is off
+        dot_df = au.calculate_dot(
+            None, start, end, include_oral=True, administrations=administrations, raise_errors=True
+        )
+        ddd_df = au.calculate_ddd(None, start, end, administrations=administrations, raise_errors=True)
+        rows = {}
+        for table, df, columns in (("au_cube_dot", dot_df, DOT_COLUMNS), ("au_cube_ddd", ddd_df, DDD_COLUMNS)):
+            rows[table] = _records(df[df["month"].isin(months)], columns) if not df.empty else []
+        return rows
+
+    def _compute_denominators(self, months: list[str], today: date) -> dict[str, list[dict[str, Any]]]:
+        """Patient and device days per location for the months."""
+        calc = self.denominator_calc
+        start, end = month_start(months[0]), self._query_end(months[-1], today)
+        patient_days_df = calc.get_patient_days(None, start, end, raise_errors=True)
+        device_days_df = calc.get_device_days(None, start, end, raise_errors=True)
+
+        keys = ["nhsn_location_code", "month"]
+        merged = pd.merge(
+            patient_days_df.reindex(columns=[*keys, "patient_days"]),
+            device_days_df.reindex(columns=[*keys, *DEVICE_DAY_COLUMNS]),
+            on=keys,
+            how="outer",
+        )
+        merged = merged[merged["month"].isin(months)].sort_values(keys, ignore_index=True)
+        counts = ["patient_days", *DEVICE_DAY_COLUMNS]
+        merged[counts] = merged[counts].fillna(0).astype("int64")
+
+        rows = []
+        for row in merged.itertuples(index=False):
+            record = {
+                "id": f"{row.month}:{row.nhsn_location_code}",
+                "month": row.month,
+                "location_code": row.nhsn_location_code,
+            }
+            for column in counts:
+                record[column] = int(getattr(row, column))
+            for column in DEVICE_DAY_COLUMNS:
+                utilization = column.replace("_days", "_utilization")
+                record[utilization] = (
+                    round(record[column] / record["patient_days"], 3)
+                    if record["patient_days"] > 0 else 0
+                )
+            rows.append(record)
+        return {"denominators_monthly": rows}
+
+    def _compute_ar(self, months: list[str], today: date) -> dict[str, list[dict[str, Any]]]:
+        """First-isolate counts, resistance and phenotypes, a quarter at a time.
+
+        Cultures are deduplicated over the quarter to date, so a month's
+        first isolates account for the quarter's earlier months.
+        """
+        ar = self.ar_extractor
+        rules = ar.get_phenotype_rules()
+        if rules is None:
+            raise RuntimeError("Phenotype rules query failed")
+        rule_order = {rule.code: j for j, rule in enumerate(rules)}
+        keys = ["month", "nhsn_location_code", "organism_name"]
+        rows = {"ar_cube_organisms": [], "ar_cube_resistance": [], "ar_cube_phenotypes": []}
+
+        for year, quarter in sorted({quarter_of(month) for month in months}):
+            quarter_label = f"{year}-Q{quarter}"
+            all_months = quarter_months(year, quarter)
+            write_months = [month for month in months if month in all_months]
+
+            cultures = ar.get_culture_results(
+                None,
+                month_start(all_months[0]),
+                self._query_end(all_months[-1], today),
+                raise_errors=True,
+            )
+            if cultures.empty:
+                continue
+            cultures["month"] = pd.to_datetime(cultures["specimen_date"]).dt.strftime("%Y-%m")
+            cultures = cultures[cultures["month"].isin(all_months)]
+
+            scopes = {
+                scope: ar.apply_first_isolate_rule(cultures.copy(), per_location=(scope == "location"))
+                for scope in AR_SCOPES
+            }
+            scopes = {scope: df[df["month"].isin(write_months)] for scope, df in scopes.items()}
+            cultures = cultures[cultures["month"].isin(write_months)]
+            isolate_ids = sorted(set().union(*(df["isolate_id"] for df in scopes.values())))
+            suscept_df = (
+                ar.get_susceptibility_results(isolate_ids, raise_errors=True)
+                if isolate_ids else pd.DataFrame()
+            )
+
+            for scope, first_isolates in scopes.items():
+                tag = {"quarter": quarter_label, "scope": scope}
+                organisms = (
+                    cultures.assign(is_first=cultures.index.isin(first_isolates.index))
+                    .groupby(keys, dropna=False)
+                    .agg(cultures=("isolate_id", "size"), first_isolates=("is_first", "sum"))
+                    .reset_index()
+                )
+                rows["ar_cube_organisms"].extend(
+                    _records(organisms, [*keys, "cultures", "first_isolates"], **tag)
+                )
+                if first_isolates.empty:
+                    continue
+
+                if not suscept_df.empty:
+                    resistance = resistance_rates(
+                        first_isolates, suscept_df, keys=(*keys, "antibiotic")
+                    )
+                    rows["ar_cube_resistance"].extend(
+                        _records(resistance, [*keys, "antibiotic", *RESISTANCE_COUNTS], **tag)
+                    )
+
+                if not rules:
+                    continue
+                for month, month_isolates in first_isolates.groupby("month"):
+                    phenotypes = phenotype_prevalence(month_isolates, suscept_df, rules, quarter_label)
+                    if phenotypes.empty:
+                        continue
+                    phenotypes["month"] = month
+                    phenotypes["rule_order"] = phenotypes["phenotype_code"].map(rule_order)
+                    rows["ar_cube_phenotypes"].extend(
+                        _records(
+                            phenotypes,
+                            [
+                                "month", "nhsn_location_code", "phenotype_code", "phenotype_name",
+                                "rule_order", "eligible_isolates", "phenotype_isolates",
+                            ],
+                            **tag,
+                        )
+                    )
+        return rows
+
+    # --- Reading ---
+
+    def _read(
+        self,
+        cube: str,
+        table: str,
+        start_month: str,
+        end_month: str,
+        locations: list[str] | None = None,
+        scope: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Cube rows for whole months, refreshing missing or aged open months first."""
+        self.refresh(start_month, end_month, cubes=(cube,), max_age=self.max_age)
+        return self.db.get_cube_rows(table, start_month, end_month, locations, scope)
+
+    @staticmethod
+    def _month_range(start_date: date | None, end_date: date | None) -> tuple[str, str]:
+        """Months covering a date range (defaults to the current month)."""
+        today = date.today()
+        return month_key(start_date or today.replace(day=1)), month_key(end_date or today)
+
+    @staticmethod
+    def _whole_months(start_date: date | None, end_date: date | None) -> bool:
+        """Whether a date range starts and ends on month boundaries.
+
+        The current month is stored through today, so a range ending
+        today or later ends on its boundary.
+        """
+        today = date.today()
+        start, end = start_date or today.replace(day=1), end_date or today
+        return start.day == 1 and (end >= today or (end + timedelta(days=1)).day == 1)
+
+    def get_dot(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        include_oral: bool | None = None,
+    ) -> pd.DataFrame:
+        """DOT rows for the months of a date range, as calculate_dot returns them."""
+        if include_oral is None:
+            include_oral = Config.AU_INCLUDE_ORAL
+        if not self._whole_months(start_date, end_date):
+            return self.au_extractor.calculate_dot(locations, start_date, end_date, include_oral)
+
+        rows = self._read("au", "au_cube_dot", *self._month_range(start_date, end_date), locations)
+        df = _frame(rows, DOT_COLUMNS)
+        if not include_oral:
+            df = df[df["route"].notna() & ~df["route"].isin(ORAL_ROUTES)].reset_index(drop=True)
+        return df
+
+    def get_ddd(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """DDD rows for the months of a date range, as calculate_ddd returns them."""
+        if not self._whole_months(start_date, end_date):
+            return self.au_extractor.calculate_ddd(locations, start_date, end_date)
+        rows = self._read("au", "au_cube_ddd", *self._month_range(start_date, end_date), locations)
+        return _frame(rows, DDD_COLUMNS)
+
+    def _denominator_frames(
+        self,
+        locations: list[str] | None,
+        start_date: date | None,
+        end_date: date | None,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Patient days and combined device days frames for a date range."""
+        if not self._whole_months(start_date, end_date):
+            calc = self.denominator_calc
+            return (
+                calc.get_patient_days(locations, start_date, end_date),
+                calc.get_device_days(locations, start_date, end_date),
+            )
+        rows = self._read(
+            "denominators", "denominators_monthly", *self._month_range(start_date, end_date), locations
+        )
+        keys = ["nhsn_location_code", "month"]
+        df = _frame(rows, [*keys, "patient_days", *DEVICE_DAY_COLUMNS])
+        patient_days_df = df[df["patient_days"] > 0][[*keys, "patient_days"]].reset_index(drop=True)
+        device_days_df = df[(df[list(DEVICE_DAY_COLUMNS)] > 0).any(axis=1)][[*keys, *DEVICE_DAY_COLUMNS]]
+        return patient_days_df, device_days_df.reset_index(drop=True)
+
+    def get_device_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        device: str | None = None,
+    ) -> pd.DataFrame:
+        """Device days, all devices or one, as DenominatorCalculator returns them.
+
+        Args:
+            locations: List of NHSN location codes.
+            start_date: Start of date range.
+            end_date: End of date range.
+            device: One of DEVICE_DAY_COLUMNS, or None for all (get_device_days).
+        """
+        _, device_days_df = self._denominator_frames(locations, start_date, end_date)
+        if device is None:
+            return device_days_df
+        keys = ["nhsn_location_code", "month"]
+        rows = device_days_df[device_days_df[device] > 0][[*keys, device]]
+        return rows.reset_index(drop=True)
+
+    def get_patient_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """Patient days for the months of a date range, as get_patient_days returns them."""
+        return self._denominator_frames(locations, start_date, end_date)[0]
+
+    def get_denominator_summary(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> dict[str, Any]:
+        """DenominatorCalculator.get_denominator_summary from the cube."""
+        if not self._whole_months(start_date, end_date):
+            return self.denominator_calc.get_denominator_summary(locations, start_date, end_date)
+        patient_days_df, device_days_df = self._denominator_frames(locations, start_date, end_date)
+        return denominator_summary(patient_days_df, device_days_df, start_date, end_date)
+
+    def get_au_summary(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        include_oral: bool | None = None,
+    ) -> dict[str, Any]:
+        """AUDataExtractor.get_monthly_summary from the cube."""
+        if not self._whole_months(start_date, end_date):
+            return self.au_extractor.get_monthly_summary(locations, start_date, end_date, include_oral)
+        return monthly_summary(
+            self.get_dot(locations, start_date, end_date, include_oral),
+            self.get_ddd(locations, start_date, end_date),
+            self.get_patient_days(locations, start_date, end_date),
+            start_date,
+            end_date,
+        )
+
+    def get_usage_by_category(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """AUDataExtractor.get_usage_by_category from the cube."""
+        return usage_by_category(self.get_dot(locations, start_date, end_date))
+
+    def export_au_for_nhsn(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """AUDataExtractor.export_for_nhsn from the cube."""
+        return nhsn_export(
+            self.get_dot(locations, start_date, end_date),
+            self.get_patient_days(locations, start_date, end_date),
+        )
+
+    def _ar_rows(
+        self,
+        table: str,
+        locations: list[str] | None,
+        year: int | None,
+        quarter: int | None,
+    ) -> tuple[list[dict[str, Any]], str]:
+        """AR cube rows for a quarter, and the quarter label."""
+        year, quarter = self._quarter(year, quarter)
+        months = quarter_months(year, quarter)
+        scope = "location" if locations else "facility"
+        rows = self._read("ar", table, months[0], months[-1], locations, scope)
+        return rows, f"{year}-Q{quarter}"
+
+    @staticmethod
+    def _quarter(year: int | None, quarter: int | None) -> tuple[int, int]:
+        """Year and quarter, defaulting to the current quarter."""
+        today = date.today()
+        return year or today.year, quarter or (today.month - 1) // 3 + 1
+
+    def get_resistance_rates(
+        self,
+        locations: list[str] | None = None,
+        year: int | None = None,
+        quarter: int | None = None,
+    ) -> pd.DataFrame:
+        """ARDataExtractor.calculate_resistance_rates from the cube."""
+        rows, _ = self._ar_rows("ar_cube_resistance", locations, year, quarter)
+        if not rows:
+            return pd.DataFrame()
+
+        df = _frame(rows, [*RESISTANCE_KEYS, *RESISTANCE_COUNTS])
+        df = df.groupby(RESISTANCE_KEYS)[RESISTANCE_COUNTS].sum().reset_index()
+        df["percent_resistant"] = (df["resistant_isolates"] / df["total_isolates"] * 100).round(1)
+        df["percent_non_susceptible"] = (
+            (df["resistant_isolates"] + df["intermediate_isolates"]) / df["total_isolates"] * 100
+        ).round(1)
+        return df
+
+    def get_phenotypes(
+        self,
+        locations: list[str] | None = None,
+        year: int | None = None,
+        quarter: int | None = None,
+    ) -> pd.DataFrame:
+        """ARDataExtractor.calculate_phenotypes from the cube.
+
+        Locations are in code order rather than order of first isolate.
+        """
+        rows, quarter_label = self._ar_rows("ar_cube_phenotypes", locations, year, quarter)
+        if not rows:
+            return pd.DataFrame()
+
+        df = (
+            pd.DataFrame(rows)
+            .groupby(["location_code", "rule_order", "phenotype_code", "phenotype_name"], dropna=False)
+            [["eligible_isolates", "phenotype_isolates"]]
+            .sum()
+            .reset_index()
+        )
+        return pd.DataFrame(
+            [
+                {
+                    "nhsn_location_code": row.location_code,
+                    "quarter": quarter_label,
+                    "phenotype_code": row.phenotype_code,
+                    "phenotype_name": row.phenotype_name,
+                    "eligible_isolates": int(row.eligible_isolates),
+                    "phenotype_isolates": int(row.phenotype_isolates),
+                    "percent_positive": round(row.phenotype_isolates / row.eligible_isolates * 100, 1),
+                }
+                for row in df.itertuples(index=False)
+            ]
+        )
+
+    def get_ar_summary(
+        self,
+        locations: list[str] | None = None,
+        year: int | None = None,
+        quarter: int | None = None,
+    ) -> dict[str, Any]:
+        """ARDataExtractor.get_quarterly_summary from the cube.
+
+        Organisms within a location are listed by name.
+        """
+        year, quarter = self._quarter(year, quarter)
+        months = quarter_months(year, quarter)
+        start_date, end_date = month_start(months[0]), next_month_start(months[-1]) - timedelta(days=1)
+
+        rows, quarter_label = self._ar_rows("ar_cube_organisms", locations, year, quarter)
+        organisms = _frame(rows, ["nhsn_location_code", "organism_name", "cultures", "first_isolates"])
+        first = organisms[organisms["first_isolates"] > 0]
+        resistance_df = self.get_resistance_rates(locations, year, quarter)
+        phenotype_df = self.get_phenotypes(locations, year, quarter)
+
+        result = {
+            "period": {
+                "year": year,
+                "quarter": quarter,
+                "quarter_string": quarter_label,
+                "start_date": str(start_date),
+                "end_date": str(end_date),
+            },
+            "overall_totals": {
+                "total_cultures": int(organisms["cultures"].sum()),
+                "first_isolates": int(organisms["first_isolates"].sum()),
+                "unique_organisms": int(first["organism_name"].nunique()),
+            },
+            "locations": [],
+            "phenotypes": phenotype_df.to_dict("records") if not phenotype_df.empty else [],
+        }
+
+        counts = (
+            first.dropna(subset=["nhsn_location_code"])
+            .groupby(["nhsn_location_code", "organism_name"], dropna=False)["first_isolates"]
+            .sum()
+        )
+        for loc, loc_counts in counts.groupby(level=0):
+            loc_resistance = (
+                resistance_df[resistance_df["nhsn_location_code"] == loc]
+                if not resistance_df.empty
+                else pd.DataFrame()
+            )
+            loc_summary = {
+                "nhsn_location_code": loc,
+                "total_isolates": int(loc_counts.sum()),
+                "organisms": [],
+            }
+            for (_, org), org_count in loc_counts.items():
+                loc_summary["organisms"].append(
+                    {
+                        "organism_name": org,
+                        "isolate_count": int(org_count),
+                        "resistance_data": (
+                            loc_resistance[loc_resistance["organism_name"] == org].to_dict("records")
+                            if not loc_resistance.empty
+                            else []
+                        ),
+                    }
+                )
+            result["locations"].append(loc_summary)
+
+        return result
+
+    def get_freshness(
+        self,
+        start_month: str | None = None,
+        end_month: str | None = None,
+        cubes: tuple[str, ...] = CUBES,
+    ) -> dict[str, Any]:
+        """When the cube months behind a page were computed.
+
+        Args:
+            start_month: First month (YYYY-MM). Defaults to end_month.
+            end_month: Last month (YYYY-MM). Defaults to the current month.
+            cubes: Cubes the page reads.
+
+        Returns:
+            Dictionary with computed_at (oldest computation among the
+            months), open_months (months still being refreshed) and
+            frozen_months (count of closed months).
+        """
+        end_month = min(end_month or month_key(date.today()), month_key(date.today()))
+        months = months_between(start_month or end_month, end_month)
+        computed_at = []
+        open_months = set()
+        frozen = 0
+        for cube in cubes:
+            state = self.db.get_cube_months(cube)
+            for month in months:
+                if month not in state:
+                    continue
+                computed_at.append(state[month]["computed_at"])
+                if state[month]["closed"]:
+                    frozen += 1
+                else:
+                    open_months.add(month)
+        return {
+            "computed_at": min(computed_at) if computed_at else None,
+            "open_months": sorted(open_months),
+            "frozen_months": frozen,
+        }
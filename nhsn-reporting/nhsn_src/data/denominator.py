@@ -6,16 +6,46 @@ for calculating HAI rates (infections per 1,000 device-days).
 """
 
 import logging
-from datetime import date
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 
 from ..config import Config
+from .intervals import device_days_by_month, patient_days_by_month
 
 logger = logging.getLogger(__name__)
 
+DENOMINATOR_BACKENDS = ("sql", "interval")
+
+DEVICE_DAY_COLUMNS = ("central_line_days", "urinary_catheter_days", "ventilator_days")
+
+# Flowsheet items (IP_FLO_GP_DATA fd) that document each device. Matched once
+# against the reference table to build a FLO_MEAS_ID -> device map.
+_DEVICE_ITEM_FILTERS = {
+    "central_line_days": "fd.DISP_NAME LIKE '%central%line%' OR fd.DISP_NAME LIKE '%PICC%'",
+    "urinary_catheter_days": """fd.DISP_NAME LIKE '%foley%'
+               OR fd.DISP_NAME LIKE '%urinary%catheter%'
+               OR fd.DISP_NAME LIKE '%indwelling%catheter%'""",
+    "ventilator_days": """fd.DISP_NAME LIKE '%ventilator%'
+               OR fd.DISP_NAME LIKE '%mechanical%vent%'
+               OR fd.DISP_NAME LIKE '%vent%mode%'
+               OR fd.DISP_NAME LIKE '%intubat%'""",
+}
+
+# Measurement values (IP_FLWSHT_MEAS fm) that still count as device present
+_DEVICE_VALUE_FILTERS = {
+    "central_line_days": "fm.MEAS_VALUE NOT LIKE '%removed%'",
+    "urinary_catheter_days": """fm.MEAS_VALUE NOT LIKE '%removed%'
+            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'""",
+    "ventilator_days": """fm.MEAS_VALUE NOT LIKE '%removed%'
+            AND fm.MEAS_VALUE NOT LIKE '%extubat%'
+            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'""",
+}
+
 
 class DenominatorCalculator:
     """Calculate device-days and patient-days from Clarity data.
@@ -27,6 +57,12 @@ class DenominatorCalculator:
     - Central line days: Count of patient-days with a central line present
     - Patient days: Total patient census days per location
 
+    Two backends produce identical results:
+    - "sql": aggregate in the database (patient days via a recursive CTE
+      that expands each stay into one row per day)
+    - "interval": pull stays and device documentation once and aggregate
+      with interval arithmetic in NumPy (see nhsn_src.data.intervals)
+
     Example:
         calc = DenominatorCalculator()
         df = calc.get_central_line_days(
@@ -36,35 +72,63 @@ class DenominatorCalculator:
         )
     """
 
-    def __init__(self, connection_string: str | None = None):
+    def __init__(self, connection_string: str | None = None, backend: str | None = None):
         """Initialize the calculator.
 
         Args:
             connection_string: Database connection string. If not provided,
                 uses Config.get_clarity_connection_string().
+            backend: "sql" or "interval". Defaults to Config.DENOMINATOR_BACKEND.
         """
         self.connection_string = connection_string or Config.get_clarity_connection_string()
+        self.backend = backend or Config.DENOMINATOR_BACKEND
+        if self.backend not in DENOMINATOR_BACKENDS:
+            raise ValueError(
+                f"Unknown denominator backend {self.backend!r}; "
+                f"expected one of {', '.join(DENOMINATOR_BACKENDS)}"
+            )
         self._engine = None
+        self._engine_lock = threading.Lock()
+        self._device_items: dict[str, tuple[int, ...]] | None = None
+        self._device_items_lock = threading.Lock()
 
     def _get_engine(self):
-        """Lazy initialization of SQLAlchemy engine."""
-        if self._engine is None:
-            if not self.connection_string:
-                raise ValueError(
-                    "No Clarity connection configured. Set CLARITY_CONNECTION_STRING "
-                    "or MOCK_CLARITY_DB_PATH in environment."
-                )
-            try:
-                from sqlalchemy import create_engine
-                self._engine = create_engine(self.connection_string)
-            except ImportError:
-                raise ImportError("sqlalchemy required for denominator calculations")
-        return self._engine
+        """Lazy initialization of SQLAlchemy engine.
+
+        get_denominator_summary queries from two threads, so creation is
+        locked to keep them from each building a pool.
+        """
+        with self._engine_lock:
+            if self._engine is None:
+                if not self.connection_string:
+                    raise ValueError(
+                        "No Clarity connection configured. Set CLARITY_CONNECTION_STRING "
+                        "or MOCK_CLARITY_DB_PATH in environment."
+                    )
+                try:
+                    from sqlalchemy import create_engine
+                    self._engine = create_engine(self.connection_string)
+                except ImportError:
+                    raise ImportError("sqlalchemy required for denominator calculations")
+            return self._engine
 
     def _is_sqlite(self) -> bool:
         """Check if using SQLite (mock) database."""
         return "sqlite" in (self.connection_string or "").lower()
 
+    @staticmethod
+    def _date_params(start_date: date, end_date: date) -> dict[str, date]:
+        """Query parameters for an inclusive date range.
+
+        Timestamps on end_date sort after the bare date, so queries bound
+        the range with ``< :end_before`` (the following day) instead.
+        """
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "end_before": end_date + timedelta(days=1),
+        }
+
     def get_central_line_days(
         self,
         locations: list[str] | None = None,
@@ -88,58 +152,7 @@ class DenominatorCalculator:
             - month: Year-month string (YYYY-MM)
             - central_line_days: Count of patient-days with line present
         """
-        if start_date is None:
-            start_date = date.today().replace(year=date.today().year - 1)
-        if end_date is None:
-            end_date = date.today()
-
-        # SQLite uses strftime, SQL Server uses FORMAT/CONVERT
-        if self._is_sqlite():
-            month_expr = "strftime('%Y-%m', fm.RECORDED_TIME)"
-            date_expr = "date(fm.RECORDED_TIME)"
-        else:
-            month_expr = "FORMAT(fm.RECORDED_TIME, 'yyyy-MM')"
-            date_expr = "CONVERT(DATE, fm.RECORDED_TIME)"
-
-        location_filter = ""
-        if locations:
-            location_list = ", ".join(f"'{loc}'" for loc in locations)
-            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
-
-        query = f"""
-        SELECT
-            loc.NHSN_LOCATION_CODE,
-            {month_expr} AS month,
-            COUNT(DISTINCT pe.PAT_ID || '-' || {date_expr}) AS central_line_days
-        FROM IP_FLWSHT_MEAS fm
-        JOIN IP_FLWSHT_REC rec ON fm.FSD_ID = rec.FSD_ID
-        JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
-        JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
-        JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
-        WHERE (fd.DISP_NAME LIKE '%central%line%' OR fd.DISP_NAME LIKE '%PICC%')
-            AND fm.MEAS_VALUE NOT LIKE '%removed%'
-            AND fm.RECORDED_TIME >= :start_date
-            AND fm.RECORDED_TIME <= :end_date
-            {location_filter}
-        GROUP BY loc.NHSN_LOCATION_CODE, {month_expr}
-        ORDER BY {month_expr}, loc.NHSN_LOCATION_CODE
-        """
-
-        try:
-            from sqlalchemy import text
-            engine = self._get_engine()
-            with engine.connect() as conn:
-                df = pd.read_sql(
-                    text(query),
-                    conn,
-                    params={"start_date": start_date, "end_date": end_date},
-                )
-                # Normalize column names to lowercase
-                df.columns = df.columns.str.lower()
-                return df
-        except Exception as e:
-            logger.error(f"Central line days query failed: {e}")
-            return pd.DataFrame(columns=["nhsn_location_code", "month", "central_line_days"])
+        return self.get_device_days(locations, start_date, end_date, devices=["central_line_days"])
 
     def get_urinary_catheter_days(
         self,
@@ -165,61 +178,7 @@ class DenominatorCalculator:
             - month: Year-month string (YYYY-MM)
             - urinary_catheter_days: Count of patient-days with catheter present
         """
-        if start_date is None:
-            start_date = date.today().replace(year=date.today().year - 1)
-        if end_date is None:
-            end_date = date.today()
-
-        # SQLite uses strftime, SQL Server uses FORMAT/CONVERT
-        if self._is_sqlite():
-            month_expr = "strftime('%Y-%m', fm.RECORDED_TIME)"
-            date_expr = "date(fm.RECORDED_TIME)"
-        else:
-            month_expr = "FORMAT(fm.RECORDED_TIME, 'yyyy-MM')"
-            date_expr = "CONVERT(DATE, fm.RECORDED_TIME)"
-
-        location_filter = ""
-        if locations:
-            location_list = ", ".join(f"'{loc}'" for loc in locations)
-            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
-
-        query = f"""
-        SELECT
-            loc.NHSN_LOCATION_CODE,
-            {month_expr} AS month,
-            COUNT(DISTINCT pe.PAT_ID || '-' || {date_expr}) AS urinary_catheter_days
-        FROM IP_FLWSHT_MEAS fm
-        JOIN IP_FLWSHT_REC rec ON fm.FSD_ID = rec.FSD_ID
-        JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
-        JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
-        JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
-        WHERE (fd.DISP_NAME LIKE '%foley%'
-               OR fd.DISP_NAME LIKE '%urinary%catheter%'
-               OR fd.DISP_NAME LIKE '%indwelling%catheter%')
-            AND fm.MEAS_VALUE NOT LIKE '%removed%'
-            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'
-            AND fm.RECORDED_TIME >= :start_date
-            AND fm.RECORDED_TIME <= :end_date
-            {location_filter}
-        GROUP BY loc.NHSN_LOCATION_CODE, {month_expr}
-        ORDER BY {month_expr}, loc.NHSN_LOCATION_CODE
-        """
-
-        try:
-            from sqlalchemy import text
-            engine = self._get_engine()
-            with engine.connect() as conn:
-                df = pd.read_sql(
-                    text(query),
-                    conn,
-                    params={"start_date": start_date, "end_date": end_date},
-                )
-                # Normalize column names to lowercase
-                df.columns = df.columns.str.lower()
-                return df
-        except Exception as e:
-            logger.error(f"Urinary catheter days query failed: {e}")
-            return pd.DataFrame(columns=["nhsn_location_code", "month", "urinary_catheter_days"])
+        return self.get_device_days(locations, start_date, end_date, devices=["urinary_catheter_days"])
 
     def get_ventilator_days(
         self,
@@ -245,11 +204,122 @@ class DenominatorCalculator:
             - month: Year-month string (YYYY-MM)
             - ventilator_days: Count of patient-days on mechanical ventilation
         """
+        return self.get_device_days(locations, start_date, end_date, devices=["ventilator_days"])
+
+    def get_device_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        devices: list[str] | None = None,
+        raise_errors: bool = False,
+    ) -> pd.DataFrame:
+        """Calculate device days for several devices in one flowsheet scan.
+
+        Each measurement is classified by its FLO_MEAS_ID (see
+        _get_device_items) rather than by matching display names per row.
+
+        Args:
+            locations: List of NHSN location codes. If None, includes all.
+            start_date: Start of date range (inclusive). Defaults to 1 year ago.
+            end_date: End of date range (inclusive). Defaults to today.
+            devices: Device columns to count. Defaults to DEVICE_DAY_COLUMNS.
+            raise_errors: Re-raise a failed query instead of returning an empty frame.
+
+        Returns:
+            DataFrame with nhsn_location_code, month (YYYY-MM) and one
+            count column per device. Only (location, month) pairs with at
+            least one device day are included.
+        """
         if start_date is None:
             start_date = date.today().replace(year=date.today().year - 1)
         if end_date is None:
             end_date = date.today()
+        devices = list(devices or DEVICE_DAY_COLUMNS)
+
+        try:
+            if self.backend == "interval":
+                documentation = self._fetch_device_documentation(
+                    devices, locations, start_date, end_date
+                )
+                counts = [device_days_by_month(documentation, device) for device in devices]
+                merged = counts[0]
+                for df in counts[1:]:
+                    merged = pd.merge(merged, df, on=["nhsn_location_code", "month"], how="outer")
+                if len(counts) > 1 and not merged.empty:
+                    merged[devices] = merged[devices].fillna(0).astype("int64")
+                    merged = merged.sort_values(["month", "nhsn_location_code"], ignore_index=True)
+                return merged
+            return self._query_device_days(devices, locations, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Device days query failed: {e}")
+            if raise_errors:
+                raise
+            return pd.DataFrame(columns=["nhsn_location_code", "month", *devices])
+
+    def _get_device_items(self) -> dict[str, tuple[int, ...]]:
+        """FLO_MEAS_IDs documenting each device, read once and cached.
+
+        IP_FLO_GP_DATA is reference data, so display names are matched
+        against it once instead of for every flowsheet measurement.
+        """
+        with self._device_items_lock:
+            if self._device_items is None:
+                flags = ",\n                ".join(
+                    f"CASE WHEN {condition} THEN 1 ELSE 0 END AS {device}"
+                    for device, condition in _DEVICE_ITEM_FILTERS.items()
+                )
+                any_device = " OR ".join(f"({c})" for c in _DEVICE_ITEM_FILTERS.values())
+                query = f"""
+                SELECT
+                    fd.FLO_MEAS_ID,
+                    {flags}
+                FROM IP_FLO_GP_DATA fd
+                WHERE {any_device}
+                """
+
+                from sqlalchemy import text
+                with self._get_engine().connect() as conn:
+                    rows = conn.execute(text(query)).mappings().all()
+                self._device_items = {
+                    device: tuple(
+                        int(row["FLO_MEAS_ID"]) for row in rows if row[device]
+                    )
+                    for device in _DEVICE_ITEM_FILTERS
+                }
+                logger.debug(
+                    "Device flowsheet items: "
+                    + ", ".join(f"{d}={len(ids)}" for d, ids in self._device_items.items())
+                )
+            return self._device_items
+
+    def _device_conditions(self, devices: list[str]) -> tuple[dict[str, str], str]:
+        """Per-device measurement conditions and the FLO_MEAS_ID prefilter."""
+        items = self._get_device_items()
+        conditions = {}
+        for device in devices:
+            if items[device]:
+                id_list = ", ".join(str(i) for i in items[device])
+                conditions[device] = (
+                    f"fm.FLO_MEAS_ID IN ({id_list}) AND {_DEVICE_VALUE_FILTERS[device]}"
+                )
+            else:
+                conditions[device] = "1 = 0"
+
+        all_ids = sorted({i for device in devices for i in items[device]})
+        prefilter = (
+            f"fm.FLO_MEAS_ID IN ({', '.join(str(i) for i in all_ids)})" if all_ids else "1 = 0"
+        )
+        return conditions, prefilter
 
+    def _query_device_days(
+        self,
+        devices: list[str],
+        locations: list[str] | None,
+        start_date: date,
+        end_date: date,
+    ) -> pd.DataFrame:
+        """Count distinct patient-days per device in one aggregate query."""
         # SQLite uses strftime, SQL Server uses FORMAT/CONVERT
         if self._is_sqlite():
             month_expr = "strftime('%Y-%m', fm.RECORDED_TIME)"
@@ -263,51 +333,49 @@ class DenominatorCalculator:
             location_list = ", ".join(f"'{loc}'" for loc in locations)
             location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
 
+        conditions, prefilter = self._device_conditions(devices)
+        counts = ",\n            ".join(
+            f"COUNT(DISTINCT CASE WHEN {condition} "
+            f"THEN pe.PAT_ID || '-' || {date_expr} END) AS {device}"
+            for device, condition in conditions.items()
+        )
+        any_device = " OR ".join(f"({c})" for c in conditions.values())
+
         query = f"""
         SELECT
             loc.NHSN_LOCATION_CODE,
             {month_expr} AS month,
-            COUNT(DISTINCT pe.PAT_ID || '-' || {date_expr}) AS ventilator_days
+            {counts}
         FROM IP_FLWSHT_MEAS fm
         JOIN IP_FLWSHT_REC rec ON fm.FSD_ID = rec.FSD_ID
         JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
-        JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
-        WHERE (fd.DISP_NAME LIKE '%ventilator%'
-               OR fd.DISP_NAME LIKE '%mechanical%vent%'
-               OR fd.DISP_NAME LIKE '%vent%mode%'
-               OR fd.DISP_NAME LIKE '%intubat%')
-            AND fm.MEAS_VALUE NOT LIKE '%removed%'
-            AND fm.MEAS_VALUE NOT LIKE '%extubat%'
-            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'
+        WHERE {prefilter}
+            AND ({any_device})
             AND fm.RECORDED_TIME >= :start_date
-            AND fm.RECORDED_TIME <= :end_date
+            AND fm.RECORDED_TIME < :end_before
             {location_filter}
         GROUP BY loc.NHSN_LOCATION_CODE, {month_expr}
         ORDER BY {month_expr}, loc.NHSN_LOCATION_CODE
         """
 
-        try:
-            from sqlalchemy import text
-            engine = self._get_engine()
-            with engine.connect() as conn:
-                df = pd.read_sql(
-                    text(query),
-                    conn,
-                    params={"start_date": start_date, "end_date": end_date},
-                )
-                # Normalize column names to lowercase
-                df.columns = df.columns.str.lower()
-                return df
-        except Exception as e:
-            logger.error(f"Ventilator days query failed: {e}")
-            return pd.DataFrame(columns=["nhsn_location_code", "month", "ventilator_days"])
+        from sqlalchemy import text
+        with self._get_engine().connect() as conn:
+            df = pd.read_sql(
+                text(query),
+                conn,
+                params=self._date_params(start_date, end_date),
+            )
+        # Normalize column names to lowercase
+        df.columns = df.columns.str.lower()
+        return df
 
     def get_patient_days(
         self,
         locations: list[str] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
+        raise_errors: bool = False,
     ) -> pd.DataFrame:
         """Calculate patient days by location and month.
 
@@ -319,6 +387,7 @@ class DenominatorCalculator:
             locations: List of NHSN location codes. If None, includes all.
             start_date: Start of date range. Defaults to 1 year ago.
             end_date: End of date range. Defaults to today.
+            raise_errors: Re-raise a failed query instead of returning an empty frame.
 
         Returns:
             DataFrame with columns:
@@ -331,6 +400,9 @@ class DenominatorCalculator:
         if end_date is None:
             end_date = date.today()
 
+        if self.backend == "interval":
+            return self._interval_patient_days(locations, start_date, end_date, raise_errors)
+
         location_filter = ""
         if locations:
             location_list = ", ".join(f"'{loc}'" for loc in locations)
@@ -348,7 +420,7 @@ class DenominatorCalculator:
                     MAX(date(pe.HOSP_ADMIT_DTTM), date(:start_date)) AS census_date,
                     MIN(date(COALESCE(pe.HOSP_DISCH_DTTM, :end_date)), date(:end_date)) AS end_dt
                 FROM PAT_ENC pe
-                WHERE pe.HOSP_ADMIT_DTTM <= :end_date
+                WHERE pe.HOSP_ADMIT_DTTM < :end_before
                     AND (pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM >= :start_date)
 
                 UNION ALL
@@ -385,7 +457,7 @@ class DenominatorCalculator:
                     CAST(CASE WHEN pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM > :end_date
                          THEN :end_date ELSE pe.HOSP_DISCH_DTTM END AS DATE) AS end_dt
                 FROM PAT_ENC pe
-                WHERE pe.HOSP_ADMIT_DTTM <= :end_date
+                WHERE pe.HOSP_ADMIT_DTTM < :end_before
                     AND (pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM >= :start_date)
 
                 UNION ALL
@@ -418,13 +490,137 @@ class DenominatorCalculator:
                 df = pd.read_sql(
                     text(query),
                     conn,
-                    params={"start_date": start_date, "end_date": end_date},
+                    params=self._date_params(start_date, end_date),
                 )
                 # Normalize column names to lowercase
                 df.columns = df.columns.str.lower()
                 return df
         except Exception as e:
             logger.error(f"Patient days query failed: {e}")
+            if raise_errors:
+                raise
+            return pd.DataFrame(columns=["nhsn_location_code", "month", "patient_days"])
+
+    def _fetch_stays(
+        self,
+        locations: list[str] | None,
+        start_date: date,
+        end_date: date,
+    ) -> pd.DataFrame:
+        """Pull admit/discharge dates of mapped stays overlapping the range.
+
+        Uses the same encounter filter as the recursive CTE in
+        get_patient_days, without expanding stays into days.
+        """
+        if self._is_sqlite():
+            admit_expr, disch_expr = "date(pe.HOSP_ADMIT_DTTM)", "date(pe.HOSP_DISCH_DTTM)"
+        else:
+            admit_expr = "CAST(pe.HOSP_ADMIT_DTTM AS DATE)"
+            disch_expr = "CAST(pe.HOSP_DISCH_DTTM AS DATE)"
+
+        location_filter = ""
+        if locations:
+            location_list = ", ".join(f"'{loc}'" for loc in locations)
+            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
+
+        query = f"""
+        SELECT
+            loc.NHSN_LOCATION_CODE,
+            {admit_expr} AS admit_date,
+            {disch_expr} AS discharge_date
+        FROM PAT_ENC pe
+        JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+        WHERE pe.HOSP_ADMIT_DTTM < :end_before
+            AND (pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM >= :start_date)
+            {location_filter}
+        """
+
+        from sqlalchemy import text
+        with self._get_engine().connect() as conn:
+            df = pd.read_sql(
+                text(query),
+                conn,
+                params=self._date_params(start_date, end_date),
+            )
+        df.columns = df.columns.str.lower()
+        return df
+
+    def _fetch_device_documentation(
+        self,
+        devices: list[str],
+        locations: list[str] | None,
+        start_date: date,
+        end_date: date,
+    ) -> pd.DataFrame:
+        """Pull patient-days documenting any of the given devices, in one scan.
+
+        Args:
+            devices: Device columns (e.g. ["central_line_days"]).
+
+        Returns:
+            DataFrame with one row per location, pat_id and recorded_date,
+            and a 0/1 column per device.
+        """
+        if self._is_sqlite():
+            date_expr = "date(fm.RECORDED_TIME)"
+        else:
+            date_expr = "CONVERT(DATE, fm.RECORDED_TIME)"
+
+        location_filter = ""
+        if locations:
+            location_list = ", ".join(f"'{loc}'" for loc in locations)
+            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
+
+        conditions, prefilter = self._device_conditions(devices)
+        flags = ",\n            ".join(
+            f"MAX(CASE WHEN {condition} THEN 1 ELSE 0 END) AS {device}"
+            for device, condition in conditions.items()
+        )
+        any_device = " OR ".join(f"({c})" for c in conditions.values())
+
+        query = f"""
+        SELECT
+            loc.NHSN_LOCATION_CODE,
+            pe.PAT_ID,
+            {date_expr} AS recorded_date,
+            {flags}
+        FROM IP_FLWSHT_MEAS fm
+        JOIN IP_FLWSHT_REC rec ON fm.FSD_ID = rec.FSD_ID
+        JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
+        JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+        WHERE {prefilter}
+            AND ({any_device})
+            AND fm.RECORDED_TIME >= :start_date
+            AND fm.RECORDED_TIME < :end_before
+            {location_filter}
+        GROUP BY loc.NHSN_LOCATION_CODE, pe.PAT_ID, {date_expr}
+        """
+
+        from sqlalchemy import text
+        with self._get_engine().connect() as conn:
+            df = pd.read_sql(
+                text(query),
+                conn,
+                params=self._date_params(start_date, end_date),
+            )
+        df.columns = df.columns.str.lower()
+        return df
+
+    def _interval_patient_days(
+        self,
+        locations: list[str] | None,
+        start_date: date,
+        end_date: date,
+        raise_errors: bool = False,
+    ) -> pd.DataFrame:
+        """get_patient_days via interval arithmetic over pulled stays."""
+        try:
+            stays = self._fetch_stays(locations, start_date, end_date)
+            return patient_days_by_month(stays, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Patient days interval calculation failed: {e}")
+            if raise_errors:
+                raise
             return pd.DataFrame(columns=["nhsn_location_code", "month", "patient_days"])
 
     def get_denominator_summary(
@@ -451,138 +647,16 @@ class DenominatorCalculator:
                 - months: List of monthly data with device-days and patient_days
                 - totals: Aggregate totals for the period
         """
-        # Fetch all denominator data
-        line_days_df = self.get_central_line_days(locations, start_date, end_date)
-        catheter_days_df = self.get_urinary_catheter_days(locations, start_date, end_date)
-        vent_days_df = self.get_ventilator_days(locations, start_date, end_date)
-        patient_days_df = self.get_patient_days(locations, start_date, end_date)
-
-        # Check if all empty
-        all_empty = (
-            line_days_df.empty
-            and catheter_days_df.empty
-            and vent_days_df.empty
-            and patient_days_df.empty
-        )
-        if all_empty:
-            return {
-                "date_range": {
-                    "start": str(start_date) if start_date else None,
-                    "end": str(end_date) if end_date else None,
-                },
-                "locations": [],
-            }
-
-        # Start with patient days as base, merge all device days
-        merged = patient_days_df[["nhsn_location_code", "month", "patient_days"]].copy()
-
-        if not line_days_df.empty:
-            merged = pd.merge(
-                merged,
-                line_days_df[["nhsn_location_code", "month", "central_line_days"]],
-                on=["nhsn_location_code", "month"],
-                how="outer",
-            )
-
-        if not catheter_days_df.empty:
-            merged = pd.merge(
-                merged,
-                catheter_days_df[["nhsn_location_code", "month", "urinary_catheter_days"]],
-                on=["nhsn_location_code", "month"],
-                how="outer",
-            )
-
-        if not vent_days_df.empty:
-            merged = pd.merge(
-                merged,
-                vent_days_df[["nhsn_location_code", "month", "ventilator_days"]],
-                on=["nhsn_location_code", "month"],
-                how="outer",
+        # One flowsheet scan for all device days, with the patient-days
+        # query running alongside it
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="patient-days") as executor:
+            patient_days_future = executor.submit(
+                self.get_patient_days, locations, start_date, end_date
             )
+            device_days_df = self.get_device_days(locations, start_date, end_date)
+            patient_days_df = patient_days_future.result()
 
-        # Fill NaN with 0 for all numeric columns
-        merged = merged.fillna(0)
-
-        # Ensure all expected columns exist
-        for col in ["central_line_days", "urinary_catheter_days", "ventilator_days", "patient_days"]:
-            if col not in merged.columns:
-                merged[col] = 0
-
-        # Build summary structure
-        result = {
-            "date_range": {
-                "start": str(start_date) if start_date else None,
-                "end": str(end_date) if end_date else None,
-            },
-            "locations": [],
-        }
-
-        location_codes = merged["nhsn_location_code"].unique()
-        for loc_code in sorted(location_codes):
-            loc_data = merged[merged["nhsn_location_code"] == loc_code]
-
-            months = []
-            for _, row in loc_data.iterrows():
-                patient_days = int(row["patient_days"])
-                central_line_days = int(row["central_line_days"])
-                urinary_catheter_days = int(row["urinary_catheter_days"])
-                ventilator_days = int(row["ventilator_days"])
-
-                months.append({
-                    "month": row["month"],
-                    "patient_days": patient_days,
-                    "central_line_days": central_line_days,
-                    "urinary_catheter_days": urinary_catheter_days,
-                    "ventilator_days": ventilator_days,
-                    "central_line_utilization": (
-                        round(central_line_days / patient_days, 3)
-                        if patient_days > 0 else 0
-                    ),
-                    "urinary_catheter_utilization": (
-                        round(urinary_catheter_days / patient_days, 3)
-                        if patient_days > 0 else 0
-                    ),
-                    "ventilator_utilization": (
-                        round(ventilator_days / patient_days, 3)
-                        if patient_days > 0 else 0
-                    ),
-                })
-
-            # Calculate totals
-            total_patient_days = int(loc_data["patient_days"].sum())
-            total_line_days = int(loc_data["central_line_days"].sum())
-            total_catheter_days = int(loc_data["urinary_catheter_days"].sum())
-            total_vent_days = int(loc_data["ventilator_days"].sum())
-
-            totals = {
-                "patient_days": total_patient_days,
-                "central_line_days": total_line_days,
-                "urinary_catheter_days": total_catheter_days,
-                "ventilator_days": total_vent_days,
-            }
-
-            if total_patient_days > 0:
-                totals["central_line_utilization"] = round(
-                    total_line_days / total_patient_days, 3
-                )
-                totals["urinary_catheter_utilization"] = round(
-                    total_catheter_days / total_patient_days, 3
-                )
-                totals["ventilator_utilization"] = round(
-                    total_vent_days / total_patient_days, 3
-                )
-            else:
-                totals["central_line_utilization"] = 0
-                totals["urinary_catheter_utilization"] = 0
-                totals["ventilator_utilization"] = 0
-
-            result["locations"].append({
-                "nhsn_location_code": loc_code,
-                "months": months,
-                "totals": totals,
-            })
-
-        return result
+        return denominator_summary(patient_days_df, device_days_df, start_date, end_date)
 
     def get_clabsi_rate(
         self,
@@ -685,3 +759,125 @@ class DenominatorCalculator:
             "ventilator_days": total_vent_days,
             "rate_per_1000": round(rate, 2),
         }
+
+
+def denominator_summary(
+    patient_days_df: pd.DataFrame,
+    device_days_df: pd.DataFrame,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> dict[str, Any]:
+    """Assemble get_denominator_summary's result from monthly frames.
+
+    Args:
+        patient_days_df: Patient days as get_patient_days returns them.
+        device_days_df: Device days as get_device_days returns them.
+        start_date: Start of date range (for date_range).
+        end_date: End of date range (for date_range).
+
+    Returns:
+        The get_denominator_summary dictionary.
+    """
+    if device_days_df.empty and patient_days_df.empty:
+        return {
+            "date_range": {
+                "start": str(start_date) if start_date else None,
+                "end": str(end_date) if end_date else None,
+            },
+            "locations": [],
+        }
+
+    # Start with patient days as base, merge all device days
+    merged = patient_days_df[["nhsn_location_code", "month", "patient_days"]].copy()
+
+    if not device_days_df.empty:
+        merged = pd.merge(
+            merged,
+            device_days_df[["nhsn_location_code", "month", *DEVICE_DAY_COLUMNS]],
+            on=["nhsn_location_code", "month"],
+            how="outer",
+        )
+
+    # Fill NaN with 0 for all numeric columns
+    merged = merged.fillna(0)
+
+    # Ensure all expected columns exist
+    for col in ["central_line_days", "urinary_catheter_days", "ventilator_days", "patient_days"]:
+        if col not in merged.columns:
+            merged[col] = 0
+
+    # Build summary structure
+    result = {
+        "date_range": {
+            "start": str(start_date) if start_date else None,
+            "end": str(end_date) if end_date else None,
+        },
+        "locations": [],
+    }
+
+    location_codes = merged["nhsn_location_code"].unique()
+    for loc_code in sorted(location_codes):
+        loc_data = merged[merged["nhsn_location_code"] == loc_code]
+
+        months = []
+        for _, row in loc_data.iterrows():
+            patient_days = int(row["patient_days"])
+            central_line_days = int(row["central_line_days"])
+            urinary_catheter_days = int(row["urinary_catheter_days"])
+            ventilator_days = int(row["ventilator_days"])
+
+            months.append({
+                "month": row["month"],
+                "patient_days": patient_days,
+                "central_line_days": central_line_days,
+                "urinary_catheter_days": urinary_catheter_days,
+                "ventilator_days": ventilator_days,
+                "central_line_utilization": (
+                    round(central_line_days / patient_days, 3)
+                    if patient_days > 0 else 0
+                ),
+                "urinary_catheter_utilization": (
+                    round(urinary_catheter_days / patient_days, 3)
+                    if patient_days > 0 else 0
+                ),
+                "ventilator_utilization": (
+                    round(ventilator_days / patient_days, 3)
+                    if patient_days > 0 else 0
+                ),
+            })
+
+        # Calculate totals
+        total_patient_days = int(loc_data["patient_days"].sum())
+        total_line_days = int(loc_data["central_line_days"].sum())
+        total_catheter_days = int(loc_data["urinary_catheter_days"].sum())
+        total_vent_days = int(loc_data["ventilator_days"].sum())
+
+        totals = {
+            "patient_days": total_patient_days,
+            "central_line_days": total_line_days,
+            "urinary_catheter_days": total_catheter_days,
+            "ventilator_days": total_vent_days,
+        }
+
+        if total_patient_days > 0:
+            totals["central_line_utilization"] = round(
+                total_line_days / total_patient_days, 3
+            )
+            totals["urinary_catheter_utilization"] = round(
+                total_catheter_days / total_patient_days, 3
+            )
+            totals["ventilator_utilization"] = round(
+                total_vent_days / total_patient_days, 3
+            )
+        else:
+            totals["central_line_utilization"] = 0
+            totals["urinary_catheter_utilization"] = 0
+            totals["ventilator_utilization"] = 0
+
+        result["locations"].append({
+            "nhsn_location_code": loc_code,
+            "months": months,
+            "totals": totals,
+        })
+
+    return result
@@ -0,0 +1,139 @@
+"""Interval arithmetic for NHSN patient-day and device-day denominators.
+
+The SQL denominator queries expand every encounter into one row per
+calendar day with a recursive CTE (SQL Server needs MAXRECURSION for it)
+and count distinct patient-days of flowsheet documentation per device in
+three separate scans. This module computes the same monthly figures in
+NumPy from rows pulled once:
+
+- Patient days: each stay is clipped to the reporting range and added to a
+  per-location difference array over a day index (+1 on the first census
+  day, -1 after the last). A cumulative sum gives the daily census, which
+  is summed per calendar month at the month boundaries.
+- Device days: flowsheet rows documenting a device are reduced to distinct
+  (location, patient, day) keys and counted per month.
+
+Results match DenominatorCalculator's SQL path row for row:
+
+    stays = calc._fetch_stays(locations, start_date, end_date)
+    df = patient_days_by_month(stays, start_date, end_date)
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+
+def _to_days(values: pd.Series) -> np.ndarray:
+    """Dates (strings, dates or timestamps; missing as NaT) as datetime64[D]."""
+    return pd.to_datetime(values).to_numpy().astype("datetime64[D]")
+
+
+def _month_labels(months: np.ndarray) -> np.ndarray:
+    return np.datetime_as_string(months, unit="M")
+
+
+def _monthly_frame(
+    location_codes: np.ndarray,
+    month_labels: np.ndarray,
+    counts: np.ndarray,
+    column: str,
+) -> pd.DataFrame:
+    """Long-format rows for the non-zero cells of a location x month grid.
+
+    Rows are ordered by month, then location code, like the SQL queries.
+    """
+    month_idx, loc_idx = np.nonzero(counts.T)
+    return pd.DataFrame({
+        "nhsn_location_code": location_codes[loc_idx],
+        "month": month_labels[month_idx],
+        column: counts[loc_idx, month_idx].astype("int64"),
+    })
+
+
+def patient_days_by_month(stays: pd.DataFrame, start_date: date, end_date: date) -> pd.DataFrame:
+    """Patient days per location and calendar month.
+
+    Each census day from the later of admission and start_date through the
+    earlier of discharge and end_date counts once, in its own month. A stay
+    always contributes its first census day, even if discharged before it.
+
+    Args:
+        stays: Rows with nhsn_location_code, admit_date and discharge_date
+            (missing while still admitted).
+        start_date: Start of date range (inclusive).
+        end_date: End of date range (inclusive).
+
+    Returns:
+        DataFrame with nhsn_location_code, month (YYYY-MM) and patient_days.
+    """
+    empty = pd.DataFrame(columns=["nhsn_location_code", "month", "patient_days"])
+    if stays.empty:
+        return empty
+
+    start = np.datetime64(start_date, "D")
+    end = np.datetime64(end_date, "D")
+
+    admit = _to_days(stays["admit_date"])
+    discharge = _to_days(stays["discharge_date"])
+    first = np.maximum(admit, start)
+    last = np.minimum(np.where(np.isnat(discharge), end, discharge), end)
+    last = np.maximum(last, first)
+
+    keep = ~np.isnat(first) & (first <= end)
+    if not keep.any():
+        return empty
+    codes, loc_idx = np.unique(stays["nhsn_location_code"].to_numpy()[keep], return_inverse=True)
+    first_idx = (first[keep] - start).astype("int64")
+    stop_idx = (last[keep] - start).astype("int64") + 1
+
+    num_days = int((end - start).astype("int64")) + 1
+    diff = np.zeros((len(codes), num_days + 1), dtype="int64")
+    np.add.at(diff, (loc_idx, first_idx), 1)
+    np.add.at(diff, (loc_idx, stop_idx), -1)
+    census = diff.cumsum(axis=1)[:, :num_days]
+
+    # Split the day index at month boundaries
+    months = (start + np.arange(num_days)).astype("datetime64[M]")
+    boundaries = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    monthly = np.add.reduceat(census, boundaries, axis=1)
+
+    return _monthly_frame(codes, _month_labels(months[boundaries]), monthly, "patient_days")
+
+
+def device_days_by_month(documentation: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Distinct patient-days of device documentation per location and month.
+
+    Args:
+        documentation: Flowsheet rows with nhsn_location_code, pat_id,
+            recorded_date and a 0/1 flag column per device.
+        column: The device flag column to count (e.g. "central_line_days").
+
+    Returns:
+        DataFrame with nhsn_location_code, month (YYYY-MM) and column.
+    """
+    empty = pd.DataFrame(columns=["nhsn_location_code", "month", column])
+    if documentation.empty:
+        return empty
+
+    rows = documentation[documentation[column].astype(bool)].dropna(subset=["pat_id", "recorded_date"])
+    if rows.empty:
+        return empty
+
+    codes, loc_idx = np.unique(rows["nhsn_location_code"].to_numpy(), return_inverse=True)
+    patient_idx = pd.factorize(rows["pat_id"])[0]
+    days = _to_days(rows["recorded_date"])
+    keys = np.unique(
+        np.column_stack([loc_idx, patient_idx, days.astype("int64")]).astype("int64"),
+        axis=0,
+    )
+
+    distinct_months = keys[:, 2].astype("datetime64[D]").astype("datetime64[M]")
+    first_month = distinct_months.min()
+    month_idx = (distinct_months - first_month).astype("int64")
+    counts = np.zeros((len(codes), int(month_idx.max()) + 1), dtype="int64")
+    np.add.at(counts, (keys[:, 0], month_idx), 1)
+
+    months = first_month + np.arange(counts.shape[1])
+    return _monthly_frame(codes, _month_labels(months), counts, column)
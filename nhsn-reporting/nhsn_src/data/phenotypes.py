@@ -0,0 +1,215 @@
+"""Vectorized resistance phenotype evaluation for NHSN AR reporting.
+
+Phenotype definitions come from NHSN_PHENOTYPE_MAP rows:
+
+- ORGANISM_PATTERN: SQL LIKE-style pattern ("%" wildcards, "|" alternatives)
+  matched case-insensitively anywhere in the organism name. Empty means
+  every organism is eligible.
+- RESISTANCE_PATTERN: "|"-separated alternatives of ","-separated
+  conditions, each "ANTIBIOTIC_CODE:INTERPRETATION" - e.g. "MEM:R|ETP:R"
+  or "CTX:R,CAZ:R,FEP:S".
+
+Each rule is parsed once into a PhenotypeRule. Susceptibilities are pivoted
+into an isolate x antibiotic interpretation matrix, so every rule is
+evaluated for all isolates with column comparisons rather than by
+filtering the susceptibility table per isolate and condition:
+
+    rules = compile_phenotypes(phenotypes_df)
+    df = phenotype_prevalence(first_isolates, suscept_df, rules, "2026-Q1")
+
+Matching follows ARDataExtractor._check_phenotype_match: a condition uses
+the isolate's first result for that antibiotic code (case-insensitive), and
+an isolate with no susceptibility results at all counts as a match.
+"""
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class PhenotypeRule:
+    """One parsed NHSN_PHENOTYPE_MAP row."""
+
+    code: str
+    name: str
+    organism_regex: re.Pattern | None
+    # OR of ANDs: each clause is ((ANTIBIOTIC_CODE, interpretation), ...)
+    clauses: tuple[tuple[tuple[str, str], ...], ...] | None  # None = no resistance pattern
+
+    @classmethod
+    def parse(
+        cls,
+        code: str,
+        name: str,
+        organism_pattern: str | None,
+        resistance_pattern: str | None,
+    ) -> "PhenotypeRule":
+        """Parse a phenotype definition's patterns."""
+        organism_regex = None
+        if organism_pattern:
+            organism_regex = re.compile(organism_pattern.replace("%", ".*"), re.IGNORECASE)
+
+        clauses = None
+        if resistance_pattern:
+            parsed = []
+            for or_cond in resistance_pattern.split("|"):
+                conditions = []
+                for cond in or_cond.split(","):
+                    if ":" not in cond:
+                        continue
+                    abx_code, required_interp = cond.split(":")
+                    conditions.append((abx_code.strip().upper(), required_interp.strip()))
+                parsed.append(tuple(conditions))
+            clauses = tuple(parsed)
+
+        return cls(code, name, organism_regex, clauses)
+
+    def antibiotic_codes(self) -> set[str]:
+        """Antibiotic codes the resistance pattern refers to."""
+        return {abx for clause in self.clauses or () for abx, _ in clause}
+
+
+def compile_phenotypes(phenotypes: pd.DataFrame) -> list[PhenotypeRule]:
+    """Parse phenotype definitions (lower-cased NHSN_PHENOTYPE_MAP columns)."""
+    def pattern(value) -> str:
+        return value if isinstance(value, str) else ""  # NULL reads back as None or NaN
+
+    return [
+        PhenotypeRule.parse(
+            row.phenotype_code,
+            row.phenotype_name,
+            pattern(row.organism_pattern),
+            pattern(row.resistance_pattern),
+        )
+        for row in phenotypes.itertuples(index=False)
+    ]
+
+
+def interpretation_matrix(susceptibilities: pd.DataFrame, codes: set[str] | None = None) -> pd.DataFrame:
+    """Pivot susceptibilities to isolate_id x ANTIBIOTIC_CODE interpretations.
+
+    Keeps the first result per isolate and antibiotic code, in row order.
+
+    Args:
+        susceptibilities: Rows with isolate_id, antibiotic_code and interpretation.
+        codes: Only these (upper-case) antibiotic codes.
+    """
+    if susceptibilities.empty or "antibiotic_code" not in susceptibilities.columns:
+        return pd.DataFrame()
+
+    results = susceptibilities[["isolate_id", "antibiotic_code", "interpretation"]].dropna(
+        subset=["antibiotic_code"]
+    )
+    results = results.assign(antibiotic_code=results["antibiotic_code"].str.upper())
+    if codes is not None:
+        results = results[results["antibiotic_code"].isin(codes)]
+    results = results.drop_duplicates(subset=["isolate_id", "antibiotic_code"], keep="first")
+    return results.pivot(index="isolate_id", columns="antibiotic_code", values="interpretation")
+
+
+def evaluate_phenotypes(
+    isolates: pd.DataFrame,
+    susceptibilities: pd.DataFrame,
+    rules: list[PhenotypeRule],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Evaluate every rule for every isolate.
+
+    Args:
+        isolates: Rows with isolate_id and organism_name.
+        susceptibilities: Rows with isolate_id, antibiotic_code and interpretation.
+        rules: Compiled phenotype rules.
+
+    Returns:
+        (eligible, matched) boolean arrays of shape (len(isolates), len(rules)).
+        matched is only meaningful where eligible.
+    """
+    n = len(isolates)
+    eligible = np.ones((n, len(rules)), dtype=bool)
+    matched = np.ones((n, len(rules)), dtype=bool)
+    if n == 0 or not rules:
+        return eligible, matched
+
+    # Organism patterns: one regex search per distinct organism name
+    organisms = isolates["organism_name"]
+    distinct = organisms.drop_duplicates()
+    for j, rule in enumerate(rules):
+        if rule.organism_regex is not None:
+            hits = {
+                org: isinstance(org, str) and rule.organism_regex.search(org) is not None
+                for org in distinct
+            }
+            eligible[:, j] = organisms.map(hits).to_numpy(dtype=bool)
+
+    # Resistance patterns, against one matrix row per isolate
+    codes = set().union(*(rule.antibiotic_codes() for rule in rules))
+    matrix = interpretation_matrix(susceptibilities, codes)
+    isolate_ids = isolates["isolate_id"]
+    if "isolate_id" in susceptibilities.columns:
+        has_results = isolate_ids.isin(susceptibilities["isolate_id"]).to_numpy()
+    else:
+        has_results = np.zeros(n, dtype=bool)
+    matrix = matrix.reindex(index=isolate_ids, columns=sorted(codes))
+
+    for j, rule in enumerate(rules):
+        if rule.clauses is None:
+            continue
+        any_clause = np.zeros(n, dtype=bool)
+        for clause in rule.clauses:
+            all_met = np.ones(n, dtype=bool)
+            for abx_code, required_interp in clause:
+                all_met &= (matrix[abx_code] == required_interp).to_numpy(dtype=bool, na_value=False)
+            any_clause |= all_met
+        # No susceptibility results at all counts as a match
+        matched[:, j] = any_clause | ~has_results
+
+    return eligible, matched
+
+
+def phenotype_prevalence(
+    isolates: pd.DataFrame,
+    susceptibilities: pd.DataFrame,
+    rules: list[PhenotypeRule],
+    quarter: str,
+) -> pd.DataFrame:
+    """Phenotype prevalence per location.
+
+    Args:
+        isolates: First isolates with isolate_id, nhsn_location_code and organism_name.
+        susceptibilities: Susceptibility results for those isolates.
+        rules: Compiled phenotype rules.
+        quarter: Quarter label (YYYY-Q#).
+
+    Returns:
+        DataFrame with one row per location and phenotype that has eligible
+        isolates, locations in order of appearance and phenotypes in rule order.
+    """
+    eligible, matched = evaluate_phenotypes(isolates, susceptibilities, rules)
+    locations = isolates["nhsn_location_code"].to_numpy()
+    codes = range(len(rules))
+
+    eligible_counts = pd.DataFrame(eligible, columns=codes).groupby(locations, sort=False).sum()
+    match_counts = pd.DataFrame(eligible & matched, columns=codes).groupby(locations, sort=False).sum()
+
+    results = []
+    for loc in eligible_counts.index:
+        for j, rule in enumerate(rules):
+            eligible_isolates = int(eligible_counts.at[loc, j])
+            if eligible_isolates == 0:
+                continue
+            phenotype_matches = int(match_counts.at[loc, j])
+            results.append(
+                {
+                    "nhsn_location_code": loc,
+                    "quarter": quarter,
+                    "phenotype_code": rule.code,
+                    "phenotype_name": rule.name,
+                    "eligible_isolates": eligible_isolates,
+                    "phenotype_isolates": phenotype_matches,
+                    "percent_positive": round(phenotype_matches / eligible_isolates * 100, 1),
+                }
+            )
+
+    return pd.DataFrame(results)
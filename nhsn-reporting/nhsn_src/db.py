@@ -7,6 +7,7 @@ from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any
 
+from . import config  # noqa: F401 - puts the project root on sys.path for common.*
 from .models import (
     HAICandidate,
     HAIType,
@@ -24,8 +25,61 @@ from .models import (
     LLMAuditEntry,
 )
 
+from common.db import Migration, add_column, ensure_schema, get_connection
+
 logger = logging.getLogger(__name__)
 
+SCHEMA_PATH = Path(__file__).parent.parent / "schema.sql"
+
+# Reporting cube tables and the columns written to them, per cube
+# (see nhsn_src.data.cube)
+CUBE_TABLES = {
+    "au": {
+        "au_cube_dot": (
+            "month", "location_code", "nhsn_code", "nhsn_category", "medication_name",
+            "route", "days_of_therapy",
+        ),
+        "au_cube_ddd": (
+            "month", "location_code", "nhsn_code", "nhsn_category", "medication_name",
+            "ddd_standard", "ddd_unit", "total_grams", "defined_daily_doses",
+        ),
+    },
+    "ar": {
+        "ar_cube_organisms": (
+            "month", "quarter", "scope", "location_code", "organism_name",
+            "cultures", "first_isolates",
+        ),
+        "ar_cube_resistance": (
+            "month", "quarter", "scope", "location_code", "organism_name", "antibiotic",
+            "total_isolates", "resistant_isolates", "intermediate_isolates",
+            "susceptible_isolates",
+        ),
+        "ar_cube_phenotypes": (
+            "month", "quarter", "scope", "location_code", "phenotype_code", "phenotype_name",
+            "rule_order", "eligible_isolates", "phenotype_isolates",
+        ),
+    },
+    "denominators": {
+        "denominators_monthly": (
+            "id", "month", "location_code", "patient_days", "central_line_days",
+            "urinary_catheter_days", "ventilator_days", "central_line_utilization",
+            "urinary_catheter_utilization", "ventilator_utilization",
+        ),
+    },
+}
+
+
+def _add_nhsn_reported_columns(conn: sqlite3.Connection) -> None:
+    # No-op on a fresh NHSN database; hai_candidates is hai-detection's table
+    add_column("hai_candidates", "nhsn_reported", "INTEGER DEFAULT 0")(conn)
+    add_column("hai_candidates", "nhsn_reported_at", "TEXT")(conn)
+
+
+# Schema changes for existing databases (see common.db.schema)
+MIGRATIONS = [
+    Migration(1, "Track NHSN submission of candidates", _add_nhsn_reported_columns),
+]
+
 
 class NHSNDatabase:
     """SQLite database for NHSN candidate and classification storage."""
@@ -36,19 +90,12 @@ class NHSNDatabase:
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize the database schema."""
-        schema_path = Path(__file__).parent.parent / "schema.sql"
-        with open(schema_path) as f:
-            schema = f.read()
-
-        with self._get_connection() as conn:
-            conn.executescript(schema)
+        """Initialize the database schema (once per process per database)."""
+        ensure_schema(self.db_path, "nhsn", schema_path=SCHEMA_PATH, migrations=MIGRATIONS)
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's shared WAL connection (see common.db)."""
+        return get_connection(self.db_path)
 
     # --- Candidate Operations ---
 
@@ -1041,19 +1088,7 @@ class NHSNDatabase:
 
         now = datetime.now().isoformat()
         with self._get_connection() as conn:
-            # Update the nhsn_reported flag (we need to add this column if it doesn't exist)
-            # First check if column exists
-            cursor = conn.execute("PRAGMA table_info(hai_candidates)")
-            columns = [row[1] for row in cursor.fetchall()]
-
-            if "nhsn_reported" not in columns:
-                conn.execute(
-                    "ALTER TABLE hai_candidates ADD COLUMN nhsn_reported INTEGER DEFAULT 0"
-                )
-                conn.execute(
-                    "ALTER TABLE hai_candidates ADD COLUMN nhsn_reported_at TEXT"
-                )
-
+            # nhsn_reported columns come from migration 1
             placeholders = ",".join(["?" for _ in candidate_ids])
             conn.execute(
                 f"""
@@ -1218,3 +1253,124 @@ class NHSNDatabase:
                 })
 
             return result
+
+    # --- Reporting Cube ---
+
+    def save_cube_months(
+        self,
+        cube: str,
+        months: list[str],
+        rows: dict[str, list[dict[str, Any]]],
+        closed: set[str] | None = None,
+    ) -> None:
+        """Replace a cube's rows for some months in one transaction.
+
+        Args:
+            cube: Cube name (a key of CUBE_TABLES).
+            months: Months (YYYY-MM) being written; their existing rows are
+                deleted even if no new rows are given for them.
+            rows: New rows per cube table, as dicts keyed by column name.
+            closed: Months to record as closed (frozen).
+        """
+        closed = closed or set()
+        computed_at = datetime.now().isoformat(timespec="seconds")
+        placeholders = ", ".join("?" for _ in months)
+
+        with self._get_connection() as conn:
+            for table, columns in CUBE_TABLES[cube].items():
+                conn.execute(f"DELETE FROM {table} WHERE month IN ({placeholders})", months)
+                table_rows = rows.get(table, [])
+                if table_rows:
+                    conn.executemany(
+                        f"INSERT INTO {table} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join('?' for _ in columns)})",
+                        [tuple(row.get(column) for column in columns) for row in table_rows],
+                    )
+            conn.executemany(
+                """
+                INSERT INTO reporting_cube_months (cube, month, closed, computed_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(cube, month) DO UPDATE SET
+                    closed = excluded.closed,
+                    computed_at = excluded.computed_at
+                """,
+                [(cube, month, int(month in closed), computed_at) for month in months],
+            )
+            conn.commit()
+
+    def get_cube_rows(
+        self,
+        table: str,
+        start_month: str,
+        end_month: str,
+        locations: list[str] | None = None,
+        scope: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get a cube table's rows for a range of months.
+
+        Args:
+            table: Cube table name.
+            start_month: First month (YYYY-MM), inclusive.
+            end_month: Last month (YYYY-MM), inclusive.
+            locations: NHSN location codes to include (all if None).
+            scope: AR first-isolate scope ('facility' or 'location').
+
+        Returns:
+            Rows as dicts, by month in the order they were saved
+        """
+        if not any(table in tables for tables in CUBE_TABLES.values()):
+            raise ValueError(f"Unknown cube table {table!r}")
+
+        sql = f"SELECT * FROM {table} WHERE month >= ? AND month <= ?"
+        params: list[Any] = [start_month, end_month]
+        if locations:
+            sql += f" AND location_code IN ({', '.join('?' for _ in locations)})"
+            params.extend(locations)
+        if scope:
+            sql += " AND scope = ?"
+            params.append(scope)
+        # Rows were written in the order their frames were computed in
+        sql += " ORDER BY month, rowid"
+
+        with self._get_connection() as conn:
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    def get_cube_months(self, cube: str) -> dict[str, dict[str, Any]]:
+        """Get the computed months of a cube.
+
+        Returns:
+            Dict of month (YYYY-MM) to {"closed": bool, "computed_at": datetime}
+        """
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT month, closed, computed_at FROM reporting_cube_months WHERE cube = ?",
+                (cube,),
+            ).fetchall()
+        return {
+            row["month"]: {
+                "closed": bool(row["closed"]),
+                "computed_at": datetime.fromisoformat(row["computed_at"]),
+            }
+            for row in rows
+        }
+
+    def reopen_cube_months(self, cube: str, months: list[str] | None = None) -> int:
+        """Forget when cube months were computed so they are rebuilt.
+
+        Args:
+            cube: Cube name.
+            months: Months to reopen (all of the cube's months if None).
+
+        Returns:
+            Number of months reopened
+        """
+        sql = "DELETE FROM reporting_cube_months WHERE cube = ?"
+        params: list[Any] = [cube]
+        if months is not None:
+            sql += f" AND month IN ({', '.join('?' for _ in months)})"
+            params.extend(months)
+
+        with self._get_connection() as conn:
+            cursor = conn.execute(sql, params)
+            conn.commit()
+            return cursor.rowcount
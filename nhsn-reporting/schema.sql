@@ -228,6 +228,98 @@ CREATE INDEX IF NOT EXISTS idx_ar_phenotype_summary ON ar_phenotype_summary(summ
 CREATE INDEX IF NOT EXISTS idx_ar_phenotype_organism ON ar_phenotype_summary(organism_code);
 CREATE INDEX IF NOT EXISTS idx_ar_phenotype_type ON ar_phenotype_summary(phenotype);
 
+-- ============================================================
+-- Dashboard Reporting Cube (see nhsn_src.data.cube)
+-- ============================================================
+-- Monthly AU/AR aggregates by location, computed from Clarity. Closed
+-- months are frozen once computed; open months are refreshed. Patient and
+-- device days are stored in denominators_monthly.
+
+-- Days of therapy by location, month, antimicrobial and route
+CREATE TABLE IF NOT EXISTS au_cube_dot (
+    month TEXT NOT NULL,  -- YYYY-MM format
+    location_code TEXT,
+    nhsn_code TEXT,
+    nhsn_category TEXT,
+    medication_name TEXT,
+    route TEXT,
+    days_of_therapy INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_au_cube_dot_month ON au_cube_dot(month, location_code);
+
+-- Grams and defined daily doses by location, month and antimicrobial
+CREATE TABLE IF NOT EXISTS au_cube_ddd (
+    month TEXT NOT NULL,
+    location_code TEXT,
+    nhsn_code TEXT,
+    nhsn_category TEXT,
+    medication_name TEXT,
+    ddd_standard REAL,
+    ddd_unit TEXT,
+    total_grams REAL,
+    defined_daily_doses REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_au_cube_ddd_month ON au_cube_ddd(month, location_code);
+
+-- AR rows are kept for two first-isolate scopes: 'facility' deduplicates
+-- across all locations, 'location' within each location (as when the AR
+-- report is filtered to one location)
+
+-- Positive cultures and first isolates by location, month and organism
+CREATE TABLE IF NOT EXISTS ar_cube_organisms (
+    month TEXT NOT NULL,
+    quarter TEXT NOT NULL,  -- YYYY-Q# format
+    scope TEXT NOT NULL,  -- facility, location
+    location_code TEXT,
+    organism_name TEXT,
+    cultures INTEGER NOT NULL,
+    first_isolates INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ar_cube_organisms_month ON ar_cube_organisms(scope, month, location_code);
+
+-- Susceptibility results of first isolates by organism and antibiotic
+CREATE TABLE IF NOT EXISTS ar_cube_resistance (
+    month TEXT NOT NULL,
+    quarter TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    location_code TEXT NOT NULL,
+    organism_name TEXT NOT NULL,
+    antibiotic TEXT NOT NULL,
+    total_isolates INTEGER NOT NULL,
+    resistant_isolates INTEGER NOT NULL,
+    intermediate_isolates INTEGER NOT NULL,
+    susceptible_isolates INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ar_cube_resistance_month ON ar_cube_resistance(scope, month, location_code);
+
+-- Resistance phenotype counts (MRSA, VRE, CRE, ...) of first isolates
+CREATE TABLE IF NOT EXISTS ar_cube_phenotypes (
+    month TEXT NOT NULL,
+    quarter TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    location_code TEXT NOT NULL,
+    phenotype_code TEXT NOT NULL,
+    phenotype_name TEXT,
+    rule_order INTEGER NOT NULL,  -- Position in NHSN_PHENOTYPE_MAP
+    eligible_isolates INTEGER NOT NULL,
+    phenotype_isolates INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ar_cube_phenotypes_month ON ar_cube_phenotypes(scope, month, location_code);
+
+-- When each cube month was computed, and whether it is frozen
+CREATE TABLE IF NOT EXISTS reporting_cube_months (
+    cube TEXT NOT NULL,  -- au, ar, denominators
+    month TEXT NOT NULL,
+    closed INTEGER DEFAULT 0,  -- 1 = month closed and frozen
+    computed_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (cube, month)
+);
+
 -- ============================================================
 -- AU/AR Reporting Views
 -- ============================================================
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark AR phenotype calculation on synthetic isolates.
+
+Compares the per-isolate loop calculate_phenotypes used to run (filtering
+the susceptibility table for every isolate, phenotype and condition) with
+the compiled, vectorized engine in nhsn_src.data.phenotypes, checks that
+both produce the same table, and reports isolates/second.
+
+Usage:
+    python scripts/benchmark_ar_phenotypes.py
+    python scripts/benchmark_ar_phenotypes.py --isolates 2000,20000 --skip-legacy-above 5000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nhsn_src.data.ar_extractor import ARDataExtractor
+from nhsn_src.data.phenotypes import compile_phenotypes, phenotype_prevalence
+
+# As seeded in mock_clarity/schema.sql
+PHENOTYPES = pd.DataFrame(
+    [
+        ("MRSA", "Methicillin-resistant Staphylococcus aureus", "Staphylococcus aureus", "OXA:R"),
+        ("VRE", "Vancomycin-resistant Enterococcus", "Enterococcus%", "VAN:R"),
+        ("ESBL", "Extended-spectrum beta-lactamase", "Escherichia coli|Klebsiella%", "CTX:R,CAZ:R,FEP:S"),
+        ("CRE", "Carbapenem-resistant Enterobacterales", "%", "MEM:R|ETP:R"),
+        ("CRPA", "Carbapenem-resistant Pseudomonas aeruginosa", "Pseudomonas aeruginosa", "MEM:R|IPM:R"),
+        ("CRAB", "Carbapenem-resistant Acinetobacter baumannii", "Acinetobacter baumannii", "MEM:R|IPM:R"),
+    ],
+    columns=["phenotype_code", "phenotype_name", "organism_pattern", "resistance_pattern"],
+)
+
+ORGANISMS = [
+    "Staphylococcus aureus", "Enterococcus faecium", "Enterococcus faecalis",
+    "Escherichia coli", "Klebsiella pneumoniae", "Pseudomonas aeruginosa",
+    "Acinetobacter baumannii", "Enterobacter cloacae",
+]
+ANTIBIOTICS = ["OXA", "VAN", "CTX", "CAZ", "FEP", "MEM", "ETP", "IPM", "CIP", "GEN", "SXT", "TZP"]
+
+
+def synthetic(count: int, locations: int = 40) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """First isolates and their susceptibilities."""
+    rng = random.Random(11)
+    isolates = pd.DataFrame({
+        "isolate_id": range(count),
+        "nhsn_location_code": [f"LOC{rng.randrange(locations):02d}" for _ in range(count)],
+        "organism_name": [rng.choice(ORGANISMS) for _ in range(count)],
+    })
+    rows = []
+    for isolate_id in range(count):
+        if rng.random() < 0.05:
+            continue  # No susceptibilities reported
+        for abx in rng.sample(ANTIBIOTICS, rng.randrange(4, len(ANTIBIOTICS))):
+            rows.append((isolate_id, abx, abx, rng.choices("SIR", weights=(70, 5, 25))[0]))
+    suscept = pd.DataFrame(rows, columns=["isolate_id", "antibiotic", "antibiotic_code", "interpretation"])
+    return isolates, suscept
+
+
+def legacy(extractor: ARDataExtractor, isolates, suscept_df, phenotypes, quarter_str) -> pd.DataFrame:
+    """calculate_phenotypes' original nested loops."""
+    results = []
+    for loc in isolates["nhsn_location_code"].unique():
+        loc_isolates = isolates[isolates["nhsn_location_code"] == loc]
+        for _, pheno in phenotypes.iterrows():
+            phenotype_matches = 0
+            eligible_isolates = 0
+            for _, isolate in loc_isolates.iterrows():
+                iso_suscept = suscept_df[suscept_df["isolate_id"] == isolate["isolate_id"]]
+                org_pattern = pheno["organism_pattern"] or ""
+                if org_pattern:
+                    regex_pattern = org_pattern.replace("%", ".*")
+                    if not re.search(regex_pattern, isolate["organism_name"], re.IGNORECASE):
+                        continue
+                eligible_isolates += 1
+                if extractor._check_phenotype_match(
+                    isolate["organism_name"],
+                    iso_suscept,
+                    pheno["organism_pattern"] or "",
+                    pheno["resistance_pattern"] or "",
+                ):
+                    phenotype_matches += 1
+            if eligible_isolates > 0:
+                results.append({
+                    "nhsn_location_code": loc,
+                    "quarter": quarter_str,
+                    "phenotype_code": pheno["phenotype_code"],
+                    "phenotype_name": pheno["phenotype_name"],
+                    "eligible_isolates": eligible_isolates,
+                    "phenotype_isolates": phenotype_matches,
+                    "percent_positive": round(phenotype_matches / eligible_isolates * 100, 1),
+                })
+    return pd.DataFrame(results)
+
+
+def timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AR phenotype calculation")
+    parser.add_argument("--isolates", default="1000,5000,50000", help="Comma-separated isolate counts")
+    parser.add_argument("--skip-legacy-above", type=int, default=5000,
+                        help="Don't time the legacy loop for larger counts (it takes minutes)")
+    args = parser.parse_args()
+
+    extractor = ARDataExtractor("sqlite:///:memory:")
+    print(f"{'isolates':>9} {'legacy iso/s':>13} {'engine iso/s':>13} {'speedup':>8}  identical")
+    for count in (int(c) for c in args.isolates.split(",")):
+        isolates, suscept = synthetic(count)
+        engine_s, engine_df = timed(
+            lambda: phenotype_prevalence(isolates, suscept, compile_phenotypes(PHENOTYPES), "2026-Q1")
+        )
+
+        if count > args.skip_legacy_above:
+            print(f"{count:>9} {'-':>13} {count / engine_s:>13,.0f} {'-':>8}  -")
+            continue
+
+        legacy_s, legacy_df = timed(lambda: legacy(extractor, isolates, suscept, PHENOTYPES, "2026-Q1"))
+        identical = legacy_df.equals(engine_df)
+        print(
+            f"{count:>9} {count / legacy_s:>13,.0f} {count / engine_s:>13,.0f} "
+            f"{legacy_s / engine_s:>7.0f}x  {identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark AU extraction backends on a month of mock Clarity MAR data.
+
+Times what the AU detail page needs (monthly summary, category rollup and
+patient-level administrations) with the "sql" backend, which runs the MAR
+join once per calculation, and with the "frame" backend, which extracts
+the month once and derives everything from that frame. Checks that both
+produce the same DOT, DDD and administration rows.
+
+Usage:
+    python scripts/benchmark_au.py
+    python scripts/benchmark_au.py --encounters 5000 --repeat 3
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mock_clarity.generate_data import MockClarityGenerator
+from nhsn_src.data.au_extractor import AUDataExtractor
+
+
+def build_mock_clarity(db_path: Path, encounters: int, base_time: datetime) -> None:
+    """Generate a month of encounters, all with antimicrobial administrations."""
+    random.seed(24)
+    generator = MockClarityGenerator(db_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.initialize_database()
+        generator.generate_providers()
+        generator.generate_random_patients(encounters, 1, base_time=base_time)
+        generator.generate_au_ar_data(
+            months=1, encounters_with_au=encounters, encounters_with_ar=0, base_time=base_time
+        )
+        generator.load_to_database()
+
+
+def timed(fn, repeat: int):
+    """Median milliseconds per call and the last result."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def same_frame(left: pd.DataFrame, right: pd.DataFrame) -> bool:
+    """Equal up to floating-point summation order."""
+    try:
+        pd.testing.assert_frame_equal(left, right, check_exact=False, rtol=1e-9)
+        return True
+    except AssertionError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AU extraction backends")
+    parser.add_argument("--encounters", type=int, default=1000, help="Encounters with AU data")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per backend")
+    args = parser.parse_args()
+
+    base_time = datetime(2026, 6, 30, 23, 0)
+    start_date, end_date = date(2026, 6, 1), date(2026, 6, 30)
+    period = (None, start_date, end_date)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "mock_clarity.db"
+        build_mock_clarity(db_path, args.encounters, base_time)
+        connection_string = f"sqlite:///{db_path}"
+        sql = AUDataExtractor(connection_string, backend="sql")
+        frame = AUDataExtractor(connection_string, backend="frame")
+
+        def sql_path():
+            return (
+                sql.get_monthly_summary(*period),
+                sql.get_usage_by_category(*period),
+                sql.get_antimicrobial_administrations(*period),
+            )
+
+        def frame_path():
+            admins = frame.load_administrations(*period)
+            return (
+                frame.get_monthly_summary(*period, administrations=admins),
+                frame.get_usage_by_category(administrations=admins),
+                frame.get_antimicrobial_administrations(administrations=admins),
+            )
+
+        sql_ms, sql_result = timed(sql_path, args.repeat)
+        frame_ms, frame_result = timed(frame_path, args.repeat)
+        sql_summary_ms, _ = timed(lambda: sql.get_monthly_summary(*period), args.repeat)
+        frame_summary_ms, _ = timed(lambda: frame.get_monthly_summary(*period), args.repeat)
+
+        admins = frame.load_administrations(*period)
+        checks = {
+            "dot": same_frame(sql.calculate_dot(*period), frame.calculate_dot(administrations=admins)),
+            "ddd": same_frame(sql.calculate_ddd(*period), frame.calculate_ddd(administrations=admins)),
+            "administrations": sql_result[2].equals(frame_result[2]),
+            "summary": sql_result[0] == frame_result[0],
+            "categories": sql_result[1].equals(frame_result[1]),
+        }
+
+    print(f"{len(admins)} administrations in {start_date:%Y-%m}\n")
+    print(f"{'work':<34} {'sql ms':>8} {'frame ms':>9} {'speedup':>8}")
+    print(f"{'monthly summary':<34} {sql_summary_ms:>8.1f} {frame_summary_ms:>9.1f} "
+          f"{sql_summary_ms / frame_summary_ms:>7.1f}x")
+    print(f"{'summary + categories + patient rows':<34} {sql_ms:>8.1f} {frame_ms:>9.1f} "
+          f"{sql_ms / frame_ms:>7.1f}x")
+    print("\nidentical: " + ", ".join(f"{name}={ok}" for name, ok in checks.items()))
+
+
+if __name__ == "__main__":
+    main()
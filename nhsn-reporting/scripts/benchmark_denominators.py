@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark DenominatorCalculator backends on a scaled mock Clarity DB.
+
+Builds a mock Clarity database with the generator's defaults (50 patients
+over 3 months) multiplied by --scale, then times each denominator method
+with the "sql" backend (recursive CTE day expansion for patient days) and
+the "interval" backend (NumPy interval arithmetic), checking that both
+return identical frames.
+
+Usage:
+    python scripts/benchmark_denominators.py
+    python scripts/benchmark_denominators.py --scale 40 --months 12 --repeat 3
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mock_clarity.generate_data import MockClarityGenerator
+from nhsn_src.data.denominator import DenominatorCalculator
+
+METHODS = [
+    "get_patient_days",
+    "get_central_line_days",
+    "get_urinary_catheter_days",
+    "get_ventilator_days",
+]
+
+
+def build_mock_clarity(db_path: Path, patients: int, months: int, base_time: datetime) -> None:
+    """Generate and load random patients (generator output silenced)."""
+    random.seed(22)
+    generator = MockClarityGenerator(db_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.initialize_database()
+        generator.generate_providers()
+        generator.generate_random_patients(patients, months, base_time=base_time)
+        generator.load_to_database()
+
+
+def timed(fn, repeat: int):
+    """Median milliseconds per call and the last result."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark denominator backends")
+    parser.add_argument("--scale", type=int, default=10, help="Multiple of the generator's 50 patients")
+    parser.add_argument("--months", type=int, default=3, help="Months of generated admissions")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per method and backend")
+    args = parser.parse_args()
+
+    base_time = datetime(2026, 6, 15, 9, 30)
+    start_date = (base_time - timedelta(days=args.months * 30)).date()
+    end_date = base_time.date()
+    patients = 50 * args.scale
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "mock_clarity.db"
+        build_mock_clarity(db_path, patients, args.months, base_time)
+        connection_string = f"sqlite:///{db_path}"
+        sql = DenominatorCalculator(connection_string, backend="sql")
+        interval = DenominatorCalculator(connection_string, backend="interval")
+
+        print(f"{patients} patients, {start_date} to {end_date}\n")
+        print(f"{'method':<26} {'sql ms':>8} {'interval ms':>12} {'speedup':>8}  identical")
+        for method in METHODS:
+            run = lambda calc: getattr(calc, method)(None, start_date, end_date)
+            sql_ms, sql_df = timed(lambda: run(sql), args.repeat)
+            interval_ms, interval_df = timed(lambda: run(interval), args.repeat)
+            print(
+                f"{method:<26} {sql_ms:>8.1f} {interval_ms:>12.1f} "
+                f"{sql_ms / interval_ms:>7.1f}x  {sql_df.equals(interval_df)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
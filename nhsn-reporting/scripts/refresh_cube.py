@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Refresh the NHSN dashboard reporting cube.
+
+Computes the cube months that are missing or still open (not yet
+NHSN_CUBE_CLOSE_DAYS past their end) so dashboard pages read precomputed
+aggregates. Run from cron, e.g. hourly:
+
+    python scripts/refresh_cube.py --from 2026-01
+
+Rebuild recomputes closed (frozen) months too, e.g. after a Clarity
+correction or a change to the NHSN mappings:
+
+    python scripts/refresh_cube.py --from 2026-01 --to 2026-03 --rebuild
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nhsn_src.config import Config
+from nhsn_src.data import ReportingCube
+from nhsn_src.data.cube import CUBES
+from nhsn_src.db import NHSNDatabase
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the NHSN reporting cube")
+    parser.add_argument("--from", dest="from_month", help="First month (YYYY-MM)")
+    parser.add_argument("--to", dest="to_month", help="Last month (YYYY-MM, default: current month)")
+    parser.add_argument(
+        "--cube", action="append", choices=CUBES, help="Cube to refresh (repeatable, default: all)"
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Recompute closed months too")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.rebuild and not args.from_month:
+        parser.error("--rebuild requires --from")
+
+    cube = ReportingCube(NHSNDatabase(Config.NHSN_DB_PATH))
+    cubes = tuple(args.cube or CUBES)
+    if args.rebuild:
+        computed = cube.rebuild(args.from_month, args.to_month, cubes)
+    else:
+        computed = cube.refresh(args.from_month, args.to_month, cubes)
+
+    for name, months in computed.items():
+        print(f"{name}: {', '.join(months) if months else 'up to date'}")
+
+
+if __name__ == "__main__":
+    main()
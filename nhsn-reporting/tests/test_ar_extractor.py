@@ -477,6 +477,59 @@ class TestARPhenotypeMatching:
         assert result is False
 
 
+class TestPhenotypeEngine:
+    """Tests for the vectorized phenotype engine."""
+
+    PHENOTYPES = pd.DataFrame({
+        "phenotype_code": ["MRSA", "ESBL", "CRE"],
+        "phenotype_name": ["MRSA", "ESBL", "CRE"],
+        "organism_pattern": ["Staphylococcus aureus", "Escherichia coli|Klebsiella%", None],
+        "resistance_pattern": ["OXA:R", "CTX:R,FEP:S", "MEM:R|ETP:R"],
+    })
+
+    def test_rule_parsing(self):
+        """Test patterns are parsed into organism regex and OR-of-AND clauses."""
+        from nhsn_src.data.phenotypes import compile_phenotypes
+
+        mrsa, esbl, cre = compile_phenotypes(self.PHENOTYPES)
+
+        assert mrsa.organism_regex.search("staphylococcus AUREUS")
+        assert esbl.clauses == ((("CTX", "R"), ("FEP", "S")),)
+        assert cre.organism_regex is None
+        assert cre.clauses == ((("MEM", "R"),), (("ETP", "R"),))
+
+    def test_prevalence_by_location(self):
+        """Test eligible and matching isolates are counted per location."""
+        from nhsn_src.data.phenotypes import compile_phenotypes, phenotype_prevalence
+
+        isolates = pd.DataFrame({
+            "isolate_id": [1, 2, 3, 4, 5],
+            "nhsn_location_code": ["ICU-A", "ICU-A", "WARD-B", "WARD-B", "WARD-B"],
+            "organism_name": [
+                "Staphylococcus aureus", "Klebsiella pneumoniae", "Escherichia coli",
+                "Escherichia coli", "Staphylococcus aureus",
+            ],
+        })
+        suscept = pd.DataFrame({
+            "isolate_id": [1, 2, 2, 2, 3, 3, 3],
+            "antibiotic_code": ["oxa", "CTX", "FEP", "MEM", "CTX", "FEP", "FEP"],
+            "interpretation": ["R", "R", "S", "S", "R", "R", "S"],
+        })
+        # Isolate 3: the first FEP result (R) is used, so not ESBL.
+        # Isolates 4 and 5 have no results, which counts as a match.
+
+        df = phenotype_prevalence(isolates, suscept, compile_phenotypes(self.PHENOTYPES), "2026-Q1")
+
+        by_key = {(r.nhsn_location_code, r.phenotype_code): r for r in df.itertuples()}
+        assert list(df["nhsn_location_code"].unique()) == ["ICU-A", "WARD-B"]
+        assert by_key[("ICU-A", "MRSA")].phenotype_isolates == 1
+        assert by_key[("ICU-A", "ESBL")].phenotype_isolates == 1
+        assert by_key[("WARD-B", "ESBL")].eligible_isolates == 2
+        assert by_key[("WARD-B", "ESBL")].phenotype_isolates == 1
+        assert by_key[("WARD-B", "CRE")].percent_positive == 66.7
+        assert ("ICU-A", "CRE") in by_key and by_key[("ICU-A", "CRE")].phenotype_isolates == 0
+
+
 class TestARDataExtractorEdgeCases:
     """Edge case tests for AR extractor."""
 
@@ -309,6 +309,48 @@ class TestAUDataExtractor:
         glyco = df[df["nhsn_category"] == "Glycopeptides"]
         assert len(glyco) > 0
 
+    def test_frame_backend_matches_sql(self, temp_db):
+        """Test the frame backend derives the SQL path's results from one extraction."""
+        from nhsn_src.data.au_extractor import AUDataExtractor
+
+        sql = AUDataExtractor(f"sqlite:///{temp_db}", backend="sql")
+        frame = AUDataExtractor(f"sqlite:///{temp_db}", backend="frame")
+        args = (None, date(2026, 1, 1), date(2026, 1, 31))
+        admins = frame.load_administrations(*args)
+
+        assert len(admins) == 9
+        pd.testing.assert_frame_equal(
+            frame.calculate_dot(administrations=admins), sql.calculate_dot(*args)
+        )
+        pd.testing.assert_frame_equal(
+            frame.calculate_ddd(administrations=admins), sql.calculate_ddd(*args)
+        )
+        pd.testing.assert_frame_equal(
+            frame.get_antimicrobial_administrations(administrations=admins),
+            sql.get_antimicrobial_administrations(*args),
+        )
+        assert frame.get_monthly_summary(*args, administrations=admins) == sql.get_monthly_summary(*args)
+
+    def test_load_administrations_converts_doses(self, extractor):
+        """Test the compact frame carries categorical strings and grams."""
+        admins = extractor.load_administrations(
+            locations=["WARD-B"],
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 1, 31),
+        )
+
+        assert list(admins["nhsn_code"].unique()) == ["CRO"]
+        assert isinstance(admins["nhsn_location_code"].dtype, pd.CategoricalDtype)
+        assert list(admins["month"].astype(str).unique()) == ["2026-01"]
+        assert admins["dose_grams"].sum() == pytest.approx(4.0)
+
+    def test_unknown_backend_rejected(self, temp_db):
+        """Test an unknown backend name raises."""
+        from nhsn_src.data.au_extractor import AUDataExtractor
+
+        with pytest.raises(ValueError):
+            AUDataExtractor(f"sqlite:///{temp_db}", backend="cube")
+
 
 class TestAUDataExtractorEdgeCases:
     """Edge case tests for AU extractor."""
@@ -0,0 +1,237 @@
+"""Tests for denominator (patient-day and device-day) calculation."""
+
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from mock_clarity import get_schema_sql
+
+
+METHODS = [
+    "get_patient_days",
+    "get_central_line_days",
+    "get_urinary_catheter_days",
+    "get_ventilator_days",
+]
+
+
+class TestIntervalBackend:
+    """Tests that the interval backend matches the SQL path."""
+
+    @pytest.fixture
+    def edge_case_db(self):
+        """Stays and flowsheets around the edges of Jan-Feb 2026."""
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+        conn = sqlite3.connect(db_path)
+        conn.executescript(get_schema_sql())
+        conn.executemany(
+            "INSERT INTO PAT_ENC (PAT_ENC_CSN_ID, PAT_ID, INPATIENT_DATA_ID, HOSP_ADMIT_DTTM, "
+            "HOSP_DISCH_DTTM, DEPARTMENT_ID) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                # Crosses the month boundary: Jan 30, 31 | Feb 1, 2
+                (1, 1, 1, "2026-01-30 08:00:00", "2026-02-02 12:00:00", 100),
+                # Admitted before the range, still admitted: clipped to Jan 10 - Feb 15
+                (2, 2, 2, "2025-12-20 10:00:00", None, 101),
+                # Admitted and discharged the same day
+                (3, 3, 3, "2026-01-15 09:00:00", "2026-01-15 17:00:00", 100),
+                # Unmapped department
+                (4, 4, 4, "2026-01-12 09:00:00", "2026-01-20 09:00:00", 999),
+                # Discharged before the range
+                (5, 5, 5, "2025-12-01 09:00:00", "2026-01-05 09:00:00", 100),
+            ],
+        )
+        conn.execute("INSERT INTO IP_FLWSHT_REC (FSD_ID, INPATIENT_DATA_ID) VALUES (10, 1)")
+        conn.executemany(
+            "INSERT INTO IP_FLWSHT_MEAS (FLO_MEAS_ID, FSD_ID, RECORDED_TIME, MEAS_VALUE) "
+            "VALUES (?, 10, ?, ?)",
+            [
+                # Two central line rows on Jan 31 are one line day
+                (1001, "2026-01-31 08:00:00", "PICC"),
+                (1002, "2026-01-31 20:00:00", "Right arm"),
+                (1001, "2026-02-01 08:00:00", "PICC"),
+                (1001, "2026-02-02 08:00:00", "removed"),
+                (2101, "2026-01-31 08:00:00", "Foley"),
+                (3102, "2026-02-01 08:00:00", "Yes"),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        yield f"sqlite:///{db_path}"
+
+        os.unlink(db_path)
+
+    @pytest.fixture
+    def mock_clarity_db(self):
+        """Random patients from the mock Clarity generator."""
+        from mock_clarity.generate_data import MockClarityGenerator
+
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+        random.seed(42)
+        generator = MockClarityGenerator(db_path)
+        generator.initialize_database()
+        generator.generate_providers()
+        generator.generate_random_patients(80, 4, base_time=datetime(2026, 5, 15, 9, 30))
+        generator.load_to_database()
+
+        yield f"sqlite:///{db_path}"
+
+        os.unlink(db_path)
+
+    def test_unknown_backend_rejected(self):
+        """Test an unknown backend name raises."""
+        from nhsn_src.data.denominator import DenominatorCalculator
+
+        with pytest.raises(ValueError):
+            DenominatorCalculator("sqlite:///:memory:", backend="cube")
+
+    def test_patient_days_split_at_month_boundaries(self, edge_case_db):
+        """Test stays are clipped to the range and split by calendar month."""
+        from nhsn_src.data.denominator import DenominatorCalculator
+
+        calc = DenominatorCalculator(edge_case_db, backend="interval")
+        df = calc.get_patient_days(start_date=date(2026, 1, 10), end_date=date(2026, 2, 15))
+
+        rows = {(r.nhsn_location_code, r.month): r.patient_days for r in df.itertuples()}
+        assert rows == {
+            ("T5A", "2026-01"): 3,   # Jan 30, 31 + same-day stay
+            ("T5B", "2026-01"): 22,  # Jan 10 - 31
+            ("T5A", "2026-02"): 2,   # Feb 1, 2
+            ("T5B", "2026-02"): 15,  # Feb 1 - 15
+        }
+        assert list(df["month"]) == sorted(df["month"])
+
+    def test_device_days_count_distinct_patient_days(self, edge_case_db):
+        """Test several rows on one day count once and removals don't count."""
+        from nhsn_src.data.denominator import DenominatorCalculator
+
+        calc = DenominatorCalculator(edge_case_db, backend="interval")
+        kwargs = {"start_date": date(2026, 1, 1), "end_date": date(2026, 3, 1)}
+
+        line_days = calc.get_central_line_days(**kwargs)
+        assert list(line_days.itertuples(index=False, name=None)) == [
+            ("T5A", "2026-01", 1),
+            ("T5A", "2026-02", 1),
+        ]
+        assert calc.get_urinary_catheter_days(**kwargs)["urinary_catheter_days"].sum() == 1
+        assert calc.get_ventilator_days(**kwargs)["ventilator_days"].sum() == 1
+
+    def test_edge_cases_match_sql(self, edge_case_db):
+        """Test both backends agree on the hand-built edge cases."""
+        from nhsn_src.data.denominator import DenominatorCalculator
+
+        sql = DenominatorCalculator(edge_case_db, backend="sql")
+        interval = DenominatorCalculator(edge_case_db, backend="interval")
+        for method in METHODS:
+            args = (None, date(2026, 1, 10), date(2026, 2, 15))
+            pd.testing.assert_frame_equal(
+                getattr(interval, method)(*args), getattr(sql, method)(*args), obj=method
+            )
+
+    @pytest.mark.parametrize("locations,start,end", [
+        (None, date(2026, 1, 17), date(2026, 5, 10)),
+        (["T5A", "G5S"], date(2026, 2, 1), date(2026, 3, 31)),
+    ])
+    def test_mock_clarity_matches_sql(self, mock_clarity_db, locations, start, end):
+        """Test both backends agree on generated mock Clarity data."""
+        from nhsn_src.data.denominator import DenominatorCalculator
+
+        sql = DenominatorCalculator(mock_clarity_db, backend="sql")
+        interval = DenominatorCalculator(mock_clarity_db, backend="interval")
+        for method in METHODS:
+            expected = getattr(sql, method)(locations, start, end)
+            assert not expected.empty
+            pd.testing.assert_frame_equal(
+                getattr(interval, method)(locations, start, end), expected, obj=method
+            )
+
+
+class TestDenominatorSummary:
+    """Tests for the single-scan device days and denominator summary."""
+
+    @pytest.fixture
+    def mock_clarity_db(self):
+        """Random patients from the mock Clarity generator."""
+        from mock_clarity.generate_data import MockClarityGenerator
+
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+        random.seed(7)
+        generator = MockClarityGenerator(db_path)
+        generator.initialize_database()
+        generator.generate_providers()
+        generator.generate_random_patients(60, 3, base_time=datetime(2026, 5, 15, 9, 30))
+        generator.load_to_database()
+
+        yield f"sqlite:///{db_path}"
+
+        os.unlink(db_path)
+
+    @pytest.mark.parametrize("backend", ["sql", "interval"])
+    def test_device_days_match_single_device_queries(self, mock_clarity_db, backend):
+        """Test one scan gives each device's figures from its own query."""
+        from nhsn_src.data.denominator import DEVICE_DAY_COLUMNS, DenominatorCalculator
+
+        calc = DenominatorCalculator(mock_clarity_db, backend=backend)
+        args = (None, date(2026, 3, 1), date(2026, 5, 1))
+        combined = calc.get_device_days(*args)
+
+        assert list(combined.columns) == ["nhsn_location_code", "month", *DEVICE_DAY_COLUMNS]
+        for column in DEVICE_DAY_COLUMNS:
+            single = calc.get_device_days(*args, devices=[column])
+            nonzero = combined[combined[column] > 0][["nhsn_location_code", "month", column]]
+            pd.testing.assert_frame_equal(nonzero.reset_index(drop=True), single, obj=column)
+
+    def test_summary_reads_item_map_once(self, mock_clarity_db):
+        """Test the summary's totals and that flowsheet items are cached."""
+        from nhsn_src.data.denominator import DenominatorCalculator
+
+        calc = DenominatorCalculator(mock_clarity_db)
+        args = (None, date(2026, 3, 1), date(2026, 5, 1))
+        summary = calc.get_denominator_summary(*args)
+
+        items = calc._device_items
+        assert items["central_line_days"] == (1001, 1002, 1003, 1004, 1005, 1006)
+        totals = {
+            "patient_days": int(calc.get_patient_days(*args)["patient_days"].sum()),
+            "central_line_days": int(calc.get_central_line_days(*args)["central_line_days"].sum()),
+        }
+        assert calc._device_items is items
+        assert sum(loc["totals"]["patient_days"] for loc in summary["locations"]) == totals["patient_days"]
+        assert (
+            sum(loc["totals"]["central_line_days"] for loc in summary["locations"])
+            == totals["central_line_days"]
+        )
+        assert calc.get_denominator_summary(*args) == summary
+
+    def test_summary_creates_one_engine(self, mock_clarity_db, monkeypatch):
+        """Test the summary's two query threads share one lazily created engine."""
+        import time
+
+        import sqlalchemy
+
+        from nhsn_src.data.denominator import DenominatorCalculator
+
+        engines = []
+        create_engine = sqlalchemy.create_engine
+
+        def slow_create_engine(*args, **kwargs):
+            time.sleep(0.05)  # Widen the window for both threads to create one
+            engines.append(create_engine(*args, **kwargs))
+            return engines[-1]
+
+        monkeypatch.setattr(sqlalchemy, "create_engine", slow_create_engine)
+        calc = DenominatorCalculator(mock_clarity_db)
+        calc.get_denominator_summary(None, date(2026, 3, 1), date(2026, 5, 1))
+
+        assert len(engines) == 1
@@ -0,0 +1,239 @@
+"""Tests for the persisted monthly reporting cube."""
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope="module")
+def clarity_db():
+    """Mock Clarity AU, AR and device data for Feb-Jun 2026."""
+    from mock_clarity.generate_data import MockClarityGenerator
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+
+    random.seed(25)
+    base_time = datetime(2026, 6, 20, 9, 30)
+    generator = MockClarityGenerator(db_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.initialize_database()
+        generator.generate_providers()
+        generator.generate_random_patients(200, 4, base_time=base_time)
+        generator.generate_au_ar_data(
+            months=4, encounters_with_au=80, encounters_with_ar=120, base_time=base_time
+        )
+        generator.load_to_database()
+
+    yield db_path
+
+    os.unlink(db_path)
+
+
+def make_cube(clarity_path):
+    """A cube over a fresh NHSN database, with its live extractors."""
+    from nhsn_src.data import ARDataExtractor, AUDataExtractor, DenominatorCalculator, ReportingCube
+    from nhsn_src.db import NHSNDatabase
+
+    connection_string = f"sqlite:///{clarity_path}"
+    au = AUDataExtractor(connection_string)
+    ar = ARDataExtractor(connection_string)
+    calc = DenominatorCalculator(connection_string)
+    nhsn_dir = tempfile.mkdtemp()
+    cube = ReportingCube(NHSNDatabase(os.path.join(nhsn_dir, "nhsn.db")), au, ar, calc)
+    return cube, au, ar, calc, nhsn_dir
+
+
+@pytest.fixture(scope="module")
+def refreshed_cube(clarity_db):
+    """A cube with Jan-Jun 2026 computed, and the live extractors."""
+    cube, au, ar, calc, nhsn_dir = make_cube(clarity_db)
+    cube.refresh("2026-01", "2026-06")
+    yield cube, au, ar, calc
+    shutil.rmtree(nhsn_dir)
+
+
+class TestCubeMatchesLive:
+    """Tests that cube reads give the live extractors' results."""
+
+    @pytest.mark.parametrize("locations", [None, ["T5A", "G5S"]])
+    def test_au(self, refreshed_cube, locations):
+        """Test AU summary, category rollup and export."""
+        cube, au, _, _ = refreshed_cube
+        args = (locations, date(2026, 3, 1), date(2026, 5, 31))
+
+        summary = cube.get_au_summary(*args)
+        assert summary["overall_totals"]["total_dot"] > 0
+        assert summary == au.get_monthly_summary(*args)
+        assert cube.get_au_summary(*args, include_oral=True) == au.get_monthly_summary(
+            *args, include_oral=True
+        )
+        pd.testing.assert_frame_equal(cube.get_usage_by_category(*args), au.get_usage_by_category(*args))
+        pd.testing.assert_frame_equal(cube.export_au_for_nhsn(*args), au.export_for_nhsn(*args))
+
+    @pytest.mark.parametrize("locations", [None, ["T5A", "G5S"]])
+    def test_denominators(self, refreshed_cube, locations):
+        """Test the denominator summary."""
+        cube, _, _, calc = refreshed_cube
+        args = (locations, date(2026, 2, 1), date(2026, 6, 30))
+
+        summary = cube.get_denominator_summary(*args)
+        assert summary["locations"]
+        assert summary == calc.get_denominator_summary(*args)
+
+    @pytest.mark.parametrize("locations", [None, ["T5A"]])
+    @pytest.mark.parametrize("quarter", [1, 2])
+    def test_ar(self, refreshed_cube, locations, quarter):
+        """Test resistance rates, phenotypes and the quarterly summary."""
+        cube, _, ar, _ = refreshed_cube
+        args = (locations, 2026, quarter)
+
+        pd.testing.assert_frame_equal(
+            cube.get_resistance_rates(*args), ar.calculate_resistance_rates(*args)
+        )
+        # The cube lists phenotype locations by code
+        phenotypes = ar.calculate_phenotypes(*args)
+        phenotypes = phenotypes.sort_values("nhsn_location_code", kind="stable", ignore_index=True)
+        pd.testing.assert_frame_equal(cube.get_phenotypes(*args), phenotypes)
+
+        # ...and organisms within a location by name
+        summary = ar.get_quarterly_summary(*args)
+        for loc in summary["locations"]:
+            loc["organisms"].sort(key=lambda org: org["organism_name"])
+        summary["phenotypes"] = phenotypes.to_dict("records")
+        result = cube.get_ar_summary(*args)
+        assert result["overall_totals"]["first_isolates"] > 0
+        assert result == summary
+
+    def test_partial_months_read_live(self, refreshed_cube):
+        """Test ranges starting or ending mid-month give the live results."""
+        cube, au, _, calc = refreshed_cube
+        args = (None, date(2026, 3, 10), date(2026, 5, 20))
+
+        summary = cube.get_au_summary(*args)
+        whole = cube.get_au_summary(None, date(2026, 3, 1), date(2026, 5, 31))
+        assert 0 < summary["overall_totals"]["total_dot"] < whole["overall_totals"]["total_dot"]
+        assert summary == au.get_monthly_summary(*args)
+        pd.testing.assert_frame_equal(cube.export_au_for_nhsn(*args), au.export_for_nhsn(*args))
+        assert cube.get_denominator_summary(*args) == calc.get_denominator_summary(*args)
+
+    def test_end_day_included(self, refreshed_cube):
+        """Test the live extractors count the last day of a range."""
+        _, au, _, calc = refreshed_cube
+
+        def total_dot(start, end):
+            return au.calculate_dot(None, start, end)["days_of_therapy"].sum()
+
+        def total_patient_days(start, end):
+            return calc.get_patient_days(None, start, end)["patient_days"].sum()
+
+        for total in (total_dot, total_patient_days):
+            last_day = total(date(2026, 5, 31), date(2026, 5, 31))
+            assert last_day > 0
+            assert total(date(2026, 5, 1), date(2026, 5, 31)) == (
+                total(date(2026, 5, 1), date(2026, 5, 30)) + last_day
+            )
+
+
+class TestCubeMonths:
+    """Tests for closing, refreshing and rebuilding cube months."""
+
+    @pytest.fixture
+    def clarity_copy(self, clarity_db):
+        """A copy of the mock Clarity database the test can change."""
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        shutil.copyfile(clarity_db, db_path)
+        yield db_path
+        os.unlink(db_path)
+
+    @pytest.fixture
+    def cube(self, clarity_copy):
+        cube, au, _, _, nhsn_dir = make_cube(clarity_copy)
+        yield cube, au
+        shutil.rmtree(nhsn_dir)
+
+    def test_is_closed(self, cube):
+        """Test a month closes close_days after it ends."""
+        cube, _ = cube
+        cube.close_days = 7
+        assert not cube.is_closed("2026-05", date(2026, 6, 7))
+        assert cube.is_closed("2026-05", date(2026, 6, 8))
+
+    def test_closed_months_frozen_until_rebuilt(self, cube, clarity_copy):
+        """Test closed months keep their figures when Clarity changes."""
+        cube, _ = cube
+        args = (None, date(2026, 4, 1), date(2026, 4, 30))
+        assert cube.refresh("2026-04", "2026-04", cubes=("au",)) == {"au": ["2026-04"]}
+        before = cube.get_au_summary(*args)
+
+        conn = sqlite3.connect(clarity_copy)
+        conn.execute("DELETE FROM MAR_ADMIN_INFO WHERE TAKEN_TIME LIKE '2026-04-1%'")
+        conn.commit()
+        conn.close()
+
+        assert cube.refresh("2026-04", "2026-04", cubes=("au",)) == {"au": []}
+        assert cube.get_au_summary(*args) == before
+
+        assert cube.rebuild("2026-04", "2026-04", cubes=("au",)) == {"au": ["2026-04"]}
+        after = cube.get_au_summary(*args)
+        assert after["overall_totals"]["total_dot"] < before["overall_totals"]["total_dot"]
+
+    @pytest.mark.parametrize("name", ["au", "ar", "denominators"])
+    def test_failed_query_not_saved(self, clarity_copy, name):
+        """Test a Clarity failure leaves months uncomputed rather than frozen empty."""
+        from sqlalchemy import create_engine
+
+        cube, au, ar, calc, nhsn_dir = make_cube(clarity_copy)
+        cube.close_days = 0
+        unreachable = create_engine(f"sqlite:///{os.path.join(nhsn_dir, 'missing', 'clarity.db')}")
+        for extractor in (au, ar, calc):
+            extractor._engine = unreachable
+
+        with pytest.raises(Exception):
+            cube.refresh("2026-04", "2026-04", cubes=(name,))
+        assert cube.db.get_cube_months(name) == {}
+
+        for extractor in (au, ar, calc):
+            extractor._engine = None
+        assert cube.refresh("2026-04", "2026-04", cubes=(name,)) == {name: ["2026-04"]}
+        assert cube.db.get_cube_months(name)["2026-04"]["closed"]
+        shutil.rmtree(nhsn_dir)
+
+    def test_open_months_refreshed(self, cube):
+        """Test open months are recomputed, on read only once stale."""
+        cube, _ = cube
+        cube.close_days = 100000
+
+        cube.get_denominator_summary(None, date(2026, 5, 1), date(2026, 6, 30))
+        freshness = cube.get_freshness("2026-05", "2026-06", cubes=("denominators",))
+        assert freshness["open_months"] == ["2026-05", "2026-06"]
+        assert freshness["frozen_months"] == 0
+        assert freshness["computed_at"] is not None
+
+        # Within max_age, reads use the stored months
+        assert cube.refresh("2026-05", "2026-06", cubes=("denominators",), max_age=cube.max_age) == {
+            "denominators": []
+        }
+        assert cube.refresh(
+            "2026-05", "2026-06", cubes=("denominators",), max_age=timedelta(0)
+        ) == {"denominators": ["2026-05", "2026-06"]}
+        assert cube.refresh("2026-06", "2026-06", cubes=("denominators",)) == {
+            "denominators": ["2026-06"]
+        }
+
+    def test_months_after_current_not_computed(self, cube):
+        """Test refresh stops at the current month."""
+        cube, _ = cube
+        today = date.today()
+        this_month = today.strftime("%Y-%m")
+        computed = cube.refresh(this_month, f"{today.year + 1}-12", cubes=("au",))
+        assert computed == {"au": [this_month]}
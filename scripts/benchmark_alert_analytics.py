@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark AlertStore.get_analytics over a year of synthetic alerts.
+
+Times three ways of producing the /asp-alerts/reports figures:
+
+1. legacy   - the separate per-figure queries get_analytics used to run
+2. single   - the current single grouped scan, with the cache bypassed
+3. cached   - get_analytics as the reports page calls it (cache warm)
+
+Usage:
+    python scripts/benchmark_alert_analytics.py
+    python scripts/benchmark_alert_analytics.py --per-day 500 --days 90
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.alert_store import AlertStore, AlertType
+from common.db import close_connections, get_connection
+
+# The queries get_analytics ran before computing everything in one scan
+LEGACY_QUERIES = [
+    "SELECT COUNT(*) FROM alerts WHERE created_at >= ?",
+    "SELECT date(created_at), COUNT(*) FROM alerts WHERE created_at >= ? GROUP BY date(created_at)",
+    "SELECT severity, COUNT(*) FROM alerts WHERE created_at >= ? GROUP BY severity",
+    "SELECT status, COUNT(*) FROM alerts WHERE created_at >= ? GROUP BY status",
+    """SELECT resolution_reason, COUNT(*) FROM alerts WHERE created_at >= ?
+       AND status = 'resolved' AND resolution_reason IS NOT NULL GROUP BY resolution_reason""",
+    """SELECT AVG(CAST((julianday(acknowledged_at) - julianday(created_at)) * 1440 AS INTEGER)),
+              AVG(CAST((julianday(resolved_at) - julianday(created_at)) * 1440 AS INTEGER)),
+              MIN(CAST((julianday(resolved_at) - julianday(created_at)) * 1440 AS INTEGER)),
+              MAX(CAST((julianday(resolved_at) - julianday(created_at)) * 1440 AS INTEGER))
+       FROM alerts WHERE created_at >= ? AND status = 'resolved' AND resolved_at IS NOT NULL""",
+    "SELECT strftime('%w', created_at), COUNT(*) FROM alerts WHERE created_at >= ? GROUP BY strftime('%w', created_at)",
+]
+
+
+def populate(store: AlertStore, per_day: int) -> int:
+    """Insert a year of alerts, most of them acknowledged and resolved."""
+    rng = random.Random(7)
+    types = [t.value for t in AlertType]
+    reasons = ["acknowledged", "messaged_team", "approved", "therapy_changed", "auto_accepted"]
+    now = datetime.now()
+
+    def rows():
+        for i in range(365 * per_day):
+            created = now - timedelta(minutes=rng.randrange(365 * 24 * 60))
+            resolved = rng.random() < 0.9
+            acknowledged = created + timedelta(minutes=rng.randrange(5, 240))
+            yield (
+                f"{i:08x}", rng.choice(types), f"source-{i}",
+                "resolved" if resolved else rng.choice(["pending", "sent", "acknowledged"]),
+                rng.choice(["critical", "warning", "info"]),
+                created.isoformat(),
+                acknowledged.isoformat() if resolved or rng.random() < 0.5 else None,
+                (acknowledged + timedelta(minutes=rng.randrange(5, 2880))).isoformat() if resolved else None,
+                rng.choice(reasons) if resolved else None,
+            )
+
+    conn = get_connection(store.db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO alerts (id, alert_type, source_id, status, severity, created_at, "
+            "acknowledged_at, resolved_at, resolution_reason) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows(),
+        )
+    conn.execute("ANALYZE")
+    return 365 * per_day
+
+
+def timed(fn, repeat: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark alert analytics")
+    parser.add_argument("--per-day", type=int, default=200, help="Synthetic alerts per day")
+    parser.add_argument("--days", type=int, default=30, help="Report period")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AlertStore(db_path=str(Path(tmp) / "alerts.db"))
+        total = populate(store, args.per_day)
+        conn = get_connection(store.db_path)
+        cutoff = (datetime.now() - timedelta(days=args.days)).isoformat()
+
+        def legacy():
+            for sql in LEGACY_QUERIES:
+                conn.execute(sql, (cutoff,)).fetchall()
+
+        results = {
+            "legacy": timed(legacy, args.repeat),
+            "single": timed(lambda: store._compute_analytics(None, args.days), args.repeat),
+            "cached": timed(lambda: store.get_analytics(days=args.days), args.repeat),
+        }
+        close_connections()
+
+    print(f"{total} alerts over a year, {args.days}-day report\n")
+    print(f"{'mode':<8} {'ms/report':>10}")
+    for mode, ms in results.items():
+        print(f"{mode:<8} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Benchmark alert list pages as the alerts table grows.
+
+For each table size, builds a synthetic alerts database and times the
+queries behind the dashboard's history page and the /api/alerts endpoint:
+
+- history      resolved ASP alerts, first page
+- history deep resolved ASP alerts, 50 pages in (keyset cursor)
+- offset deep  the same page reached with LIMIT/OFFSET, for comparison
+- by type      resolved alerts of one type (the history page's type filter)
+- patient      one patient's alerts
+- api          unfiltered first page
+- api deep     unfiltered, 50 pages in (keyset cursor)
+
+Each size is run twice: with the current composite indexes and with the
+single-column indexes the schema used to have (``legacy``). With the
+composite indexes, every keyset column should stay roughly flat as the
+table grows.
+
+Usage:
+    python scripts/benchmark_alert_pagination.py
+    python scripts/benchmark_alert_pagination.py --sizes 10000,100000,1000000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.alert_store import AlertStatus, AlertStore, AlertType
+from common.db import close_connections, get_connection
+
+PAGE_SIZE = 50
+DEEP_PAGES = 50
+
+ASP_TYPES = [
+    AlertType.BACTEREMIA, AlertType.DRUG_BUG_MISMATCH, AlertType.GUIDELINE_DEVIATION,
+    AlertType.ABX_NO_INDICATION, AlertType.BROAD_SPECTRUM_USAGE,
+    AlertType.SURGICAL_PROPHYLAXIS, AlertType.CUSTOM,
+]
+
+LEGACY_INDEXES = """
+    DROP INDEX IF EXISTS idx_alerts_status_created;
+    DROP INDEX IF EXISTS idx_alerts_type_status_created;
+    DROP INDEX IF EXISTS idx_alerts_mrn_created;
+    DROP INDEX IF EXISTS idx_alerts_created;
+    CREATE INDEX idx_alerts_status ON alerts(status);
+    CREATE INDEX idx_alerts_type ON alerts(alert_type);
+    CREATE INDEX idx_alerts_patient_mrn ON alerts(patient_mrn);
+    CREATE INDEX idx_alerts_created_at ON alerts(created_at);
+"""
+
+
+def populate(store: AlertStore, count: int) -> None:
+    """Insert count synthetic alerts spread over the last two years."""
+    rng = random.Random(42)
+    types = [t.value for t in AlertType]
+    start = datetime.now() - timedelta(days=730)
+    step = timedelta(days=730) / count
+
+    def rows():
+        for i in range(count):
+            created = start + step * i
+            # Older alerts are almost all resolved; recent ones mostly active
+            resolved = rng.random() < (0.98 if i < count * 0.99 else 0.3)
+            yield (
+                f"{i:08x}", rng.choice(types), f"source-{i}",
+                AlertStatus.RESOLVED.value if resolved else rng.choice(["pending", "sent", "acknowledged"]),
+                rng.choice(["critical", "warning", "info"]),
+                f"MRN{rng.randrange(count // 20 + 1):06d}",
+                f"Alert {i}", '{"organism": "Staphylococcus aureus"}',
+                created.isoformat(),
+            )
+
+    conn = get_connection(store.db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO alerts (id, alert_type, source_id, status, severity, patient_mrn, "
+            "title, content, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows(),
+        )
+    conn.execute("ANALYZE")
+
+
+def timed(fn, repeat: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def deep_cursor(store: AlertStore, **filters) -> str | None:
+    cursor = None
+    for _ in range(DEEP_PAGES):
+        _, cursor = store.list_alerts_page(limit=PAGE_SIZE, cursor=cursor, **filters)
+    return cursor
+
+
+def run(size: int, legacy: bool, repeat: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AlertStore(db_path=str(Path(tmp) / "alerts.db"))
+        populate(store, size)
+        if legacy:
+            get_connection(store.db_path).executescript(LEGACY_INDEXES + "ANALYZE;")
+
+        history = {"status": AlertStatus.RESOLVED, "alert_type": ASP_TYPES}
+        history_cursor = deep_cursor(store, **history)
+        api_cursor = deep_cursor(store)
+
+        placeholders = ",".join("?" for _ in ASP_TYPES)
+        offset_sql = (
+            f"SELECT * FROM alerts WHERE status = ? AND alert_type IN ({placeholders}) "
+            "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+        )
+        offset_params = ["resolved"] + [t.value for t in ASP_TYPES] + [PAGE_SIZE, PAGE_SIZE * DEEP_PAGES]
+        conn = get_connection(store.db_path)
+
+        results = {
+            "history": timed(lambda: store.list_alerts_page(limit=PAGE_SIZE, **history), repeat),
+            "history deep": timed(
+                lambda: store.list_alerts_page(limit=PAGE_SIZE, cursor=history_cursor, **history), repeat
+            ),
+            "offset deep": timed(lambda: conn.execute(offset_sql, offset_params).fetchall(), repeat),
+            "by type": timed(
+                lambda: store.list_alerts_page(
+                    limit=PAGE_SIZE, status=AlertStatus.RESOLVED, alert_type=AlertType.SURGICAL_PROPHYLAXIS
+                ), repeat
+            ),
+            "patient": timed(lambda: store.list_alerts_page(limit=PAGE_SIZE, patient_mrn="MRN000007"), repeat),
+            "api": timed(lambda: store.list_alerts_page(limit=PAGE_SIZE), repeat),
+            "api deep": timed(lambda: store.list_alerts_page(limit=PAGE_SIZE, cursor=api_cursor), repeat),
+        }
+        close_connections()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark alert list pagination")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Comma-separated alert table sizes")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    columns = ["history", "history deep", "offset deep", "by type", "patient", "api", "api deep"]
+    print(f"Median ms per page of {PAGE_SIZE} (deep = {DEEP_PAGES} pages in)\n")
+    print(f"{'indexes':<10} {'alerts':>9} " + " ".join(f"{c:>13}" for c in columns))
+    for legacy in (True, False):
+        for size in sizes:
+            r = run(size, legacy, args.repeat)
+            print(
+                f"{'legacy' if legacy else 'composite':<10} {size:>9} "
+                + " ".join(f"{r[c]:>13.2f}" for c in columns)
+            )
+
+
+if __name__ == "__main__":
+    main()
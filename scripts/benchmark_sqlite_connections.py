@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark AlertStore throughput: per-call connections vs. common.db.
+
+Runs the same workload twice against a fresh database:
+
+1. legacy - a new rollback-journal ``sqlite3.connect`` for every operation
+   (how the stores worked before common.db)
+2. shared - thread-local WAL connections from common.db
+
+The workload is one writer thread saving alerts (as a monitor does) while
+several reader threads list alerts (as dashboard requests do).
+
+Usage:
+    python scripts/benchmark_sqlite_connections.py
+    python scripts/benchmark_sqlite_connections.py --alerts 2000 --readers 8
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.alert_store import AlertStatus, AlertStore, AlertType
+from common.db import close_connections
+
+
+def legacy_connect(self) -> sqlite3.Connection:
+    conn = sqlite3.connect(self.db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def run(mode: str, alerts: int, readers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AlertStore(db_path=str(Path(tmp) / "alerts.db"))
+        if mode == "legacy":
+            store._connect = legacy_connect.__get__(store)
+
+        done = threading.Event()
+        reads = [0] * readers
+        errors: list[Exception] = []
+
+        def writer():
+            try:
+                for i in range(alerts):
+                    store.save_alert(
+                        alert_type=AlertType.BACTEREMIA,
+                        source_id=f"culture-{i}",
+                        severity="warning" if i % 3 else "critical",
+                        patient_mrn=f"MRN{i % 200:05d}",
+                        title=f"Benchmark alert {i}",
+                        content={"organism": "Staphylococcus aureus", "index": i},
+                    )
+            except Exception as e:
+                errors.append(e)
+            finally:
+                done.set()
+                close_connections()
+
+        def reader(slot: int):
+            try:
+                while not done.is_set():
+                    store.list_alerts(status=AlertStatus.PENDING, limit=50)
+                    reads[slot] += 1
+            except Exception as e:
+                errors.append(e)
+            finally:
+                close_connections()
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        write_thread = threading.Thread(target=writer)
+        write_thread.start()
+        write_thread.join()
+        elapsed = time.perf_counter() - start
+        for t in threads:
+            t.join()
+
+    return {
+        "elapsed": elapsed,
+        "writes_per_s": alerts / elapsed,
+        "reads_per_s": sum(reads) / elapsed,
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite connection handling")
+    parser.add_argument("--alerts", type=int, default=1000, help="Alerts to save")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent dashboard reader threads")
+    args = parser.parse_args()
+
+    print(f"{args.alerts} alert saves, {args.readers} concurrent readers\n")
+    print(f"{'mode':<8} {'elapsed':>9} {'writes/s':>10} {'reads/s':>10} {'errors':>7}")
+    for mode in ("legacy", "shared"):
+        r = run(mode, args.alerts, args.readers)
+        print(
+            f"{mode:<8} {r['elapsed']:>8.2f}s {r['writes_per_s']:>10.0f} "
+            f"{r['reads_per_s']:>10.0f} {r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
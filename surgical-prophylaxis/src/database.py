@@ -5,10 +5,19 @@ Database operations for surgical prophylaxis module.
 import json
 import os
 import sqlite3
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+
+# Add project root to path for the shared common.db connection layer
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.db import get_connection
+
 from .models import (
     ComplianceStatus,
     MedicationAdministration,
@@ -38,14 +47,12 @@ class ProphylaxisDatabase:
         if schema_path.exists():
             with open(schema_path) as f:
                 schema = f.read()
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 conn.executescript(schema)
 
     def _get_conn(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's shared WAL connection (see common.db)."""
+        return get_connection(self.db_path)
 
     # --- Surgical Cases ---
 
@@ -463,7 +470,7 @@ class ProphylaxisDatabase:
         if schema_path.exists():
             with open(schema_path) as f:
                 schema = f.read()
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 conn.executescript(schema)
 
     def save_journey(
@@ -8,12 +8,21 @@ to maintain the complete patient journey through the surgical workflow.
 import json
 import logging
 import sqlite3
+import sys
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Any
 
+
+# Add project root to path for the shared common.db connection layer
+_project_root = Path(__file__).parent.parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.db import get_connection
+
 from .location_tracker import LocationState, PatientLocationUpdate
 from .schedule_monitor import ScheduledSurgery
 from .preop_checker import PreOpCheckResult, AlertTrigger
@@ -133,14 +142,12 @@ class StateManager:
         if schema_path.exists():
             with open(schema_path) as f:
                 schema = f.read()
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 conn.executescript(schema)
 
     def _get_conn(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's shared WAL connection (see common.db)."""
+        return get_connection(self.db_path)
 
     def create_journey(self, surgery: ScheduledSurgery) -> SurgicalJourney:
         """